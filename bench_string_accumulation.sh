@@ -0,0 +1,33 @@
+#!/bin/bash
+# Times a long string-building loop before and after translation.
+# The baselines copy the whole string on every iteration; the translations
+# append in place (Tcl) or join a list once after the loop (Python).
+set -e
+
+cd /workspaces/PLT
+
+echo "Building PLT.CLI..."
+dotnet build src/PLT/PLT.CLI/PLT.CLI.csproj -q 2>&1 | head -20
+
+PLT=./src/PLT/PLT.CLI/bin/Debug/net8.0/PLT.CLI
+SRC=src/examples/string_accumulation.py
+OUT=/tmp/plt_bench
+mkdir -p $OUT
+
+$PLT --from py --to tcl $SRC > $OUT/accumulate.tcl
+$PLT --from py --to python $SRC > $OUT/accumulate.py
+# What the Tcl loop costs without append: a fresh copy per iteration
+sed 's/append s \(.*\)$/set s [string cat $s \1]/' $OUT/accumulate.tcl > $OUT/accumulate_copy.tcl
+
+echo ""
+echo "Tcl, append:"
+time tclsh $OUT/accumulate.tcl
+echo ""
+echo "Tcl, copy per iteration:"
+time tclsh $OUT/accumulate_copy.tcl
+echo ""
+echo "Python, list + join:"
+time python3 $OUT/accumulate.py
+echo ""
+echo "Python, original +=:"
+time python3 $SRC
@@ -5,13 +5,30 @@ using PLT.CORE.Backends.Tcl;
 using PLT.CORE.Frontends.Js;
 using PLT.CORE.Frontends.Python;
 using PLT.CORE.Frontends.CSharp;
+using PLT.CORE.Optimization;
+using PLT.CORE.Project;
+using PLT.CORE.Telemetry;
 
 
 static void Usage()
 {
     Console.WriteLine("Usage:");
     Console.WriteLine("  plt --from <js|py|cs> --to <python|c|tcl> <input> [-o out]");
+    Console.WriteLine("  plt --from py --to <python|c|tcl> --project <dir> -o <outdir>");
     Console.WriteLine("  --print-ir      Print the IR before emitting output");
+    Console.WriteLine("  --ir-format <tree|sexpr|jsonl>  IR dump format (implies --print-ir)");
+    Console.WriteLine("  --ir-kind <K[,K]>  Dump only subtrees rooted at these node kinds (e.g. FunctionDef)");
+    Console.WriteLine("  --ir-name <name>   Dump only subtrees defining/referencing a name (e.g. Parser.parse)");
+    Console.WriteLine("  --ir-depth <n>     Dump at most n levels below each dumped node");
+    Console.WriteLine("  --ir-out <file>    Stream the IR dump to a file instead of the console");
+    Console.WriteLine("  --stats         Print per-phase timings, counts and allocations to stderr");
+    Console.WriteLine("  --trace <file>  Write a Chrome trace (chrome://tracing, Perfetto) of every phase");
+    Console.WriteLine("  --no-parallel   Parse and emit on a single thread even for large inputs");
+    Console.WriteLine("  -O, --optimize  Optimize the IR before emitting (hoists loop-invariant expressions, caches repeated attribute reads)");
+    Console.WriteLine("  --tree-shake    Drop top-level functions and classes unreachable from top-level code");
+    Console.WriteLine("  --entry <name[,name]>  Also keep these definitions (implies --tree-shake)");
+    Console.WriteLine("  --project <dir> Translate every module under <dir>, following imports; re-runs only");
+    Console.WriteLine("                  retranslate modules that changed or whose imports' interfaces changed");
     Console.WriteLine();
     Console.WriteLine("Examples:");
     Console.WriteLine("  dotnet run --project .\\PLT.CLI\\ -- --from js --to python examples\\hello.js -o out.py");
@@ -24,6 +41,18 @@ string? to = null;
 string? inputPath = null;
 string? outputPath = null;
 bool printIr = false;
+var irFormat = IrDumpFormat.Tree;
+List<string>? irKinds = null;
+string? irName = null;
+int? irDepth = null;
+string? irOut = null;
+bool printStats = false;
+string? tracePath = null;
+string? projectRoot = null;
+bool parallel = true;
+bool optimize = false;
+bool treeShake = false;
+List<string> entryPoints = new();
 
 
 for (int i = 0; i < args.Length; i++)
@@ -33,6 +62,62 @@ for (int i = 0; i < args.Length; i++)
         case "--print-ir":
             printIr = true;
             break;
+        case "--ir-format":
+            printIr = true;
+            switch (i + 1 < args.Length ? args[++i] : null)
+            {
+                case "tree": irFormat = IrDumpFormat.Tree; break;
+                case "sexpr": irFormat = IrDumpFormat.SExpr; break;
+                case "jsonl": irFormat = IrDumpFormat.JsonLines; break;
+                default:
+                    Console.WriteLine("--ir-format must be one of: tree, sexpr, jsonl");
+                    return;
+            }
+            break;
+        case "--ir-kind":
+            printIr = true;
+            irKinds = (i + 1 < args.Length ? args[++i] : "").Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries).ToList();
+            break;
+        case "--ir-name":
+            printIr = true;
+            irName = i + 1 < args.Length ? args[++i] : null;
+            break;
+        case "--ir-depth":
+            printIr = true;
+            if (i + 1 >= args.Length || !int.TryParse(args[++i], out var depth) || depth < 0)
+            {
+                Console.WriteLine("--ir-depth expects a non-negative number");
+                return;
+            }
+            irDepth = depth;
+            break;
+        case "--ir-out":
+            printIr = true;
+            irOut = i + 1 < args.Length ? args[++i] : null;
+            break;
+        case "--stats":
+            printStats = true;
+            break;
+        case "--trace":
+            tracePath = i + 1 < args.Length ? args[++i] : null;
+            break;
+        case "--no-parallel":
+            parallel = false;
+            break;
+        case "-O":
+        case "--optimize":
+            optimize = true;
+            break;
+        case "--tree-shake":
+            treeShake = true;
+            break;
+        case "--entry":
+            treeShake = true;
+            entryPoints.AddRange((i + 1 < args.Length ? args[++i] : "").Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries));
+            break;
+        case "--project":
+            projectRoot = i + 1 < args.Length ? args[++i] : null;
+            break;
         case "--from":
             from = i + 1 < args.Length ? args[++i] : null;
             break;
@@ -56,13 +141,38 @@ for (int i = 0; i < args.Length; i++)
     }
 }
 
-if (from is null || to is null || inputPath is null)
+if (from is null || to is null || (inputPath is null && projectRoot is null))
 {
     Usage();
     return;
 }
 
-if (!File.Exists(inputPath))
+if (projectRoot is not null)
+{
+    if (from != "py")
+    {
+        Console.WriteLine("--project currently supports --from py only");
+        return;
+    }
+    if (!Directory.Exists(projectRoot))
+    {
+        Console.WriteLine($"Project directory not found: {projectRoot}");
+        return;
+    }
+    if (string.IsNullOrWhiteSpace(outputPath))
+    {
+        Console.WriteLine("--project requires -o <outdir>");
+        return;
+    }
+    if (treeShake)
+    {
+        // What a module may drop depends on every module importing it, which
+        // would defeat retranslating only what changed.
+        Console.WriteLine("--tree-shake is not supported with --project");
+        return;
+    }
+}
+else if (!File.Exists(inputPath))
 {
     Console.WriteLine($"Input file not found: {inputPath}");
     return;
@@ -75,37 +185,140 @@ if (from != "js" && from != "py" && from != "cs")
     return;
 }
 
-var source = File.ReadAllText(inputPath);
-var ir = from switch
-{
-    "js" => MiniJsFrontend.ParseConsoleLogHelloWorld(source),
-    "py" => PythonFrontend.Parse(source),
-    "cs" => CSharpFrontend.Parse(source),
-    _ => throw new Exception($"Unknown frontend: {from}")
-};
-
-if (printIr)
+if (to is not ("python" or "py" or "c" or "tcl"))
 {
-    Console.WriteLine("=== IR ===");
-    Console.WriteLine(PrettyPrinter.Print(ir));
+    Console.WriteLine($"Unsupported --to {to}");
+    return;
 }
 
-
-// Emit
-string output = to switch
+string Emit(IrProgram ir) => to switch
 {
-    "python" or "py" => new PythonEmitter().Emit(ir),
-    "c" => new CEmitter().Emit(ir),
-    "tcl" => new TclEmitter().Emit(ir),
+    "python" or "py" => new PythonEmitter { Parallel = parallel ? null : false }.Emit(ir),
+    "c" => new CEmitter { Parallel = parallel ? null : false }.Emit(ir),
+    "tcl" => new TclEmitter { Parallel = parallel ? null : false }.Emit(ir),
     _ => throw new Exception($"Unsupported --to {to}")
 };
 
-if (!string.IsNullOrWhiteSpace(outputPath))
+using var recorder = printStats || tracePath is not null ? new PhaseRecorder() : null;
+
+if (projectRoot is not null)
 {
-    File.WriteAllText(outputPath, output);
-    Console.WriteLine($"Wrote {to} to: {outputPath}");
+    var result = new ProjectTranslator
+    {
+        SourceRoot = projectRoot,
+        OutputRoot = outputPath!,
+        // Optimized and unoptimized output differ, so switching -O retranslates everything.
+        Target = optimize ? $"{to} -O" : to,
+        OutputExtension = to switch { "c" => ".c", "tcl" => ".tcl", _ => ".py" },
+        Emit = ir => Emit(optimize ? IrOptimizer.Optimize(ir) : ir),
+        Parallel = parallel,
+    }.Translate();
+
+    foreach (var module in result.Modules.Where(m => m.Status is ModuleStatus.Failed or ModuleStatus.Blocked))
+        Console.WriteLine($"{module.Status.ToString().ToLowerInvariant()}: {module.Module.Name}: {module.Error}");
+    Console.WriteLine($"Translated {result.WithStatus(ModuleStatus.Translated).Count()}, " +
+        $"up to date {result.WithStatus(ModuleStatus.UpToDate).Count()}, " +
+        $"failed {result.WithStatus(ModuleStatus.Failed).Count()}, " +
+        $"blocked {result.WithStatus(ModuleStatus.Blocked).Count()} ({result.Modules.Count} modules) in: {outputPath}");
+}
+else if (inputPath is not null)
+{
+    using (var translate = PltTelemetry.StartPhase("translate"))
+    {
+        translate.SetTag("input", inputPath);
+        translate.SetTag("from", from);
+        translate.SetTag("to", to);
+
+        // The frontends lex directly from a memory mapping of the input file.
+        using (var phase = PltTelemetry.StartPhase("read"))
+        {
+            phase.RecordInputBytes(new FileInfo(inputPath).Length);
+        }
+
+        var ir = from switch
+        {
+            "js" => JsFrontend.ParseFile(inputPath),
+            "py" => parallel ? PythonFrontend.ParseFile(inputPath) : PythonFrontend.ParseFile(inputPath, parallel: false),
+            "cs" => parallel ? CSharpFrontend.ParseFile(inputPath) : CSharpFrontend.ParseFile(inputPath, parallel: false),
+            _ => throw new Exception($"Unknown frontend: {from}")
+        };
+
+        TreeShakeResult? shaken = null;
+        IrProgram? unshakenIr = null;
+        if (treeShake)
+        {
+            unshakenIr = ir;
+            shaken = TreeShaker.Shake(ir, entryPoints);
+            ir = shaken.Program;
+        }
+
+        if (optimize)
+            ir = IrOptimizer.Optimize(ir);
+
+        if (printIr)
+        {
+            var dumpOptions = new IrDumpOptions { Format = irFormat, Kinds = irKinds, Name = irName, MaxDepth = irDepth };
+            if (!string.IsNullOrWhiteSpace(irOut))
+            {
+                using var writer = new StreamWriter(irOut);
+                IrDumper.Dump(ir, writer, dumpOptions);
+                Console.WriteLine($"Wrote IR to: {irOut}");
+            }
+            else
+            {
+                Console.WriteLine("=== IR ===");
+                IrDumper.Dump(ir, Console.Out, dumpOptions);
+                Console.WriteLine();
+            }
+        }
+
+
+        // Emit
+        string output = Emit(ir);
+
+        if (shaken is not null)
+        {
+            if (shaken.KeptEverything)
+            {
+                Console.Error.WriteLine("Tree shaking kept everything: the program calls globals(), eval() or similar");
+            }
+            else
+            {
+                // Emitted again without shaking, just to report the difference
+                var unshaken = unshakenIr!;
+                long before = System.Text.Encoding.UTF8.GetByteCount(Emit(optimize ? IrOptimizer.Optimize(unshaken) : unshaken));
+                long after = System.Text.Encoding.UTF8.GetByteCount(output);
+                Console.Error.WriteLine($"Tree shaking removed {shaken.Removed.Count} definition(s), " +
+                    $"{before - after} of {before} bytes ({(before == 0 ? 0 : 100.0 * (before - after) / before):0.#}%)");
+                if (shaken.Removed.Count > 0)
+                    Console.Error.WriteLine($"  {string.Join(", ", shaken.Removed)}");
+            }
+        }
+
+        if (!string.IsNullOrWhiteSpace(outputPath))
+        {
+            using (var phase = PltTelemetry.StartPhase("write"))
+            {
+                File.WriteAllText(outputPath, output);
+                phase.RecordOutputBytes(new FileInfo(outputPath).Length);
+            }
+            Console.WriteLine($"Wrote {to} to: {outputPath}");
+        }
+        else
+        {
+            Console.WriteLine(output);
+        }
+    }
 }
-else
+
+if (recorder is not null)
 {
-    Console.WriteLine(output);
+    if (printStats)
+        Console.Error.Write(recorder.FormatSummary());
+
+    if (!string.IsNullOrWhiteSpace(tracePath))
+    {
+        recorder.WriteChromeTrace(tracePath);
+        Console.Error.WriteLine($"Wrote trace to: {tracePath}");
+    }
 }
@@ -0,0 +1,273 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Analysis;
+
+// Builds a SymbolTable with Python's scoping rules:
+//   - a name bound anywhere in a function body (assignment, for target, tuple
+//     unpacking, except ... as, def, class, import) is local to the whole function;
+//   - other names resolve outwards through enclosing functions to the module,
+//     skipping class bodies, and are unresolved (builtins) if nothing binds them;
+//   - comprehensions and lambdas get their own scope for their loop variables and
+//     parameters; a comprehension's first iterable is evaluated outside it.
+// Each statement scope is analysed in two passes, bindings first and then uses,
+// since a use may come before the binding that makes a name local.
+public static class ScopeAnalyzer
+{
+    public static SymbolTable Analyze(IrProgram program)
+    {
+        using var phase = PltTelemetry.StartPhase("scopes");
+        var module = new Scope(ScopeKind.Module, "<module>", program, null, program.Body);
+        var table = new SymbolTable(module);
+        AnalyzeStatementScope(table, module, Array.Empty<string>());
+        phase.SetTag("scopes", table._scopes.Count);
+        return table;
+    }
+
+    private static void AnalyzeStatementScope(SymbolTable table, Scope scope, IReadOnlyList<string> parameters)
+    {
+        table._scopes[scope.Owner] = scope;
+        foreach (var parameter in parameters)
+            Bind(scope, parameter, SymbolKind.Parameter, scope.Owner);
+
+        CollectBindings(table, scope, scope.Body, direct: true);
+
+        foreach (var symbol in scope._symbols.Values)
+        {
+            if (symbol.Kind == SymbolKind.Variable && !table._declarations.Contains(symbol.Definitions[0]))
+                scope._hoisted.Add(symbol);
+        }
+
+        foreach (var stmt in scope.Body)
+            ResolveStmt(table, scope, stmt);
+    }
+
+    // direct: the statements belong to scope.Body itself rather than a nested block.
+    private static void CollectBindings(SymbolTable table, Scope scope, IEnumerable<Stmt> stmts, bool direct)
+    {
+        foreach (var stmt in stmts)
+        {
+            switch (stmt)
+            {
+                case VarAssignment v:
+                    var symbol = Bind(scope, v.VarName, SymbolKind.Variable, v);
+                    if (direct && symbol.Definitions.Count == 1)
+                        table._declarations.Add(v);
+                    break;
+
+                case TupleUnpackingAssignment t:
+                    foreach (var name in t.VarNames)
+                        Bind(scope, name, SymbolKind.Variable, t);
+                    break;
+
+                case ForEachStmt f:
+                    foreach (var name in SplitTargets(f.LoopVar))
+                        Bind(scope, name, SymbolKind.Variable, f);
+                    CollectBindings(table, scope, f.Body, direct: false);
+                    break;
+
+                case TryStmt t:
+                    CollectBindings(table, scope, t.TryBody, direct: false);
+                    foreach (var (_, varName, body) in t.ExceptClauses)
+                    {
+                        if (varName != null)
+                            Bind(scope, varName, SymbolKind.Variable, t);
+                        CollectBindings(table, scope, body, direct: false);
+                    }
+                    if (t.FinallyBody != null)
+                        CollectBindings(table, scope, t.FinallyBody, direct: false);
+                    break;
+
+                case FunctionDefStmt f:
+                    Bind(scope, f.FunctionName, SymbolKind.Function, f);
+                    break;
+
+                case ClassDefStmt c:
+                    Bind(scope, c.ClassName, SymbolKind.Class, c);
+                    break;
+
+                case YieldStmt:
+                    if (scope.Kind == ScopeKind.Function)
+                        scope.IsGenerator = true;
+                    break;
+
+                case ImportStmt i:
+                    foreach (var (name, alias) in i.Names)
+                    {
+                        if (name == "*")
+                            continue;
+                        // "import a.b" binds a; "from m import a.b" isn't valid Python
+                        var bound = alias ?? (i.FromModule == null ? name.Split('.')[0] : name);
+                        Bind(scope, bound, SymbolKind.Import, i);
+                    }
+                    break;
+
+                default:
+                    // if/while and any other compound statement
+                    CollectBindings(table, scope, IrWalker.Children(stmt).OfType<Stmt>(), direct: false);
+                    break;
+            }
+        }
+    }
+
+    private static void ResolveStmt(SymbolTable table, Scope scope, Stmt stmt)
+    {
+        switch (stmt)
+        {
+            case FunctionDefStmt f:
+                AnalyzeStatementScope(table,
+                    new Scope(ScopeKind.Function, Qualify(scope, f.FunctionName), f, scope, f.Body),
+                    f.Parameters);
+                break;
+
+            case ClassDefStmt c:
+                AnalyzeStatementScope(table,
+                    new Scope(ScopeKind.Class, Qualify(scope, c.ClassName), c, scope, c.Body),
+                    Array.Empty<string>());
+                break;
+
+            default:
+                foreach (var child in IrWalker.Children(stmt))
+                {
+                    if (child is Stmt s)
+                        ResolveStmt(table, scope, s);
+                    else if (child is Expr e)
+                        ResolveExpr(table, scope, e);
+                }
+                break;
+        }
+    }
+
+    // Explicit stack: expression chains from generated code can be very long.
+    private static void ResolveExpr(SymbolTable table, Scope scope, Expr root)
+    {
+        var stack = new Stack<Node>();
+        stack.Push(root);
+        var children = new List<Node>();
+
+        while (stack.Count > 0)
+        {
+            var node = stack.Pop();
+            switch (node)
+            {
+                case Variable v:
+                    Use(table, scope, v, v.Name);
+                    continue;
+
+                case StringPartVariable p:
+                    Use(table, scope, p, p.VarName);
+                    continue;
+
+                // The callee is read like a variable; its arguments are walked below
+                case FunctionCall { IsNamespaced: false } call:
+                    Use(table, scope, call, call.FunctionName);
+                    break;
+
+                case ListComprehension lc:
+                {
+                    ResolveExpr(table, scope, lc.IterableExpr);
+                    var inner = ExpressionScope(table, ScopeKind.Comprehension, "<listcomp>", lc, scope, SplitTargets(lc.LoopVar));
+                    ResolveExpr(table, inner, lc.Element);
+                    if (lc.FilterCondition != null)
+                        ResolveExpr(table, inner, lc.FilterCondition);
+                    continue;
+                }
+
+                case DictComprehension dc:
+                {
+                    ResolveExpr(table, scope, dc.IterableExpr);
+                    var inner = ExpressionScope(table, ScopeKind.Comprehension, "<dictcomp>", dc, scope, SplitTargets(dc.LoopVar));
+                    ResolveExpr(table, inner, dc.KeyExpr);
+                    ResolveExpr(table, inner, dc.ValueExpr);
+                    if (dc.FilterCondition != null)
+                        ResolveExpr(table, inner, dc.FilterCondition);
+                    continue;
+                }
+
+                case LambdaExpr lam:
+                {
+                    var inner = ExpressionScope(table, ScopeKind.Lambda, "<lambda>", lam, scope, lam.Parameters);
+                    ResolveExpr(table, inner, lam.Body);
+                    continue;
+                }
+            }
+
+            children.Clear();
+            children.AddRange(IrWalker.Children(node));
+            for (int i = children.Count - 1; i >= 0; i--)
+                stack.Push(children[i]);
+        }
+    }
+
+    private static Scope ExpressionScope(SymbolTable table, ScopeKind kind, string name, Node owner, Scope parent, IEnumerable<string> names)
+    {
+        var scope = new Scope(kind, Qualify(parent, name), owner, parent, Array.Empty<Stmt>());
+        table._scopes[owner] = scope;
+        foreach (var n in names)
+            Bind(scope, n, kind == ScopeKind.Lambda ? SymbolKind.Parameter : SymbolKind.Variable, owner);
+        return scope;
+    }
+
+    private static void Use(SymbolTable table, Scope scope, Node use, string name)
+    {
+        table._useScopes[use] = scope;
+
+        var symbol = Lookup(scope, name);
+        if (symbol == null)
+            return;
+
+        table._resolved[use] = symbol;
+        symbol._uses.Add(use);
+
+        if (symbol.IsGlobal && symbol.Kind == SymbolKind.Variable)
+        {
+            var frame = EnclosingFunction(scope);
+            if (frame != null && !frame._globalsUsed.Contains(symbol))
+                frame._globalsUsed.Add(symbol);
+        }
+    }
+
+    private static Symbol? Lookup(Scope scope, string name)
+    {
+        for (var s = scope; s != null; s = s.Parent)
+        {
+            // A class body's names are only visible inside the class body itself.
+            if (s.Kind == ScopeKind.Class && s != scope)
+                continue;
+            if (s._symbols.TryGetValue(name, out var symbol))
+                return symbol;
+        }
+        return null;
+    }
+
+    // The function whose frame an expression scope runs in, if any.
+    private static Scope? EnclosingFunction(Scope scope)
+    {
+        for (var s = scope; s != null; s = s.Parent)
+        {
+            if (s.Kind == ScopeKind.Function)
+                return s;
+            if (s.Kind is ScopeKind.Module or ScopeKind.Class)
+                return null;
+        }
+        return null;
+    }
+
+    private static Symbol Bind(Scope scope, string name, SymbolKind kind, Node definition)
+    {
+        if (!scope._symbols.TryGetValue(name, out var symbol))
+        {
+            symbol = new Symbol(name, kind, scope);
+            scope._symbols[name] = symbol;
+        }
+        symbol._definitions.Add(definition);
+        return symbol;
+    }
+
+    private static string Qualify(Scope parent, string name) =>
+        parent.Kind == ScopeKind.Module ? name : $"{parent.Name}.{name}";
+
+    // Loop targets are stored as "k, v" (for) or "k,v" (comprehensions).
+    private static IEnumerable<string> SplitTargets(string targets) =>
+        targets.Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries);
+}
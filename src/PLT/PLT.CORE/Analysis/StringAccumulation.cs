@@ -0,0 +1,263 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Analysis;
+
+// Finds strings built up inside loops (`s += x` / `s = s + x + y`), which copy the
+// whole string on every iteration in all three targets.
+//
+// An accumulation is a VarAssignment inside a for/while loop whose value is a chain
+// of "+" starting at the variable itself, where the variable is known to hold a
+// string. Backends with an in-place append (Tcl) use it for every accumulation.
+// Backends that need a separate builder (a Python list, a C buffer) keep one only
+// for the duration of a loop in which the variable is read nowhere except as the
+// left operand of its own accumulations; BuffersOf(loop) lists those variables, and
+// the builder is turned back into the string right after the loop.
+public sealed class StringAccumulation
+{
+    private readonly Dictionary<Node, IReadOnlyList<Expr>> _pieces = new(ReferenceEqualityComparer.Instance);
+    private readonly Dictionary<Node, IReadOnlyList<Symbol>> _buffers = new(ReferenceEqualityComparer.Instance);
+    private readonly HashSet<Node> _buffered = new(ReferenceEqualityComparer.Instance);
+    private readonly HashSet<Symbol> _strings = new();
+    private readonly HashSet<Node> _stringAssignments = new(ReferenceEqualityComparer.Instance);
+
+    private StringAccumulation()
+    {
+    }
+
+    // The values appended by an accumulation, with nested string concatenations
+    // flattened (`s = s + (x + ",")` appends x and ","); null for any other assignment.
+    public IReadOnlyList<Expr>? Pieces(VarAssignment assignment) =>
+        _pieces.TryGetValue(assignment, out var pieces) ? pieces : null;
+
+    // True when the accumulation appends to a builder opened by an enclosing loop.
+    public bool IsBuffered(VarAssignment assignment) => _buffered.Contains(assignment);
+
+    // Variables that get a builder for the duration of a ForEachStmt or WhileStmt,
+    // in first-accumulation order.
+    public IReadOnlyList<Symbol> BuffersOf(Stmt loop) =>
+        _buffers.TryGetValue(loop, out var buffers) ? buffers : Array.Empty<Symbol>();
+
+    public bool HasBuffers => _buffers.Count > 0;
+
+    // True for accumulated variables, which are known to hold strings.
+    public bool IsString(Symbol symbol) => _strings.Contains(symbol);
+
+    // True for any assignment to an accumulated variable.
+    public bool AssignsString(VarAssignment assignment) => _stringAssignments.Contains(assignment);
+
+    public static StringAccumulation Analyze(IrProgram program, SymbolTable symbols)
+    {
+        using var phase = PltTelemetry.StartPhase("accumulation");
+        var result = new StringAccumulation();
+
+        foreach (var scope in symbols.Scopes)
+        {
+            var candidates = new List<(VarAssignment Assignment, Symbol Symbol, Variable Left, List<Expr> Pieces)>();
+            CollectCandidates(scope, scope.Body, inLoop: false, candidates);
+            if (candidates.Count == 0)
+                continue;
+
+            var accumulations = new Dictionary<Node, Variable>(ReferenceEqualityComparer.Instance);
+            foreach (var group in candidates.GroupBy(c => c.Symbol))
+            {
+                if (!HoldsString(group.Key, group.Select(c => c.Assignment), group.SelectMany(c => c.Pieces)))
+                    continue;
+                result._strings.Add(group.Key);
+                result._stringAssignments.UnionWith(group.Key.Definitions.OfType<VarAssignment>());
+                foreach (var (assignment, _, left, pieces) in group)
+                {
+                    result._pieces[assignment] = pieces;
+                    accumulations[assignment] = left;
+                }
+            }
+
+            if (accumulations.Count > 0)
+                AssignBuffers(result, symbols, scope, scope.Body, accumulations, new HashSet<Symbol>(), inTry: false);
+        }
+
+        phase.SetTag("accumulations", result._pieces.Count);
+        phase.SetTag("buffers", result._buffers.Values.Sum(b => b.Count));
+        return result;
+    }
+
+    private static void CollectCandidates(Scope scope, IEnumerable<Stmt> stmts, bool inLoop,
+        List<(VarAssignment, Symbol, Variable, List<Expr>)> candidates)
+    {
+        foreach (var stmt in stmts)
+        {
+            switch (stmt)
+            {
+                case VarAssignment v when inLoop:
+                    var left = LeftmostOperand(v.Value, out var pieces);
+                    if (left != null && left.Name == v.VarName && scope.Lookup(v.VarName) is { } symbol)
+                        candidates.Add((v, symbol, left, pieces));
+                    break;
+
+                // Nested functions and classes are scopes of their own.
+                case FunctionDefStmt or ClassDefStmt:
+                    break;
+
+                case ForEachStmt or WhileStmt:
+                    CollectCandidates(scope, IrWalker.Children(stmt).OfType<Stmt>(), inLoop: true, candidates);
+                    break;
+
+                default:
+                    CollectCandidates(scope, IrWalker.Children(stmt).OfType<Stmt>(), inLoop, candidates);
+                    break;
+            }
+        }
+    }
+
+    // For `a + b + c` (left-associative), the Variable a and the pieces [b, c].
+    private static Variable? LeftmostOperand(Expr value, out List<Expr> pieces)
+    {
+        pieces = new List<Expr>();
+        var operands = new Stack<Expr>();
+        var expr = value;
+        while (expr is BinaryOp { Op: "+" } b)
+        {
+            operands.Push(b.Right);
+            expr = b.Left;
+        }
+        if (expr is not Variable variable || operands.Count == 0)
+            return null;
+        while (operands.Count > 0)
+            Flatten(operands.Pop(), pieces);
+        return variable;
+    }
+
+    // Splits a string-valued + into its pieces. A long concatenation nests on the left,
+    // so that spine is walked with loops: a + along it splits if it is string-valued
+    // (it or something to its left is) and every + above it split too.
+    private static void Flatten(Expr expr, List<Expr> pieces)
+    {
+        var spine = new List<BinaryOp>();
+        for (var e = expr; e is BinaryOp { Op: "+" } b; e = b.Left)
+            spine.Add(b);
+
+        var stringValued = new bool[spine.Count];
+        for (int i = spine.Count - 1; i >= 0; i--)
+            stringValued[i] = (i == spine.Count - 1 ? IsStringValued(spine[i].Left) : stringValued[i + 1]) || IsStringValued(spine[i].Right);
+
+        int split = 0;
+        while (split < spine.Count && stringValued[split])
+            split++;
+
+        pieces.Add(split < spine.Count ? spine[split] : split == 0 ? expr : spine[split - 1].Left);
+        for (int i = split - 1; i >= 0; i--)
+            Flatten(spine[i].Right, pieces);
+    }
+
+    // A variable holds a string if something appended to it is a string, or if every
+    // other assignment to it stores one.
+    private static bool HoldsString(Symbol symbol, IEnumerable<VarAssignment> accumulations, IEnumerable<Expr> pieces)
+    {
+        if (pieces.Any(IsStringValued))
+            return true;
+
+        var accumulating = new HashSet<Node>(accumulations, ReferenceEqualityComparer.Instance);
+        var others = symbol.Definitions.Where(d => !accumulating.Contains(d)).ToList();
+        return others.Count > 0 && others.All(d => d is VarAssignment v && IsStringValued(v.Value));
+    }
+
+    internal static bool IsStringValued(Expr expr)
+    {
+        // Down the left of a + chain with a loop, as for Flatten
+        while (expr is BinaryOp { Op: "+" } b)
+        {
+            if (IsStringValued(b.Right))
+                return true;
+            expr = b.Left;
+        }
+
+        return expr switch
+        {
+            Literal { Value: string } => true,
+            StringInterpolation => true,
+            FunctionCall { FunctionName: "str" or "repr" or "chr" or "format" or "hex" or "oct" or "bin" } => true,
+            MethodCall { MethodName: "join" or "upper" or "lower" or "strip" or "lstrip" or "rstrip" or "replace" or "format" or "decode" or "__slice__" } m
+                => m.MethodName != "__slice__" || IsStringValued(m.Target),
+            BinaryOp { Op: "%" or "*" } b => b.Left is Literal { Value: string },
+            _ => false,
+        };
+    }
+
+    // Walks a scope's statements outermost loop first, so a variable gets a single
+    // builder around the largest loop that allows one.
+    private static void AssignBuffers(StringAccumulation result, SymbolTable symbols, Scope scope, IEnumerable<Stmt> stmts,
+        Dictionary<Node, Variable> accumulations, HashSet<Symbol> open, bool inTry)
+    {
+        foreach (var stmt in stmts)
+        {
+            switch (stmt)
+            {
+                case VarAssignment v when open.Count > 0 && accumulations.ContainsKey(v):
+                    if (open.Contains(scope.Lookup(v.VarName)!))
+                        result._buffered.Add(v);
+                    break;
+
+                case FunctionDefStmt or ClassDefStmt:
+                    break;
+
+                case ForEachStmt or WhileStmt:
+                {
+                    // An exception escaping the loop would leave the string un-joined
+                    // for an except/finally block that reads it.
+                    var opened = inTry ? new List<Symbol>() : Bufferable(symbols, scope, stmt, accumulations, open);
+                    if (opened.Count > 0)
+                    {
+                        result._buffers[stmt] = opened;
+                        open.UnionWith(opened);
+                    }
+                    AssignBuffers(result, symbols, scope, IrWalker.Children(stmt).OfType<Stmt>(), accumulations, open, inTry);
+                    open.ExceptWith(opened);
+                    break;
+                }
+
+                case TryStmt:
+                    AssignBuffers(result, symbols, scope, IrWalker.Children(stmt).OfType<Stmt>(), accumulations, open, inTry: true);
+                    break;
+
+                default:
+                    AssignBuffers(result, symbols, scope, IrWalker.Children(stmt).OfType<Stmt>(), accumulations, open, inTry);
+                    break;
+            }
+        }
+    }
+
+    private static List<Symbol> Bufferable(SymbolTable symbols, Scope scope, Stmt loop,
+        Dictionary<Node, Variable> accumulations, HashSet<Symbol> open)
+    {
+        // Everything evaluated on each iteration; a for loop's iterable is evaluated
+        // once, before the builder would be needed.
+        var order = new List<Node>();
+        foreach (var child in IrWalker.Children(loop))
+        {
+            if (loop is ForEachStmt f && ReferenceEquals(child, f.IterableExpr))
+                continue;
+            order.AddRange(IrWalker.Descendants(child));
+        }
+        var inside = new HashSet<Node>(order, ReferenceEqualityComparer.Instance);
+        var lefts = new HashSet<Node>(accumulations.Values, ReferenceEqualityComparer.Instance);
+
+        var bufferable = new List<Symbol>();
+        foreach (var node in order)
+        {
+            if (node is not VarAssignment v || !accumulations.ContainsKey(v))
+                continue;
+            var symbol = scope.Lookup(v.VarName)!;
+            if (open.Contains(symbol) || bufferable.Contains(symbol))
+                continue;
+
+            bool onlyAccumulates =
+                symbol.Definitions.All(d => !inside.Contains(d) || accumulations.ContainsKey(d)) &&
+                symbol.Uses.All(u =>
+                    symbols.ScopeOfUse(u) == scope &&
+                    (!inside.Contains(u) || lefts.Contains(u)));
+            if (onlyAccumulates)
+                bufferable.Add(symbol);
+        }
+        return bufferable;
+    }
+}
@@ -0,0 +1,135 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Analysis;
+
+public enum ScopeKind
+{
+    Module,
+    Function,
+    Class,
+    Comprehension,
+    Lambda,
+}
+
+public enum SymbolKind
+{
+    Variable,   // bound by assignment, for, tuple unpacking or except ... as
+    Parameter,
+    Function,
+    Class,
+    Import,
+}
+
+public sealed class Symbol
+{
+    internal Symbol(string name, SymbolKind kind, Scope scope)
+    {
+        Name = name;
+        Kind = kind;
+        Scope = scope;
+    }
+
+    public string Name { get; }
+
+    // How the name was first bound in its scope.
+    public SymbolKind Kind { get; }
+    public Scope Scope { get; }
+
+    // Binding statements/expressions (VarAssignment, ForEachStmt, FunctionDefStmt, ...)
+    // in source order.
+    public IReadOnlyList<Node> Definitions => _definitions;
+
+    // Variable, StringPartVariable and FunctionCall nodes that resolve to this symbol, in
+    // source order.
+    public IReadOnlyList<Node> Uses => _uses;
+
+    public bool IsGlobal => Scope.Kind == ScopeKind.Module;
+
+    internal readonly List<Node> _definitions = new();
+    internal readonly List<Node> _uses = new();
+
+    public override string ToString() => $"{Scope.Name}.{Name} ({Kind})";
+}
+
+public sealed class Scope
+{
+    internal Scope(ScopeKind kind, string name, Node owner, Scope? parent, IReadOnlyList<Stmt> body)
+    {
+        Kind = kind;
+        Name = name;
+        Owner = owner;
+        Parent = parent;
+        Body = body;
+    }
+
+    public ScopeKind Kind { get; }
+
+    // Dotted path of enclosing function/class names ("<module>", "Parser.parse").
+    public string Name { get; }
+
+    // The IrProgram, FunctionDefStmt, ClassDefStmt, comprehension or lambda.
+    public Node Owner { get; }
+    public Scope? Parent { get; }
+
+    // The statements that run directly in this scope (empty for expression scopes).
+    public IReadOnlyList<Stmt> Body { get; }
+
+    public IReadOnlyDictionary<string, Symbol> Symbols => _symbols;
+
+    // Module-level variables read by this function (including by comprehensions and
+    // lambdas inside it, which run in the same frame), in first-use order. Backends
+    // without implicit access to globals link these once on entry.
+    public IReadOnlyList<Symbol> GlobalsUsed => _globalsUsed;
+
+    // Variables whose first binding is nested inside a block (if/while/for/try)
+    // rather than a statement of Body, or is not an assignment. A backend with
+    // block-scoped declarations declares these once at the top of the scope.
+    public IReadOnlyList<Symbol> HoistedLocals => _hoisted;
+
+    // A function whose body yields: calling it makes a generator instead of running it.
+    public bool IsGenerator { get; internal set; }
+
+    internal readonly Dictionary<string, Symbol> _symbols = new();
+    internal readonly List<Symbol> _globalsUsed = new();
+    internal readonly List<Symbol> _hoisted = new();
+
+    public Symbol? Lookup(string name) => _symbols.TryGetValue(name, out var symbol) ? symbol : null;
+
+    public override string ToString() => $"{Kind} {Name}";
+}
+
+// Result of ScopeAnalyzer: every scope of a program and, for each use of a name,
+// the symbol it resolves to. Nodes are looked up by reference, since IR records
+// compare by value.
+public sealed class SymbolTable
+{
+    internal SymbolTable(Scope module)
+    {
+        Module = module;
+    }
+
+    public Scope Module { get; }
+
+    internal readonly Dictionary<Node, Scope> _scopes = new(ReferenceEqualityComparer.Instance);
+    internal readonly Dictionary<Node, Symbol> _resolved = new(ReferenceEqualityComparer.Instance);
+    internal readonly Dictionary<Node, Scope> _useScopes = new(ReferenceEqualityComparer.Instance);
+    internal readonly HashSet<Node> _declarations = new(ReferenceEqualityComparer.Instance);
+
+    public IEnumerable<Scope> Scopes => _scopes.Values;
+
+    // The scope introduced by an IrProgram, FunctionDefStmt, ClassDefStmt,
+    // ListComprehension, DictComprehension or LambdaExpr.
+    public Scope? ScopeOf(Node owner) => _scopes.TryGetValue(owner, out var scope) ? scope : null;
+
+    // The symbol a Variable or StringPartVariable refers to, or a FunctionCall calls;
+    // null for builtins and names that are never bound.
+    public Symbol? Resolve(Node use) => _resolved.TryGetValue(use, out var symbol) ? symbol : null;
+
+    // The scope a Variable, StringPartVariable or FunctionCall appears in.
+    public Scope? ScopeOfUse(Node use) => _useScopes.TryGetValue(use, out var scope) ? scope : null;
+
+    // True for the VarAssignment that first binds its name, when it is a statement of
+    // its scope's Body; backends declare the variable there. Later assignments, and
+    // names in HoistedLocals, are plain assignments.
+    public bool IsDeclaration(VarAssignment assignment) => _declarations.Contains(assignment);
+}
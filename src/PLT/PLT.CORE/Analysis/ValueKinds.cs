@@ -0,0 +1,175 @@
+using System.Collections.Concurrent;
+using PLT.CORE.Backends;
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Analysis;
+
+public enum ValueKind
+{
+    Unknown,
+    String,
+    List,
+    Dict,
+    Generator,
+}
+
+// What kind of container an expression evaluates to, where the program makes it
+// evident: literals and comprehensions, the str/list/dict constructors, string
+// methods, and variables whose assignments all agree. Backends use it to pick a
+// native operation (`k in d` as a hash lookup rather than a scan of a list);
+// Unknown keeps the generic one. A call to one of the module's own generator
+// functions is a Generator, which a backend may step through lazily.
+public sealed class ValueKinds
+{
+    private readonly SymbolTable _symbols;
+    private readonly Dictionary<Symbol, ValueKind> _variables = new();
+    private readonly Dictionary<Node, Symbol> _targets = new(ReferenceEqualityComparer.Instance);
+    // Kinds already worked out, by node (emitters may ask from several threads). Cleared
+    // between rounds while variables' kinds are still being settled.
+    private readonly ConcurrentDictionary<Expr, ValueKind> _known = new(ReferenceEqualityComparer.Instance);
+
+    private ValueKinds(SymbolTable symbols)
+    {
+        _symbols = symbols;
+    }
+
+    // A variable that accumulation builds up as a string is one, whatever its pieces.
+    public static ValueKinds Analyze(IrProgram program, SymbolTable symbols, StringAccumulation? accumulation = null)
+    {
+        using var phase = PltTelemetry.StartPhase("kinds");
+        var result = new ValueKinds(symbols);
+
+        var all = symbols.Scopes
+            .SelectMany(s => s.Symbols.Values)
+            .Where(s => s.Kind == SymbolKind.Variable)
+            .ToList();
+        foreach (var symbol in all)
+        {
+            foreach (var definition in symbol.Definitions)
+                result._targets[definition] = symbol;
+            if (accumulation?.IsString(symbol) == true)
+                result._variables[symbol] = ValueKind.String;
+        }
+        var variables = all.Where(s => s.Definitions.All(d => d is VarAssignment)).ToList();
+
+        // A variable's kind follows from its assignments, which may read variables
+        // settled in a later round (`b = a` before `a = {}` in source order).
+        bool changed = true;
+        for (int round = 0; changed && round < 4; round++)
+        {
+            changed = false;
+            result._known.Clear();
+            foreach (var symbol in variables)
+            {
+                var kind = Agree(symbol.Definitions.Select(d => result.KindOf(((VarAssignment)d).Value)));
+                if (kind != ValueKind.Unknown && !result._variables.ContainsKey(symbol))
+                {
+                    result._variables[symbol] = kind;
+                    changed = true;
+                }
+            }
+        }
+
+        result._known.Clear();
+        return result;
+    }
+
+    public ValueKind KindOf(Expr expr)
+    {
+        if (_known.TryGetValue(expr, out var known))
+            return known;
+
+        var kind = StringAccumulation.IsStringValued(expr) ? ValueKind.String : Infer(expr);
+        _known[expr] = kind;
+        return kind;
+    }
+
+    public ValueKind KindOf(Symbol symbol) => _variables.GetValueOrDefault(symbol);
+
+    // The kind of a variable named in an f-string
+    public ValueKind KindOf(StringPartVariable part) =>
+        _symbols.Resolve(part) is { } symbol ? KindOf(symbol) : ValueKind.Unknown;
+
+    // The kind of the variable an assignment binds, over all its assignments
+    public ValueKind KindOfTarget(VarAssignment assignment) =>
+        _targets.TryGetValue(assignment, out var symbol) ? KindOf(symbol) : ValueKind.Unknown;
+
+    private ValueKind Infer(Expr expr) => expr switch
+    {
+        ListLiteral or ListComprehension => ValueKind.List,
+        DictLiteral or DictComprehension => ValueKind.Dict,
+        FunctionCall { FunctionName: "list" or "sorted" } => ValueKind.List,
+        FunctionCall { FunctionName: "dict" } => ValueKind.Dict,
+        FunctionCall f when IsGeneratorFunction(f.FunctionName) => ValueKind.Generator,
+        MethodCall { MethodName: "split" or "keys" or "values" } => ValueKind.List,
+        MethodCall { MethodName: "copy" or "__slice__" } m => KindOf(m.Target),
+        Intrinsic { Name: "ternary", Args: [_, var a, var b] } => Agree(new[] { KindOf(a), KindOf(b) }),
+        // list + list, and list * n
+        BinaryOp { Op: "+" } b => Sum(b),
+        BinaryOp { Op: "*" } b => KindOf(Chain(b)[0].Left) == ValueKind.List ? ValueKind.List : ValueKind.Unknown,
+        Variable v => _symbols.Resolve(v) is { } symbol ? KindOf(symbol) : ValueKind.Unknown,
+        _ => ValueKind.Unknown,
+    };
+
+    // Whether the module binds name itself (a def len(...) of its own), so a call to
+    // it isn't the builtin.
+    public bool IsDefined(string name) => _symbols.Module.Symbols.ContainsKey(name);
+
+    // Whether call calls a value held in a variable or parameter (a lambda, say) rather
+    // than a def or a builtin.
+    public bool CallsValue(FunctionCall call) =>
+        _symbols.Resolve(call) is { Kind: SymbolKind.Variable or SymbolKind.Parameter };
+
+    // Whether a comprehension's loop variables share a name with a variable of the
+    // frame it runs in, which a loop without a scope of its own would overwrite.
+    public bool Shadows(Node comprehension)
+    {
+        if (_symbols.ScopeOf(comprehension) is not { } scope)
+            return false;
+        foreach (var name in scope.Symbols.Keys)
+        {
+            // Enclosing comprehensions run in the same frame; anything else has its own
+            for (var outer = scope.Parent; outer != null; outer = outer.Parent)
+            {
+                if (outer.Lookup(name) != null)
+                    return true;
+                if (outer.Kind != ScopeKind.Comprehension)
+                    break;
+            }
+        }
+        return false;
+    }
+
+    // Whether name is a def at module level whose body yields.
+    public bool IsGeneratorFunction(string name) =>
+        _symbols.Module.Symbols.TryGetValue(name, out var symbol)
+        && symbol.Kind == SymbolKind.Function
+        && symbol.Definitions.Count == 1
+        && _symbols.ScopeOf(symbol.Definitions[0]) is { IsGenerator: true };
+
+    // The one kind all of them have, or Unknown.
+    private static ValueKind Agree(IEnumerable<ValueKind> kinds)
+    {
+        var distinct = kinds.Distinct().ToList();
+        return distinct.Count == 1 ? distinct[0] : ValueKind.Unknown;
+    }
+
+    // The terms of a + chain, down its left spine with a loop, so a chain of any
+    // length is settled at constant stack depth.
+    private ValueKind Sum(BinaryOp root)
+    {
+        var spine = Chain(root);
+        var kind = KindOf(spine[0].Left);
+        foreach (var op in spine)
+            kind = Either(kind, KindOf(op.Right));
+        return kind;
+    }
+
+    private static List<BinaryOp> Chain(BinaryOp root) =>
+        OperatorChains.LeftSpine(root, (op, left) => left.Op == op.Op);
+
+    // Python only adds a list to a list: if either side is known, so is the sum.
+    private static ValueKind Either(ValueKind left, ValueKind right) =>
+        left == ValueKind.Unknown ? right : right == ValueKind.Unknown || right == left ? left : ValueKind.Unknown;
+}
@@ -1,27 +1,225 @@
 using System.Text;
+using PLT.CORE.Analysis;
 using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
 
 namespace PLT.CORE.Backends.C;
 
 public sealed class CEmitter
 {
+    // Render top-level statements concurrently: true forces it, false disables it,
+    // null (the default) decides from the program size and core count.
+    public bool? Parallel { get; init; }
+
     public string Emit(IrProgram program)
     {
+        using var phase = PltTelemetry.StartPhase("emit.c");
+        var symbols = ScopeAnalyzer.Analyze(program);
+        var accumulation = StringAccumulation.Analyze(program, symbols);
+        var kinds = ValueKinds.Analyze(program, symbols, accumulation);
+        var formatted = FormattedLocals(program, symbols, accumulation);
         var sb = new StringBuilder();
 
+        bool formats = UsesFormat(program);
+        bool lowered = IrWalker.Descendants(program).Any(n => n is Expr e && Builtins.Lower(e, kinds, _ => "") != null);
+        if (formats)
+            sb.AppendLine("#include <stdarg.h>");
         sb.AppendLine("#include <stdio.h>");
+        if (accumulation.HasBuffers || formats || lowered)
+            sb.AppendLine("#include <stdlib.h>");
+        if (accumulation.HasBuffers || lowered)
+            sb.AppendLine("#include <string.h>");
+        if (accumulation.HasBuffers)
+        {
+            sb.AppendLine();
+            sb.Append(StringBufferRuntime);
+        }
+        if (formats)
+        {
+            sb.AppendLine();
+            sb.Append(FormatRuntime);
+        }
+        if (formatted.Any(f => f.Definitions.Any(d => !symbols.IsDeclaration((VarAssignment)d))))
+        {
+            sb.AppendLine();
+            sb.Append(ReplaceRuntime);
+        }
         sb.AppendLine();
         sb.AppendLine("int main(void) {");
 
-        foreach (var stmt in program.Body)
-            EmitStmt(stmt, sb, indent: 1);
+        EmitHoistedLocals(symbols.Module, sb, 1, kinds, formatted);
+        if (ParallelEmission.ShouldParallelize(program.Body, Parallel))
+            ParallelEmission.EmitBody(program.Body, sb, 1, (s, b, i) => EmitStmt(s, b, i, symbols, accumulation, kinds, formatted), "emit.c");
+        else
+            foreach (var stmt in program.Body)
+                EmitStmt(stmt, sb, 1, symbols, accumulation, kinds, formatted);
 
         sb.AppendLine("    return 0;");
         sb.AppendLine("}");
-        return sb.ToString();
+        var output = sb.ToString();
+        phase.RecordOutput(output);
+        return output;
+    }
+
+    // Growable buffer for strings built up in loops, emitted only when one is used.
+    private const string StringBufferRuntime = """
+        typedef struct { char *data; size_t len, cap; } plt_strbuf;
+
+        static void plt_strbuf_append(plt_strbuf *buf, const char *s) {
+            size_t n = strlen(s);
+            if (buf->len + n + 1 > buf->cap) {
+                buf->cap = (buf->len + n + 1) * 2;
+                buf->data = realloc(buf->data, buf->cap);
+            }
+            memcpy(buf->data + buf->len, s, n + 1);
+            buf->len += n;
+        }
+
+        """;
+
+    // An interpolated string, formatted into a buffer sized by a first, measuring
+    // vsnprintf; emitted only when one is used outside print().
+    private const string FormatRuntime = """
+        static char *plt_format(const char *fmt, ...) {
+            va_list args;
+            va_start(args, fmt);
+            int n = vsnprintf(NULL, 0, fmt, args);
+            va_end(args);
+            char *buf = malloc(n + 1);
+            va_start(args, fmt);
+            vsnprintf(buf, n + 1, fmt, args);
+            va_end(args);
+            return buf;
+        }
+
+        """;
+
+    // Frees a formatted local's old string as it takes its new one; emitted only when
+    // some local is reassigned a format.
+    private const string ReplaceRuntime = """
+        static const char *plt_replace(const char *old, char *next) {
+            free((char *)old);
+            return next;
+        }
+
+        """;
+
+    // print(f"...") is a printf of its own; any other interpolation needs plt_format.
+    private static bool UsesFormat(IrProgram program)
+    {
+        var printed = new HashSet<Node>(ReferenceEqualityComparer.Instance);
+        foreach (var node in IrWalker.Descendants(program))
+        {
+            if (node is Intrinsic { Name: "print", Args: [StringInterpolation s] })
+                printed.Add(s);
+            else if (node is StringInterpolation other && !printed.Contains(other) && other.Parts.Any(p => p is not StringPartLiteral))
+                return true;
+        }
+        return false;
+    }
+
+    // String locals that only ever hold plt_format's results and are read only by
+    // other formats or print: nothing else can point at their old string, so each
+    // reassignment frees it through plt_replace, and a loop keeps one string alive
+    // rather than one per iteration.
+    private static HashSet<Symbol> FormattedLocals(IrProgram program, SymbolTable symbols, StringAccumulation accumulation)
+    {
+        var fields = new HashSet<Node>(ReferenceEqualityComparer.Instance);
+        foreach (var node in IrWalker.Descendants(program))
+        {
+            if (node is StringInterpolation s)
+                fields.UnionWith(s.Parts.OfType<StringPartExpr>().Select(p => p.Expr).OfType<Variable>());
+            else if (node is Intrinsic { Name: "print", Args: [Variable printed] })
+                fields.Add(printed);
+            else if (node is FunctionCall { FunctionName: "print", Args: [Variable argument] } call && symbols.Resolve(call) == null)
+                fields.Add(argument);
+        }
+
+        var formatted = new HashSet<Symbol>();
+        foreach (var symbol in symbols.Scopes.SelectMany(scope => scope.Symbols.Values))
+        {
+            if (symbol.Kind == SymbolKind.Variable
+                && symbol.Definitions.All(d => d is VarAssignment { Value: StringInterpolation value } v
+                    && value.Parts.Any(p => p is not StringPartLiteral) && !accumulation.AssignsString(v))
+                && symbol.Uses.All(u => u is StringPartVariable || fields.Contains(u)))
+                formatted.Add(symbol);
+        }
+        return formatted;
+    }
+
+    // Whether some return in f's own body (not a nested def's) has a value.
+    private static bool ReturnsValue(FunctionDefStmt f)
+    {
+        var stack = new Stack<Node>(f.Body);
+        while (stack.Count > 0)
+        {
+            var node = stack.Pop();
+            if (node is ReturnStmt { Value: not null })
+                return true;
+            if (node is Stmt and not (FunctionDefStmt or ClassDefStmt))
+                foreach (var child in IrWalker.Children(node).OfType<Stmt>())
+                    stack.Push(child);
+        }
+        return false;
+    }
+
+    private static string BufferName(string varName) => $"{varName}_buf";
+
+    // a, b = x, y: every value is read before any name changes. One at a time when
+    // some order has no value read a name already assigned, else through temporaries
+    // in a block of their own.
+    private static void EmitParallelAssignment(IReadOnlyList<string> names, IReadOnlyList<Expr> values, StringBuilder sb, int indent, ValueKinds kinds)
+    {
+        var pad = new string(' ', indent * 4);
+        var pairs = names.Zip(values).ToList();
+        foreach (var order in new[] { pairs, Enumerable.Reverse(pairs).ToList() })
+        {
+            var assigned = new HashSet<string>();
+            bool clean = true;
+            foreach (var (name, value) in order)
+            {
+                if (IrWalker.Descendants(value).Any(n => n is Variable v && assigned.Contains(v.Name)))
+                {
+                    clean = false;
+                    break;
+                }
+                assigned.Add(name);
+            }
+            if (!clean)
+                continue;
+            foreach (var (name, value) in order)
+            {
+                sb.Append(pad).Append(name).Append(" = ");
+                EmitExpr(value, sb, kinds);
+                sb.AppendLine(";");
+            }
+            return;
+        }
+
+        sb.AppendLine($"{pad}{{");
+        foreach (var (name, value) in pairs)
+        {
+            sb.Append(pad).Append("    ").Append(DeclaredType(kinds.KindOf(value))).Append("_next_").Append(name).Append(" = ");
+            EmitExpr(value, sb, kinds);
+            sb.AppendLine(";");
+        }
+        foreach (var name in names)
+            sb.AppendLine($"{pad}    {name} = _next_{name};");
+        sb.AppendLine($"{pad}}}");
     }
 
-    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent)
+    private static void EmitHoistedLocals(Scope scope, StringBuilder sb, int indent, ValueKinds kinds, IReadOnlySet<Symbol> formatted)
+    {
+        var pad = new string(' ', indent * 4);
+        foreach (var local in scope.HoistedLocals)
+            sb.AppendLine($"{pad}{DeclaredType(kinds.KindOf(local))}{local.Name}{(formatted.Contains(local) ? " = NULL" : "")};");
+    }
+
+    // Strings, accumulated or assigned, are declared as such; anything else is an int.
+    // TODO: infer other types
+    private static string DeclaredType(ValueKind kind) => kind == ValueKind.String ? "const char *" : "int ";
+
+    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent, SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds, IReadOnlySet<Symbol> formatted)
     {
         var pad = new string(' ', indent * 4);
 
@@ -31,19 +229,34 @@ public sealed class CEmitter
                 if (!string.IsNullOrWhiteSpace(s.LeadingComment))
                     sb.AppendLine($"{pad}// {s.LeadingComment}");
                 sb.Append(pad);
-                EmitExpr(s.Expr, sb);
+                EmitExpr(s.Expr, sb, kinds);
                 sb.AppendLine(";");
                 break;
 
             case VarAssignment v:
                 if (!string.IsNullOrWhiteSpace(v.LeadingComment))
                     sb.AppendLine($"{pad}// {v.LeadingComment}");
+                if (accumulation.IsBuffered(v))
+                {
+                    foreach (var piece in accumulation.Pieces(v)!)
+                    {
+                        sb.Append(pad);
+                        sb.Append($"plt_strbuf_append(&{BufferName(v.VarName)}, ");
+                        EmitExpr(piece, sb, kinds);
+                        sb.AppendLine(");");
+                    }
+                    break;
+                }
                 sb.Append(pad);
-                sb.Append("int ");  // TODO: infer type
+                // Declare on the first assignment only; names first bound in a nested
+                // block were declared at the top of the function.
+                bool replaces = !symbols.IsDeclaration(v) && formatted.Any(f => f.Definitions.Any(d => ReferenceEquals(d, v)));
+                if (symbols.IsDeclaration(v))
+                    sb.Append(DeclaredType(kinds.KindOfTarget(v)));
                 sb.Append(v.VarName);
-                sb.Append(" = ");
-                EmitExpr(v.Value, sb);
-                sb.AppendLine(";");
+                sb.Append(replaces ? $" = plt_replace({v.VarName}, " : " = ");
+                EmitExpr(v.Value, sb, kinds);
+                sb.AppendLine(replaces ? ");" : ";");
                 break;
 
             case PassStmt p:
@@ -52,9 +265,46 @@ public sealed class CEmitter
                 sb.AppendLine($"{pad}// pass");
                 break;
 
+            case ReturnStmt r:
+                if (!string.IsNullOrWhiteSpace(r.LeadingComment))
+                    sb.AppendLine($"{pad}// {r.LeadingComment}");
+                sb.Append(pad);
+                sb.Append("return");
+                if (r.Value != null)
+                {
+                    sb.Append(" ");
+                    EmitExpr(r.Value, sb, kinds);
+                }
+                sb.AppendLine(";");
+                break;
+
+            case BreakStmt b:
+                if (!string.IsNullOrWhiteSpace(b.LeadingComment))
+                    sb.AppendLine($"{pad}// {b.LeadingComment}");
+                sb.AppendLine($"{pad}break;");
+                break;
+
+            case ContinueStmt c:
+                if (!string.IsNullOrWhiteSpace(c.LeadingComment))
+                    sb.AppendLine($"{pad}// {c.LeadingComment}");
+                sb.AppendLine($"{pad}continue;");
+                break;
+
+            case YieldStmt y:
+                if (!string.IsNullOrWhiteSpace(y.LeadingComment))
+                    sb.AppendLine($"{pad}// {y.LeadingComment}");
+                // C has no coroutines to suspend into
+                sb.AppendLine($"{pad}// {(y.IsFrom ? "yield from" : "yield")} ...");
+                break;
+
             case TupleUnpackingAssignment t:
                 if (!string.IsNullOrWhiteSpace(t.LeadingComment))
                     sb.AppendLine($"{pad}// {t.LeadingComment}");
+                if (t.Value is ListLiteral list && list.Elements.Count == t.VarNames.Count)
+                {
+                    EmitParallelAssignment(t.VarNames, list.Elements, sb, indent, kinds);
+                    break;
+                }
                 sb.Append(pad);
                 sb.Append("// Tuple unpacking not supported in C: (");
                 for (int i = 0; i < t.VarNames.Count; i++)
@@ -63,24 +313,31 @@ public sealed class CEmitter
                     sb.Append(t.VarNames[i]);
                 }
                 sb.Append(") = ");
-                EmitExpr(t.Value, sb);
+                EmitExpr(t.Value, sb, kinds);
                 sb.AppendLine();
                 break;
 
             case IfStmt i:
                 if (!string.IsNullOrWhiteSpace(i.LeadingComment))
                     sb.AppendLine($"{pad}// {i.LeadingComment}");
+                if (SwitchChains.Match(i) is { IsString: false } chain
+                    && !chain.Cases.Any(c => SwitchChains.BreaksOut(c.Body))
+                    && !(chain.Default != null && SwitchChains.BreaksOut(chain.Default)))
+                {
+                    EmitSwitch(chain, sb, indent, symbols, accumulation, kinds, formatted);
+                    break;
+                }
                 sb.Append(pad);
                 sb.Append("if (");
-                EmitExpr(i.Condition, sb);
+                EmitExpr(i.Condition, sb, kinds);
                 sb.AppendLine(") {");
                 foreach (var s in i.ThenBody)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds, formatted);
                 if (i.ElseBody != null)
                 {
                     sb.AppendLine($"{pad}}} else {{");
                     foreach (var s in i.ElseBody)
-                        EmitStmt(s, sb, indent + 1);
+                        EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds, formatted);
                 }
                 sb.AppendLine($"{pad}}}");
                 break;
@@ -88,28 +345,51 @@ public sealed class CEmitter
             case ForEachStmt f:
                 if (!string.IsNullOrWhiteSpace(f.LeadingComment))
                     sb.AppendLine($"{pad}// {f.LeadingComment}");
-                // C doesn't have foreach; we'll approximate with a comment
-                sb.AppendLine($"{pad}// foreach {f.LoopVar} in ...");
-                foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                var forBuffers = accumulation.BuffersOf(f);
+                foreach (var buffer in forBuffers)
+                {
+                    sb.AppendLine($"{pad}plt_strbuf {BufferName(buffer.Name)} = {{0}};");
+                    sb.AppendLine($"{pad}plt_strbuf_append(&{BufferName(buffer.Name)}, {buffer.Name});");
+                }
+                if (CountedLoops.MatchRange(f, symbols, kinds) is { } range)
+                {
+                    EmitRangeLoop(range, f.Body, sb, indent, symbols, accumulation, kinds, formatted);
+                }
+                else
+                {
+                    // C doesn't have foreach; we'll approximate with a comment
+                    sb.AppendLine($"{pad}// foreach {f.LoopVar} in ...");
+                    foreach (var s in f.Body)
+                        EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds, formatted);
+                }
+                foreach (var buffer in forBuffers)
+                    sb.AppendLine($"{pad}{buffer.Name} = {BufferName(buffer.Name)}.data;");
                 break;
 
             case WhileStmt w:
                 if (!string.IsNullOrWhiteSpace(w.LeadingComment))
                     sb.AppendLine($"{pad}// {w.LeadingComment}");
+                var whileBuffers = accumulation.BuffersOf(w);
+                foreach (var buffer in whileBuffers)
+                {
+                    sb.AppendLine($"{pad}plt_strbuf {BufferName(buffer.Name)} = {{0}};");
+                    sb.AppendLine($"{pad}plt_strbuf_append(&{BufferName(buffer.Name)}, {buffer.Name});");
+                }
                 sb.Append(pad);
                 sb.Append("while (");
-                EmitExpr(w.Condition, sb);
+                EmitExpr(w.Condition, sb, kinds);
                 sb.AppendLine(") {");
                 foreach (var s in w.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds, formatted);
                 sb.AppendLine($"{pad}}}");
+                foreach (var buffer in whileBuffers)
+                    sb.AppendLine($"{pad}{buffer.Name} = {BufferName(buffer.Name)}.data;");
                 break;
 
             case FunctionDefStmt f:
                 if (!string.IsNullOrWhiteSpace(f.LeadingComment))
                     sb.AppendLine($"{pad}// {f.LeadingComment}");
-                sb.Append("void ");  // TODO: infer return type
+                sb.Append(ReturnsValue(f) ? "int " : "void ");  // TODO: infer return type
                 sb.Append(f.FunctionName);
                 sb.Append("(");
                 for (int j = 0; j < f.Parameters.Count; j++)
@@ -119,8 +399,10 @@ public sealed class CEmitter
                     sb.Append(f.Parameters[j]);
                 }
                 sb.AppendLine(") {");
-                foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                EmitHoistedLocals(symbols.ScopeOf(f)!, sb, indent + 1, kinds, formatted);
+                // A call to itself in tail position loops instead of taking a stack frame
+                foreach (var s in TailCalls.Loop(f) ?? f.Body)
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds, formatted);
                 sb.AppendLine("}");
                 break;
 
@@ -132,7 +414,13 @@ public sealed class CEmitter
                 else
                     sb.AppendLine($"{pad}// Class {c.ClassName}");
                 foreach (var s in c.Body)
-                    EmitStmt(s, sb, indent);
+                    EmitStmt(s, sb, indent, symbols, accumulation, kinds, formatted);
+                break;
+
+            case ImportStmt im:
+                if (!string.IsNullOrWhiteSpace(im.LeadingComment))
+                    sb.AppendLine($"{pad}// {im.LeadingComment}");
+                sb.AppendLine($"{pad}// {ImportSyntax.Format(im)}");
                 break;
 
             case TryStmt t:
@@ -140,7 +428,7 @@ public sealed class CEmitter
                     sb.AppendLine($"{pad}// {t.LeadingComment}");
                 sb.AppendLine($"{pad}// Try block");
                 foreach (var s in t.TryBody)
-                    EmitStmt(s, sb, indent);
+                    EmitStmt(s, sb, indent, symbols, accumulation, kinds, formatted);
                 if (t.ExceptClauses.Count > 0)
                 {
                     foreach (var (exceptionType, varName, body) in t.ExceptClauses)
@@ -150,14 +438,14 @@ public sealed class CEmitter
                         else
                             sb.AppendLine($"{pad}// Catch all exceptions");
                         foreach (var s in body)
-                            EmitStmt(s, sb, indent);
+                            EmitStmt(s, sb, indent, symbols, accumulation, kinds, formatted);
                     }
                 }
                 if (t.FinallyBody != null)
                 {
                     sb.AppendLine($"{pad}// Finally block");
                     foreach (var s in t.FinallyBody)
-                        EmitStmt(s, sb, indent);
+                        EmitStmt(s, sb, indent, symbols, accumulation, kinds, formatted);
                 }
                 break;
 
@@ -166,7 +454,91 @@ public sealed class CEmitter
         }
     }
 
-    private static void EmitExpr(Expr expr, StringBuilder sb)
+    // switch over integer labels, which the compiler can make a jump table of.
+    private static void EmitSwitch(SwitchChains.Chain chain, StringBuilder sb, int indent,
+        SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds, IReadOnlySet<Symbol> formatted)
+    {
+        var pad = new string(' ', indent * 4);
+        sb.Append($"{pad}switch (");
+        EmitExpr(chain.Subject, sb, kinds);
+        sb.AppendLine(") {");
+        foreach (var (labels, body) in chain.Cases)
+        {
+            foreach (var label in labels)
+                sb.AppendLine($"{pad}    case {label}:");
+            foreach (var s in body)
+                EmitStmt(s, sb, indent + 2, symbols, accumulation, kinds, formatted);
+            if (body is not [.., ReturnStmt or ContinueStmt])
+                sb.AppendLine($"{pad}        break;");
+        }
+        if (chain.Default != null)
+        {
+            sb.AppendLine($"{pad}    default:");
+            foreach (var s in chain.Default)
+                EmitStmt(s, sb, indent + 2, symbols, accumulation, kinds, formatted);
+            sb.AppendLine($"{pad}        break;");
+        }
+        sb.AppendLine($"{pad}}}");
+    }
+
+    // for (i = start; i < stop; i++) over the counter the function already declares.
+    // A bound the body may change is read once into a block-local _stop_i/_step_i,
+    // as Python evaluates range()'s arguments once.
+    private static void EmitRangeLoop(CountedLoops.Range range, IReadOnlyList<Stmt> body, StringBuilder sb, int indent,
+        SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds, IReadOnlySet<Symbol> formatted)
+    {
+        var pad = new string(' ', indent * 4);
+        var locals = new List<string>();
+        string Operand(Expr bound, string prefix)
+        {
+            if (CountedLoops.IsStable(bound, body))
+                return Bound(bound, kinds);
+            var name = $"_{prefix}_{range.Var}";
+            locals.Add($"int {name} = {Bound(bound, kinds)};");
+            return name;
+        }
+
+        var i = range.Var;
+        var stop = Operand(range.Stop, "stop");
+        var step = Operand(range.Step, "step");
+        var test = range.Direction switch
+        {
+            > 0 => $"{i} < {stop}",
+            < 0 => $"{i} > {stop}",
+            _ => $"({step} > 0 ? {i} < {stop} : {i} > {stop})",
+        };
+        var update = step switch
+        {
+            "1" => $"{i}++",
+            "-1" => $"{i}--",
+            _ when range.Direction < 0 => $"{i} -= {step[1..]}",
+            _ => $"{i} += {step}",
+        };
+
+        int depth = indent;
+        if (locals.Count > 0)
+        {
+            sb.AppendLine($"{pad}{{");
+            depth++;
+            foreach (var local in locals)
+                sb.AppendLine($"{pad}    {local}");
+        }
+        var loopPad = new string(' ', depth * 4);
+        sb.AppendLine($"{loopPad}for ({i} = {Bound(range.Start, kinds)}; {test}; {update}) {{");
+        foreach (var s in body)
+            EmitStmt(s, sb, depth + 1, symbols, accumulation, kinds, formatted);
+        sb.AppendLine($"{loopPad}}}");
+        if (locals.Count > 0)
+            sb.AppendLine($"{pad}}}");
+    }
+
+    // A loop bound: a negative literal is written as one (-2, not - 2)
+    private static string Bound(Expr bound, ValueKinds kinds) =>
+        bound is UnaryOp { Op: "-", Operand: Literal { Value: var v } l } && NumericLiteral.IsNumber(v)
+            ? "-" + FormatCLiteral(v, l.Spelling)
+            : Operand(bound, kinds);
+
+    private static void EmitExpr(Expr expr, StringBuilder sb, ValueKinds kinds)
     {
         switch (expr)
         {
@@ -177,7 +549,7 @@ public sealed class CEmitter
                     throw new NotSupportedException("C backend currently supports print() with exactly 1 argument.");
 
                 sb.Append("printf(");
-                EmitPrintfForSingleArg(i.Args[0], sb);
+                EmitPrintfForSingleArg(i.Args[0], sb, kinds);
                 sb.Append(")");
                 return;
 
@@ -185,26 +557,43 @@ public sealed class CEmitter
                 // ternary(condition, true_expr, false_expr) => condition ? true_expr : false_expr
                 if (i.Args.Count >= 3)
                 {
-                    EmitExpr(i.Args[0], sb);  // condition
+                    EmitExpr(i.Args[0], sb, kinds);  // condition
                     sb.Append(" ? ");
-                    EmitExpr(i.Args[1], sb);  // true_expr
+                    EmitExpr(i.Args[1], sb, kinds);  // true_expr
                     sb.Append(" : ");
-                    EmitExpr(i.Args[2], sb);  // false_expr
+                    EmitExpr(i.Args[2], sb, kinds);  // false_expr
                 }
                 return;
 
+            case Intrinsic { Name: "getattr", Args: [var target, Literal { Value: string field }] }:
+                // Attributes map to struct members
+                EmitExpr(target, sb, kinds);
+                sb.Append(".").Append(field);
+                return;
+
+            case Intrinsic { Name: "setattr", Args: [var target, Literal { Value: string field }, var value] }:
+                EmitExpr(target, sb, kinds);
+                sb.Append(".").Append(field).Append(" = ");
+                EmitExpr(value, sb, kinds);
+                return;
+
+            // C has no keyword arguments; the value is passed in its place
+            case Intrinsic { Name: "keyword", Args: [_, var value] }:
+                EmitExpr(value, sb, kinds);
+                return;
+
             case Intrinsic i when i.Name == "raise":
                 // C doesn't have exceptions, emit as comment
                 sb.Append("/* raise ");
                 if (i.Args.Count > 0)
                 {
-                    EmitExpr(i.Args[0], sb);
+                    EmitExpr(i.Args[0], sb, kinds);
                 }
                 sb.Append(" */");
                 return;
 
             case Literal l:
-                sb.Append(FormatCLiteral(l.Value));
+                sb.Append(FormatCLiteral(l.Value, l.Spelling));
                 return;
 
             case Variable v:
@@ -216,7 +605,7 @@ public sealed class CEmitter
                 for (int j = 0; j < l.Elements.Count; j++)
                 {
                     if (j > 0) sb.Append(", ");
-                    EmitExpr(l.Elements[j], sb);
+                    EmitExpr(l.Elements[j], sb, kinds);
                 }
                 sb.Append("}");
                 return;
@@ -226,34 +615,54 @@ public sealed class CEmitter
                 for (int j = 0; j < d.Items.Count; j++)
                 {
                     if (j > 0) sb.Append(", ");
-                    EmitExpr(d.Items[j].Key, sb);
+                    EmitExpr(d.Items[j].Key, sb, kinds);
                     sb.Append(": ");
-                    EmitExpr(d.Items[j].Value, sb);
+                    EmitExpr(d.Items[j].Value, sb, kinds);
                 }
                 sb.Append("} */");
                 return;
 
             case BinaryOp b:
-                EmitExpr(b.Left, sb);
-                sb.Append(" ");
-                sb.Append(b.Op);
-                sb.Append(" ");
-                EmitExpr(b.Right, sb);
+            {
+                if (Builtins.Lower(b, kinds, o => Operand(o, kinds)) is { } membership)
+                {
+                    sb.Append(membership);
+                    return;
+                }
+                var spine = OperatorChains.LeftSpine(b);
+                EmitExpr(spine[0].Left, sb, kinds);
+                foreach (var op in spine)
+                {
+                    sb.Append(" ");
+                    sb.Append(Operators.GetValueOrDefault(op.Op, op.Op));
+                    sb.Append(" ");
+                    EmitExpr(op.Right, sb, kinds);
+                }
                 return;
+            }
 
             case UnaryOp u:
-                sb.Append(u.Op);
+                sb.Append(Operators.GetValueOrDefault(u.Op, u.Op));
                 sb.Append(" ");
-                EmitExpr(u.Operand, sb);
+                // !x binds tighter than not x: not a == b is !(a == b)
+                if (u.Op == "not" && u.Operand is BinaryOp)
+                    sb.Append('(').Append(Operand(u.Operand, kinds)).Append(')');
+                else
+                    EmitExpr(u.Operand, sb, kinds);
                 return;
 
             case FunctionCall f:
+                if (Builtins.Lower(f, kinds, o => Operand(o, kinds)) is { } builtin)
+                {
+                    sb.Append(builtin);
+                    return;
+                }
                 sb.Append(f.FunctionName);
                 sb.Append("(");
                 for (int j = 0; j < f.Args.Count; j++)
                 {
                     if (j > 0) sb.Append(", ");
-                    EmitExpr(f.Args[j], sb);
+                    EmitExpr(f.Args[j], sb, kinds);
                 }
                 sb.Append(")");
                 return;
@@ -262,67 +671,70 @@ public sealed class CEmitter
                 if (m.MethodName == "__slice__")
                 {
                     sb.Append("/* slice: ");
-                    EmitExpr(m.Target, sb);
+                    EmitExpr(m.Target, sb, kinds);
                     sb.Append("[");
                     if (m.Args[0] is not Literal { Value: null })
-                        EmitExpr(m.Args[0], sb);
+                        EmitExpr(m.Args[0], sb, kinds);
                     sb.Append(":");
                     if (m.Args[1] is not Literal { Value: null })
-                        EmitExpr(m.Args[1], sb);
+                        EmitExpr(m.Args[1], sb, kinds);
                     if (m.Args.Count > 2 && m.Args[2] is not Literal { Value: null })
                     {
                         sb.Append(":");
-                        EmitExpr(m.Args[2], sb);
+                        EmitExpr(m.Args[2], sb, kinds);
                     }
                     sb.Append("] */");
                 }
                 else if (m.MethodName == "__getitem__")
                 {
                     // Array indexing in C
-                    EmitExpr(m.Target, sb);
+                    EmitExpr(m.Target, sb, kinds);
                     sb.Append("[");
-                    EmitExpr(m.Args[0], sb);
+                    EmitExpr(m.Args[0], sb, kinds);
                     sb.Append("]");
                 }
+                else if (Builtins.Lower(m, kinds, o => Operand(o, kinds)) is { } method)
+                {
+                    sb.Append(method);
+                }
                 else
                 {
                     // C doesn't have methods, just function calls
                     sb.Append(m.MethodName);
                     sb.Append("(");
-                    EmitExpr(m.Target, sb);
+                    EmitExpr(m.Target, sb, kinds);
                     for (int j = 0; j < m.Args.Count; j++)
                     {
                         sb.Append(", ");
-                        EmitExpr(m.Args[j], sb);
+                        EmitExpr(m.Args[j], sb, kinds);
                     }
                     sb.Append(")");
                 }
                 return;
 
             case StringInterpolation s:
-                sb.Append("\"");
-                foreach (var part in s.Parts)
+                if (s.Parts.All(p => p is StringPartLiteral))
                 {
-                    if (part is StringPartLiteral lit)
-                        sb.Append(EscapeCString(lit.Value));
-                    else if (part is StringPartVariable var)
-                        sb.Append("%s");  // simplified
+                    sb.Append(FormatCLiteral(string.Concat(s.Parts.Cast<StringPartLiteral>().Select(p => p.Value))));
+                    return;
                 }
-                sb.Append("\"");
+                sb.Append("plt_format(");
+                EmitFormat(s, "", sb, kinds);
+                sb.Append(")");
                 return;
 
             case ListComprehension lc:
                 // C doesn't have native list comprehensions, emit as comment
                 sb.Append("/* list comprehension: [");
-                EmitExpr(lc.Element, sb);
+                EmitExpr(lc.Element, sb, kinds);
                 sb.Append(" for ");
                 sb.Append(lc.LoopVar);
                 sb.Append(" in ");
-                EmitExpr(lc.IterableExpr, sb);
+                EmitExpr(lc.IterableExpr, sb, kinds);
                 if (lc.FilterCondition != null)
                 {
                     sb.Append(" if ");
-                    EmitExpr(lc.FilterCondition, sb);
+                    EmitExpr(lc.FilterCondition, sb, kinds);
                 }
                 sb.Append("] */");
                 return;
@@ -330,17 +742,17 @@ public sealed class CEmitter
             case DictComprehension dc:
                 // C doesn't have native dict comprehensions, emit as comment
                 sb.Append("/* dict comprehension: {");
-                EmitExpr(dc.KeyExpr, sb);
+                EmitExpr(dc.KeyExpr, sb, kinds);
                 sb.Append(": ");
-                EmitExpr(dc.ValueExpr, sb);
+                EmitExpr(dc.ValueExpr, sb, kinds);
                 sb.Append(" for ");
                 sb.Append(dc.LoopVar);
                 sb.Append(" in ");
-                EmitExpr(dc.IterableExpr, sb);
+                EmitExpr(dc.IterableExpr, sb, kinds);
                 if (dc.FilterCondition != null)
                 {
                     sb.Append(" if ");
-                    EmitExpr(dc.FilterCondition, sb);
+                    EmitExpr(dc.FilterCondition, sb, kinds);
                 }
                 sb.Append("} */");
                 return;
@@ -354,7 +766,7 @@ public sealed class CEmitter
                     sb.Append(lam.Parameters[j]);
                 }
                 sb.Append(": ");
-                EmitExpr(lam.Body, sb);
+                EmitExpr(lam.Body, sb, kinds);
                 sb.Append(" */");
                 return;
 
@@ -363,28 +775,68 @@ public sealed class CEmitter
         }
     }
 
-    private static void EmitPrintfForSingleArg(Expr arg, StringBuilder sb)
+    private static string Operand(Expr expr, ValueKinds kinds)
     {
+        var sb = new StringBuilder();
+        EmitExpr(expr, sb, kinds);
+        return sb.ToString();
+    }
+
+    // Python's builtins and string methods as the C library's (see LoweringTable).
+    // Only strings have a native representation here; lists and dicts don't yet.
+    private static readonly LoweringTable Builtins = new()
+    {
+        { "str:len", "strlen(@0)" },
+        { "str:in", "(strstr(@1, @0) != NULL)" },
+        { "str:not in", "(strstr(@1, @0) == NULL)" },
+        { "abs/1", "abs(@0)" },
+        { "str:int/1", "atoi(@0)" },
+        { "str:float/1", "atof(@0)" },
+        { "ord/1", "((unsigned char)(@0)[0])" },
+        { ".startswith/1", "(strncmp(@0, @1, strlen(@1)) == 0)" },
+        { ".find/1", "(strstr(@0, @1) ? (int)(strstr(@0, @1) - @0) : -1)" },
+    };
+
+    // Python operators spelled differently in C. C's / truncates where // floors;
+    // they agree on non-negative operands.
+    private static readonly Dictionary<string, string> Operators = new()
+    {
+        ["and"] = "&&",
+        ["or"] = "||",
+        ["not"] = "!",
+        ["is"] = "==",
+        ["is not"] = "!=",
+        ["//"] = "/",
+    };
+
+    private static void EmitPrintfForSingleArg(Expr arg, StringBuilder sb, ValueKinds kinds)
+    {
+        if (arg is StringInterpolation s)
+        {
+            EmitFormat(s, "\\n", sb, kinds);
+            return;
+        }
+
         // Minimal: only handle string literals nicely.
         // We can expand later (ints, floats, bools).
         if (arg is Literal { Value: string })
         {
             sb.Append("\"%s\\n\", ");
-            EmitExpr(arg, sb);
+            EmitExpr(arg, sb, kinds);
             return;
         }
 
         if (arg is Literal { Value: int or long })
         {
             sb.Append("\"%lld\\n\", ");
-            EmitExpr(arg, sb);
+            EmitExpr(arg, sb, kinds);
             return;
         }
 
         if (arg is Literal { Value: float or double })
         {
             sb.Append("\"%f\\n\", ");
-            EmitExpr(arg, sb);
+            EmitExpr(arg, sb, kinds);
             return;
         }
 
@@ -392,16 +844,63 @@ public sealed class CEmitter
         throw new NotSupportedException("C backend only supports print() of string/number literals for now.");
     }
 
-    private static string FormatCLiteral(object? value) =>
+    // The printf format string for an interpolation, then its arguments. Fields
+    // without a type in their spec are printed as ints unless the expression is known
+    // to be a string, matching the types locals are declared with.
+    private static void EmitFormat(StringInterpolation s, string suffix, StringBuilder sb, ValueKinds kinds)
+    {
+        var args = new List<Expr>();
+        sb.Append('"');
+        foreach (var part in s.Parts)
+        {
+            switch (part)
+            {
+                case StringPartLiteral lit:
+                    sb.Append(EscapeCString(lit.Value).Replace("%", "%%"));
+                    break;
+                case StringPartVariable v:
+                    sb.Append(kinds.KindOf(v) == ValueKind.String ? "%s" : "%d");
+                    args.Add(new Variable(v.VarName));
+                    break;
+                case StringPartExpr e:
+                    // !r quotes a string and leaves a number as it is; the quotes would
+                    // sit outside a spec's padding, so the two don't combine
+                    var type = FieldType(e.Expr, kinds);
+                    bool quoted = e.Conversion is 'r' or 'a' && type == 's';
+                    if (quoted && e.FormatSpec != null)
+                        throw new NotSupportedException($"C backend can't apply a format spec to !{e.Conversion}.");
+                    var conversion = PrintfSpec.Require(e.FormatSpec, type);
+                    sb.Append(quoted ? $"'{conversion}'" : conversion);
+                    args.Add(e.Expr);
+                    break;
+            }
+        }
+        sb.Append(suffix).Append('"');
+        foreach (var arg in args)
+        {
+            sb.Append(", ");
+            EmitExpr(arg, sb, kinds);
+        }
+    }
+
+    private static char FieldType(Expr expr, ValueKinds kinds) => expr switch
+    {
+        _ when StringAccumulation.IsStringValued(expr) || kinds.KindOf(expr) == ValueKind.String => 's',
+        Literal => PrintfSpec.DefaultType(expr),
+        _ => 'd',
+    };
+
+    private static string FormatCLiteral(object? value, string? spelling = null) =>
         value switch
         {
             null => "0", // placeholder; C has no null literal for primitives
             string s => $"\"{EscapeCString(s)}\"",
             bool b => b ? "1" : "0",
-            int i => i.ToString(),
-            long l => l.ToString(),
-            float f => f.ToString(System.Globalization.CultureInfo.InvariantCulture) + "f",
-            double d => d.ToString(System.Globalization.CultureInfo.InvariantCulture),
+            // Ahead of the general number arm, so a single-precision value keeps C's f
+            // suffix: 0.1f, not the double nearest its widened value
+            float f => NumericLiteral.Format(double.Parse(f.ToString("R", System.Globalization.CultureInfo.InvariantCulture),
+                System.Globalization.CultureInfo.InvariantCulture), null, octalAndBinary: false) + "f",
+            _ when NumericLiteral.IsNumber(value) => NumericLiteral.Format(value, spelling, octalAndBinary: false),
             _ => "0"
         };
 
@@ -0,0 +1,130 @@
+using System.Numerics;
+using PLT.CORE.Analysis;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// for loops over range(), enumerate() and zip(), which a backend with a counted or
+// multi-list loop of its own runs without first building the sequence they stand for.
+internal static class CountedLoops
+{
+    // for Var in range(Start, Stop, Step). Direction is the sign of Step, or 0 when
+    // only the running program knows it.
+    public sealed record Range(string Var, Expr Start, Expr Stop, Expr Step, int Direction);
+
+    // for Index, Item in enumerate(Iterable, Start)
+    public sealed record Enumerate(string Index, string Item, Expr Iterable, Expr Start);
+
+    // for a, b, ... in zip(xs, ys, ...)
+    public sealed record Zip(IReadOnlyList<string> Vars, IReadOnlyList<Expr> Iterables);
+
+    public static Range? MatchRange(ForEachStmt f, SymbolTable symbols, ValueKinds kinds)
+    {
+        if (f.IterableExpr is not FunctionCall { FunctionName: "range", Args: var args } || kinds.IsDefined("range"))
+            return null;
+        // A counted loop reads its counter back, so one the body assigns would change
+        // the iterations; Python's range wouldn't notice. It also leaves the counter at
+        // the stop value rather than the last one, which must go unread.
+        if (Targets(f.LoopVar) is not [var name] || Assigned(f.Body).Contains(name) || IsReadAfter(f, name, symbols))
+            return null;
+
+        var one = new Literal(1);
+        var range = args switch
+        {
+            [var stop] => new Range(name, new Literal(0), stop, one, 1),
+            [var start, var stop] => new Range(name, start, stop, one, 1),
+            [var start, var stop, var step] => new Range(name, start, stop, step, Sign(step)),
+            _ => null,
+        };
+        // range(..., 0) raises in Python
+        return range != null && IsZero(range.Step) ? null : range;
+    }
+
+    public static Enumerate? MatchEnumerate(ForEachStmt f, SymbolTable symbols, ValueKinds kinds)
+    {
+        if (f.IterableExpr is not FunctionCall { FunctionName: "enumerate", Args: var args } || kinds.IsDefined("enumerate"))
+            return null;
+        // The index is counted up from its own last value, and over an empty list is
+        // left at one before the start
+        if (Targets(f.LoopVar) is not [var index, var item]
+            || Assigned(f.Body).Contains(index) || IsReadAfter(f, index, symbols))
+            return null;
+        return args switch
+        {
+            [var iterable] => new Enumerate(index, item, iterable, new Literal(0)),
+            [var iterable, var start] => new Enumerate(index, item, iterable, start),
+            _ => null,
+        };
+    }
+
+    public static Zip? MatchZip(ForEachStmt f, ValueKinds kinds)
+    {
+        if (f.IterableExpr is not FunctionCall { FunctionName: "zip", Args: var args } || kinds.IsDefined("zip"))
+            return null;
+        var vars = Targets(f.LoopVar);
+        return args.Count > 1 && vars.Count == args.Count && args.All(a => a is not Intrinsic { Name: "keyword" })
+            ? new Zip(vars, args)
+            : null;
+    }
+
+    // Whether expr has the same value on every iteration of body, so a loop bound can
+    // be read in place rather than copied once before the loop.
+    public static bool IsStable(Expr expr, IReadOnlyList<Stmt> body) => expr switch
+    {
+        Literal => true,
+        UnaryOp { Op: "-", Operand: Literal } => true,
+        Variable v => !Assigned(body).Contains(v.Name),
+        _ => false,
+    };
+
+    // Whether name, bound by loop f, may be read where f's value of it is still the
+    // one it holds: anywhere outside a loop that binds it afresh.
+    private static bool IsReadAfter(ForEachStmt f, string name, SymbolTable symbols)
+    {
+        var symbol = symbols.Scopes
+            .Select(s => s.Lookup(name))
+            .FirstOrDefault(s => s != null && s.Definitions.Any(d => ReferenceEquals(d, f)));
+        if (symbol == null)
+            return true;
+        var rebound = new HashSet<Node>(ReferenceEqualityComparer.Instance);
+        foreach (var loop in symbol.Definitions.OfType<ForEachStmt>())
+            rebound.UnionWith(loop.Body.SelectMany(s => IrWalker.Descendants(s)));
+        return !symbol.Uses.All(rebound.Contains);
+    }
+
+    private static int Sign(Expr step) => step switch
+    {
+        Literal { Value: var v } when NumericLiteral.IsNumber(v) => Sign(v!),
+        UnaryOp { Op: "-", Operand: Literal { Value: var v } } when NumericLiteral.IsNumber(v) => -Sign(v!),
+        _ => 0,
+    };
+
+    private static int Sign(object number) => Math.Sign(number is BigInteger b ? (double)b : Convert.ToDouble(number));
+
+    private static bool IsZero(Expr step) =>
+        step is Literal or UnaryOp { Op: "-", Operand: Literal } && Sign(step) == 0;
+
+    private static List<string> Targets(string loopVar) =>
+        loopVar.Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries).ToList();
+
+    private static HashSet<string> Assigned(IReadOnlyList<Stmt> body)
+    {
+        var names = new HashSet<string>();
+        foreach (var node in body.SelectMany(s => IrWalker.Descendants(s)))
+        {
+            switch (node)
+            {
+                case VarAssignment v:
+                    names.Add(v.VarName);
+                    break;
+                case TupleUnpackingAssignment t:
+                    names.UnionWith(t.VarNames);
+                    break;
+                case ForEachStmt inner:
+                    names.UnionWith(Targets(inner.LoopVar));
+                    break;
+            }
+        }
+        return names;
+    }
+}
@@ -0,0 +1,110 @@
+using System.Collections;
+using System.Text;
+using PLT.CORE.Analysis;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// Python builtins, methods and membership tests as a backend's own commands, one
+// template per entry:
+//
+//     { "dict:.get/2", "[dict getdef @0 @1 @2]" }
+//
+// A key is [kind:]op[/argc]. The op is a builtin's name (len), a method's with a
+// leading dot (.get), or in / not in; argc counts the arguments, not the receiver.
+// The kind (str, list, dict or gen) is that of the subject: a method's receiver, a
+// builtin's first argument, the container of `in`. The most specific entry wins:
+// kind:op/argc, kind:op, op/argc, then op.
+//
+// In a template @N is the Nth operand as the backend renders it (the receiver is
+// @0 for a method, and the item @0 and container @1 for `in`), and #N is the name
+// of that operand, for commands that update a variable in place (lappend); an
+// entry using #N is passed over when the operand isn't a plain variable.
+internal sealed class LoweringTable : IEnumerable<KeyValuePair<string, string>>
+{
+    private readonly Dictionary<string, string> _templates = new();
+
+    public void Add(string key, string template) => _templates.Add(key, template);
+
+    public IEnumerator<KeyValuePair<string, string>> GetEnumerator() => _templates.GetEnumerator();
+
+    IEnumerator IEnumerable.GetEnumerator() => GetEnumerator();
+
+    // The target code for expr, or null to emit it the generic way.
+    public string? Lower(Expr expr, ValueKinds kinds, Func<Expr, string> operand)
+    {
+        string op;
+        List<Expr> operands;
+        Expr subject;
+        switch (expr)
+        {
+            case FunctionCall f when f.Args.Count > 0 && !kinds.IsDefined(f.FunctionName):
+                op = f.FunctionName;
+                operands = f.Args.ToList();
+                subject = f.Args[0];
+                break;
+            case MethodCall m:
+                op = "." + m.MethodName;
+                operands = m.Args.Prepend(m.Target).ToList();
+                subject = m.Target;
+                break;
+            case BinaryOp { Op: "in" or "not in" } b:
+                op = b.Op;
+                operands = new List<Expr> { b.Left, b.Right };
+                subject = b.Right;
+                break;
+            default:
+                return null;
+        }
+        // name=value arguments have no place in a template
+        if (operands.Any(o => o is Intrinsic { Name: "keyword" }))
+            return null;
+
+        int argc = expr is MethodCall ? operands.Count - 1 : operands.Count;
+        var kind = KindPrefix(kinds.KindOf(subject));
+        var keys = new List<string>();
+        if (kind != null)
+            keys.AddRange(new[] { $"{kind}:{op}/{argc}", $"{kind}:{op}" });
+        keys.AddRange(new[] { $"{op}/{argc}", op });
+
+        foreach (var key in keys)
+            if (_templates.TryGetValue(key, out var template) && Expand(template, operands, operand) is { } code)
+                return code;
+        return null;
+    }
+
+    private static string? KindPrefix(ValueKind kind) => kind switch
+    {
+        ValueKind.String => "str",
+        ValueKind.List => "list",
+        ValueKind.Dict => "dict",
+        ValueKind.Generator => "gen",
+        _ => null,
+    };
+
+    private static string? Expand(string template, List<Expr> operands, Func<Expr, string> operand)
+    {
+        var sb = new StringBuilder();
+        for (int i = 0; i < template.Length; i++)
+        {
+            char c = template[i];
+            if (c is '@' or '#' && i + 1 < template.Length && char.IsAsciiDigit(template[i + 1]))
+            {
+                int n = template[++i] - '0';
+                if (n >= operands.Count)
+                    return null;
+                if (c == '@')
+                    sb.Append(operand(operands[n]));
+                else if (operands[n] is Variable v)
+                    sb.Append(v.Name);
+                else
+                    return null;
+            }
+            else
+            {
+                sb.Append(c);
+            }
+        }
+        return sb.ToString();
+    }
+}
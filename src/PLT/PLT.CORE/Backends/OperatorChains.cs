@@ -0,0 +1,28 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// The frontends build an operator chain (a + b + ... + z, or a generated
+// concatenation of thousands of pieces) as BinaryOps nested on the left, one per
+// operator. Emitters walk that spine with a loop rather than recursing into each
+// Left, so the length of a chain doesn't bound what can be emitted; only the
+// operands themselves are emitted recursively.
+internal static class OperatorChains
+{
+    // The operators along the left spine of root, innermost first: for
+    // ((a + b) - c) * d that is [a + b, _ - c, _ * d], and a is the first one's Left.
+    // The walk stops at a left operand that isn't a BinaryOp or that `extends`
+    // (given the operator and its left operand) rejects.
+    public static List<BinaryOp> LeftSpine(BinaryOp root, Func<BinaryOp, BinaryOp, bool>? extends = null)
+    {
+        var spine = new List<BinaryOp> { root };
+        var node = root;
+        while (node.Left is BinaryOp left && (extends == null || extends(node, left)))
+        {
+            spine.Add(left);
+            node = left;
+        }
+        spine.Reverse();
+        return spine;
+    }
+}
@@ -0,0 +1,56 @@
+using System.Text;
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Backends;
+
+// Top-level statements are emitted by static, stateless EmitStmt methods that only
+// append to the buffer they are given, so contiguous runs of them can be rendered
+// into separate buffers on the thread pool and concatenated in source order with
+// byte-identical results.
+internal static class ParallelEmission
+{
+    // Fewer top-level statements than this are emitted on the calling thread.
+    public const int Threshold = 256;
+
+    // null picks automatically from the program size and core count.
+    public static bool ShouldParallelize(IReadOnlyList<Stmt> body, bool? parallel) =>
+        parallel ?? (body.Count >= Threshold && Environment.ProcessorCount > 1);
+
+    public static void EmitBody(
+        IReadOnlyList<Stmt> body,
+        StringBuilder sb,
+        int indent,
+        Action<Stmt, StringBuilder, int> emitStmt,
+        string phaseName)
+    {
+        var batchCount = Math.Max(1, Math.Min(body.Count, Environment.ProcessorCount * 4));
+        var buffers = new StringBuilder[batchCount];
+
+        try
+        {
+            Parallel.For(0, batchCount, batch =>
+            {
+                using var phase = PltTelemetry.StartPhase(phaseName + ".batch");
+                var start = (int)((long)body.Count * batch / batchCount);
+                var end = (int)((long)body.Count * (batch + 1) / batchCount);
+                var buffer = new StringBuilder();
+                for (int i = start; i < end; i++)
+                    emitStmt(body[i], buffer, indent);
+                buffers[batch] = buffer;
+            });
+        }
+        catch (AggregateException)
+        {
+            // Re-emit sequentially so the caller sees the same exception, from the
+            // same statement, as a sequential run would have thrown.
+            foreach (var stmt in body)
+                emitStmt(stmt, sb, indent);
+            return;
+        }
+
+        sb.EnsureCapacity(sb.Length + buffers.Sum(b => b.Length));
+        foreach (var buffer in buffers)
+            sb.Append(buffer);
+    }
+}
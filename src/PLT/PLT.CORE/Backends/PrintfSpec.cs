@@ -0,0 +1,86 @@
+using System.Text;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// Python format specs ([[fill]align][sign][#][0][width][,][.precision][type]) as
+// printf conversions, for the backends whose formatting is printf's: Tcl's format
+// and C's snprintf.
+internal static class PrintfSpec
+{
+    // The conversion for one replacement field: ">10.2f" is "%10.2f", "<8" is "%-8s",
+    // "05d" is "%05d". Without a type, defaultType is used; a string ('s') is then
+    // left-aligned and anything else right-aligned, as Python does. Null where printf
+    // has no equivalent: centring, a fill other than space, grouping, binary,
+    // percentages, or a nested {field}.
+    public static string? FromPython(string? spec, char defaultType)
+    {
+        spec ??= "";
+        int i = 0;
+
+        char? align = null;
+        if (spec.Length >= 2 && spec[1] is '<' or '>' or '^' or '=')
+        {
+            if (spec[0] != ' ')
+                return null;
+            align = spec[1];
+            i = 2;
+        }
+        else if (spec.Length >= 1 && spec[0] is '<' or '>' or '^' or '=')
+        {
+            align = spec[0];
+            i = 1;
+        }
+        if (align is '^' or '=')
+            return null;
+
+        var flags = new StringBuilder();
+        if (i < spec.Length && spec[i] is '+' or ' ')
+            flags.Append(spec[i++]);
+        else if (i < spec.Length && spec[i] == '-')
+            i++;
+        if (i < spec.Length && spec[i] == '#')
+            flags.Append(spec[i++]);
+        if (i < spec.Length && spec[i] == '0')
+            flags.Append(spec[i++]);
+
+        int widthStart = i;
+        while (i < spec.Length && char.IsAsciiDigit(spec[i]))
+            i++;
+        var width = spec[widthStart..i];
+
+        string? precision = null;
+        if (i < spec.Length && spec[i] == '.')
+        {
+            int precisionStart = ++i;
+            while (i < spec.Length && char.IsAsciiDigit(spec[i]))
+                i++;
+            if (i == precisionStart)
+                return null;
+            precision = spec[precisionStart..i];
+        }
+
+        char type = defaultType;
+        if (i < spec.Length && spec[i] is 'd' or 'e' or 'E' or 'f' or 'F' or 'g' or 'G' or 'o' or 'x' or 'X' or 's' or 'c')
+            type = spec[i++];
+        if (i != spec.Length)
+            return null;
+
+        if (width.Length > 0 && (align == '<' || (align == null && type == 's')))
+            flags.Insert(0, '-');
+        return $"%{flags}{width}{(precision != null ? "." + precision : "")}{type}";
+    }
+
+    // FromPython for a field that has to be formatted: a spec printf can't express is
+    // an error, not a silently different rendering.
+    public static string Require(string? spec, char defaultType) =>
+        FromPython(spec, defaultType) ?? throw new NotSupportedException($"Format spec ':{spec}' has no printf equivalent.");
+
+    // A numeric literal's own type, for a field that doesn't give one.
+    public static char DefaultType(Expr expr) => expr switch
+    {
+        Literal { Value: double or float } => 'g',
+        Literal { Value: var v } when NumericLiteral.IsInteger(v) => 'd',
+        _ => 's',
+    };
+}
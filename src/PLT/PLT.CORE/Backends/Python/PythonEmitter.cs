@@ -1,19 +1,35 @@
 using System.Text;
+using PLT.CORE.Analysis;
 using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
 
 namespace PLT.CORE.Backends.Python;
 
 public sealed class PythonEmitter
 {
+    // Render top-level statements concurrently: true forces it, false disables it,
+    // null (the default) decides from the program size and core count.
+    public bool? Parallel { get; init; }
+
     public string Emit(IrProgram program)
     {
+        using var phase = PltTelemetry.StartPhase("emit.python");
+        var accumulation = StringAccumulation.Analyze(program, ScopeAnalyzer.Analyze(program));
         var sb = new StringBuilder();
-        foreach (var stmt in program.Body)
-            EmitStmt(stmt, sb, indent: 0);
-        return sb.ToString();
+        if (ParallelEmission.ShouldParallelize(program.Body, Parallel))
+            ParallelEmission.EmitBody(program.Body, sb, 0, (s, b, i) => EmitStmt(s, b, i, accumulation), "emit.python");
+        else
+            foreach (var stmt in program.Body)
+                EmitStmt(stmt, sb, 0, accumulation);
+        var output = sb.ToString();
+        phase.RecordOutput(output);
+        return output;
     }
 
-    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent)
+    // The list a string accumulated in a loop is collected in until the loop ends.
+    private static string PartsName(string varName) => $"_{varName}_parts";
+
+    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent, StringAccumulation accumulation)
     {
         var pad = new string(' ', indent * 4);
 
@@ -31,6 +47,19 @@ public sealed class PythonEmitter
                 if (!string.IsNullOrWhiteSpace(v.LeadingComment))
                     sb.AppendLine($"{pad}# {v.LeadingComment}");
                 sb.Append(pad);
+                if (accumulation.IsBuffered(v))
+                {
+                    var pieces = accumulation.Pieces(v)!;
+                    sb.Append(PartsName(v.VarName));
+                    sb.Append(pieces.Count == 1 ? ".append(" : ".extend((");
+                    for (int j = 0; j < pieces.Count; j++)
+                    {
+                        if (j > 0) sb.Append(", ");
+                        EmitExpr(pieces[j], sb);
+                    }
+                    sb.AppendLine(pieces.Count == 1 ? ")" : "))");
+                    break;
+                }
                 sb.Append(v.VarName);
                 sb.Append(" = ");
                 EmitExpr(v.Value, sb);
@@ -43,6 +72,44 @@ public sealed class PythonEmitter
                 sb.AppendLine($"{pad}pass");
                 break;
 
+            case ReturnStmt r:
+                if (!string.IsNullOrWhiteSpace(r.LeadingComment))
+                    sb.AppendLine($"{pad}# {r.LeadingComment}");
+                sb.Append(pad);
+                sb.Append("return");
+                if (r.Value != null)
+                {
+                    sb.Append(" ");
+                    EmitExpr(r.Value, sb);
+                }
+                sb.AppendLine();
+                break;
+
+            case BreakStmt b:
+                if (!string.IsNullOrWhiteSpace(b.LeadingComment))
+                    sb.AppendLine($"{pad}# {b.LeadingComment}");
+                sb.AppendLine($"{pad}break");
+                break;
+
+            case ContinueStmt c:
+                if (!string.IsNullOrWhiteSpace(c.LeadingComment))
+                    sb.AppendLine($"{pad}# {c.LeadingComment}");
+                sb.AppendLine($"{pad}continue");
+                break;
+
+            case YieldStmt y:
+                if (!string.IsNullOrWhiteSpace(y.LeadingComment))
+                    sb.AppendLine($"{pad}# {y.LeadingComment}");
+                sb.Append(pad);
+                sb.Append(y.IsFrom ? "yield from" : "yield");
+                if (y.Value != null)
+                {
+                    sb.Append(" ");
+                    EmitExpr(y.Value, sb);
+                }
+                sb.AppendLine();
+                break;
+
             case TupleUnpackingAssignment t:
                 if (!string.IsNullOrWhiteSpace(t.LeadingComment))
                     sb.AppendLine($"{pad}# {t.LeadingComment}");
@@ -66,18 +133,21 @@ public sealed class PythonEmitter
                 EmitExpr(i.Condition, sb);
                 sb.AppendLine(":");
                 foreach (var s in i.ThenBody)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, accumulation);
                 if (i.ElseBody != null)
                 {
                     sb.AppendLine($"{pad}else:");
                     foreach (var s in i.ElseBody)
-                        EmitStmt(s, sb, indent + 1);
+                        EmitStmt(s, sb, indent + 1, accumulation);
                 }
                 break;
 
             case ForEachStmt f:
                 if (!string.IsNullOrWhiteSpace(f.LeadingComment))
                     sb.AppendLine($"{pad}# {f.LeadingComment}");
+                var forBuffers = accumulation.BuffersOf(f);
+                foreach (var buffer in forBuffers)
+                    sb.AppendLine($"{pad}{PartsName(buffer.Name)} = [{buffer.Name}]");
                 sb.Append(pad);
                 sb.Append("for ");
                 sb.Append(f.LoopVar);
@@ -85,18 +155,25 @@ public sealed class PythonEmitter
                 EmitExpr(f.IterableExpr, sb);
                 sb.AppendLine(":");
                 foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, accumulation);
+                foreach (var buffer in forBuffers)
+                    sb.AppendLine($"{pad}{buffer.Name} = ''.join({PartsName(buffer.Name)})");
                 break;
 
             case WhileStmt w:
                 if (!string.IsNullOrWhiteSpace(w.LeadingComment))
                     sb.AppendLine($"{pad}# {w.LeadingComment}");
+                var whileBuffers = accumulation.BuffersOf(w);
+                foreach (var buffer in whileBuffers)
+                    sb.AppendLine($"{pad}{PartsName(buffer.Name)} = [{buffer.Name}]");
                 sb.Append(pad);
                 sb.Append("while ");
                 EmitExpr(w.Condition, sb);
                 sb.AppendLine(":");
                 foreach (var s in w.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, accumulation);
+                foreach (var buffer in whileBuffers)
+                    sb.AppendLine($"{pad}{buffer.Name} = ''.join({PartsName(buffer.Name)})");
                 break;
 
             case FunctionDefStmt f:
@@ -112,8 +189,10 @@ public sealed class PythonEmitter
                     sb.Append(f.Parameters[j]);
                 }
                 sb.AppendLine(")");
-                foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                // Python keeps every frame of a recursion; calls to itself in tail
+                // position become a loop instead
+                foreach (var s in TailCalls.Loop(f) ?? f.Body)
+                    EmitStmt(s, sb, indent + 1, accumulation);
                 break;
 
             case ClassDefStmt c:
@@ -130,7 +209,13 @@ public sealed class PythonEmitter
                 }
                 sb.AppendLine(":");
                 foreach (var s in c.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, accumulation);
+                break;
+
+            case ImportStmt im:
+                if (!string.IsNullOrWhiteSpace(im.LeadingComment))
+                    sb.AppendLine($"{pad}# {im.LeadingComment}");
+                sb.AppendLine($"{pad}{ImportSyntax.Format(im)}");
                 break;
 
             case TryStmt t:
@@ -138,7 +223,7 @@ public sealed class PythonEmitter
                     sb.AppendLine($"{pad}# {t.LeadingComment}");
                 sb.AppendLine($"{pad}try:");
                 foreach (var s in t.TryBody)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, accumulation);
                 foreach (var (exceptionType, varName, body) in t.ExceptClauses)
                 {
                     sb.Append($"{pad}except");
@@ -154,13 +239,13 @@ public sealed class PythonEmitter
                     }
                     sb.AppendLine(":");
                     foreach (var s in body)
-                        EmitStmt(s, sb, indent + 1);
+                        EmitStmt(s, sb, indent + 1, accumulation);
                 }
                 if (t.FinallyBody != null)
                 {
                     sb.AppendLine($"{pad}finally:");
                     foreach (var s in t.FinallyBody)
-                        EmitStmt(s, sb, indent + 1);
+                        EmitStmt(s, sb, indent + 1, accumulation);
                 }
                 break;
 
@@ -195,6 +280,16 @@ public sealed class PythonEmitter
                 }
                 return;
 
+            case Intrinsic { Name: "getattr", Args: [var target, Literal { Value: string attr }] }:
+                EmitExpr(target, sb);
+                sb.Append(".").Append(attr);
+                return;
+
+            case Intrinsic { Name: "keyword", Args: [Literal { Value: string name }, var value] }:
+                sb.Append(name).Append('=');
+                EmitExpr(value, sb);
+                return;
+
             case Intrinsic i when i.Name == "raise":
                 sb.Append("raise ");
                 if (i.Args.Count > 0)
@@ -204,7 +299,7 @@ public sealed class PythonEmitter
                 return;
 
             case Literal l:
-                sb.Append(FormatLiteral(l.Value));
+                sb.Append(FormatLiteral(l.Value, l.Spelling));
                 return;
 
             case Variable v:
@@ -234,12 +329,18 @@ public sealed class PythonEmitter
                 return;
 
             case BinaryOp b:
-                EmitExpr(b.Left, sb);
-                sb.Append(" ");
-                sb.Append(b.Op);
-                sb.Append(" ");
-                EmitExpr(b.Right, sb);
+            {
+                var spine = OperatorChains.LeftSpine(b);
+                EmitExpr(spine[0].Left, sb);
+                foreach (var op in spine)
+                {
+                    sb.Append(" ");
+                    sb.Append(op.Op);
+                    sb.Append(" ");
+                    EmitExpr(op.Right, sb);
+                }
                 return;
+            }
 
             case UnaryOp u:
                 sb.Append(u.Op);
@@ -299,16 +400,41 @@ public sealed class PythonEmitter
                 return;
 
             case StringInterpolation s:
-                sb.Append("f\"");
+            {
+                // Before Python 3.12 a field can't reuse the f-string's own quote, so a
+                // field holding a string literal (always written with ") gets '.
+                char quote = s.Parts.Any(p => p is StringPartExpr e && IrWalker.Descendants(e.Expr).Any(n => n is Literal { Value: string })) ? '\'' : '"';
+                sb.Append('f').Append(quote);
                 foreach (var part in s.Parts)
                 {
-                    if (part is StringPartLiteral lit)
-                        sb.Append(EscapeString(lit.Value));
-                    else if (part is StringPartVariable var)
-                        sb.Append("{").Append(var.VarName).Append("}");
+                    switch (part)
+                    {
+                        case StringPartLiteral lit:
+                            sb.Append(EscapeString(lit.Value, quote).Replace("{", "{{").Replace("}", "}}"));
+                            break;
+                        case StringPartVariable v:
+                            sb.Append('{').Append(v.VarName).Append('}');
+                            break;
+                        case StringPartExpr e:
+                        {
+                            var field = new StringBuilder();
+                            EmitExpr(e.Expr, field);
+                            // {{ would read as an escaped brace, and a lambda's : as the spec
+                            if (e.Expr is LambdaExpr)
+                                field.Insert(0, '(').Append(')');
+                            sb.Append('{').Append(field.Length > 0 && field[0] == '{' ? " " : "").Append(field);
+                            if (e.Conversion != null)
+                                sb.Append('!').Append(e.Conversion);
+                            if (e.FormatSpec != null)
+                                sb.Append(':').Append(e.FormatSpec);
+                            sb.Append('}');
+                            break;
+                        }
+                    }
                 }
-                sb.Append("\"");
+                sb.Append(quote);
                 return;
+            }
 
             case ListComprehension lc:
                 sb.Append("[");
@@ -370,19 +496,16 @@ public sealed class PythonEmitter
         }
     }
 
-    private static string FormatLiteral(object? value) =>
+    private static string FormatLiteral(object? value, string? spelling = null) =>
         value switch
         {
             null => "None",
             string s => $"\"{EscapeString(s)}\"",
             bool b => b ? "True" : "False",
-            int i => i.ToString(),
-            long l => l.ToString(),
-            float f => f.ToString(System.Globalization.CultureInfo.InvariantCulture),
-            double d => d.ToString(System.Globalization.CultureInfo.InvariantCulture),
+            _ when NumericLiteral.IsNumber(value) => NumericLiteral.Format(value, spelling, octalAndBinary: true),
             _ => $"\"{EscapeString(value.ToString() ?? "")}\""
         };
 
-    private static string EscapeString(string s) =>
-        s.Replace("\\", "\\\\").Replace("\"", "\\\"");
+    private static string EscapeString(string s, char quote = '"') =>
+        s.Replace("\\", "\\\\").Replace(quote.ToString(), "\\" + quote);
 }
@@ -0,0 +1,105 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// if/elif chains that compare one expression against constants, which a backend with
+// a switch of its own dispatches on once instead of testing each arm in turn.
+internal static class SwitchChains
+{
+    // case a: / case b: ... Body
+    public sealed record Case(IReadOnlyList<object> Labels, IReadOnlyList<Stmt> Body);
+
+    // switch (Subject) { Cases...; default: Default }. The labels are all strings or
+    // all integers, and no two arms share one.
+    public sealed record Chain(Expr Subject, IReadOnlyList<Case> Cases, IReadOnlyList<Stmt>? Default)
+    {
+        public bool IsString => Cases[0].Labels[0] is string;
+    }
+
+    // A chain of fewer arms reads as well as an if and costs no more.
+    private const int MinCases = 3;
+
+    public static Chain? Match(IfStmt i)
+    {
+        Expr? subject = null;
+        var cases = new List<Case>();
+        var seen = new HashSet<object>();
+        IReadOnlyList<Stmt>? rest = new Stmt[] { i };
+
+        // Each elif is an IfStmt alone in the else branch; one with a comment of its
+        // own is left for the if chain to carry.
+        while (rest is [IfStmt arm] && (cases.Count == 0 || arm.LeadingComment == null))
+        {
+            var labels = new List<object>();
+            if (!Labels(arm.Condition, ref subject, labels) || !labels.All(seen.Add))
+                break;
+            cases.Add(new Case(labels, arm.ThenBody));
+            rest = arm.ElseBody;
+        }
+
+        if (cases.Count < MinCases || subject == null)
+            return null;
+        // Python compares "1" and 1 unequal, but one switch has one label type
+        bool strings = cases[0].Labels[0] is string;
+        if (!cases.SelectMany(c => c.Labels).All(l => l is string == strings))
+            return null;
+        return new Chain(subject, cases, rest);
+    }
+
+    // Whether a case body leaves an enclosing loop with break, which inside a C switch
+    // would leave the switch instead.
+    public static bool BreaksOut(IReadOnlyList<Stmt> body) => body.Any(s => s switch
+    {
+        BreakStmt => true,
+        IfStmt i => BreaksOut(i.ThenBody) || (i.ElseBody != null && BreaksOut(i.ElseBody)),
+        TryStmt t => BreaksOut(t.TryBody)
+            || t.ExceptClauses.Any(c => BreaksOut(c.Body))
+            || (t.FinallyBody != null && BreaksOut(t.FinallyBody)),
+        _ => false,
+    });
+
+    // subject == label, or several of them joined by or
+    private static bool Labels(Expr condition, ref Expr? subject, List<object> labels)
+    {
+        switch (condition)
+        {
+            case BinaryOp { Op: "or" } b:
+                return Labels(b.Left, ref subject, labels) && Labels(b.Right, ref subject, labels);
+
+            case BinaryOp { Op: "==" } b:
+                var label = b.Right as Literal ?? b.Left as Literal;
+                var operand = ReferenceEquals(label, b.Right) ? b.Left : b.Right;
+                if (label?.Value is not (string or int or long) || Key(operand) is not { } key)
+                    return false;
+                if (subject != null && Key(subject) != key)
+                    return false;
+                subject = operand;
+                labels.Add(label.Value is int n ? (long)n : label.Value);
+                return true;
+
+            default:
+                return false;
+        }
+    }
+
+    // A spelling of expr when evaluating it once gives what each arm of the chain would
+    // have seen: a variable, or attribute and item reads of one. Null otherwise. (The
+    // IR's records hold their arguments in lists, which compare by reference.)
+    private static string? Key(Expr expr) => expr switch
+    {
+        Variable v => v.Name,
+        Intrinsic { Name: "getattr", Args: [var target, Literal { Value: string attribute }] } =>
+            Key(target) is { } inner ? $"{inner}.{attribute}" : null,
+        MethodCall { MethodName: "__getitem__", Args: [var index] } m =>
+            Key(m.Target) is { } inner && IndexKey(index) is { } at ? $"{inner}[{at}]" : null,
+        _ => null,
+    };
+
+    private static string? IndexKey(Expr index) => index switch
+    {
+        Literal { Value: string s } => $"'{s}'",
+        Literal l => Convert.ToString(l.Value, System.Globalization.CultureInfo.InvariantCulture),
+        Variable v => v.Name,
+        _ => null,
+    };
+}
@@ -0,0 +1,110 @@
+using PLT.CORE.Analysis;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Backends;
+
+// Calls in tail position (`return f(...)`), which need not keep the caller's frame:
+// a backend with tail calls of its own makes them in place, and one without can
+// still turn a function's calls to itself into a loop.
+internal static class TailCalls
+{
+    // Whether r returns the result of calling one of the module's own functions.
+    // Builtins are left alone, since they may be lowered to something that isn't a
+    // call at all.
+    public static bool IsTailCall(ReturnStmt r, SymbolTable symbols) =>
+        r.Value is FunctionCall { IsNamespaced: false } call
+        && call.Args.All(a => a is not Intrinsic { Name: "keyword" })
+        && symbols.Module.Symbols.TryGetValue(call.FunctionName, out var symbol)
+        && symbol.Kind == SymbolKind.Function;
+
+    // f's body as a while-true loop in which each `return f(args)` rebinds the
+    // parameters to args and continues, so recursion of any depth runs in one frame.
+    // Null when f makes no such call, makes one where continue wouldn't reach the loop
+    // (inside a loop of its own, or a try whose handlers it would leave), or defines
+    // functions of its own.
+    public static IReadOnlyList<Stmt>? Loop(FunctionDefStmt f)
+    {
+        // A closure made on one pass would see the parameters the next pass rebinds
+        if (f.Parameters.Contains(f.FunctionName)
+            || f.Body.SelectMany(s => IrWalker.Descendants(s)).Any(n => n is FunctionDefStmt or ClassDefStmt or LambdaExpr))
+            return null;
+
+        bool found = false;
+        bool ok = true;
+
+        List<Stmt> Rewrite(IReadOnlyList<Stmt> body)
+        {
+            var result = new List<Stmt>(body.Count);
+            foreach (var stmt in body)
+            {
+                switch (stmt)
+                {
+                    case ReturnStmt r when IsSelfCall(r, f, out var args):
+                        found = true;
+                        result.AddRange(Rebind(f.Parameters, args));
+                        result.Add(new ContinueStmt(r.LeadingComment));
+                        break;
+
+                    case IfStmt i:
+                        result.Add(i with
+                        {
+                            ThenBody = Rewrite(i.ThenBody),
+                            ElseBody = i.ElseBody == null ? null : Rewrite(i.ElseBody),
+                        });
+                        break;
+
+                    case ForEachStmt or WhileStmt or TryStmt:
+                        if (IrWalker.Descendants(stmt).Any(n => n is ReturnStmt inner && IsSelfCall(inner, f, out _)))
+                            ok = false;
+                        result.Add(stmt);
+                        break;
+
+                    default:
+                        result.Add(stmt);
+                        break;
+                }
+            }
+            return result;
+        }
+
+        // A docstring stays the function's first statement
+        int skip = f.Body is [ExprStmt { Expr: Literal { Value: string } }, ..] ? 1 : 0;
+        var loop = Rewrite(f.Body.Skip(skip).ToList());
+        if (!found || !ok)
+            return null;
+
+        // The loop goes round again by itself; running off the end of its body is
+        // running off the end of f
+        if (loop is [.., ContinueStmt { LeadingComment: null }])
+            loop.RemoveAt(loop.Count - 1);
+        else if (loop is not [.., ReturnStmt])
+            loop.Add(new BreakStmt());
+        return f.Body.Take(skip).Append(new WhileStmt(new Literal(true), loop)).ToList();
+    }
+
+    private static bool IsSelfCall(ReturnStmt r, FunctionDefStmt f, out IReadOnlyList<Expr> args)
+    {
+        args = Array.Empty<Expr>();
+        if (r.Value is not FunctionCall { IsNamespaced: false } call || call.FunctionName != f.FunctionName
+            || call.Args.Count != f.Parameters.Count || call.Args.Any(a => a is Intrinsic { Name: "keyword" }))
+            return false;
+        args = call.Args;
+        return true;
+    }
+
+    // The assignment that binds each parameter to its argument, as one call would:
+    // a, b = b, a % b, every argument read before any parameter changes.
+    private static List<Stmt> Rebind(IReadOnlyList<string> parameters, IReadOnlyList<Expr> args)
+    {
+        // f(n - 1, acc) leaves acc as it is
+        var pairs = parameters.Zip(args)
+            .Where(p => p.Second is not Variable v || v.Name != p.First)
+            .ToList();
+        return pairs switch
+        {
+            [] => new List<Stmt>(),
+            [var (name, arg)] => new List<Stmt> { new VarAssignment(name, arg) },
+            _ => new List<Stmt> { new TupleUnpackingAssignment(pairs.Select(p => p.First).ToList(), new ListLiteral(pairs.Select(p => p.Second).ToList())) },
+        };
+    }
+}
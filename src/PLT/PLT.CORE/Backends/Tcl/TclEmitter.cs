@@ -1,16 +1,33 @@
+using System.Globalization;
+using System.Numerics;
 using System.Text;
+using PLT.CORE.Analysis;
 using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
 
 namespace PLT.CORE.Backends.Tcl;
 
 public sealed class TclEmitter
 {
+    // Render top-level statements concurrently: true forces it, false disables it,
+    // null (the default) decides from the program size and core count.
+    public bool? Parallel { get; init; }
+
     public string Emit(IrProgram program)
     {
+        using var phase = PltTelemetry.StartPhase("emit.tcl");
+        var symbols = ScopeAnalyzer.Analyze(program);
+        var accumulation = StringAccumulation.Analyze(program, symbols);
+        var kinds = ValueKinds.Analyze(program, symbols, accumulation);
         var sb = new StringBuilder();
-        foreach (var stmt in program.Body)
-            EmitStmt(stmt, sb, indent: 0);
-        return sb.ToString();
+        if (ParallelEmission.ShouldParallelize(program.Body, Parallel))
+            ParallelEmission.EmitBody(program.Body, sb, 0, (s, b, i) => EmitStmt(s, b, i, symbols, accumulation, kinds), "emit.tcl");
+        else
+            foreach (var stmt in program.Body)
+                EmitStmt(stmt, sb, 0, symbols, accumulation, kinds);
+        var output = sb.ToString();
+        phase.RecordOutput(output);
+        return output;
     }
 
     private enum ExprContext
@@ -19,7 +36,7 @@ public sealed class TclEmitter
         InsideExpr    // Variables don't need $prefix (inside [expr {...}])
     }
 
-    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent)
+    private static void EmitStmt(Stmt stmt, StringBuilder sb, int indent, SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds)
     {
         var pad = new string(' ', indent * 4);
 
@@ -29,18 +46,41 @@ public sealed class TclEmitter
                 if (!string.IsNullOrWhiteSpace(s.LeadingComment))
                     sb.AppendLine($"{pad}# {s.LeadingComment}");
                 sb.Append(pad);
-                EmitExpr(s.Expr, sb, ExprContext.Normal);
-                sb.AppendLine();
+                // [lappend xs $x] is a value; as a statement the command runs on its own
+                var command = Word(s.Expr, kinds);
+                sb.AppendLine(IsBracketed(command) ? command[1..^1] : command);
                 break;
 
             case VarAssignment v:
                 if (!string.IsNullOrWhiteSpace(v.LeadingComment))
                     sb.AppendLine($"{pad}# {v.LeadingComment}");
                 sb.Append(pad);
+                // String built up in a loop: append in place rather than copying it
+                if (accumulation.Pieces(v) is { } pieces)
+                {
+                    sb.Append("append ");
+                    sb.Append(v.VarName);
+                    foreach (var piece in pieces)
+                    {
+                        sb.Append(" ");
+                        sb.Append(Word(piece, kinds));
+                    }
+                    sb.AppendLine();
+                    break;
+                }
+                if (v.Value is DictComprehension dc && !kinds.Shadows(dc)
+                    && !IrWalker.Descendants(dc).Any(n => n is Variable { Name: var name } && name == v.VarName))
+                {
+                    sb.AppendLine($"set {v.VarName} [dict create]");
+                    sb.Append(pad);
+                    EmitDictLoop(dc, v.VarName, sb, kinds);
+                    sb.AppendLine();
+                    break;
+                }
                 sb.Append("set ");
                 sb.Append(v.VarName);
                 sb.Append(" ");
-                EmitExpr(v.Value, sb, ExprContext.Normal);
+                sb.Append(Word(v.Value, kinds));
                 sb.AppendLine();
                 break;
 
@@ -50,6 +90,37 @@ public sealed class TclEmitter
                 sb.AppendLine($"{pad}# pass");
                 break;
 
+            case ReturnStmt r:
+                if (!string.IsNullOrWhiteSpace(r.LeadingComment))
+                    sb.AppendLine($"{pad}# {r.LeadingComment}");
+                if (TailCalls.IsTailCall(r, symbols))
+                {
+                    // The callee replaces this frame rather than nesting inside it
+                    sb.AppendLine($"{pad}tailcall {Command(r.Value!, kinds)}");
+                    break;
+                }
+                sb.Append(pad);
+                sb.Append("return");
+                if (r.Value != null)
+                {
+                    sb.Append(" ");
+                    sb.Append(Word(r.Value, kinds));
+                }
+                sb.AppendLine();
+                break;
+
+            case BreakStmt b:
+                if (!string.IsNullOrWhiteSpace(b.LeadingComment))
+                    sb.AppendLine($"{pad}# {b.LeadingComment}");
+                sb.AppendLine($"{pad}break");
+                break;
+
+            case ContinueStmt c:
+                if (!string.IsNullOrWhiteSpace(c.LeadingComment))
+                    sb.AppendLine($"{pad}# {c.LeadingComment}");
+                sb.AppendLine($"{pad}continue");
+                break;
+
             case TupleUnpackingAssignment t:
                 if (!string.IsNullOrWhiteSpace(t.LeadingComment))
                     sb.AppendLine($"{pad}# {t.LeadingComment}");
@@ -57,7 +128,7 @@ public sealed class TclEmitter
                 // Then: lassign $varlist var1 var2 ...
                 sb.Append(pad);
                 sb.Append("set _tuple ");
-                EmitExpr(t.Value, sb, ExprContext.Normal);
+                sb.Append(Word(t.Value, kinds));
                 sb.AppendLine();
                 sb.Append(pad);
                 sb.Append("lassign $_tuple");
@@ -72,17 +143,22 @@ public sealed class TclEmitter
             case IfStmt i:
                 if (!string.IsNullOrWhiteSpace(i.LeadingComment))
                     sb.AppendLine($"{pad}# {i.LeadingComment}");
+                if (SwitchChains.Match(i) is { IsString: true } chain)
+                {
+                    EmitSwitch(chain, sb, indent, symbols, accumulation, kinds);
+                    break;
+                }
                 sb.Append(pad);
                 sb.Append("if {");
-                EmitExpr(i.Condition, sb, ExprContext.Normal);
+                sb.Append(Word(i.Condition, kinds));
                 sb.AppendLine("} {");
                 foreach (var s in i.ThenBody)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds);
                 if (i.ElseBody != null)
                 {
                     sb.AppendLine($"{pad}}} else {{");
                     foreach (var s in i.ElseBody)
-                        EmitStmt(s, sb, indent + 1);
+                        EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds);
                 }
                 sb.AppendLine($"{pad}}}");
                 break;
@@ -90,14 +166,67 @@ public sealed class TclEmitter
             case ForEachStmt f:
                 if (!string.IsNullOrWhiteSpace(f.LeadingComment))
                     sb.AppendLine($"{pad}# {f.LeadingComment}");
+                if (kinds.KindOf(f.IterableExpr) == ValueKind.Generator)
+                {
+                    // Step the coroutine one value at a time instead of collecting them
+                    var generator = "_gen_" + SplitLoopVars(f.LoopVar).First();
+                    sb.AppendLine($"{pad}set {generator} {Word(f.IterableExpr, kinds)}");
+                    EmitGeneratorLoop(generator, f.LoopVar, f.Body, sb, indent, symbols, accumulation, kinds);
+                    // Leaving early strands the coroutine mid-body
+                    if (f.Body.SelectMany(s => IrWalker.Descendants(s)).Any(n => n is BreakStmt))
+                        sb.AppendLine($"{pad}catch {{rename ${generator} {{}}}}");
+                    break;
+                }
                 sb.Append(pad);
-                sb.Append("foreach ");
-                sb.Append(f.LoopVar);
-                sb.Append(" ");
-                EmitExpr(f.IterableExpr, sb, ExprContext.Normal);
+                var enumerate = CountedLoops.MatchEnumerate(f, symbols, kinds);
+                if (CountedLoops.MatchRange(f, symbols, kinds) is { } range)
+                {
+                    EmitRangeLoop(range, f.Body, sb, kinds);
+                }
+                else if (enumerate != null)
+                {
+                    // The index counts up as foreach walks the list
+                    sb.Append("set ").Append(enumerate.Index).Append(' ').AppendLine(BeforeStart(enumerate.Start, kinds));
+                    sb.Append(pad).Append("foreach ").Append(enumerate.Item).Append(' ').Append(Word(enumerate.Iterable, kinds));
+                }
+                else if (CountedLoops.MatchZip(f, kinds) is { } zip)
+                {
+                    // foreach takes the lists side by side, but pads the shorter ones
+                    // with empty strings where zip stops at the shortest, so each is
+                    // cut to the shortest length first
+                    var lists = new List<string>();
+                    for (int j = 0; j < zip.Vars.Count; j++)
+                    {
+                        if (zip.Iterables[j] is Variable)
+                        {
+                            lists.Add(Word(zip.Iterables[j], kinds));
+                            continue;
+                        }
+                        sb.Append("set _zip_").Append(zip.Vars[j]).Append(' ').AppendLine(Word(zip.Iterables[j], kinds));
+                        sb.Append(pad);
+                        lists.Add("$_zip_" + zip.Vars[j]);
+                    }
+                    var shortest = "_len_" + zip.Vars[0];
+                    sb.Append("set ").Append(shortest).Append(" [tcl::mathfunc::min");
+                    foreach (var list in lists)
+                        sb.Append(" [llength ").Append(list).Append(']');
+                    sb.AppendLine("]");
+                    sb.Append(pad).Append("foreach");
+                    for (int j = 0; j < zip.Vars.Count; j++)
+                        sb.Append(' ').Append(zip.Vars[j]).Append($" [lrange {lists[j]} 0 ${shortest}-1]");
+                }
+                else
+                {
+                    sb.Append("foreach ");
+                    sb.Append(LoopVars(f.LoopVar));
+                    sb.Append(" ");
+                    sb.Append(Word(f.IterableExpr, kinds));
+                }
                 sb.AppendLine(" {");
+                if (enumerate != null)
+                    sb.AppendLine($"{pad}    incr {enumerate.Index}");
                 foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds);
                 sb.AppendLine($"{pad}}}");
                 break;
 
@@ -106,10 +235,10 @@ public sealed class TclEmitter
                     sb.AppendLine($"{pad}# {w.LeadingComment}");
                 sb.Append(pad);
                 sb.Append("while {");
-                EmitExpr(w.Condition, sb, ExprContext.Normal);
+                sb.Append(Word(w.Condition, kinds));
                 sb.AppendLine("} {");
                 foreach (var s in w.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds);
                 sb.AppendLine($"{pad}}}");
                 break;
 
@@ -125,11 +254,48 @@ public sealed class TclEmitter
                     sb.Append(f.Parameters[j]);
                 }
                 sb.AppendLine("} {");
+                var scope = symbols.ScopeOf(f)!;
+                int bodyIndent = scope.IsGenerator ? indent + 2 : indent + 1;
+                var bodyPad = new string(' ', bodyIndent * 4);
+                if (scope.IsGenerator)
+                {
+                    // A generator is a coroutine: the proc starts it, the coroutine
+                    // yields its own name back, and each call to that name runs the
+                    // body to its next yield. Returning deletes the command, which
+                    // tells the caller it is exhausted.
+                    var parameters = string.Join(" ", f.Parameters);
+                    sb.AppendLine($"{pad}    coroutine {f.FunctionName}#[incr ::_generators] apply {{{{{parameters}}} {{");
+                }
+                // Module-level variables aren't visible inside a proc; link the ones
+                // this function reads once on entry.
+                var globals = scope.GlobalsUsed;
+                if (globals.Count > 0)
+                    sb.AppendLine($"{bodyPad}global {string.Join(" ", globals.Select(g => g.Name))}");
+                if (scope.IsGenerator)
+                    sb.AppendLine($"{bodyPad}yield [info coroutine]");
                 foreach (var s in f.Body)
-                    EmitStmt(s, sb, indent + 1);
+                    EmitStmt(s, sb, bodyIndent, symbols, accumulation, kinds);
+                if (scope.IsGenerator)
+                    sb.AppendLine($"{pad}    }}}}" + string.Concat(f.Parameters.Select(p => " $" + p)));
                 sb.AppendLine("}");
                 break;
 
+            case YieldStmt y:
+                if (!string.IsNullOrWhiteSpace(y.LeadingComment))
+                    sb.AppendLine($"{pad}# {y.LeadingComment}");
+                if (y.Value == null)
+                    sb.AppendLine($"{pad}yield");
+                else if (!y.IsFrom)
+                    sb.AppendLine($"{pad}yield {Word(y.Value, kinds)}");
+                else if (kinds.KindOf(y.Value) == ValueKind.Generator)
+                {
+                    sb.AppendLine($"{pad}set _from {Word(y.Value, kinds)}");
+                    EmitGeneratorLoop("_from", "_item", new Stmt[] { new YieldStmt(new Variable("_item")) }, sb, indent, symbols, accumulation, kinds);
+                }
+                else
+                    sb.AppendLine($"{pad}foreach _item {Word(y.Value, kinds)} {{yield $_item}}");
+                break;
+
             case ClassDefStmt c:
                 if (!string.IsNullOrWhiteSpace(c.LeadingComment))
                     sb.AppendLine($"{pad}# {c.LeadingComment}");
@@ -138,7 +304,13 @@ public sealed class TclEmitter
                 else
                     sb.AppendLine($"{pad}# Class {c.ClassName}");
                 foreach (var s in c.Body)
-                    EmitStmt(s, sb, indent);
+                    EmitStmt(s, sb, indent, symbols, accumulation, kinds);
+                break;
+
+            case ImportStmt im:
+                if (!string.IsNullOrWhiteSpace(im.LeadingComment))
+                    sb.AppendLine($"{pad}# {im.LeadingComment}");
+                sb.AppendLine($"{pad}# {ImportSyntax.Format(im)}");
                 break;
 
             case TryStmt t:
@@ -146,7 +318,7 @@ public sealed class TclEmitter
                     sb.AppendLine($"{pad}# {t.LeadingComment}");
                 sb.AppendLine($"{pad}# Try block");
                 foreach (var s in t.TryBody)
-                    EmitStmt(s, sb, indent);
+                    EmitStmt(s, sb, indent, symbols, accumulation, kinds);
                 if (t.ExceptClauses.Count > 0)
                 {
                     foreach (var (exceptionType, varName, body) in t.ExceptClauses)
@@ -156,14 +328,14 @@ public sealed class TclEmitter
                         else
                             sb.AppendLine($"{pad}# Catch all exceptions");
                         foreach (var s in body)
-                            EmitStmt(s, sb, indent);
+                            EmitStmt(s, sb, indent, symbols, accumulation, kinds);
                     }
                 }
                 if (t.FinallyBody != null)
                 {
                     sb.AppendLine($"{pad}# Finally block");
                     foreach (var s in t.FinallyBody)
-                        EmitStmt(s, sb, indent);
+                        EmitStmt(s, sb, indent, symbols, accumulation, kinds);
                 }
                 break;
 
@@ -172,15 +344,22 @@ public sealed class TclEmitter
         }
     }
 
-    private static void EmitExpr(Expr expr, StringBuilder sb, ExprContext context = ExprContext.Normal)
+    private static void EmitExpr(Expr expr, StringBuilder sb, ValueKinds kinds, ExprContext context = ExprContext.Normal)
     {
+        // An operand of expr is a value, so a command there is substituted
+        if (context == ExprContext.InsideExpr && expr is FunctionCall or MethodCall or Intrinsic)
+        {
+            sb.Append(Word(expr, kinds));
+            return;
+        }
+
         switch (expr)
         {
             case Intrinsic i when i.Name == "print":
                 sb.Append("puts ");
                 if (i.Args.Count == 1)
                 {
-                    EmitExpr(i.Args[0], sb, ExprContext.Normal);
+                    sb.Append(Word(i.Args[0], kinds));
                 }
                 else if (i.Args.Count > 1)
                 {
@@ -188,7 +367,7 @@ public sealed class TclEmitter
                     foreach (var arg in i.Args)
                     {
                         sb.Append(" ");
-                        EmitExpr(arg, sb, ExprContext.Normal);
+                        sb.Append(Word(arg, kinds));
                     }
                     sb.Append("]");
                 }
@@ -200,21 +379,31 @@ public sealed class TclEmitter
                 sb.Append("[expr {");
                 if (i.Args.Count >= 3)
                 {
-                    EmitExpr(i.Args[0], sb, ExprContext.InsideExpr);  // condition
+                    EmitExpr(i.Args[0], sb, kinds, ExprContext.InsideExpr);  // condition
                     sb.Append(" ? ");
-                    EmitExpr(i.Args[1], sb, ExprContext.InsideExpr);  // true_expr
+                    EmitExpr(i.Args[1], sb, kinds, ExprContext.InsideExpr);  // true_expr
                     sb.Append(" : ");
-                    EmitExpr(i.Args[2], sb, ExprContext.InsideExpr);  // false_expr
+                    EmitExpr(i.Args[2], sb, kinds, ExprContext.InsideExpr);  // false_expr
                 }
                 sb.Append("}]");
                 return;
 
+            // sys.platform -> $::tcl_platform(platform)
+            case Intrinsic { Name: "getattr", Args: [Variable { Name: "sys" }, Literal { Value: "platform" }] }:
+                sb.Append("$::tcl_platform(platform)");
+                return;
+
+            // name=value => -name value, the Tcl convention for options
+            case Intrinsic { Name: "keyword", Args: [Literal { Value: string name }, var value] }:
+                sb.Append('-').Append(name).Append(' ').Append(Word(value, kinds));
+                return;
+
             case Intrinsic i when i.Name == "raise":
                 // raise(exception) => error "exception"
                 sb.Append("error ");
                 if (i.Args.Count > 0)
                 {
-                    EmitExpr(i.Args[0], sb, ExprContext.Normal);
+                    sb.Append(Word(i.Args[0], kinds));
                 }
                 else
                 {
@@ -223,7 +412,7 @@ public sealed class TclEmitter
                 return;
 
             case Literal l:
-                sb.Append(FormatLiteral(l.Value));
+                sb.Append(FormatLiteral(l.Value, l.Spelling));
                 return;
 
             case Variable v:
@@ -236,7 +425,7 @@ public sealed class TclEmitter
                 for (int j = 0; j < l.Elements.Count; j++)
                 {
                     sb.Append(" ");
-                    EmitExpr(l.Elements[j], sb, ExprContext.Normal);
+                    sb.Append(Word(l.Elements[j], kinds));
                 }
                 sb.Append("]");
                 return;
@@ -246,14 +435,19 @@ public sealed class TclEmitter
                 for (int j = 0; j < d.Items.Count; j++)
                 {
                     sb.Append(" ");
-                    EmitExpr(d.Items[j].Key, sb, ExprContext.Normal);
+                    sb.Append(Word(d.Items[j].Key, kinds));
                     sb.Append(" ");
-                    EmitExpr(d.Items[j].Value, sb, ExprContext.Normal);
+                    sb.Append(Word(d.Items[j].Value, kinds));
                 }
                 sb.Append("]");
                 return;
 
             case BinaryOp b:
+                if (Builtins.Lower(b, kinds, o => Word(o, kinds)) is { } membership)
+                {
+                    sb.Append(membership);
+                    return;
+                }
                 // Special case: string repetition in Python (str * int) => [string repeat str int]
                 if (b.Op == "*")
                 {
@@ -262,7 +456,7 @@ public sealed class TclEmitter
                         sb.Append("[string repeat ");
                         sb.Append(FormatLiteral(str));
                         sb.Append(" ");
-                        EmitExpr(b.Right, sb, ExprContext.Normal);
+                        sb.Append(Word(b.Right, kinds));
                         sb.Append("]");
                         return;
                     }
@@ -271,26 +465,42 @@ public sealed class TclEmitter
                         sb.Append("[string repeat ");
                         sb.Append(FormatLiteral(str2));
                         sb.Append(" ");
-                        EmitExpr(b.Left, sb, ExprContext.Normal);
+                        sb.Append(Word(b.Left, kinds));
                         sb.Append("]");
                         return;
                     }
                 }
-                // Tcl uses expr for math/logic
+                // Python's + joins strings, where expr's would add them as numbers
+                if (b.Op == "+" && (StringAccumulation.IsStringValued(b) || kinds.KindOf(b) == ValueKind.String))
+                {
+                    var pieces = OperatorChains.LeftSpine(b, (op, left) => left.Op == "+");
+                    sb.Append("[string cat ").Append(Word(pieces[0].Left, kinds));
+                    foreach (var piece in pieces)
+                        sb.Append(' ').Append(Word(piece.Right, kinds));
+                    sb.Append(']');
+                    return;
+                }
+                // Tcl uses expr for math/logic. Operators of equal precedence nested on
+                // the left (a + b - c + ...) share one expr, which Tcl evaluates left to
+                // right just as the nesting says.
+                var spine = OperatorChains.LeftSpine(b, (op, left) => SamePrecedence(op.Op, left.Op) && !IsStringRepeat(left));
                 sb.Append("[expr {");
-                EmitExpr(b.Left, sb, ExprContext.InsideExpr);
-                sb.Append(" ");
-                sb.Append(b.Op);
-                sb.Append(" ");
-                EmitExpr(b.Right, sb, ExprContext.InsideExpr);
+                EmitExpr(spine[0].Left, sb, kinds, ExprContext.InsideExpr);
+                foreach (var op in spine)
+                {
+                    sb.Append(" ");
+                    sb.Append(Operators.GetValueOrDefault(op.Op, op.Op));
+                    sb.Append(" ");
+                    EmitExpr(op.Right, sb, kinds, ExprContext.InsideExpr);
+                }
                 sb.Append("}]");
                 return;
 
             case UnaryOp u:
                 sb.Append("[expr {");
-                sb.Append(u.Op);
+                sb.Append(Operators.GetValueOrDefault(u.Op, u.Op));
                 sb.Append(" ");
-                EmitExpr(u.Operand, sb, ExprContext.InsideExpr);
+                EmitExpr(u.Operand, sb, kinds, ExprContext.InsideExpr);
                 sb.Append("}]");
                 return;
 
@@ -302,40 +512,32 @@ public sealed class TclEmitter
                     sb.Append("[list]");
                     return;
                 }
-                // Map print to puts
-                if (f.FunctionName == "print")
-                {
-                    sb.Append("puts");
-                    for (int j = 0; j < f.Args.Count; j++)
-                    {
-                        sb.Append(" ");
-                        EmitExpr(f.Args[j], sb, ExprContext.Normal);
-                    }
-                }
-                else
+                // A lambda is a command prefix held in a variable, not a command
+                bool callsValue = kinds.CallsValue(f);
+                if (!callsValue && Builtins.Lower(f, kinds, o => Word(o, kinds)) is { } builtin)
                 {
-                    sb.Append(f.FunctionName);
-                    for (int j = 0; j < f.Args.Count; j++)
-                    {
-                        sb.Append(" ");
-                        EmitExpr(f.Args[j], sb, ExprContext.Normal);
-                    }
+                    sb.Append(builtin);
+                    return;
                 }
+                // Map print to puts
+                sb.Append(callsValue ? "{*}$" + f.FunctionName : f.FunctionName == "print" ? "puts" : f.FunctionName);
+                foreach (var arg in f.Args)
+                    sb.Append(' ').Append(Word(arg, kinds));
                 return;
 
             case MethodCall m:
                 if (m.MethodName == "__slice__")
                 {
                     sb.Append("[string range ");
-                    EmitExpr(m.Target, sb, ExprContext.Normal);
+                    sb.Append(Word(m.Target, kinds));
                     sb.Append(" ");
                     if (m.Args[0] is not Literal { Value: null })
-                        EmitExpr(m.Args[0], sb, ExprContext.Normal);
+                        sb.Append(Word(m.Args[0], kinds));
                     else
                         sb.Append("0");
                     sb.Append(" ");
                     if (m.Args[1] is not Literal { Value: null })
-                        EmitExpr(m.Args[1], sb, ExprContext.Normal);
+                        sb.Append(Word(m.Args[1], kinds));
                     else
                         sb.Append("end");
                     sb.Append("]");
@@ -344,243 +546,84 @@ public sealed class TclEmitter
                 {
                     // Array/string indexing: array[index] -> lindex $array $index or string index
                     sb.Append("[lindex ");
-                    EmitExpr(m.Target, sb, ExprContext.Normal);
+                    sb.Append(Word(m.Target, kinds));
                     sb.Append(" ");
-                    EmitExpr(m.Args[0], sb, ExprContext.Normal);
+                    sb.Append(Word(m.Args[0], kinds));
                     sb.Append("]");
                 }
+                // Check for known Python standard library patterns
+                // platform.system() -> $::tcl_platform(os)
+                else if (m.Target is Variable { Name: "platform" } && m.MethodName == "system")
+                {
+                    sb.Append("$::tcl_platform(os)");
+                }
+                // sys.platform -> $::tcl_platform(platform)
+                else if (m.Target is Variable { Name: "sys" } && m.MethodName == "platform")
+                {
+                    sb.Append("$::tcl_platform(platform)");
+                }
+                else if (Builtins.Lower(m, kinds, o => Word(o, kinds)) is { } method)
+                {
+                    sb.Append(method);
+                }
+                // Default: treat as namespace call (may not work but preserve attempt)
                 else
                 {
-                    // Check for known Python standard library patterns
-                    // platform.system() -> $::tcl_platform(os)
-                    if (m.Target is Variable { Name: "platform" } && m.MethodName == "system")
-                    {
-                        sb.Append("$::tcl_platform(os)");
-                    }
-                    // sys.platform -> $::tcl_platform(platform)
-                    else if (m.Target is Variable { Name: "sys" } && m.MethodName == "platform")
-                    {
-                        sb.Append("$::tcl_platform(platform)");
-                    }
-                    // str.startswith() -> [string match]
-                    else if (m.MethodName == "startswith")
-                    {
-                        sb.Append("[string match ");
-                        // For string literals, we need to build the pattern with asterisk inside quotes
-                        if (m.Args[0] is Literal { Value: string literalStr })
-                        {
-                            // Escape backslashes in the literal for Tcl
-                            var escaped = literalStr.Replace("\\", "\\\\");
-                            sb.Append($"\"{escaped}*\"");
-                        }
-                        else
-                        {
-                            // For expressions, concatenate with asterisk
-                            sb.Append("\"");
-                            EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                            sb.Append("*\"");
-                        }
-                        sb.Append(" ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.endswith() -> [string match]
-                    else if (m.MethodName == "endswith")
-                    {
-                        sb.Append("[string match ");
-                        // For string literals, we need to build the pattern with asterisk inside quotes
-                        if (m.Args[0] is Literal { Value: string literalStr })
-                        {
-                            // Escape backslashes in the literal for Tcl
-                            var escaped = literalStr.Replace("\\", "\\\\");
-                            sb.Append($"\"*{escaped}\"");
-                        }
-                        else
-                        {
-                            // For expressions, concatenate with asterisk
-                            sb.Append("\"*");
-                            EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                            sb.Append("\"");
-                        }
-                        sb.Append(" ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.split() -> [split]
-                    else if (m.MethodName == "split")
-                    {
-                        sb.Append("[split ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        if (m.Args.Count > 0)
-                        {
-                            sb.Append(" ");
-                            EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                        }
-                        sb.Append("]");
-                    }
-                    // str.join() -> [join]
-                    else if (m.MethodName == "join")
-                    {
-                        sb.Append("[join ");
-                        EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                        sb.Append(" ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.upper() -> [string toupper]
-                    else if (m.MethodName == "upper")
-                    {
-                        sb.Append("[string toupper ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.lower() -> [string tolower]
-                    else if (m.MethodName == "lower")
-                    {
-                        sb.Append("[string tolower ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.replace() -> [string map]
-                    else if (m.MethodName == "replace")
-                    {
-                        sb.Append("[string map {");
-                        EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                        sb.Append(" ");
-                        EmitExpr(m.Args[1], sb, ExprContext.Normal);
-                        sb.Append("} ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.strip() -> [string trim]
-                    else if (m.MethodName == "strip")
-                    {
-                        sb.Append("[string trim ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // str.encode() -> bytes (just return as-is for now)
-                    else if (m.MethodName == "encode")
-                    {
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                    }
-                    // bytes.decode() -> string (just return as-is for now)
-                    else if (m.MethodName == "decode")
-                    {
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                    }
-                    // dict.items() -> Build a list compatible with foreach {k v} iteration
-                    // Returns alternating key-value pairs in a flat list
-                    else if (m.MethodName == "items")
-                    {
-                        // Use foreach to build alternating key-value list
-                        sb.Append("[set _items [list]; foreach k [dict keys ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("] {lappend _items $k [dict get ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append(" $k]}; set _items]");
-                    }
-                    // dict.keys() -> [dict keys]
-                    else if (m.MethodName == "keys")
-                    {
-                        sb.Append("[dict keys ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        sb.Append("]");
-                    }
-                    // list.append() -> [lappend varname value]
-                    else if (m.MethodName == "append")
-                    {
-                        sb.Append("[lappend ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        if (m.Args.Count > 0)
-                        {
-                            sb.Append(" ");
-                            EmitExpr(m.Args[0], sb, ExprContext.Normal);
-                        }
-                        sb.Append("]");
-                    }
-                    // Default: treat as namespace call (may not work but preserve attempt)
-                    else
-                    {
-                        sb.Append("::");
-                        sb.Append(m.MethodName);
-                        sb.Append(" ");
-                        EmitExpr(m.Target, sb, ExprContext.Normal);
-                        for (int j = 0; j < m.Args.Count; j++)
-                        {
-                            sb.Append(" ");
-                            EmitExpr(m.Args[j], sb, ExprContext.Normal);
-                        }
-                    }
+                    sb.Append("::");
+                    sb.Append(m.MethodName);
+                    sb.Append(" ");
+                    sb.Append(Word(m.Target, kinds));
+                    foreach (var arg in m.Args)
+                        sb.Append(' ').Append(Word(arg, kinds));
                 }
                 return;
 
             case StringInterpolation s:
-                sb.Append("\"");
-                foreach (var part in s.Parts)
-                {
-                    if (part is StringPartLiteral lit)
-                        sb.Append(EscapeString(lit.Value));
-                    else if (part is StringPartVariable var)
-                        sb.Append("$").Append(var.VarName);
-                }
-                sb.Append("\"");
+                EmitInterpolation(s, sb, kinds);
                 return;
 
             case ListComprehension lc:
-                sb.Append("[list");
-                sb.Append(" ");
-                sb.Append("[foreach ");
-                sb.Append(lc.LoopVar);
-                sb.Append(" ");
-                EmitExpr(lc.IterableExpr, sb, ExprContext.Normal);
-                sb.Append(" {");
-                if (lc.FilterCondition != null)
-                {
-                    sb.Append("if {");
-                    EmitExpr(lc.FilterCondition, sb, ExprContext.Normal);
-                    sb.Append("} {");
-                }
-                sb.Append("lappend _result ");
-                EmitExpr(lc.Element, sb, ExprContext.Normal);
-                if (lc.FilterCondition != null)
-                    sb.Append("}");
-                sb.Append("}]");
+            {
+                // lmap collects the body's result for each item and continue skips one;
+                // it sets nothing but the loop variables.
+                var lmap = new StringBuilder("lmap ");
+                lmap.Append(LoopVars(lc.LoopVar)).Append(' ').Append(Word(lc.IterableExpr, kinds));
+                lmap.Append(" {").Append(Filter(lc.FilterCondition, kinds)).Append(Command(lc.Element, kinds)).Append('}');
+                sb.Append(kinds.Shadows(lc) ? InOwnFrame(lc, lmap.ToString()) : $"[{lmap}]");
                 return;
+            }
 
             case DictComprehension dc:
-                // Tcl dict comprehension: Initialize dict, foreach to populate, then return it
-                sb.Append("[dict create {*}[set _result [dict create]; foreach {");
-                // Handle tuple unpacking for loop vars like "k,v"
-                sb.Append(dc.LoopVar.Replace(",", " "));
-                sb.Append("} ");
-                EmitExpr(dc.IterableExpr, sb, ExprContext.Normal);
-                sb.Append(" {");
-                if (dc.FilterCondition != null)
-                {
-                    sb.Append("if {");
-                    EmitExpr(dc.FilterCondition, sb, ExprContext.Normal);
-                    sb.Append("} {");
-                }
-                sb.Append("dict set _result ");
-                EmitExpr(dc.KeyExpr, sb, ExprContext.Normal);
-                sb.Append(" ");
-                EmitExpr(dc.ValueExpr, sb, ExprContext.Normal);
-                if (dc.FilterCondition != null)
-                    sb.Append("}");
-                sb.Append("}; set _result]]");
+            {
+                // Filled in one pass in a local of its own; an assignment fills its
+                // target directly (see VarAssignment).
+                var dict = "_dict_" + string.Join("_", SplitLoopVars(dc.LoopVar));
+                var fill = new StringBuilder("set ").Append(dict).Append(" [dict create]; ");
+                EmitDictLoop(dc, dict, fill, kinds);
+                fill.Append("; set ").Append(dict);
+                sb.Append(kinds.Shadows(dc) ? InOwnFrame(dc, fill.ToString()) : $"[{fill}]");
                 return;
+            }
 
             case LambdaExpr lam:
-                sb.Append("lambda");
-                foreach (var param in lam.Parameters)
+            {
+                // A command prefix around an apply term: call it with {*}$f args. The
+                // term is a literal, so Tcl compiles the body once and keeps the bytecode
+                // on it; an apply body sees none of the caller's variables, so those it
+                // reads are bound as leading arguments when the lambda is created.
+                var captured = CapturedVariables(lam.Parameters, lam.Body);
+                var term = $"{{{TclList(captured.Concat(lam.Parameters).ToList())} {{{Command(lam.Body, kinds)}}}}}";
+                if (captured.Count == 0)
                 {
-                    sb.Append(" ").Append(param);
+                    sb.Append("{apply ").Append(term).Append('}');
+                    return;
                 }
-                sb.Append(" {");
-                EmitExpr(lam.Body, sb, ExprContext.Normal);
-                sb.Append("}");
+                sb.Append("[list apply ").Append(term);
+                foreach (var name in captured)
+                    sb.Append(" $").Append(name);
+                sb.Append(']');
                 return;
+            }
 
             case Intrinsic intrinsic:
                 // Handle intrinsic operations like getattr/setattr
@@ -589,7 +632,7 @@ public sealed class TclEmitter
                 for (int j = 0; j < intrinsic.Args.Count; j++)
                 {
                     if (j > 0) sb.Append(" ");
-                    EmitExpr(intrinsic.Args[j], sb, ExprContext.Normal);
+                    sb.Append(Word(intrinsic.Args[j], kinds));
                 }
                 return;
 
@@ -598,19 +641,407 @@ public sealed class TclEmitter
         }
     }
 
-    private static string FormatLiteral(object? value) =>
+    // switch -exact, which finds the arm by hashing the subject once rather than
+    // comparing it with each label in turn.
+    private static void EmitSwitch(SwitchChains.Chain chain, StringBuilder sb, int indent,
+        SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds)
+    {
+        var pad = new string(' ', indent * 4);
+        sb.AppendLine($"{pad}switch -exact -- {Word(chain.Subject, kinds)} {{");
+        foreach (var (labels, body) in chain.Cases)
+        {
+            // Labels sharing a body fall through to it with -
+            for (int j = 0; j < labels.Count - 1; j++)
+                sb.AppendLine($"{pad}    {FormatLiteral(labels[j])} -");
+            sb.AppendLine($"{pad}    {FormatLiteral(labels[^1])} {{");
+            foreach (var s in body)
+                EmitStmt(s, sb, indent + 2, symbols, accumulation, kinds);
+            sb.AppendLine($"{pad}    }}");
+        }
+        // A last label spelled default would be taken for the default arm
+        if (chain.Default != null || chain.Cases[^1].Labels[^1] is "default")
+        {
+            sb.AppendLine($"{pad}    default {{");
+            foreach (var s in chain.Default ?? Array.Empty<Stmt>())
+                EmitStmt(s, sb, indent + 2, symbols, accumulation, kinds);
+            sb.AppendLine($"{pad}    }}");
+        }
+        sb.AppendLine($"{pad}}}");
+    }
+
+    // while 1 over a coroutine's values, into loopVar (unpacked with lassign when it is
+    // several names). A call that comes back with the command gone was the coroutine
+    // returning, not yielding, so the loop ends there.
+    private static void EmitGeneratorLoop(string generator, string loopVar, IReadOnlyList<Stmt> body,
+        StringBuilder sb, int indent, SymbolTable symbols, StringAccumulation accumulation, ValueKinds kinds)
+    {
+        var pad = new string(' ', indent * 4);
+        var vars = SplitLoopVars(loopVar).ToList();
+        sb.AppendLine($"{pad}while 1 {{");
+        sb.AppendLine(vars.Count == 1
+            ? $"{pad}    set {vars[0]} [${generator}]"
+            : $"{pad}    lassign [${generator}] {string.Join(" ", vars)}");
+        sb.AppendLine($"{pad}    if {{[namespace which ${generator}] eq \"\"}} break");
+        foreach (var s in body)
+            EmitStmt(s, sb, indent + 1, symbols, accumulation, kinds);
+        sb.AppendLine($"{pad}}}");
+    }
+
+    // for {set i start} {$i < stop} {incr i step}, without the list range() would
+    // build. A bound the body may change is read once, into _stop_i or _step_i, as
+    // Python evaluates range()'s arguments once.
+    private static void EmitRangeLoop(CountedLoops.Range range, IReadOnlyList<Stmt> body, StringBuilder sb, ValueKinds kinds)
+    {
+        var init = new StringBuilder($"set {range.Var} {Bound(range.Start, kinds)}");
+        string Operand(Expr bound, string prefix)
+        {
+            if (CountedLoops.IsStable(bound, body))
+                return Bound(bound, kinds, ExprContext.InsideExpr);
+            var name = $"_{prefix}_{range.Var}";
+            init.Append($"; set {name} {Bound(bound, kinds)}");
+            return "$" + name;
+        }
+
+        var stop = Operand(range.Stop, "stop");
+        var step = range.Step is Literal { Value: 1 } ? null : Operand(range.Step, "step");
+        var i = "$" + range.Var;
+        var test = range.Direction switch
+        {
+            > 0 => $"{i} < {stop}",
+            < 0 => $"{i} > {stop}",
+            _ => $"{step} > 0 ? {i} < {stop} : {i} > {stop}",
+        };
+        sb.Append($"for {{{init}}} {{{test}}} {{incr {range.Var}{(step == null ? "" : " " + step)}}}");
+    }
+
+    // A loop bound: a negative literal is written as one (-2, not [expr {- 2}])
+    private static string Bound(Expr bound, ValueKinds kinds, ExprContext context = ExprContext.Normal)
+    {
+        if (bound is UnaryOp { Op: "-", Operand: Literal { Value: var v } l } && NumericLiteral.IsNumber(v))
+            return "-" + FormatLiteral(v, l.Spelling);
+        if (context == ExprContext.Normal)
+            return Word(bound, kinds);
+        var sb = new StringBuilder();
+        EmitExpr(bound, sb, kinds, context);
+        return sb.ToString();
+    }
+
+    // enumerate's index before the first item, one less than its start
+    private static string BeforeStart(Expr start, ValueKinds kinds) =>
+        start is Literal { Value: var v } && NumericLiteral.IsInteger(v)
+            ? ((v is BigInteger b ? b : Convert.ToInt64(v)) - 1).ToString(CultureInfo.InvariantCulture)
+            : $"[expr {{{Bound(start, kinds, ExprContext.InsideExpr)} - 1}}]";
+
+    // A quoted word with each field substituted in place, or, when any field has a
+    // format spec, a single [format] call.
+    private static void EmitInterpolation(StringInterpolation s, StringBuilder sb, ValueKinds kinds)
+    {
+        if (s.Parts.Any(p => p is StringPartExpr { FormatSpec: not null }))
+        {
+            var args = new StringBuilder();
+            sb.Append("[format \"");
+            foreach (var part in s.Parts)
+            {
+                switch (part)
+                {
+                    case StringPartLiteral lit:
+                        sb.Append(EscapeString(lit.Value).Replace("%", "%%"));
+                        break;
+                    case StringPartVariable v:
+                        sb.Append("%s");
+                        args.Append(" $").Append(v.VarName);
+                        break;
+                    case StringPartExpr { Conversion: 'r' or 'a' } e:
+                        sb.Append(PrintfSpec.Require(e.FormatSpec, 's'));
+                        args.Append(" \"").Append(Repr(e.Expr, kinds)).Append('"');
+                        break;
+                    case StringPartExpr e:
+                        sb.Append(PrintfSpec.Require(e.FormatSpec, PrintfSpec.DefaultType(e.Expr)));
+                        args.Append(' ').Append(Word(e.Expr, kinds));
+                        break;
+                }
+            }
+            sb.Append('"').Append(args).Append(']');
+            return;
+        }
+
+        sb.Append('"');
+        for (int j = 0; j < s.Parts.Count; j++)
+        {
+            switch (s.Parts[j])
+            {
+                case StringPartLiteral lit:
+                    sb.Append(EscapeString(lit.Value));
+                    break;
+                case StringPartVariable v:
+                    AppendSubstitution(v.VarName, j + 1 < s.Parts.Count ? s.Parts[j + 1] : null, sb);
+                    break;
+                case StringPartExpr { Conversion: 'r' or 'a' } e:
+                    sb.Append(Repr(e.Expr, kinds));
+                    break;
+                case StringPartExpr { Expr: Variable v }:
+                    AppendSubstitution(v.Name, j + 1 < s.Parts.Count ? s.Parts[j + 1] : null, sb);
+                    break;
+                case StringPartExpr { Expr: Literal { Value: string text } }:
+                    sb.Append(EscapeString(text));
+                    break;
+                case StringPartExpr e:
+                    sb.Append(Word(e.Expr, kinds));
+                    break;
+            }
+        }
+        sb.Append('"');
+    }
+
+    // A field's !r (or !a), as text for inside a quoted word: a string in single
+    // quotes, a number as it is. A value of unknown kind is tested when it runs, so
+    // "5" comes out like 5. Python's escaping of quotes inside the string isn't
+    // reproduced.
+    private static string Repr(Expr expr, ValueKinds kinds)
+    {
+        if (expr is Literal { Value: string text })
+            return $"'{EscapeString(text)}'";
+        if (expr is Literal { Value: var v } && NumericLiteral.IsNumber(v))
+            return Word(expr, kinds);
+        var kind = kinds.KindOf(expr);
+        if (kind == ValueKind.String)
+            return $"'{Word(expr, kinds)}'";
+        if (kind != ValueKind.Unknown)
+            throw new NotSupportedException($"Tcl backend has no repr for a {kind.ToString().ToLowerInvariant()}.");
+        const string test = "expr {[string is double -strict $v] ? $v : \"'$v'\"}";
+        return expr is Variable variable
+            ? $"[{test.Replace("$v", "$" + variable.Name)}]"
+            : $"[apply {{{{v}} {{{test}}}}} {Word(expr, kinds)}]";
+    }
+
+    private static IEnumerable<string> SplitLoopVars(string loopVar) =>
+        loopVar.Trim().TrimStart('(').TrimEnd(')').Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries);
+
+    // x, or {k v} for a comprehension over pairs
+    private static string LoopVars(string loopVar) => TclList(SplitLoopVars(loopVar).ToList());
+
+    private static string TclList(IReadOnlyList<string> names) =>
+        names.Count == 1 ? names[0] : "{" + string.Join(" ", names) + "}";
+
+    // The names body reads but doesn't bind, in order of first use.
+    private static List<string> CapturedVariables(IEnumerable<string> parameters, Expr body)
+    {
+        var bound = new HashSet<string>(parameters);
+        foreach (var node in IrWalker.Descendants(body))
+        {
+            if (node is ListComprehension lc)
+                bound.UnionWith(SplitLoopVars(lc.LoopVar));
+            else if (node is DictComprehension dc)
+                bound.UnionWith(SplitLoopVars(dc.LoopVar));
+            else if (node is LambdaExpr inner)
+                bound.UnionWith(inner.Parameters);
+        }
+
+        var captured = new List<string>();
+        foreach (var node in IrWalker.Descendants(body))
+        {
+            var name = node switch { Variable v => v.Name, StringPartVariable p => p.VarName, _ => null };
+            if (name != null && !bound.Contains(name) && !captured.Contains(name))
+                captured.Add(name);
+        }
+        return captured;
+    }
+
+    // script, which computes comprehension, run by apply in a frame of its own, so the
+    // loop variables it sets leave the caller's variables of the same name alone. The
+    // variables it reads are passed in, as for a lambda.
+    private static string InOwnFrame(Expr comprehension, string script)
+    {
+        var captured = CapturedVariables(Array.Empty<string>(), comprehension);
+        var sb = new StringBuilder("[apply {");
+        sb.Append(TclList(captured)).Append(" {").Append(script).Append("}}");
+        foreach (var name in captured)
+            sb.Append(" $").Append(name);
+        return sb.Append(']').ToString();
+    }
+
+    // foreach over the items with dict set into dict, on one line
+    private static void EmitDictLoop(DictComprehension dc, string dict, StringBuilder sb, ValueKinds kinds)
+    {
+        sb.Append("foreach ").Append(LoopVars(dc.LoopVar)).Append(' ').Append(Word(dc.IterableExpr, kinds));
+        sb.Append(" {").Append(Filter(dc.FilterCondition, kinds)).Append("dict set ").Append(dict).Append(' ');
+        sb.Append(Word(dc.KeyExpr, kinds)).Append(' ').Append(Word(dc.ValueExpr, kinds)).Append('}');
+    }
+
+    // A comprehension's if clause, as a continue past the items it rejects
+    private static string Filter(Expr? condition, ValueKinds kinds)
+    {
+        if (condition == null)
+            return "";
+        var word = Word(condition, kinds);
+        return word.StartsWith("[expr {") && word.EndsWith("}]") && IsBracketed(word)
+            ? $"if {{!({word[7..^2]})}} continue; "
+            : $"if {{!{word}}} continue; ";
+    }
+
+    // An expression as the last command of a script, whose result is its value
+    private static string Command(Expr expr, ValueKinds kinds)
+    {
+        if (expr is Variable v)
+            return "set " + v.Name;
+        var word = Word(expr, kinds);
+        return IsBracketed(word) ? word[1..^1] : "string cat " + word;
+    }
+
+    // $name, or ${name} where the text after it would otherwise read as part of the name
+    private static void AppendSubstitution(string name, StringPart? next, StringBuilder sb)
+    {
+        bool braced = next is StringPartLiteral { Value: [var c, ..] } && (char.IsLetterOrDigit(c) || c is '_' or ':' or '(');
+        sb.Append(braced ? $"${{{name}}}" : $"${name}");
+    }
+
+    // An expression as one Tcl word. Calls, which EmitExpr writes bare as a command,
+    // are wrapped in a command substitution; those written as a value already
+    // ($::tcl_platform(os), or a lowered .copy()) are left as they are.
+    private static string Word(Expr expr, ValueKinds kinds)
+    {
+        var word = new StringBuilder();
+        EmitExpr(expr, word, kinds, ExprContext.Normal);
+        var text = word.ToString();
+        bool command = text.Length > 0 && (char.IsLetter(text[0]) || text[0] is '_' or ':' || text.StartsWith("{*}"));
+        return expr is FunctionCall or MethodCall or Intrinsic && command ? $"[{text}]" : text;
+    }
+
+    // Whether text is a single [...] substitution: the first bracket closes at the end.
+    private static bool IsBracketed(string text)
+    {
+        if (text.Length < 2 || text[0] != '[')
+            return false;
+        int depth = 0;
+        for (int j = 0; j < text.Length; j++)
+        {
+            if (text[j] == '\\')
+                j++;
+            else if (text[j] == '[')
+                depth++;
+            else if (text[j] == ']' && --depth == 0)
+                return j == text.Length - 1;
+        }
+        return false;
+    }
+
+    // The values left in generator @0, as a list. The coroutine is gone once it has
+    // returned, as in the for loop over one.
+    private const string Drained =
+        "[apply {g {set items {}; while 1 {set item [$g]; if {[namespace which $g] eq \"\"} break; lappend items $item}; return $items}} @0]";
+
+    // Python's builtins and methods as Tcl commands (see LoweringTable). A dict is
+    // kept as a Tcl dict, a hash table, so a lookup or membership test is O(1);
+    // `in` on a list is left to expr's own in.
+    private static readonly LoweringTable Builtins = new()
+    {
+        // Without a kind, len and in keep the generic emission: no one command is
+        // right for a string, a list and a dict alike
+        { "list:len", "[llength @0]" },
+        { "str:len", "[string length @0]" },
+        { "dict:len", "[dict size @0]" },
+        { "list:in", "[expr {@0 in @1}]" },
+        { "list:not in", "[expr {@0 ni @1}]" },
+        { "dict:in", "[dict exists @1 @0]" },
+        { "dict:not in", "[expr {![dict exists @1 @0]}]" },
+        { "str:in", "[expr {[string first @0 @1] >= 0}]" },
+        { "str:not in", "[expr {[string first @0 @1] < 0}]" },
+        { "str/1", "@0" },
+        { "int/1", "[expr {int(@0)}]" },
+        { "float/1", "[expr {double(@0)}]" },
+        { "abs/1", "[expr {abs(@0)}]" },
+        { "min/1", "[tcl::mathfunc::min {*}@0]" },
+        { "min/2", "[expr {min(@0, @1)}]" },
+        { "max/1", "[tcl::mathfunc::max {*}@0]" },
+        { "max/2", "[expr {max(@0, @1)}]" },
+        { "sum/1", "[tcl::mathop::+ {*}@0]" },
+        { "list:list/1", "@0" },
+        { "str:list/1", "[split @0 {}]" },
+        { "dict:list/1", "[dict keys @0]" },
+        // A generator is a coroutine handle; these take the values it yields
+        { "gen:list/1", Drained },
+        { "gen:sum/1", "[tcl::mathop::+ {*}" + Drained + "]" },
+        { "gen:min/1", "[tcl::mathfunc::min {*}" + Drained + "]" },
+        { "gen:max/1", "[tcl::mathfunc::max {*}" + Drained + "]" },
+        { "ord/1", "[scan @0 %c]" },
+        { "chr/1", "[format %c @0]" },
+        { "dict:.get/1", "[dict getdef @0 @1 {}]" },
+        { "dict:.get/2", "[dict getdef @0 @1 @2]" },
+        { "dict:.update/1", "[set #0 [dict merge @0 @1]]" },
+        // A Tcl dict is already the flat key/value list foreach {k v} walks
+        { ".items/0", "@0" },
+        { ".keys/0", "[dict keys @0]" },
+        { ".values/0", "[dict values @0]" },
+        // Tcl values are immutable; a copy is the same value
+        { ".copy/0", "@0" },
+        { ".append/1", "[lappend #0 @1]" },
+        { ".extend/1", "[lappend #0 {*}@1]" },
+        { ".insert/2", "[set #0 [linsert @0 @1 @2]]" },
+        { "list:.index/1", "[lsearch -exact @0 @1]" },
+        { ".startswith/1", "[string equal -length [string length @1] @1 @0]" },
+        { ".endswith/1", "[string equal [string range @0 end-[expr {[string length @1] - 1}] end] @1]" },
+        { ".find/1", "[string first @1 @0]" },
+        { ".rfind/1", "[string last @1 @0]" },
+        { ".split/0", @"[regexp -all -inline {\S+} @0]" },
+        { ".split/1", "[split @0 @1]" },
+        { ".join/1", "[join @1 @0]" },
+        { ".upper/0", "[string toupper @0]" },
+        { ".lower/0", "[string tolower @0]" },
+        { ".strip/0", "[string trim @0]" },
+        { ".strip/1", "[string trim @0 @1]" },
+        { ".lstrip/0", "[string trimleft @0]" },
+        { ".lstrip/1", "[string trimleft @0 @1]" },
+        { ".rstrip/0", "[string trimright @0]" },
+        { ".rstrip/1", "[string trimright @0 @1]" },
+        { ".replace/2", "[string map [list @1 @2] @0]" },
+        { ".isdigit/0", "[string is digit -strict @0]" },
+        { ".isalpha/0", "[string is alpha -strict @0]" },
+        { ".isspace/0", "[string is space -strict @0]" },
+        // Strings and bytes are both byte-clean Tcl strings
+        { ".encode", "@0" },
+        { ".decode", "@0" },
+    };
+
+    // Python operators spelled differently in expr. Integer / already floors in Tcl.
+    private static readonly Dictionary<string, string> Operators = new()
+    {
+        ["and"] = "&&",
+        ["or"] = "||",
+        ["not"] = "!",
+        ["not in"] = "ni",
+        ["is"] = "==",
+        ["is not"] = "!=",
+        ["//"] = "/",
+    };
+
+    // Binary operators that share a precedence level in Tcl's expr. All of them are
+    // left-associative, as is any other operator chained with itself, except **.
+    private static readonly string[][] PrecedenceLevels =
+    {
+        new[] { "*", "/", "%" },
+        new[] { "+", "-" },
+        new[] { "<<", ">>" },
+        new[] { "<", ">", "<=", ">=" },
+        new[] { "==", "!=" },
+    };
+
+    private static bool SamePrecedence(string op, string other) =>
+        op == other ? op != "**" : PrecedenceLevels.Any(level => level.Contains(op) && level.Contains(other));
+
+    // str * n and n * str, emitted as [string repeat] rather than inside an expr
+    private static bool IsStringRepeat(BinaryOp b) =>
+        b.Op == "*" && (b.Left is Literal { Value: string } || b.Right is Literal { Value: string });
+
+    private static string FormatLiteral(object? value, string? spelling = null) =>
         value switch
         {
             null => "\"\"",
             string s => $"\"{EscapeString(s)}\"",
             bool b => b ? "1" : "0",
-            int i => i.ToString(),
-            long l => l.ToString(),
-            float f => f.ToString(System.Globalization.CultureInfo.InvariantCulture),
-            double d => d.ToString(System.Globalization.CultureInfo.InvariantCulture),
+            _ when NumericLiteral.IsNumber(value) => NumericLiteral.Format(value, spelling, octalAndBinary: true),
             _ => $"\"{EscapeString(value.ToString() ?? "")}\""
         };
 
     private static string EscapeString(string s) =>
-        s.Replace("\\", "\\\\").Replace("\"", "\\\"").Replace("$", "\\$");
+        s.Replace("\\", "\\\\").Replace("\"", "\\\"").Replace("$", "\\$").Replace("[", "\\[").Replace("]", "\\]");
 }
@@ -1,16 +1,73 @@
 using System.Text.RegularExpressions;
 using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
 
 namespace PLT.CORE.Frontends.CSharp;
 
 public static class CSharpFrontend
 {
-    public static IrProgram Parse(string source)
+    // Below this size method bodies are parsed on the calling thread, as for Python.
+    public const int ParallelThreshold = 32 * 1024;
+
+    public static IrProgram Parse(string source) =>
+        Parse(source, parallel: ShouldParallelize(source.Length));
+
+    public static IrProgram Parse(string source, bool parallel) =>
+        Parse(new StringText(source), parallel);
+
+    // Lexes the file straight out of a read-only memory mapping; see PythonFrontend.ParseFile.
+    public static IrProgram ParseFile(string path) =>
+        ParseFile(path, parallel: ShouldParallelize(new FileInfo(path).Length));
+
+    public static IrProgram ParseFile(string path, bool parallel)
     {
-        var lexer = new CSharpLexer(source);
-        var tokens = lexer.Tokenize();
-        var parser = new CSharpParser(tokens);
-        return parser.ParseProgram();
+        if (!MappedSourceFile.IsUtf8Compatible(path))
+            return Parse(File.ReadAllText(path), parallel);
+
+        using var file = new MappedSourceFile(path);
+        return Parse(file.Text, parallel);
+    }
+
+    private static bool ShouldParallelize(long length) =>
+        length >= ParallelThreshold && Environment.ProcessorCount > 1;
+
+    private static IrProgram Parse<TText>(TText source, bool parallel) where TText : struct, ISourceText
+    {
+        List<Token> tokens;
+        using (var phase = PltTelemetry.StartPhase("lex.cs"))
+        {
+            var lexer = new CSharpLexer<TText>(source);
+            tokens = lexer.Tokenize();
+            phase.RecordTokens(tokens.Count);
+        }
+
+        using (var phase = PltTelemetry.StartPhase("parse.cs"))
+        {
+            IrProgram program;
+            if (parallel)
+            {
+                // Top-level code is parsed while member boundaries are indexed; method
+                // bodies are parsed concurrently and stitched back in declaration order.
+                // If anything fails, the sequential parse is rerun so errors are
+                // reported exactly as before.
+                try
+                {
+                    var segments = new CSharpParser(tokens).ParseSegments(deferBodies: true);
+                    phase.SetTag("methods", segments.Count(s => s.MethodName != null));
+                    program = new IrProgram(CSharpSegment.Collect(segments, parallel: true));
+                }
+                catch (Exception)
+                {
+                    program = new CSharpParser(tokens).ParseProgram();
+                }
+            }
+            else
+            {
+                program = new CSharpParser(tokens).ParseProgram();
+            }
+            phase.RecordIrNodes(program);
+            return program;
+        }
     }
 }
 
@@ -63,15 +120,15 @@ internal enum TokenType
 
 internal record Token(TokenType Type, string Value, int Line, int Col);
 
-internal class CSharpLexer
+internal class CSharpLexer<TText> where TText : struct, ISourceText
 {
-    private readonly string _source;
+    private readonly TText _source;
     private int _position = 0;
     private int _line = 1;
     private int _col = 1;
     private readonly List<Token> _tokens = new();
 
-    public CSharpLexer(string source)
+    public CSharpLexer(TText source)
     {
         _source = source;
     }
@@ -120,7 +177,7 @@ internal class CSharpLexer
                 continue;
             }
 
-            if (char.IsLetter(ch) || ch == '_' || ch == '@')
+            if (ch == '_' || ch == '@' || _source.IsLetter(_position, out _))
             {
                 ReadIdentifierOrKeyword();
                 continue;
@@ -177,59 +234,104 @@ internal class CSharpLexer
     private void ReadString()
     {
         _position++; // skip opening "
-        var sb = new System.Text.StringBuilder();
+
+        // Unescaped text is copied in runs straight from the source.
+        System.Text.StringBuilder? sb = null;
+        int runStart = _position;
 
         while (_position < _source.Length && _source[_position] != '"')
         {
             if (_source[_position] == '\\' && _position + 1 < _source.Length)
             {
+                sb ??= new System.Text.StringBuilder();
+                sb.Append(_source.Slice(runStart, _position - runStart));
                 _position++;
                 var escaped = _source[_position];
-                sb.Append(escaped switch
+                if (escaped < 0x80)
                 {
-                    'n' => '\n',
-                    't' => '\t',
-                    'r' => '\r',
-                    '\\' => '\\',
-                    '"' => '"',
-                    _ => escaped
-                });
-            }
-            else
-            {
-                sb.Append(_source[_position]);
+                    sb.Append(escaped switch
+                    {
+                        'n' => '\n',
+                        't' => '\t',
+                        'r' => '\r',
+                        '\\' => '\\',
+                        '"' => '"',
+                        _ => escaped
+                    });
+                    runStart = _position + 1;
+                }
+                else
+                {
+                    runStart = _position;
+                }
             }
             _position++;
             _col++;
         }
 
+        var tail = _source.Slice(runStart, _position - runStart);
         if (_position < _source.Length) _position++; // closing "
-        _tokens.Add(new Token(TokenType.STRING, sb.ToString(), _line, _col));
+        _tokens.Add(new Token(TokenType.STRING, sb == null ? tail : sb.Append(tail).ToString(), _line, _col));
     }
 
     private void ReadNumber()
     {
-        var sb = new System.Text.StringBuilder();
-        while (_position < _source.Length && (char.IsDigit(_source[_position]) || _source[_position] == '.'))
+        int start = _position;
+        if (_source[_position] == '0' && _position + 1 < _source.Length && _source[_position + 1] is 'x' or 'X' or 'b' or 'B')
+        {
+            _position += 2;
+            _col += 2;
+            while (_position < _source.Length && (char.IsAsciiHexDigit(_source[_position]) || _source[_position] == '_'))
+            {
+                _position++;
+                _col++;
+            }
+        }
+        else
+        {
+            while (_position < _source.Length && (char.IsDigit(_source[_position]) || _source[_position] == '.' || _source[_position] == '_'))
+            {
+                _position++;
+                _col++;
+            }
+            // Exponent, only when digits follow (1e5, 2.5E-3)
+            if (_position + 1 < _source.Length && _source[_position] is 'e' or 'E')
+            {
+                int digits = _source[_position + 1] is '+' or '-' ? _position + 2 : _position + 1;
+                if (digits < _source.Length && char.IsDigit(_source[digits]))
+                {
+                    _col += digits - _position;
+                    _position = digits;
+                    while (_position < _source.Length && char.IsDigit(_source[_position]))
+                    {
+                        _position++;
+                        _col++;
+                    }
+                }
+            }
+        }
+        // Type suffix: 10L, 3u, 1.5f, 2m
+        while (_position < _source.Length && _source[_position] is 'l' or 'L' or 'u' or 'U' or 'f' or 'F' or 'd' or 'D' or 'm' or 'M')
         {
-            sb.Append(_source[_position]);
             _position++;
             _col++;
         }
-        _tokens.Add(new Token(TokenType.NUMBER, sb.ToString(), _line, _col));
+        _tokens.Add(new Token(TokenType.NUMBER, _source.Slice(start, _position - start), _line, _col));
     }
 
     private void ReadIdentifierOrKeyword()
     {
-        var sb = new System.Text.StringBuilder();
-        while (_position < _source.Length && (char.IsLetterOrDigit(_source[_position]) || _source[_position] == '_'))
+        int start = _position;
+        while (_position < _source.Length)
         {
-            sb.Append(_source[_position]);
-            _position++;
+            int width = 1;
+            if (_source[_position] != '_' && !_source.IsLetterOrDigit(_position, out width))
+                break;
+            _position += width;
             _col++;
         }
 
-        var text = sb.ToString();
+        var text = _source.Slice(start, _position - start);
         var type = text switch
         {
             "true" or "false" => TokenType.BOOL,
@@ -245,26 +347,25 @@ internal class CSharpLexer
     {
         if (_position + 1 < _source.Length)
         {
-            var twoChar = _source.Substring(_position, 2);
-            var type = twoChar switch
-            {
-                "==" => TokenType.EQEQ,
-                "!=" => TokenType.NOTEQ,
-                "<=" => TokenType.LTEQ,
-                ">=" => TokenType.GTEQ,
-                "&&" => TokenType.AND,
-                "||" => TokenType.OR,
-                "+=" => TokenType.PLUSEQ,
-                "-=" => TokenType.MINUSEQ,
-                "*=" => TokenType.STAREQ,
-                "/=" => TokenType.SLASHEQ,
-                "=>" => TokenType.ARROW,
+            var type = (_source[_position], _source[_position + 1]) switch
+            {
+                ('=', '=') => TokenType.EQEQ,
+                ('!', '=') => TokenType.NOTEQ,
+                ('<', '=') => TokenType.LTEQ,
+                ('>', '=') => TokenType.GTEQ,
+                ('&', '&') => TokenType.AND,
+                ('|', '|') => TokenType.OR,
+                ('+', '=') => TokenType.PLUSEQ,
+                ('-', '=') => TokenType.MINUSEQ,
+                ('*', '=') => TokenType.STAREQ,
+                ('/', '=') => TokenType.SLASHEQ,
+                ('=', '>') => TokenType.ARROW,
                 _ => (TokenType?)null
             };
 
             if (type.HasValue)
             {
-                _tokens.Add(new Token(type.Value, twoChar, _line, _col));
+                _tokens.Add(new Token(type.Value, _source.Slice(_position, 2), _line, _col));
                 _position += 2;
                 _col += 2;
                 return true;
@@ -322,8 +423,15 @@ internal class CSharpParser
         _tokens = tokens;
     }
 
-    public IrProgram ParseProgram()
+    public IrProgram ParseProgram() =>
+        new IrProgram(ParseSegments(deferBodies: false).SelectMany(s => s.Statements).ToList());
+
+    // The program in declaration order: runs of top-level statements, and the body of
+    // each method. With deferBodies, method bodies are only located (by brace
+    // matching) and left for CSharpSegment to parse on first use.
+    public List<CSharpSegment> ParseSegments(bool deferBodies)
     {
+        var segments = new List<CSharpSegment>();
         var statements = new List<Stmt>();
         SkipNewlines();
 
@@ -340,7 +448,12 @@ internal class CSharpParser
             // Handle class/struct definitions - extract statements from inside
             if (Check(TokenType.KEYWORD) && (Peek().Value == "class" || Peek().Value == "struct"))
             {
-                ExtractStatementsFromClassOrStruct(statements);
+                if (statements.Count > 0)
+                {
+                    segments.Add(CSharpSegment.Parsed(statements));
+                    statements = new List<Stmt>();
+                }
+                ExtractStatementsFromClassOrStruct(segments, deferBodies);
                 SkipNewlines();
                 continue;
             }
@@ -353,10 +466,12 @@ internal class CSharpParser
             SkipNewlines();
         }
 
-        return new IrProgram(statements);
+        if (statements.Count > 0)
+            segments.Add(CSharpSegment.Parsed(statements));
+        return segments;
     }
 
-    private void ExtractStatementsFromClassOrStruct(List<Stmt> statements)
+    private void ExtractStatementsFromClassOrStruct(List<CSharpSegment> segments, bool deferBodies)
     {
         // Skip class/struct definition until we find {
         while (!Check(TokenType.LBRACE) && !IsAtEnd())
@@ -388,7 +503,7 @@ internal class CSharpParser
             // Skip method name and parameters
             if (Check(TokenType.IDENTIFIER))
             {
-                Advance(); // method name
+                var methodName = Advance().Value; // method name
                 
                 // Skip to opening paren and consume method parameters
                 while (!Check(TokenType.LPAREN) && !IsAtEnd())
@@ -411,26 +526,15 @@ internal class CSharpParser
                 // Now should be at the method body {
                 if (Match(TokenType.LBRACE))
                 {
-                    // Parse the method body
-                    int methodBraceDepth = 1;
-                    while (methodBraceDepth > 0 && !IsAtEnd())
+                    if (deferBodies)
                     {
-                        SkipNewlines();
-                        if (Check(TokenType.RBRACE))
-                        {
-                            Advance();
-                            methodBraceDepth--;
-                        }
-                        else if (Check(TokenType.LBRACE))
-                        {
-                            Advance();
-                            methodBraceDepth++;
-                        }
-                        else
-                        {
-                            var stmt = ParseStatement();
-                            if (stmt != null) statements.Add(stmt);
-                        }
+                        int start = _current;
+                        int end = SkipToMatchingBrace() ? _current - 1 : _current;
+                        segments.Add(CSharpSegment.Deferred(methodName, _tokens, start, end));
+                    }
+                    else
+                    {
+                        segments.Add(CSharpSegment.Parsed(ParseMethodBody(), methodName));
                     }
                 }
             }
@@ -441,6 +545,47 @@ internal class CSharpParser
         }
     }
 
+    // Statements of a method body, after its opening brace; consumes the closing one.
+    // A parser over just the body's tokens parses it the same way, stopping at EOF.
+    public List<Stmt> ParseMethodBody()
+    {
+        var statements = new List<Stmt>();
+        int methodBraceDepth = 1;
+        while (methodBraceDepth > 0 && !IsAtEnd())
+        {
+            SkipNewlines();
+            if (Check(TokenType.RBRACE))
+            {
+                Advance();
+                methodBraceDepth--;
+            }
+            else if (Check(TokenType.LBRACE))
+            {
+                Advance();
+                methodBraceDepth++;
+            }
+            else
+            {
+                var stmt = ParseStatement();
+                if (stmt != null) statements.Add(stmt);
+            }
+        }
+        return statements;
+    }
+
+    // After an opening brace; stops after the brace that closes it, or at EOF (false).
+    private bool SkipToMatchingBrace()
+    {
+        int depth = 1;
+        while (depth > 0 && !IsAtEnd())
+        {
+            if (Check(TokenType.LBRACE)) depth++;
+            else if (Check(TokenType.RBRACE)) depth--;
+            Advance();
+        }
+        return depth == 0;
+    }
+
     private void SkipUsingOrNamespace()
     {
         // Skip to either semicolon (for using) or opening brace (for namespace/class)
@@ -488,12 +633,19 @@ internal class CSharpParser
                 return null;
             }
             
-            // Skip control flow statements
-            if (keyword == "return" || keyword == "break" || keyword == "continue")
+            if (keyword == "break" || keyword == "continue")
             {
                 Advance();
                 ConsumeSemicolonIfPresent();
-                return null;
+                return keyword == "break" ? new BreakStmt() : new ContinueStmt();
+            }
+
+            if (keyword == "return")
+            {
+                Advance();
+                Expr? value = Check(TokenType.SEMICOLON) || Check(TokenType.RBRACE) ? null : ParseOrExpression();
+                ConsumeSemicolonIfPresent();
+                return new ReturnStmt(value);
             }
             
             return keyword switch
@@ -769,74 +921,64 @@ internal class CSharpParser
         return ParseOrExpression();
     }
 
-    private Expr ParseOrExpression()
-    {
-        var expr = ParseAndExpression();
-
-        while (Match(TokenType.OR) || (Check(TokenType.KEYWORD) && Peek().Value == "or"))
-        {
-            var op = "||";
-            var right = ParseAndExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
-
-    private Expr ParseAndExpression()
-    {
-        var expr = ParseComparisonExpression();
-
-        while (Match(TokenType.AND) || (Check(TokenType.KEYWORD) && Peek().Value == "and"))
-        {
-            var op = "&&";
-            var right = ParseComparisonExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
+    // Binary operator precedence levels, loosest first; every level is left-associative.
+    private const int OrLevel = 0;
+    private const int AndLevel = 1;
+    private const int ComparisonLevel = 2;
+    private const int AdditiveLevel = 3;
+    private const int MultiplicativeLevel = 4;
 
-    private Expr ParseComparisonExpression()
+    private Expr ParseOrExpression()
     {
-        var expr = ParseAdditiveExpression();
-
-        while (Match(TokenType.EQEQ, TokenType.NOTEQ, TokenType.LT, TokenType.GT, TokenType.LTEQ, TokenType.GTEQ))
+        // Precedence climbing: operands waiting on a looser operator are kept on a stack
+        // rather than in nested calls, so a chain of any length parses at constant stack
+        // depth, with one ParseUnaryExpression call per operand.
+        var operands = new Stack<Expr>();
+        var operators = new Stack<(string Op, int Level)>();
+        operands.Push(ParseUnaryExpression());
+
+        while (PeekBinaryOperator(out var op, out var level))
         {
-            var op = Previous().Value;
-            var right = ParseAdditiveExpression();
-            expr = new BinaryOp(expr, op, right);
+            Advance();
+            while (operators.Count > 0 && operators.Peek().Level >= level)
+                ReduceBinary(operands, operators);
+            operators.Push((op, level));
+            operands.Push(ParseUnaryExpression());
         }
 
-        return expr;
+        while (operators.Count > 0)
+            ReduceBinary(operands, operators);
+        return operands.Pop();
     }
 
-    private Expr ParseAdditiveExpression()
+    private static void ReduceBinary(Stack<Expr> operands, Stack<(string Op, int Level)> operators)
     {
-        var expr = ParseMultiplicativeExpression();
-
-        while (Match(TokenType.PLUS, TokenType.MINUS))
-        {
-            var op = Previous().Value;
-            var right = ParseMultiplicativeExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
+        var right = operands.Pop();
+        var left = operands.Pop();
+        operands.Push(new BinaryOp(left, operators.Pop().Op, right));
     }
 
-    private Expr ParseMultiplicativeExpression()
+    // The binary operator at the current token, if any, without consuming it.
+    private bool PeekBinaryOperator(out string op, out int level)
     {
-        var expr = ParseUnaryExpression();
-
-        while (Match(TokenType.STAR, TokenType.SLASH, TokenType.PERCENT))
+        var token = Peek();
+        op = token.Value;
+        (bool isOperator, level) = token.Type switch
         {
-            var op = Previous().Value;
-            var right = ParseUnaryExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
+            TokenType.OR => (true, OrLevel),
+            TokenType.AND => (true, AndLevel),
+            TokenType.KEYWORD when token.Value == "or" => (true, OrLevel),
+            TokenType.KEYWORD when token.Value == "and" => (true, AndLevel),
+            TokenType.EQEQ or TokenType.NOTEQ or TokenType.LT or TokenType.GT or TokenType.LTEQ or TokenType.GTEQ => (true, ComparisonLevel),
+            TokenType.PLUS or TokenType.MINUS => (true, AdditiveLevel),
+            TokenType.STAR or TokenType.SLASH or TokenType.PERCENT => (true, MultiplicativeLevel),
+            _ => (false, -1),
+        };
+        if (level == OrLevel)
+            op = "||";
+        else if (level == AndLevel)
+            op = "&&";
+        return isOperator;
     }
 
     private Expr ParseUnaryExpression()
@@ -899,12 +1041,24 @@ internal class CSharpParser
         return expr;
     }
 
+    // An F, D or M suffix makes a literal floating point even when it is spelled as an
+    // integer (1f); L and U leave it an integer.
+    private static Literal ParseNumber(string text)
+    {
+        bool hex = text.Length > 1 && text[1] is 'x' or 'X';
+        var digits = text.TrimEnd(hex ? new[] { 'l', 'L', 'u', 'U' } : new[] { 'l', 'L', 'u', 'U', 'f', 'F', 'd', 'D', 'm', 'M' });
+        var literal = NumericLiteral.Parse(digits) ?? throw new Exception($"Invalid number '{text}'");
+        bool real = !hex && text.Length > digits.Length && text[digits.Length..].IndexOfAny(new[] { 'f', 'F', 'd', 'D', 'm', 'M' }) >= 0;
+        return real && NumericLiteral.IsInteger(literal.Value)
+            ? new Literal(double.Parse(digits, System.Globalization.CultureInfo.InvariantCulture))
+            : literal;
+    }
+
     private Expr ParsePrimaryExpression()
     {
         if (Match(TokenType.NUMBER))
         {
-            var value = Previous().Value;
-            return new Literal(double.TryParse(value, out var d) ? d : int.Parse(value));
+            return ParseNumber(Previous().Value);
         }
 
         if (Match(TokenType.STRING))
@@ -0,0 +1,73 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Frontends.CSharp;
+
+// One piece of a C# program in declaration order: top-level statements, parsed when
+// the program is indexed, or a method body, parsed from its own tokens the first time
+// its statements are needed. Bodies don't depend on one another, so they can be
+// forced from any thread, in any order; each is parsed once.
+internal sealed class CSharpSegment
+{
+    private readonly Lazy<IReadOnlyList<Stmt>> _statements;
+
+    public string? MethodName { get; }
+
+    private CSharpSegment(string? methodName, Lazy<IReadOnlyList<Stmt>> statements)
+    {
+        MethodName = methodName;
+        _statements = statements;
+    }
+
+    public IReadOnlyList<Stmt> Statements => _statements.Value;
+
+    public bool IsParsed => _statements.IsValueCreated;
+
+    public static CSharpSegment Parsed(IReadOnlyList<Stmt> statements, string? methodName = null) =>
+        new(methodName, new Lazy<IReadOnlyList<Stmt>>(statements));
+
+    // Body tokens are tokens[start..end), between the braces.
+    public static CSharpSegment Deferred(string methodName, List<Token> tokens, int start, int end) =>
+        new(methodName, new Lazy<IReadOnlyList<Stmt>>(() =>
+        {
+            using var phase = PltTelemetry.StartPhase("parse.cs.method");
+            phase.SetTag("method", methodName);
+
+            var body = tokens.GetRange(start, end - start);
+            var eofLine = end < tokens.Count ? tokens[end].Line : tokens[^1].Line;
+            body.Add(new Token(TokenType.EOF, "", eofLine, 0));
+            return new CSharpParser(body).ParseMethodBody();
+        }, LazyThreadSafetyMode.ExecutionAndPublication));
+
+    // Concatenates the statements of every segment in order. With parallel, method
+    // bodies are parsed on the thread pool ahead of the calling thread, which takes
+    // each segment's statements as soon as they are ready (parsing it itself if no
+    // worker has started on it yet).
+    public static List<Stmt> Collect(IReadOnlyList<CSharpSegment> segments, bool parallel)
+    {
+        using var cancel = new CancellationTokenSource();
+        var prefetch = parallel
+            ? Task.Run(() => Parallel.ForEach(
+                segments.Where(s => !s.IsParsed),
+                new ParallelOptions { CancellationToken = cancel.Token },
+                segment =>
+                {
+                    // A failure is rethrown to the calling thread when it reaches this segment.
+                    try { _ = segment.Statements; } catch (Exception) { }
+                }))
+            : Task.CompletedTask;
+
+        try
+        {
+            var statements = new List<Stmt>();
+            foreach (var segment in segments)
+                statements.AddRange(segment.Statements);
+            return statements;
+        }
+        finally
+        {
+            cancel.Cancel();
+            try { prefetch.Wait(); } catch (AggregateException) { }
+        }
+    }
+}
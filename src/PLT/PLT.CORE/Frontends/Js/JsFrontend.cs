@@ -0,0 +1,1545 @@
+using System.Globalization;
+using System.Text;
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Frontends.Js;
+
+// A subset of JavaScript, lowered onto the same IR shapes the Python frontend
+// produces: console.log(...) is print, a.b is getattr, a[i] is __getitem__, &&/||/!
+// are and/or/not, this is self, constructor is __init__, and counted for loops
+// become range() loops.
+//
+// Statements: let/const/var, assignment (including += and ++), if/else, for-of,
+// for-in, counted and general for loops, while, do-while, function, class, return,
+// break/continue, throw, try/catch/finally, import. Expressions: literals, template
+// strings, arrays, objects, arrow functions with an expression body, new, calls,
+// member access, ternary and the usual operators. Regex literals, switch,
+// destructuring other than [a, b], getters/setters and generators are rejected.
+public static class JsFrontend
+{
+    public static IrProgram Parse(string source) => Parse(new StringText(source));
+
+    // Lexes the file straight out of a read-only memory mapping; see PythonFrontend.ParseFile.
+    public static IrProgram ParseFile(string path)
+    {
+        if (!MappedSourceFile.IsUtf8Compatible(path))
+            return Parse(File.ReadAllText(path));
+
+        using var file = new MappedSourceFile(path);
+        return Parse(file.Text);
+    }
+
+    private static IrProgram Parse<TText>(TText source) where TText : struct, ISourceText
+    {
+        List<Token> tokens;
+        using (var phase = PltTelemetry.StartPhase("lex.js"))
+        {
+            var lexer = new JsLexer<TText>(source);
+            tokens = lexer.Tokenize();
+            phase.RecordTokens(tokens.Count);
+        }
+
+        using (var phase = PltTelemetry.StartPhase("parse.js"))
+        {
+            var parser = new JsParser(tokens);
+            var program = parser.ParseProgram();
+            phase.RecordIrNodes(program);
+            return program;
+        }
+    }
+}
+
+internal enum TokenType
+{
+    EOF,
+    IDENTIFIER,
+    KEYWORD,
+    NUMBER,
+    STRING,
+    TEMPLATE,     // raw text between the backticks, ${...} included
+    PUNCTUATOR,
+}
+
+// Comment is the text of a // comment on the line(s) directly above the token, when
+// the token starts a statement it becomes that statement's LeadingComment.
+internal record Token(TokenType Type, string Value, int Line, int Col, string? Comment = null);
+
+internal class JsLexer<TText> where TText : struct, ISourceText
+{
+    private static readonly HashSet<string> Keywords = new()
+    {
+        "let", "const", "var", "function", "return", "if", "else", "for", "while", "do",
+        "break", "continue", "class", "extends", "new", "this", "true", "false", "null",
+        "undefined", "in", "instanceof", "typeof", "try", "catch", "finally", "throw",
+        "import", "export",
+    };
+
+    private readonly TText _source;
+    private int _position = 0;
+    private int _line = 1;
+    private int _lineStart = 0;
+    private bool _lineHasToken = false;
+    private string? _comment;
+    private readonly List<Token> _tokens = new();
+
+    public JsLexer(TText source)
+    {
+        _source = source;
+    }
+
+    public List<Token> Tokenize()
+    {
+        while (_position < _source.Length)
+        {
+            var ch = _source[_position];
+
+            if (ch == '\n')
+            {
+                _position++;
+                _line++;
+                _lineStart = _position;
+                _lineHasToken = false;
+                continue;
+            }
+
+            if (char.IsWhiteSpace(ch))
+            {
+                _position++;
+                continue;
+            }
+
+            if (ch == '/' && Peek(1) == '/')
+            {
+                ReadLineComment();
+                continue;
+            }
+
+            if (ch == '/' && Peek(1) == '*')
+            {
+                SkipBlockComment();
+                continue;
+            }
+
+            if (ch == '"' || ch == '\'')
+            {
+                ReadString(ch);
+                continue;
+            }
+
+            if (ch == '`')
+            {
+                ReadTemplate();
+                continue;
+            }
+
+            if (char.IsDigit(ch) || (ch == '.' && char.IsDigit(Peek(1))))
+            {
+                ReadNumber();
+                continue;
+            }
+
+            if (ch == '_' || ch == '$' || _source.IsLetter(_position, out _))
+            {
+                ReadIdentifierOrKeyword();
+                continue;
+            }
+
+            var punctuator = MatchPunctuator(ch);
+            if (punctuator == null)
+                throw new Exception($"Unexpected character '{ch}' at line {_line}, col {_position - _lineStart + 1}");
+            Add(TokenType.PUNCTUATOR, punctuator, _position);
+            _position += punctuator.Length;
+        }
+
+        _tokens.Add(new Token(TokenType.EOF, "", _line, _position - _lineStart + 1));
+        return _tokens;
+    }
+
+    private char Peek(int offset) =>
+        _position + offset < _source.Length ? _source[_position + offset] : '\0';
+
+    private void Add(TokenType type, string value, int start)
+    {
+        _tokens.Add(new Token(type, value, _line, start - _lineStart + 1, _lineHasToken ? null : _comment));
+        _comment = null;
+        _lineHasToken = true;
+    }
+
+    private void ReadLineComment()
+    {
+        int start = _position + 2;
+        while (_position < _source.Length && _source[_position] != '\n')
+            _position++;
+
+        // Only a comment on a line of its own describes the code below it.
+        if (!_lineHasToken)
+            _comment = _source.Slice(start, _position - start).Trim();
+    }
+
+    private void SkipBlockComment()
+    {
+        _position += 2;
+        while (_position < _source.Length && !(_source[_position] == '*' && Peek(1) == '/'))
+        {
+            if (_source[_position] == '\n')
+            {
+                _line++;
+                _lineStart = _position + 1;
+            }
+            _position++;
+        }
+        _position = Math.Min(_position + 2, _source.Length);
+    }
+
+    private void ReadString(char quote)
+    {
+        int start = _position;
+        _position++;
+
+        // Unescaped text is copied in runs straight from the source.
+        StringBuilder? sb = null;
+        int runStart = _position;
+
+        while (_position < _source.Length && _source[_position] != quote)
+        {
+            if (_source[_position] == '\n')
+                throw new Exception($"Unterminated string at line {_line}");
+
+            if (_source[_position] == '\\' && _position + 1 < _source.Length)
+            {
+                sb ??= new StringBuilder();
+                sb.Append(_source.Slice(runStart, _position - runStart));
+                _position = JsEscapes.Append(_source, _position, sb, ref _line, ref _lineStart);
+                runStart = _position;
+                continue;
+            }
+            _position++;
+        }
+
+        var tail = _source.Slice(runStart, _position - runStart);
+        if (_position < _source.Length) _position++; // closing quote
+        Add(TokenType.STRING, sb == null ? tail : sb.Append(tail).ToString(), start);
+    }
+
+    private void ReadTemplate()
+    {
+        int start = _position;
+        int startLine = _line, startLineStart = _lineStart;
+        _position++;
+
+        int depth = 0;
+        while (_position < _source.Length && (depth > 0 || _source[_position] != '`'))
+        {
+            var ch = _source[_position];
+            if (ch == '\\')
+            {
+                _position += 2;
+                continue;
+            }
+            if (ch == '$' && Peek(1) == '{')
+            {
+                depth++;
+                _position += 2;
+                continue;
+            }
+            if (depth > 0 && ch == '{')
+                depth++;
+            else if (depth > 0 && ch == '}')
+                depth--;
+            else if (ch == '\n')
+            {
+                _line++;
+                _lineStart = _position + 1;
+            }
+            _position++;
+        }
+
+        var raw = _source.Slice(start + 1, Math.Min(_position, _source.Length) - start - 1);
+        if (_position < _source.Length) _position++; // closing `
+
+        // The token is positioned where it starts, like every other token.
+        (var endLine, var endLineStart) = (_line, _lineStart);
+        (_line, _lineStart) = (startLine, startLineStart);
+        Add(TokenType.TEMPLATE, raw, start);
+        (_line, _lineStart) = (endLine, endLineStart);
+    }
+
+    private void ReadNumber()
+    {
+        int start = _position;
+        if (_source[_position] == '0' && Peek(1) is 'x' or 'X' or 'o' or 'O' or 'b' or 'B')
+        {
+            _position += 2;
+            while (_position < _source.Length && (char.IsAsciiHexDigit(_source[_position]) || _source[_position] == '_'))
+                _position++;
+        }
+        else
+        {
+            while (_position < _source.Length && (char.IsDigit(_source[_position]) || _source[_position] is '.' or '_'))
+                _position++;
+            if (_position < _source.Length && _source[_position] is 'e' or 'E')
+            {
+                _position++;
+                if (_position < _source.Length && _source[_position] is '+' or '-')
+                    _position++;
+                while (_position < _source.Length && char.IsDigit(_source[_position]))
+                    _position++;
+            }
+        }
+
+        var text = _source.Slice(start, _position - start);
+        if (_position < _source.Length && _source[_position] == 'n')
+            _position++; // BigInt suffix
+        Add(TokenType.NUMBER, text, start);
+    }
+
+    private void ReadIdentifierOrKeyword()
+    {
+        int start = _position;
+        while (_position < _source.Length)
+        {
+            int width = 1;
+            if (_source[_position] != '_' && _source[_position] != '$' && !_source.IsLetterOrDigit(_position, out width))
+                break;
+            _position += width;
+        }
+
+        var text = _source.Slice(start, _position - start);
+        Add(Keywords.Contains(text) ? TokenType.KEYWORD : TokenType.IDENTIFIER, text, start);
+    }
+
+    // Longest match; the strings are constants, so no token text is allocated.
+    private string? MatchPunctuator(char ch)
+    {
+        char c1 = Peek(1), c2 = Peek(2);
+        return ch switch
+        {
+            '=' => c1 == '=' ? (c2 == '=' ? "===" : "==") : c1 == '>' ? "=>" : "=",
+            '!' => c1 == '=' ? (c2 == '=' ? "!==" : "!=") : "!",
+            '<' => c1 == '<' ? (c2 == '=' ? "<<=" : "<<") : c1 == '=' ? "<=" : "<",
+            '>' => c1 == '>' ? (c2 == '>' ? (Peek(3) == '=' ? ">>>=" : ">>>") : c2 == '=' ? ">>=" : ">>") : c1 == '=' ? ">=" : ">",
+            '&' => c1 == '&' ? "&&" : c1 == '=' ? "&=" : "&",
+            '|' => c1 == '|' ? "||" : c1 == '=' ? "|=" : "|",
+            '?' => c1 == '?' ? "??" : c1 == '.' && !char.IsDigit(c2) ? "?." : "?",
+            '+' => c1 == '+' ? "++" : c1 == '=' ? "+=" : "+",
+            '-' => c1 == '-' ? "--" : c1 == '=' ? "-=" : "-",
+            '*' => c1 == '*' ? (c2 == '=' ? "**=" : "**") : c1 == '=' ? "*=" : "*",
+            '/' => c1 == '=' ? "/=" : "/",
+            '%' => c1 == '=' ? "%=" : "%",
+            '.' => c1 == '.' && c2 == '.' ? "..." : ".",
+            ',' => ",",
+            ';' => ";",
+            ':' => ":",
+            '(' => "(",
+            ')' => ")",
+            '[' => "[",
+            ']' => "]",
+            '{' => "{",
+            '}' => "}",
+            '^' => c1 == '=' ? "^=" : "^",
+            '~' => "~",
+            _ => null,
+        };
+    }
+}
+
+internal static class JsEscapes
+{
+    // Appends the character(s) for the escape sequence at source[position] (a
+    // backslash) and returns the position after it.
+    public static int Append<TText>(TText source, int position, StringBuilder sb, ref int line, ref int lineStart)
+        where TText : struct, ISourceText
+    {
+        var escaped = source[position + 1];
+        position += 2;
+        switch (escaped)
+        {
+            case 'n': sb.Append('\n'); break;
+            case 't': sb.Append('\t'); break;
+            case 'r': sb.Append('\r'); break;
+            case 'b': sb.Append('\b'); break;
+            case 'f': sb.Append('\f'); break;
+            case 'v': sb.Append('\v'); break;
+            case '0' when position >= source.Length || !char.IsDigit(source[position]): sb.Append('\0'); break;
+            case '\r':
+                if (position < source.Length && source[position] == '\n') position++;
+                line++;
+                lineStart = position;
+                break;
+            case '\n':
+                // Line continuation
+                line++;
+                lineStart = position;
+                break;
+            case 'x':
+                position = AppendCodePoint(source, position, 2, sb);
+                break;
+            case 'u':
+                if (position < source.Length && source[position] == '{')
+                {
+                    int end = position + 1;
+                    while (end < source.Length && source[end] != '}')
+                        end++;
+                    sb.Append(char.ConvertFromUtf32(int.Parse(source.Slice(position + 1, end - position - 1), NumberStyles.HexNumber)));
+                    position = Math.Min(end + 1, source.Length);
+                }
+                else
+                {
+                    position = AppendCodePoint(source, position, 4, sb);
+                }
+                break;
+            default:
+                if (escaped < 0x80)
+                {
+                    sb.Append(escaped);
+                }
+                else
+                {
+                    // A non-ASCII character stands for itself; decode it whole.
+                    position--;
+                    source.IsLetterOrDigit(position, out var width);
+                    sb.Append(source.Slice(position, width));
+                    position += width;
+                }
+                break;
+        }
+        return position;
+    }
+
+    private static int AppendCodePoint<TText>(TText source, int position, int digits, StringBuilder sb)
+        where TText : struct, ISourceText
+    {
+        if (position + digits > source.Length)
+            throw new Exception("Invalid escape sequence");
+        sb.Append((char)int.Parse(source.Slice(position, digits), NumberStyles.HexNumber));
+        return position + digits;
+    }
+}
+
+internal class JsParser
+{
+    private readonly List<Token> _tokens;
+    private readonly int[] _matchingParen;
+    private int _current = 0;
+
+    public JsParser(List<Token> tokens)
+    {
+        _tokens = tokens;
+
+        // Closing paren for every opening one, so arrow functions are recognized
+        // without scanning ahead (which would make nested parens quadratic).
+        _matchingParen = new int[tokens.Count];
+        var open = new Stack<int>();
+        for (int i = 0; i < tokens.Count; i++)
+        {
+            _matchingParen[i] = -1;
+            if (tokens[i].Type != TokenType.PUNCTUATOR)
+                continue;
+            if (tokens[i].Value == "(")
+                open.Push(i);
+            else if (tokens[i].Value == ")" && open.Count > 0)
+                _matchingParen[open.Pop()] = i;
+        }
+    }
+
+    public IrProgram ParseProgram()
+    {
+        var statements = new List<Stmt>();
+        while (!IsAtEnd())
+            ParseStatement(statements);
+        return new IrProgram(statements);
+    }
+
+    public Expr ParseStandaloneExpression()
+    {
+        var expr = ParseExpression();
+        if (!IsAtEnd())
+            throw new Exception($"Unexpected token: {Peek()}");
+        return expr;
+    }
+
+    // Appends the statement(s) a JS statement lowers to.
+    private void ParseStatement(List<Stmt> into)
+    {
+        var comment = Peek().Comment;
+        int first = into.Count;
+
+        if (Peek().Type == TokenType.KEYWORD)
+        {
+            switch (Peek().Value)
+            {
+                case "let" or "const" or "var":
+                    ParseDeclaration(into);
+                    break;
+                case "function":
+                    into.Add(ParseFunction());
+                    break;
+                case "class":
+                    into.Add(ParseClass());
+                    break;
+                case "if":
+                    into.Add(ParseIf());
+                    break;
+                case "for":
+                    ParseFor(into);
+                    break;
+                case "while":
+                    into.Add(ParseWhile());
+                    break;
+                case "do":
+                    ParseDoWhile(into);
+                    break;
+                case "return":
+                    into.Add(ParseReturn());
+                    break;
+                case "break":
+                    Advance();
+                    ConsumeSemicolonIfPresent();
+                    into.Add(new BreakStmt());
+                    break;
+                case "continue":
+                    Advance();
+                    ConsumeSemicolonIfPresent();
+                    into.Add(new ContinueStmt());
+                    break;
+                case "throw":
+                    Advance();
+                    into.Add(new ExprStmt(new Intrinsic("raise", new List<Expr> { ParseExpression() })));
+                    ConsumeSemicolonIfPresent();
+                    break;
+                case "try":
+                    into.Add(ParseTry());
+                    break;
+                case "import":
+                    into.Add(ParseImport());
+                    break;
+                case "export":
+                    Advance();
+                    MatchIdentifier("default");
+                    ParseStatement(into);
+                    break;
+                default:
+                    ParseExpressionStatement(into);
+                    break;
+            }
+        }
+        else if (MatchPunct("{"))
+        {
+            // A bare block has no scope of its own in the IR.
+            while (!CheckPunct("}") && !IsAtEnd())
+                ParseStatement(into);
+            ConsumePunct("}");
+        }
+        else if (MatchPunct(";"))
+        {
+            // Empty statement
+        }
+        else
+        {
+            ParseExpressionStatement(into);
+        }
+
+        if (comment != null && into.Count > first)
+            into[first] = WithComment(into[first], comment);
+    }
+
+    private static Stmt WithComment(Stmt stmt, string comment) =>
+        stmt switch
+        {
+            ExprStmt s => s with { LeadingComment = comment },
+            VarAssignment v => v with { LeadingComment = comment },
+            TupleUnpackingAssignment t => t with { LeadingComment = comment },
+            PassStmt p => p with { LeadingComment = comment },
+            ReturnStmt r => r with { LeadingComment = comment },
+            BreakStmt b => b with { LeadingComment = comment },
+            ContinueStmt c => c with { LeadingComment = comment },
+            IfStmt i => i with { LeadingComment = comment },
+            ForEachStmt f => f with { LeadingComment = comment },
+            WhileStmt w => w with { LeadingComment = comment },
+            FunctionDefStmt f => f with { LeadingComment = comment },
+            ClassDefStmt c => c with { LeadingComment = comment },
+            ImportStmt i => i with { LeadingComment = comment },
+            TryStmt t => t with { LeadingComment = comment },
+            _ => stmt,
+        };
+
+    private List<Stmt> ParseBody()
+    {
+        var body = new List<Stmt>();
+        if (MatchPunct("{"))
+        {
+            while (!CheckPunct("}") && !IsAtEnd())
+                ParseStatement(body);
+            ConsumePunct("}");
+        }
+        else
+        {
+            ParseStatement(body);
+        }
+        return body;
+    }
+
+    private void ParseDeclaration(List<Stmt> into)
+    {
+        Advance(); // let/const/var
+        do
+        {
+            if (MatchPunct("["))
+            {
+                var names = new List<string>();
+                do
+                {
+                    names.Add(Consume(TokenType.IDENTIFIER, "Expected name in destructuring").Value);
+                } while (MatchPunct(","));
+                ConsumePunct("]");
+                ConsumePunct("=");
+                into.Add(new TupleUnpackingAssignment(names, ParseExpression()));
+                continue;
+            }
+            if (CheckPunct("{"))
+                throw new NotSupportedException($"Object destructuring is not supported (line {Peek().Line})");
+
+            var name = Consume(TokenType.IDENTIFIER, "Expected variable name").Value;
+            var value = MatchPunct("=") ? ParseExpression() : new Literal(null);
+            into.Add(new VarAssignment(name, value));
+        } while (MatchPunct(","));
+        ConsumeSemicolonIfPresent();
+    }
+
+    private FunctionDefStmt ParseFunction()
+    {
+        ConsumeKeyword("function");
+        if (MatchPunct("*"))
+            throw new NotSupportedException($"Generators are not supported (line {Previous().Line})");
+        var name = Consume(TokenType.IDENTIFIER, "Expected function name").Value;
+        var parameters = ParseParameters();
+        return new FunctionDefStmt(name, parameters, ParseFunctionBody());
+    }
+
+    private List<string> ParseParameters()
+    {
+        ConsumePunct("(");
+        var parameters = new List<string>();
+        if (!CheckPunct(")"))
+        {
+            do
+            {
+                if (CheckPunct("..."))
+                    throw new NotSupportedException($"Rest parameters are not supported (line {Peek().Line})");
+                parameters.Add(Consume(TokenType.IDENTIFIER, "Expected parameter name").Value);
+                if (MatchPunct("="))
+                    ParseAssignmentExpression(); // default value (not represented in the IR)
+            } while (MatchPunct(","));
+        }
+        ConsumePunct(")");
+        return parameters;
+    }
+
+    private List<Stmt> ParseFunctionBody()
+    {
+        ConsumePunct("{");
+        var body = new List<Stmt>();
+        while (!CheckPunct("}") && !IsAtEnd())
+            ParseStatement(body);
+        ConsumePunct("}");
+        return body;
+    }
+
+    private ClassDefStmt ParseClass()
+    {
+        ConsumeKeyword("class");
+        var name = Consume(TokenType.IDENTIFIER, "Expected class name").Value;
+        string? baseClass = null;
+        if (MatchKeyword("extends"))
+            baseClass = Consume(TokenType.IDENTIFIER, "Expected base class name").Value;
+
+        ConsumePunct("{");
+        var body = new List<Stmt>();
+        while (!CheckPunct("}") && !IsAtEnd())
+        {
+            if (MatchPunct(";"))
+                continue;
+
+            // static is a contextual keyword: static foo() but also static() or static = 1
+            bool isStatic = Check(TokenType.IDENTIFIER) && Peek().Value == "static" && !PeekPunct(1, "(") && !PeekPunct(1, "=") && MatchIdentifier("static");
+            var memberName = Advance();
+            if (memberName.Type is not (TokenType.IDENTIFIER or TokenType.KEYWORD))
+                throw new Exception($"Expected class member at {memberName}");
+
+            if (CheckPunct("("))
+            {
+                // Methods take the instance explicitly, as in the Python frontend.
+                var parameters = ParseParameters();
+                if (!isStatic)
+                    parameters.Insert(0, "self");
+                var methodName = memberName.Value == "constructor" ? "__init__" : memberName.Value;
+                body.Add(new FunctionDefStmt(methodName, parameters, ParseFunctionBody(), memberName.Comment));
+            }
+            else
+            {
+                // Field: a class attribute
+                var value = MatchPunct("=") ? ParseExpression() : new Literal(null);
+                ConsumeSemicolonIfPresent();
+                body.Add(new VarAssignment(memberName.Value, value, memberName.Comment));
+            }
+        }
+        ConsumePunct("}");
+
+        if (body.Count == 0)
+            body.Add(new PassStmt());
+        return new ClassDefStmt(name, body, baseClass);
+    }
+
+    private IfStmt ParseIf()
+    {
+        ConsumeKeyword("if");
+        ConsumePunct("(");
+        var condition = ParseExpression();
+        ConsumePunct(")");
+        var thenBody = ParseBody();
+
+        IReadOnlyList<Stmt>? elseBody = null;
+        if (MatchKeyword("else"))
+            elseBody = ParseBody();
+
+        return new IfStmt(condition, thenBody, elseBody);
+    }
+
+    private void ParseFor(List<Stmt> into)
+    {
+        ConsumeKeyword("for");
+        ConsumePunct("(");
+
+        // for (const x of xs) / for (const k in obj) / for (const [k, v] of pairs)
+        int checkpoint = _current;
+        if (Peek().Type == TokenType.KEYWORD && Peek().Value is "let" or "const" or "var")
+            Advance();
+        string? loopVar = null;
+        if (MatchPunct("["))
+        {
+            var names = new List<string>();
+            do
+            {
+                names.Add(Consume(TokenType.IDENTIFIER, "Expected name in destructuring").Value);
+            } while (MatchPunct(","));
+            ConsumePunct("]");
+            loopVar = string.Join(", ", names);
+        }
+        else if (Check(TokenType.IDENTIFIER))
+        {
+            loopVar = Advance().Value;
+        }
+
+        if (loopVar != null && (MatchIdentifier("of") || MatchKeyword("in")))
+        {
+            var iterable = ParseExpression();
+            ConsumePunct(")");
+            into.Add(new ForEachStmt(loopVar, iterable, ParseBody()));
+            return;
+        }
+
+        // for (init; condition; update)
+        _current = checkpoint;
+        var init = new List<Stmt>();
+        if (!CheckPunct(";"))
+        {
+            if (Peek().Type == TokenType.KEYWORD && Peek().Value is "let" or "const" or "var")
+                ParseDeclaration(init);
+            else
+                ParseExpressionStatement(init);
+        }
+        else
+        {
+            Advance();
+        }
+
+        var condition = CheckPunct(";") ? null : ParseExpression();
+        ConsumePunct(";");
+
+        // The update runs at the end of the body and before each continue; it is parsed
+        // again for each place so no two share IR nodes.
+        int updateStart = _current;
+        List<Stmt> ParseUpdate()
+        {
+            var statements = new List<Stmt>();
+            _current = updateStart;
+            if (!CheckPunct(")"))
+                ParseExpressionStatement(statements, allowComma: true);
+            return statements;
+        }
+
+        var update = ParseUpdate();
+        ConsumePunct(")");
+
+        var body = ParseBody();
+
+        if (AsRange(init, condition, update, body) is { } counted)
+        {
+            into.Add(counted);
+            return;
+        }
+
+        int bodyEnd = _current;
+        var loop = UpdateBeforeContinue(body, ParseUpdate);
+        loop.AddRange(update);
+        _current = bodyEnd;
+        into.AddRange(init);
+        into.Add(new WhileStmt(condition ?? new Literal(true), loop));
+    }
+
+    // body with update() put before each continue of this loop (not of loops nested in
+    // it), which in a while loop would otherwise skip it.
+    private static List<Stmt> UpdateBeforeContinue(IReadOnlyList<Stmt> body, Func<List<Stmt>> update)
+    {
+        var result = new List<Stmt>(body.Count);
+        foreach (var stmt in body)
+        {
+            switch (stmt)
+            {
+                case ContinueStmt:
+                    result.AddRange(update());
+                    result.Add(stmt);
+                    break;
+                case IfStmt i:
+                    result.Add(i with
+                    {
+                        ThenBody = UpdateBeforeContinue(i.ThenBody, update),
+                        ElseBody = i.ElseBody == null ? null : UpdateBeforeContinue(i.ElseBody, update),
+                    });
+                    break;
+                case TryStmt t:
+                    result.Add(t with
+                    {
+                        TryBody = UpdateBeforeContinue(t.TryBody, update),
+                        ExceptClauses = t.ExceptClauses.Select(c => c with { Body = UpdateBeforeContinue(c.Body, update) }).ToList(),
+                        FinallyBody = t.FinallyBody == null ? null : UpdateBeforeContinue(t.FinallyBody, update),
+                    });
+                    break;
+                default:
+                    result.Add(stmt);
+                    break;
+            }
+        }
+        return result;
+    }
+
+    // for (let i = a; i < b; i++) as `for i in range(a, b)`, when the body assigns
+    // neither i nor b (JS would re-read b on every iteration) and the step is a
+    // constant. <= and >= widen the bound by one.
+    private static ForEachStmt? AsRange(List<Stmt> init, Expr? condition, List<Stmt> update, List<Stmt> body)
+    {
+        if (init is not [VarAssignment { VarName: var name, Value: var start }] ||
+            condition is not BinaryOp { Left: Variable left, Op: "<" or "<=" or ">" or ">=" } bound || left.Name != name ||
+            update is not [VarAssignment { Value: BinaryOp { Left: Variable stepVar, Op: "+" or "-", Right: Literal { Value: long step } } stepOp } stepAssign] ||
+            stepAssign.VarName != name || stepVar.Name != name || step <= 0)
+            return null;
+
+        if (bound.Right is not (Literal { Value: long } or Variable))
+            return null;
+
+        var assigned = IrWalker.Descendants(new IrProgram(body))
+            .SelectMany(n => n switch
+            {
+                VarAssignment v => new[] { v.VarName },
+                TupleUnpackingAssignment t => t.VarNames,
+                ForEachStmt f => f.LoopVar.Split(',', StringSplitOptions.TrimEntries),
+                _ => Array.Empty<string>(),
+            })
+            .ToHashSet();
+        if (assigned.Contains(name) || (bound.Right is Variable b && assigned.Contains(b.Name)))
+            return null;
+
+        bool ascending = stepOp.Op == "+";
+        if (ascending != (bound.Op is "<" or "<="))
+            return null;
+
+        Expr end = bound.Op switch
+        {
+            "<=" => Offset(bound.Right, 1),
+            ">=" => Offset(bound.Right, -1),
+            _ => bound.Right,
+        };
+        var args = new List<Expr> { start, end };
+        if (!ascending || step != 1)
+            args.Add(new Literal(ascending ? step : -step));
+        return new ForEachStmt(name, new FunctionCall("range", args), body);
+    }
+
+    private static Expr Offset(Expr expr, long by) =>
+        expr is Literal { Value: long d }
+            ? new Literal(d + by)
+            : new BinaryOp(expr, by > 0 ? "+" : "-", new Literal(Math.Abs(by)));
+
+    private WhileStmt ParseWhile()
+    {
+        ConsumeKeyword("while");
+        ConsumePunct("(");
+        var condition = ParseExpression();
+        ConsumePunct(")");
+        return new WhileStmt(condition, ParseBody());
+    }
+
+    // do { body } while (cond) runs the body once before testing cond:
+    //
+    //     _first = True
+    //     while _first or cond:
+    //         _first = False
+    //         body
+    //
+    // so break and continue in the body still leave or go round the one loop.
+    private void ParseDoWhile(List<Stmt> into)
+    {
+        ConsumeKeyword("do");
+        var body = ParseBody();
+        ConsumeKeyword("while");
+        ConsumePunct("(");
+        var condition = ParseExpression();
+        ConsumePunct(")");
+        ConsumeSemicolonIfPresent();
+
+        into.Add(new VarAssignment(DoWhileFlag, new Literal(true)));
+        body.Insert(0, new VarAssignment(DoWhileFlag, new Literal(false)));
+        into.Add(new WhileStmt(new BinaryOp(new Variable(DoWhileFlag), "or", condition), body));
+    }
+
+    private const string DoWhileFlag = "_first";
+
+    private Stmt ParseReturn()
+    {
+        var keyword = ConsumeKeyword("return");
+
+        // A value must start on the return's own line
+        if (CheckPunct(";") || CheckPunct("}") || IsAtEnd() || Peek().Line != keyword.Line)
+        {
+            ConsumeSemicolonIfPresent();
+            return new ReturnStmt(null);
+        }
+
+        var value = ParseExpression();
+        ConsumeSemicolonIfPresent();
+        return new ReturnStmt(value);
+    }
+
+    private TryStmt ParseTry()
+    {
+        ConsumeKeyword("try");
+        var tryBody = ParseFunctionBody();
+
+        var clauses = new List<(string?, string?, IReadOnlyList<Stmt>)>();
+        if (MatchKeyword("catch"))
+        {
+            string? varName = null;
+            if (MatchPunct("("))
+            {
+                varName = Consume(TokenType.IDENTIFIER, "Expected catch variable").Value;
+                ConsumePunct(")");
+            }
+            // JS catches everything: except Exception as e
+            clauses.Add((varName == null ? null : "Exception", varName, ParseFunctionBody()));
+        }
+
+        IReadOnlyList<Stmt>? finallyBody = null;
+        if (MatchKeyword("finally"))
+            finallyBody = ParseFunctionBody();
+
+        return new TryStmt(tryBody, clauses, finallyBody);
+    }
+
+    // import x from "m" / import { a, b as c } from "m" / import * as m from "m" / import "m"
+    private ImportStmt ParseImport()
+    {
+        ConsumeKeyword("import");
+        if (Match(TokenType.STRING))
+        {
+            var bare = Previous().Value;
+            ConsumeSemicolonIfPresent();
+            return new ImportStmt(null, new List<(string, string?)> { (bare, null) });
+        }
+
+        string? defaultName = null;
+        string? namespaceName = null;
+        var names = new List<(string Name, string? Alias)>();
+
+        if (Check(TokenType.IDENTIFIER))
+        {
+            defaultName = Advance().Value;
+            MatchPunct(",");
+        }
+        if (MatchPunct("*"))
+        {
+            ConsumeIdentifier("as");
+            namespaceName = Consume(TokenType.IDENTIFIER, "Expected name").Value;
+        }
+        else if (MatchPunct("{"))
+        {
+            while (!CheckPunct("}") && !IsAtEnd())
+            {
+                var name = Advance().Value;
+                string? alias = MatchIdentifier("as") ? Consume(TokenType.IDENTIFIER, "Expected alias").Value : null;
+                names.Add((name, alias));
+                if (!MatchPunct(","))
+                    break;
+            }
+            ConsumePunct("}");
+        }
+
+        ConsumeIdentifier("from");
+        var module = Consume(TokenType.STRING, "Expected module name").Value;
+        ConsumeSemicolonIfPresent();
+
+        if (names.Count > 0)
+            return new ImportStmt(module, names);
+        return new ImportStmt(null, new List<(string, string?)> { (module, namespaceName ?? defaultName) });
+    }
+
+    private void ParseExpressionStatement(List<Stmt> into, bool allowComma = false)
+    {
+        do
+        {
+            if (CheckPunct("++") || CheckPunct("--"))
+            {
+                // ++x / --x
+                var op = Advance().Value == "++" ? "+" : "-";
+                var operand = ParseUnary();
+                into.Add(Assign(operand, new BinaryOp(operand, op, new Literal(1L))));
+                continue;
+            }
+
+            var target = ParseExpression();
+
+            if (MatchPunct("="))
+            {
+                into.Add(Assign(target, ParseAssignmentValue()));
+            }
+            else if (MatchPunct("+=", "-=", "*=", "/=", "%=", "**=", "&=", "|=", "^=", "<<=", ">>=", ">>>="))
+            {
+                var op = Previous().Value[..^1];
+                into.Add(Assign(target, Binary(target, op, ParseAssignmentValue())));
+            }
+            else if (MatchPunct("++", "--"))
+            {
+                var op = Previous().Value == "++" ? "+" : "-";
+                into.Add(Assign(target, new BinaryOp(target, op, new Literal(1L))));
+            }
+            else
+            {
+                into.Add(new ExprStmt(target));
+            }
+        } while (allowComma && MatchPunct(","));
+        ConsumeSemicolonIfPresent();
+    }
+
+    private Expr ParseAssignmentValue()
+    {
+        var value = ParseExpression();
+        if (CheckPunct("=") || CheckPunct("+=") || CheckPunct("-="))
+            throw new NotSupportedException($"Chained assignment is not supported (line {Peek().Line})");
+        return value;
+    }
+
+    // x = v, obj.x = v, obj[k] = v, with the same IR the Python frontend produces.
+    private Stmt Assign(Expr target, Expr value) =>
+        target switch
+        {
+            Variable v => new VarAssignment(v.Name, value),
+            Intrinsic { Name: "getattr", Args: [var obj, var attr] } => new ExprStmt(new Intrinsic("setattr", new List<Expr> { obj, attr, value })),
+            MethodCall { MethodName: "__getitem__", Args: [var key] } m => new ExprStmt(new MethodCall(m.Target, "__setitem__", new List<Expr> { key, value })),
+            FunctionCall { FunctionName: "len" } => throw new NotSupportedException($"Assigning to .length is not supported (line {Previous().Line})"),
+            _ => throw new Exception($"Invalid assignment target at {Previous()}"),
+        };
+
+    private Expr ParseExpression() => ParseAssignmentExpression();
+
+    // Arrow functions bind loosest; everything else starts at the ternary.
+    private Expr ParseAssignmentExpression()
+    {
+        if (Check(TokenType.IDENTIFIER) && PeekPunct(1, "=>"))
+        {
+            var parameter = Advance().Value;
+            Advance(); // =>
+            return new LambdaExpr(new List<string> { parameter }, ParseArrowBody());
+        }
+
+        if (CheckPunct("(") && _matchingParen[_current] is var close && close > 0 && PeekPunct(close - _current + 1, "=>"))
+        {
+            var parameters = ParseParameters();
+            ConsumePunct("=>");
+            return new LambdaExpr(parameters, ParseArrowBody());
+        }
+
+        return ParseConditional();
+    }
+
+    private Expr ParseArrowBody()
+    {
+        if (!MatchPunct("{"))
+            return ParseAssignmentExpression();
+
+        // { return expr; } is the only block body a lambda can hold.
+        if (MatchKeyword("return"))
+        {
+            var value = ParseExpression();
+            ConsumeSemicolonIfPresent();
+            if (MatchPunct("}"))
+                return value;
+        }
+        throw new NotSupportedException($"Arrow functions with statement bodies are not supported (line {Previous().Line})");
+    }
+
+    private Expr ParseConditional()
+    {
+        var condition = ParseBinary();
+        if (!MatchPunct("?"))
+            return condition;
+
+        var then = ParseAssignmentExpression();
+        ConsumePunct(":");
+        var otherwise = ParseAssignmentExpression();
+        return new Intrinsic("ternary", new List<Expr> { condition, then, otherwise });
+    }
+
+    // Binary operators by precedence, loosest first, as (JS spelling, IR spelling).
+    private static readonly (string Js, string Ir)[][] BinaryLevels =
+    {
+        new[] { ("||", "or") },
+        new[] { ("&&", "and") },
+        new[] { ("|", "|") },
+        new[] { ("^", "^") },
+        new[] { ("&", "&") },
+        new[] { ("===", "=="), ("!==", "!="), ("==", "=="), ("!=", "!=") },
+        new[] { ("<", "<"), (">", ">"), ("<=", "<="), (">=", ">="), ("in", "in"), ("instanceof", "instanceof") },
+        new[] { ("<<", "<<"), (">>", ">>"), (">>>", ">>>") },
+        new[] { ("+", "+"), ("-", "-") },
+        new[] { ("*", "*"), ("/", "/"), ("%", "%") },
+    };
+
+    private Expr ParseBinary()
+    {
+        // Precedence climbing over explicit stacks, so long chains don't nest calls.
+        var operands = new Stack<Expr>();
+        var operators = new Stack<(string Op, int Level)>();
+        operands.Push(ParseExponent());
+
+        while (PeekBinaryOperator(out var op, out var level))
+        {
+            Advance();
+            while (operators.Count > 0 && operators.Peek().Level >= level)
+                ReduceBinary(operands, operators);
+            operators.Push((op, level));
+            operands.Push(ParseExponent());
+        }
+
+        while (operators.Count > 0)
+            ReduceBinary(operands, operators);
+        return operands.Pop();
+    }
+
+    private static void ReduceBinary(Stack<Expr> operands, Stack<(string Op, int Level)> operators)
+    {
+        var right = operands.Pop();
+        var left = operands.Pop();
+        operands.Push(Binary(left, operators.Pop().Op, right));
+    }
+
+    // >>> shifts the operand as an unsigned 32-bit int; Python's >> has no unsigned
+    // form, so the operand is first taken modulo 2**32 (% binds tighter than >> in
+    // every target, where a & mask would not).
+    private static Expr Binary(Expr left, string op, Expr right) => op switch
+    {
+        "instanceof" => new FunctionCall("isinstance", new List<Expr> { left, right }),
+        ">>>" => new BinaryOp(new BinaryOp(left, "%", new Literal(4294967296L)), ">>", right),
+        _ => new BinaryOp(left, op, right),
+    };
+
+    private bool PeekBinaryOperator(out string op, out int level)
+    {
+        var token = Peek();
+        if (token.Type is TokenType.PUNCTUATOR or TokenType.KEYWORD)
+        {
+            for (level = 0; level < BinaryLevels.Length; level++)
+            {
+                foreach (var (js, ir) in BinaryLevels[level])
+                {
+                    if (token.Value == js)
+                    {
+                        op = ir;
+                        return true;
+                    }
+                }
+            }
+        }
+        op = "";
+        level = -1;
+        return false;
+    }
+
+    private Expr ParseExponent()
+    {
+        var expr = ParseUnary();
+        if (MatchPunct("**"))
+            return new BinaryOp(expr, "**", ParseExponent()); // right-associative
+        return expr;
+    }
+
+    private Expr ParseUnary()
+    {
+        if (MatchPunct("!"))
+            return new UnaryOp("not", ParseUnary());
+        if (MatchPunct("-"))
+            return new UnaryOp("-", ParseUnary());
+        if (MatchPunct("+"))
+            return new UnaryOp("+", ParseUnary());
+        if (MatchKeyword("typeof"))
+            return new FunctionCall("type", new List<Expr> { ParseUnary() });
+        return ParsePostfix();
+    }
+
+    private Expr ParsePostfix()
+    {
+        var expr = ParsePrimary();
+
+        while (true)
+        {
+            if (MatchPunct("."))
+            {
+                var name = Advance();
+                if (name.Type is not (TokenType.IDENTIFIER or TokenType.KEYWORD))
+                    throw new Exception($"Expected property name at {name}");
+
+                if (MatchPunct("("))
+                {
+                    var args = ParseArguments();
+                    expr = (expr, name.Value, args.Count) switch
+                    {
+                        (Variable { Name: "console" }, "log" or "info" or "warn" or "error", _) => new Intrinsic("print", args),
+                        // Object.keys(o) is o.keys(), and so on
+                        (Variable { Name: "Object" }, "keys" or "values", 1) => new MethodCall(args[0], name.Value, new List<Expr>()),
+                        (Variable { Name: "Object" }, "entries", 1) => new MethodCall(args[0], "items", new List<Expr>()),
+                        _ => new MethodCall(expr, name.Value, args),
+                    };
+                }
+                else if (name.Value == "length")
+                {
+                    expr = new FunctionCall("len", new List<Expr> { expr });
+                }
+                else
+                {
+                    expr = new Intrinsic("getattr", new List<Expr> { expr, new Literal(name.Value) });
+                }
+            }
+            else if (MatchPunct("["))
+            {
+                var index = ParseExpression();
+                ConsumePunct("]");
+                expr = new MethodCall(expr, "__getitem__", new List<Expr> { index });
+            }
+            else if (CheckPunct("(") && expr is Variable v)
+            {
+                Advance();
+                expr = new FunctionCall(v.Name, ParseArguments());
+            }
+            else if (CheckPunct("?."))
+            {
+                throw new NotSupportedException($"Optional chaining is not supported (line {Peek().Line})");
+            }
+            else
+            {
+                break;
+            }
+        }
+
+        return expr;
+    }
+
+    // After the opening paren; consumes the closing one.
+    private List<Expr> ParseArguments()
+    {
+        var args = new List<Expr>();
+        if (!CheckPunct(")"))
+        {
+            do
+            {
+                if (CheckPunct("..."))
+                    throw new NotSupportedException($"Spread arguments are not supported (line {Peek().Line})");
+                args.Add(ParseExpression());
+            } while (MatchPunct(","));
+        }
+        ConsumePunct(")");
+        return args;
+    }
+
+    private Expr ParsePrimary()
+    {
+        var token = Peek();
+        switch (token.Type)
+        {
+            case TokenType.NUMBER:
+                Advance();
+                return ParseNumber(token);
+
+            case TokenType.STRING:
+                Advance();
+                return new Literal(token.Value);
+
+            case TokenType.TEMPLATE:
+                Advance();
+                return ParseTemplate(token);
+
+            case TokenType.IDENTIFIER:
+                Advance();
+                return new Variable(token.Value);
+
+            case TokenType.KEYWORD:
+                switch (token.Value)
+                {
+                    case "true" or "false":
+                        Advance();
+                        return new Literal(token.Value == "true");
+                    case "null" or "undefined":
+                        Advance();
+                        return new Literal(null);
+                    case "this":
+                        Advance();
+                        return new Variable("self");
+                    case "new":
+                    {
+                        // new X(args) constructs like a call, as in Python.
+                        Advance();
+                        var className = Consume(TokenType.IDENTIFIER, "Expected class name after 'new'").Value;
+                        var args = MatchPunct("(") ? ParseArguments() : new List<Expr>();
+                        return new FunctionCall(className, args);
+                    }
+                }
+                break;
+
+            case TokenType.PUNCTUATOR:
+                switch (token.Value)
+                {
+                    case "(":
+                    {
+                        Advance();
+                        var expr = ParseExpression();
+                        ConsumePunct(")");
+                        return expr;
+                    }
+                    case "[":
+                    {
+                        Advance();
+                        var elements = new List<Expr>();
+                        while (!CheckPunct("]") && !IsAtEnd())
+                        {
+                            elements.Add(ParseExpression());
+                            if (!MatchPunct(","))
+                                break;
+                        }
+                        ConsumePunct("]");
+                        return new ListLiteral(elements);
+                    }
+                    case "{":
+                        Advance();
+                        return ParseObject();
+                }
+                break;
+        }
+
+        throw new Exception($"Unexpected token: {token}");
+    }
+
+    // After the opening brace: { a: 1, "b": 2, [k]: v, c }
+    private DictLiteral ParseObject()
+    {
+        var items = new List<(Expr, Expr)>();
+        while (!CheckPunct("}") && !IsAtEnd())
+        {
+            var keyToken = Advance();
+            Expr key;
+            switch (keyToken.Type)
+            {
+                case TokenType.IDENTIFIER or TokenType.KEYWORD when !CheckPunct(":"):
+                    // Shorthand { a } means { a: a }
+                    items.Add((new Literal(keyToken.Value), new Variable(keyToken.Value)));
+                    if (MatchPunct(","))
+                        continue;
+                    ConsumePunct("}");
+                    return new DictLiteral(items);
+                case TokenType.IDENTIFIER or TokenType.KEYWORD:
+                    key = new Literal(keyToken.Value);
+                    break;
+                case TokenType.STRING:
+                    key = new Literal(keyToken.Value);
+                    break;
+                case TokenType.NUMBER:
+                    key = ParseNumber(keyToken);
+                    break;
+                case TokenType.PUNCTUATOR when keyToken.Value == "[":
+                    key = ParseExpression();
+                    ConsumePunct("]");
+                    break;
+                default:
+                    throw new Exception($"Unexpected token in object literal: {keyToken}");
+            }
+
+            ConsumePunct(":");
+            items.Add((key, ParseExpression()));
+            if (!MatchPunct(","))
+                break;
+        }
+        ConsumePunct("}");
+        return new DictLiteral(items);
+    }
+
+    // Typed as in every frontend (see NumericLiteral); the lexer has already dropped
+    // the n of a BigInt.
+    private static Literal ParseNumber(Token token) =>
+        NumericLiteral.Parse(token.Value) ?? throw new NotSupportedException($"Invalid number '{token.Value}' (line {token.Line})");
+
+    // `a ${b} c` is a StringInterpolation: placeholders that are plain names become
+    // StringPartVariables and any other expression a StringPartExpr.
+    private static Expr ParseTemplate(Token token)
+    {
+        var raw = token.Value;
+        var pieces = new List<Expr>();
+        var text = new StringBuilder();
+        var source = new StringText(raw);
+        int line = token.Line, lineStart = 0;
+
+        int i = 0;
+        while (i < raw.Length)
+        {
+            if (raw[i] == '\\' && i + 1 < raw.Length)
+            {
+                i = JsEscapes.Append(source, i, text, ref line, ref lineStart);
+                continue;
+            }
+            if (raw[i] == '$' && i + 1 < raw.Length && raw[i + 1] == '{')
+            {
+                int depth = 1, end = i + 2;
+                while (end < raw.Length && depth > 0)
+                {
+                    if (raw[end] == '{') depth++;
+                    else if (raw[end] == '}') depth--;
+                    end++;
+                }
+
+                if (text.Length > 0)
+                    pieces.Add(new Literal(text.ToString()));
+                text.Clear();
+
+                var inner = raw.Substring(i + 2, end - i - 3);
+                pieces.Add(new JsParser(new JsLexer<StringText>(new StringText(inner)).Tokenize()).ParseStandaloneExpression());
+                i = end;
+                continue;
+            }
+            text.Append(raw[i]);
+            i++;
+        }
+        if (text.Length > 0)
+            pieces.Add(new Literal(text.ToString()));
+
+        return new StringInterpolation(pieces
+            .Select(p => p switch
+            {
+                Literal { Value: string value } => new StringPartLiteral(value),
+                Variable v => new StringPartVariable(v.Name),
+                _ => (StringPart)new StringPartExpr(p),
+            })
+            .ToList());
+    }
+
+    private bool CheckPunct(string value)
+    {
+        var token = Peek();
+        return token.Type == TokenType.PUNCTUATOR && token.Value == value;
+    }
+
+    private bool PeekPunct(int offset, string value)
+    {
+        int index = _current + offset;
+        return index < _tokens.Count && _tokens[index].Type == TokenType.PUNCTUATOR && _tokens[index].Value == value;
+    }
+
+    private bool MatchPunct(params string[] values)
+    {
+        foreach (var value in values)
+        {
+            if (CheckPunct(value))
+            {
+                Advance();
+                return true;
+            }
+        }
+        return false;
+    }
+
+    private Token ConsumePunct(string value)
+    {
+        if (CheckPunct(value)) return Advance();
+        throw new Exception($"Expected '{value}' at {Peek()}");
+    }
+
+    private bool MatchKeyword(string value)
+    {
+        if (Peek().Type != TokenType.KEYWORD || Peek().Value != value)
+            return false;
+        Advance();
+        return true;
+    }
+
+    private Token ConsumeKeyword(string value)
+    {
+        if (Peek().Type == TokenType.KEYWORD && Peek().Value == value) return Advance();
+        throw new Exception($"Expected '{value}' at {Peek()}");
+    }
+
+    // Contextual keywords (of, as) are identifiers to the lexer.
+    private bool MatchIdentifier(string value)
+    {
+        if (Peek().Type != TokenType.IDENTIFIER || Peek().Value != value)
+            return false;
+        Advance();
+        return true;
+    }
+
+    private void ConsumeIdentifier(string value)
+    {
+        if (!MatchIdentifier(value))
+            throw new Exception($"Expected '{value}' at {Peek()}");
+    }
+
+    private void ConsumeSemicolonIfPresent()
+    {
+        if (CheckPunct(";")) Advance();
+    }
+
+    private bool Check(TokenType type)
+    {
+        if (IsAtEnd()) return false;
+        return Peek().Type == type;
+    }
+
+    private bool Match(TokenType type)
+    {
+        if (!Check(type)) return false;
+        Advance();
+        return true;
+    }
+
+    private Token Advance()
+    {
+        if (!IsAtEnd()) _current++;
+        return Previous();
+    }
+
+    private bool IsAtEnd() => Peek().Type == TokenType.EOF;
+
+    private Token Peek() => _tokens[_current];
+
+    private Token Previous() => _tokens[_current - 1];
+
+    private Token Consume(TokenType type, string message)
+    {
+        if (Check(type)) return Advance();
+        throw new Exception($"{message} at {Peek()}");
+    }
+}
@@ -0,0 +1,209 @@
+namespace PLT.CORE.Frontends.Python;
+
+internal readonly record struct SourceChunk(int Start, int Length, int FirstLine);
+
+// Finds places where a module can be cut so each piece lexes and parses on its own
+// and the concatenated statements equal a sequential parse.
+//
+// A split point is the start of a line that begins at column 0 with an identifier,
+// keyword or decorator, while the lexer is outside brackets, strings and comments.
+// The scan mirrors PythonLexer's rules (including its handling of prefixed strings,
+// f-string braces and line counting) rather than Python's, because it is the lexer's
+// state that has to be identical on both sides of the cut. Lines that continue the
+// previous statement are never split points:
+//   - else/elif/except/finally clauses
+//   - the statement after a decorator
+//   - a string literal (the parser joins adjacent strings across newlines)
+//   - anything after a line ending in '\', '|', '^' or '&'
+internal static class PythonChunker
+{
+    private static readonly HashSet<string> StringPrefixes = new()
+    {
+        "b", "r", "f", "br", "rb", "fr", "rf", "B", "R", "F", "BR", "RB", "FR", "RF"
+    };
+
+    private static readonly HashSet<string> ContinuationKeywords = new()
+    {
+        "else", "elif", "except", "finally"
+    };
+
+    public static List<(int Offset, int Line)> FindSplitPoints<TText>(TText source)
+        where TText : struct, ISourceText
+    {
+        var points = new List<(int, int)>();
+        int position = 0;
+        int line = 1;
+        int bracketDepth = 0;
+        bool pendingDecorator = false;
+        char lastSignificant = '\n';
+
+        while (position < source.Length)
+        {
+            var ch = source[position];
+
+            if (ch == '\n')
+            {
+                bool continues = lastSignificant is '\\' or '|' or '^' or '&';
+                position++;
+                line++;
+                lastSignificant = '\n';
+
+                if (bracketDepth != 0 || continues || position >= source.Length)
+                    continue;
+
+                int first = position;
+                while (first < source.Length && source[first] == ' ')
+                    first++;
+                if (first >= source.Length || source[first] is '\n' or '\r' or '#')
+                    continue;
+
+                if (source[first] == '@')
+                {
+                    // Cut before the first of a run of decorators, never between them.
+                    if (first == position && !pendingDecorator)
+                        points.Add((position, line));
+                    pendingDecorator = true;
+                    continue;
+                }
+
+                bool wasDecorated = pendingDecorator;
+                pendingDecorator = false;
+                if (first == position && !wasDecorated && StartsIndependentStatement(source, position))
+                    points.Add((position, line));
+                continue;
+            }
+
+            if (ch == '#')
+            {
+                while (position < source.Length && source[position] != '\n')
+                    position++;
+                continue;
+            }
+
+            if (ch == '"' || ch == '\'')
+            {
+                position = SkipString(source, position, isFString: false);
+                lastSignificant = ch;
+                continue;
+            }
+
+            if (char.IsDigit(ch))
+            {
+                while (position < source.Length && (source[position] == '.' || source.IsLetterOrDigit(position, out _)))
+                    position++;
+                lastSignificant = '0';
+                continue;
+            }
+
+            if (ch == '_' || source.IsLetter(position, out _))
+            {
+                int start = position;
+                position = SkipIdentifier(source, position);
+                lastSignificant = 'a';
+
+                if (position < source.Length && (source[position] == '"' || source[position] == '\'')
+                    && StringPrefixes.Contains(source.Slice(start, position - start)))
+                {
+                    bool isFString = source.Slice(start, position - start).IndexOfAny(new[] { 'f', 'F' }) >= 0;
+                    position = SkipString(source, position, isFString);
+                }
+                continue;
+            }
+
+            if (ch == '(' || ch == '[' || ch == '{')
+                bracketDepth++;
+            else if (ch == ')' || ch == ']' || ch == '}')
+                bracketDepth--;
+
+            if (!char.IsWhiteSpace(ch))
+                lastSignificant = ch;
+            position++;
+        }
+
+        return points;
+    }
+
+    // Groups split points into at most maxChunks pieces of at least minChunkLength chars.
+    public static List<SourceChunk> Chunk<TText>(TText source, int maxChunks, int minChunkLength)
+        where TText : struct, ISourceText
+    {
+        var chunks = new List<SourceChunk>();
+        var target = Math.Max(minChunkLength, source.Length / Math.Max(1, maxChunks));
+
+        int start = 0;
+        int firstLine = 1;
+        foreach (var (offset, line) in FindSplitPoints(source))
+        {
+            if (offset - start < target || source.Length - offset < minChunkLength)
+                continue;
+            chunks.Add(new SourceChunk(start, offset - start, firstLine));
+            start = offset;
+            firstLine = line;
+        }
+        chunks.Add(new SourceChunk(start, source.Length - start, firstLine));
+        return chunks;
+    }
+
+    private static bool StartsIndependentStatement<TText>(TText source, int position)
+        where TText : struct, ISourceText
+    {
+        if (source[position] != '_' && !source.IsLetter(position, out _))
+            return false;
+
+        int end = SkipIdentifier(source, position);
+        var word = source.Slice(position, end - position);
+
+        if (ContinuationKeywords.Contains(word))
+            return false;
+        if (end < source.Length && (source[end] == '"' || source[end] == '\'') && StringPrefixes.Contains(word))
+            return false;
+        return true;
+    }
+
+    private static int SkipIdentifier<TText>(TText source, int position)
+        where TText : struct, ISourceText
+    {
+        while (position < source.Length)
+        {
+            int width = 1;
+            if (source[position] != '_' && !source.IsLetterOrDigit(position, out width))
+                break;
+            position += width;
+        }
+        return position;
+    }
+
+    // Same termination rules as PythonLexer.ReadString; returns the index after the closing quote.
+    private static int SkipString<TText>(TText source, int position, bool isFString)
+        where TText : struct, ISourceText
+    {
+        var quote = source[position];
+        position++;
+
+        while (position < source.Length && source[position] != quote)
+        {
+            if (source[position] == '\\' && position + 1 < source.Length)
+            {
+                position += 2;
+                continue;
+            }
+
+            if (isFString && source[position] == '{')
+            {
+                int braceDepth = 0;
+                do
+                {
+                    if (source[position] == '{') braceDepth++;
+                    else if (source[position] == '}') braceDepth--;
+                    position++;
+                } while (position < source.Length && braceDepth > 0);
+                continue;
+            }
+
+            position++;
+        }
+
+        if (position < source.Length) position++;
+        return position;
+    }
+}
@@ -1,16 +1,109 @@
 using System.Text.RegularExpressions;
 using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
 
 namespace PLT.CORE.Frontends.Python;
 
 public static class PythonFrontend
 {
-    public static IrProgram Parse(string source)
+    // Below this size a module is parsed on the calling thread; the split scan and
+    // task scheduling cost more than they save.
+    public const int ParallelThreshold = 32 * 1024;
+    private const int MinChunkLength = 8 * 1024;
+
+    public static IrProgram Parse(string source) =>
+        Parse(source, parallel: ShouldParallelize(source.Length));
+
+    public static IrProgram Parse(string source, bool parallel) =>
+        Parse(new StringText(source), parallel);
+
+    // Lexes the file straight out of a read-only memory mapping instead of decoding
+    // it into a string first; only token text is materialized.
+    public static IrProgram ParseFile(string path) =>
+        ParseFile(path, parallel: ShouldParallelize(new FileInfo(path).Length));
+
+    public static IrProgram ParseFile(string path, bool parallel)
+    {
+        if (!MappedSourceFile.IsUtf8Compatible(path))
+            return Parse(File.ReadAllText(path), parallel);
+
+        using var file = new MappedSourceFile(path);
+        return Parse(file.Text, parallel);
+    }
+
+    private static bool ShouldParallelize(long length) =>
+        length >= ParallelThreshold && Environment.ProcessorCount > 1;
+
+    private static IrProgram Parse<TText>(TText source, bool parallel)
+        where TText : struct, ISourceText
+    {
+        if (parallel)
+        {
+            var chunks = PythonChunker.Chunk(source, Environment.ProcessorCount * 2, MinChunkLength);
+            if (chunks.Count > 1)
+                return ParseChunks(source, chunks);
+        }
+
+        List<Token> tokens;
+        using (var phase = PltTelemetry.StartPhase("lex.py"))
+        {
+            var lexer = new PythonLexer<TText>(source);
+            tokens = lexer.Tokenize();
+            phase.RecordTokens(tokens.Count);
+        }
+
+        using (var phase = PltTelemetry.StartPhase("parse.py"))
+        {
+            var parser = new PythonParser(tokens);
+            var program = parser.ParseProgram();
+            phase.RecordIrNodes(program);
+            return program;
+        }
+    }
+
+    // Lexes and parses each chunk on the thread pool and stitches the statements back
+    // together in source order. Chunks come from PythonChunker, so the result matches a
+    // sequential parse; if any chunk fails, the sequential parse is rerun so errors are
+    // reported exactly as before.
+    private static IrProgram ParseChunks<TText>(TText source, List<SourceChunk> chunks)
+        where TText : struct, ISourceText
     {
-        var lexer = new PythonLexer(source);
-        var tokens = lexer.Tokenize();
-        var parser = new PythonParser(tokens);
-        return parser.ParseProgram();
+        using var phase = PltTelemetry.StartPhase("parse.py");
+        phase.SetTag("chunks", chunks.Count);
+
+        var results = new IReadOnlyList<Stmt>[chunks.Count];
+        try
+        {
+            Parallel.For(0, chunks.Count, i =>
+            {
+                var chunk = chunks[i];
+                List<Token> tokens;
+                using (var lexPhase = PltTelemetry.StartPhase("lex.py"))
+                {
+                    var lexer = new PythonLexer<TText>(source, chunk.Start, chunk.Length, chunk.FirstLine);
+                    tokens = lexer.Tokenize();
+                    lexPhase.RecordTokens(tokens.Count);
+                }
+
+                using (PltTelemetry.StartPhase("parse.py.chunk"))
+                {
+                    results[i] = new PythonParser(tokens).ParseProgram().Body;
+                }
+            });
+        }
+        catch (AggregateException)
+        {
+            phase.Dispose();
+            return Parse(source, parallel: false);
+        }
+
+        var statements = new List<Stmt>(results.Sum(r => r.Count));
+        foreach (var body in results)
+            statements.AddRange(body);
+
+        var program = new IrProgram(statements);
+        phase.RecordIrNodes(program);
+        return program;
     }
 }
 
@@ -22,6 +115,7 @@ internal enum TokenType
     DEDENT,
     IDENTIFIER,
     STRING,
+    FSTRING,
     NUMBER,
     BOOL,
     NONE,
@@ -77,9 +171,10 @@ internal enum TokenType
 
 internal record Token(TokenType Type, string Value, int Line, int Col);
 
-internal class PythonLexer
+internal class PythonLexer<TText> where TText : struct, ISourceText
 {
-    private readonly string _source;
+    private readonly TText _source;
+    private readonly int _end;
     private int _position = 0;
     private int _line = 1;
     private int _col = 1;
@@ -87,17 +182,26 @@ internal class PythonLexer
     private int _indentLevel = 0;
     private int _bracketDepth = 0;  // Track nested brackets/parens/braces
 
-    public PythonLexer(string source)
+    public PythonLexer(TText source)
+        : this(source, 0, source.Length, 1)
+    {
+    }
+
+    // Lexes source[start..start+length) as if it were a whole module starting on firstLine.
+    public PythonLexer(TText source, int start, int length, int firstLine)
     {
         _source = source;
+        _position = start;
+        _end = start + length;
+        _line = firstLine;
     }
 
     public List<Token> Tokenize()
     {
-        while (_position < _source.Length)
+        while (_position < _end)
         {
             SkipWhitespaceExceptNewline();
-            if (_position >= _source.Length) break;
+            if (_position >= _end) break;
 
             var ch = _source[_position];
 
@@ -129,7 +233,7 @@ internal class PythonLexer
                 continue;
             }
 
-            if (char.IsLetter(ch) || ch == '_')
+            if (ch == '_' || _source.IsLetter(_position, out _))
             {
                 ReadIdentifierOrKeyword();
                 continue;
@@ -147,7 +251,7 @@ internal class PythonLexer
 
     private void SkipWhitespaceExceptNewline()
     {
-        while (_position < _source.Length && char.IsWhiteSpace(_source[_position]) && _source[_position] != '\n')
+        while (_position < _end && char.IsWhiteSpace(_source[_position]) && _source[_position] != '\n')
         {
             _position++;
             _col++;
@@ -156,7 +260,7 @@ internal class PythonLexer
 
     private void SkipComment()
     {
-        while (_position < _source.Length && _source[_position] != '\n')
+        while (_position < _end && _source[_position] != '\n')
             _position++;
     }
 
@@ -167,7 +271,7 @@ internal class PythonLexer
             return;
 
         int spaces = 0;
-        while (_position < _source.Length && _source[_position] == ' ')
+        while (_position < _end && _source[_position] == ' ')
         {
             spaces++;
             _position++;
@@ -191,158 +295,177 @@ internal class PythonLexer
     {
         var quote = _source[_position];
         _position++;
-        var sb = new System.Text.StringBuilder();
         bool isFString = prefix != null && (prefix == "f" || prefix == "F" || prefix.Contains('f') || prefix.Contains('F'));
 
-        while (_position < _source.Length && _source[_position] != quote)
+        // Unescaped text is copied in runs straight from the source, so a string
+        // without escapes costs a single Slice.
+        System.Text.StringBuilder? sb = null;
+        int runStart = _position;
+
+        while (_position < _end && _source[_position] != quote)
         {
-            if (_source[_position] == '\\' && _position + 1 < _source.Length)
+            if (_source[_position] == '\\' && _position + 1 < _end)
             {
+                sb ??= new System.Text.StringBuilder();
+                sb.Append(_source.Slice(runStart, _position - runStart));
                 _position++;
                 var escaped = _source[_position];
-                sb.Append(escaped switch
+                if (escaped < 0x80)
                 {
-                    'n' => '\n',
-                    't' => '\t',
-                    'r' => '\r',
-                    '\\' => '\\',
-                    '"' => '"',
-                    '\'' => '\'',
-                    _ => escaped
-                });
+                    sb.Append(escaped switch
+                    {
+                        'n' => '\n',
+                        't' => '\t',
+                        'r' => '\r',
+                        '\\' => '\\',
+                        '"' => '"',
+                        '\'' => '\'',
+                        _ => escaped
+                    });
+                    runStart = _position + 1;
+                }
+                else
+                {
+                    // Unknown escape of a non-ASCII character: kept verbatim with the next run
+                    runStart = _position;
+                }
             }
-            else if (isFString && _source[_position] == '{')
+            else if (isFString && (_source[_position] == '{' || _source[_position] == '}'))
             {
-                // For f-strings, skip over the embedded expression
-                // We'll just include the whole {...} as part of the string for now
-                int braceDepth = 0;
-                do
+                // Replacement fields are kept as written, braces and all, for the parser
+                // to split; {{ and }} stay doubled so they aren't taken for a field.
+                if (_position + 1 < _end && _source[_position + 1] == _source[_position])
                 {
-                    if (_source[_position] == '{') braceDepth++;
-                    else if (_source[_position] == '}') braceDepth--;
-                    sb.Append(_source[_position]);
                     _position++;
                     _col++;
-                } while (_position < _source.Length && braceDepth > 0);
-                _position--; // Back up one since the loop will increment
-                _col--;
-            }
-            else
-            {
-                sb.Append(_source[_position]);
+                }
+                else if (_source[_position] == '{')
+                {
+                    int braceDepth = 0;
+                    do
+                    {
+                        if (_source[_position] == '{') braceDepth++;
+                        else if (_source[_position] == '}') braceDepth--;
+                        _position++;
+                        _col++;
+                    } while (_position < _end && braceDepth > 0 && _source[_position] != quote);
+                    _position--; // Back up one since the loop will increment
+                    _col--;
+                }
             }
             _position++;
             _col++;
         }
 
-        if (_position < _source.Length) _position++; // closing quote
+        var tail = _source.Slice(runStart, _position - runStart);
+        var value = sb == null ? tail : sb.Append(tail).ToString();
+
+        if (_position < _end) _position++; // closing quote
         // For prefixed strings like b"...", the token value just includes the string content
-        _tokens.Add(new Token(TokenType.STRING, sb.ToString(), _line, _col));
+        _tokens.Add(new Token(isFString ? TokenType.FSTRING : TokenType.STRING, value, _line, _col));
     }
 
     private void ReadNumber()
     {
-        var sb = new System.Text.StringBuilder();
+        int start = _position;
         
         // Check for hex (0x), octal (0o), or binary (0b) literals
-        if (_position < _source.Length && _source[_position] == '0' && _position + 1 < _source.Length)
+        if (_position < _end && _source[_position] == '0' && _position + 1 < _end)
         {
             char next = _source[_position + 1];
             if (next == 'x' || next == 'X')  // Hex
             {
-                sb.Append(_source[_position++]);
-                sb.Append(_source[_position++]);
+                _position++;
+                _position++;
                 _col += 2;
-                while (_position < _source.Length && (char.IsDigit(_source[_position]) || 
+                while (_position < _end && (char.IsDigit(_source[_position]) || _source[_position] == '_' ||
                        ('a' <= _source[_position] && _source[_position] <= 'f') ||
                        ('A' <= _source[_position] && _source[_position] <= 'F')))
                 {
-                    sb.Append(_source[_position++]);
+                    _position++;
                     _col++;
                 }
-                _tokens.Add(new Token(TokenType.NUMBER, sb.ToString(), _line, _col));
+                _tokens.Add(new Token(TokenType.NUMBER, _source.Slice(start, _position - start), _line, _col));
                 return;
             }
             else if (next == 'o' || next == 'O')  // Octal
             {
-                sb.Append(_source[_position++]);
-                sb.Append(_source[_position++]);
+                _position++;
+                _position++;
                 _col += 2;
-                while (_position < _source.Length && _source[_position] >= '0' && _source[_position] <= '7')
+                while (_position < _end && ((_source[_position] >= '0' && _source[_position] <= '7') || _source[_position] == '_'))
                 {
-                    sb.Append(_source[_position++]);
+                    _position++;
                     _col++;
                 }
-                _tokens.Add(new Token(TokenType.NUMBER, sb.ToString(), _line, _col));
+                _tokens.Add(new Token(TokenType.NUMBER, _source.Slice(start, _position - start), _line, _col));
                 return;
             }
             else if (next == 'b' || next == 'B')  // Binary
             {
-                sb.Append(_source[_position++]);
-                sb.Append(_source[_position++]);
+                _position++;
+                _position++;
                 _col += 2;
-                while (_position < _source.Length && (_source[_position] == '0' || _source[_position] == '1'))
+                while (_position < _end && (_source[_position] == '0' || _source[_position] == '1' || _source[_position] == '_'))
                 {
-                    sb.Append(_source[_position++]);
+                    _position++;
                     _col++;
                 }
-                _tokens.Add(new Token(TokenType.NUMBER, sb.ToString(), _line, _col));
+                _tokens.Add(new Token(TokenType.NUMBER, _source.Slice(start, _position - start), _line, _col));
                 return;
             }
         }
         
-        // Regular decimal number (including scientific notation)
-        while (_position < _source.Length && (char.IsDigit(_source[_position]) || _source[_position] == '.'))
+        // Regular decimal number (including scientific notation), with _ separators
+        while (_position < _end && (char.IsDigit(_source[_position]) || _source[_position] == '.' || _source[_position] == '_'))
         {
-            sb.Append(_source[_position]);
             _position++;
             _col++;
         }
         
         // Handle scientific notation (e or E)
-        if (_position < _source.Length && (_source[_position] == 'e' || _source[_position] == 'E'))
+        if (_position < _end && (_source[_position] == 'e' || _source[_position] == 'E'))
         {
-            sb.Append(_source[_position]);
             _position++;
             _col++;
             
             // Optional + or - sign
-            if (_position < _source.Length && (_source[_position] == '+' || _source[_position] == '-'))
+            if (_position < _end && (_source[_position] == '+' || _source[_position] == '-'))
             {
-                sb.Append(_source[_position]);
                 _position++;
                 _col++;
             }
             
             // Exponent digits
-            while (_position < _source.Length && char.IsDigit(_source[_position]))
+            while (_position < _end && char.IsDigit(_source[_position]))
             {
-                sb.Append(_source[_position]);
                 _position++;
                 _col++;
             }
         }
         
-        _tokens.Add(new Token(TokenType.NUMBER, sb.ToString(), _line, _col));
+        _tokens.Add(new Token(TokenType.NUMBER, _source.Slice(start, _position - start), _line, _col));
     }
 
     private void ReadIdentifierOrKeyword()
     {
-        var sb = new System.Text.StringBuilder();
-        while (_position < _source.Length && (char.IsLetterOrDigit(_source[_position]) || _source[_position] == '_'))
+        int start = _position;
+        while (_position < _end)
         {
-            sb.Append(_source[_position]);
-            _position++;
+            int width = 1;
+            if (_source[_position] != '_' && !_source.IsLetterOrDigit(_position, out width))
+                break;
+            _position += width;
             _col++;
         }
 
-        var text = sb.ToString();
+        var text = _source.Slice(start, _position - start);
         
         // Check if this is a string prefix (b, r, f, br, rb, fr, rf, etc.)
         if ((text == "b" || text == "r" || text == "f" || text == "br" || text == "rb" || 
              text == "fr" || text == "rf" || text == "B" || text == "R" || text == "F" || 
              text == "BR" || text == "RB" || text == "FR" || text == "RF") &&
-            _position < _source.Length && (_source[_position] == '"' || _source[_position] == '\''))
+            _position < _end && (_source[_position] == '"' || _source[_position] == '\''))
         {
             // This is a string with a prefix - read the string and return it with the prefix
             ReadString(text);
@@ -361,57 +484,54 @@ internal class PythonLexer
     }
 
     private bool ReadOperator()
-                {
-            // Check for three-character operators first
-            if (_position + 2 < _source.Length)
+    {
+        // Check for three-character operators first
+        if (_position + 2 < _end)
+        {
+            var type3 = (_source[_position], _source[_position + 1], _source[_position + 2]) switch
             {
-                var threeChar = _source.Substring(_position, 3);
-                var type3 = threeChar switch
-                {
-                    "**=" => TokenType.STARSTAREQ,
-                    "//=" => TokenType.SLASHSLASHEQ,
-                    "<<=" => TokenType.LSHIFTEQ,
-                    ">>=" => TokenType.RSHIFTEQ,
-                    _ => (TokenType?)null
-                };
+                ('*', '*', '=') => TokenType.STARSTAREQ,
+                ('/', '/', '=') => TokenType.SLASHSLASHEQ,
+                ('<', '<', '=') => TokenType.LSHIFTEQ,
+                ('>', '>', '=') => TokenType.RSHIFTEQ,
+                _ => (TokenType?)null
+            };
 
-                if (type3.HasValue)
-                {
-                    _tokens.Add(new Token(type3.Value, threeChar, _line, _col));
-                    _position += 3;
-                    _col += 3;
-                    return true;
-                }
+            if (type3.HasValue)
+            {
+                _tokens.Add(new Token(type3.Value, _source.Slice(_position, 3), _line, _col));
+                _position += 3;
+                _col += 3;
+                return true;
             }
-        if (_position + 1 < _source.Length)
-        {
-            var twoChar = _source.Substring(_position, 2);
-            var type = twoChar switch
-            {
-                "==" => TokenType.EQEQ,
-                "!=" => TokenType.NOTEQ,
-                "<=" => TokenType.LTEQ,
-                ">=" => TokenType.GTEQ,
-                "+=" => TokenType.PLUSEQ,
-                "-=" => TokenType.MINUSEQ,
-                "*=" => TokenType.STAREQ,
-                "/=" => TokenType.SLASHEQ,
-                                "%=" => TokenType.PERCENTEQ,
-                                "|=" => TokenType.PIPEEQ,
-                                "&=" => TokenType.AMPEQ,
-                                "^=" => TokenType.CARETEQ,
-                "**" => TokenType.STARSTAR,
-                "//" => TokenType.SLASHSLASH,
-                "<<" => TokenType.LTLT,
-                ">>" => TokenType.GTGT,
-                "and" => TokenType.AND,
-                "or" => TokenType.OR,
+        }
+
+        if (_position + 1 < _end)
+        {
+            var type = (_source[_position], _source[_position + 1]) switch
+            {
+                ('=', '=') => TokenType.EQEQ,
+                ('!', '=') => TokenType.NOTEQ,
+                ('<', '=') => TokenType.LTEQ,
+                ('>', '=') => TokenType.GTEQ,
+                ('+', '=') => TokenType.PLUSEQ,
+                ('-', '=') => TokenType.MINUSEQ,
+                ('*', '=') => TokenType.STAREQ,
+                ('/', '=') => TokenType.SLASHEQ,
+                ('%', '=') => TokenType.PERCENTEQ,
+                ('|', '=') => TokenType.PIPEEQ,
+                ('&', '=') => TokenType.AMPEQ,
+                ('^', '=') => TokenType.CARETEQ,
+                ('*', '*') => TokenType.STARSTAR,
+                ('/', '/') => TokenType.SLASHSLASH,
+                ('<', '<') => TokenType.LTLT,
+                ('>', '>') => TokenType.GTGT,
                 _ => (TokenType?)null
             };
 
             if (type.HasValue)
             {
-                _tokens.Add(new Token(type.Value, twoChar, _line, _col));
+                _tokens.Add(new Token(type.Value, _source.Slice(_position, 2), _line, _col));
                 _position += 2;
                 _col += 2;
                 return true;
@@ -641,21 +761,74 @@ internal class PythonParser
     private Stmt ParseImportStatement()
     {
         Consume(TokenType.KEYWORD, "Expected 'import'");
-        // Skip the entire import line
-        while (!Check(TokenType.NEWLINE) && !IsAtEnd())
-            Advance();
+
+        var names = new List<(string Name, string? Alias)>();
+        do
+        {
+            var module = ParseDottedName();
+            names.Add((module, ParseImportAlias()));
+        } while (Match(TokenType.COMMA));
+
         SkipNewlines();
-        return null!; // Return empty statement
+        return new ImportStmt(null, names);
     }
 
     private Stmt ParseFromImportStatement()
     {
         Consume(TokenType.KEYWORD, "Expected 'from'");
-        // Skip the entire from...import line
-        while (!Check(TokenType.NEWLINE) && !IsAtEnd())
-            Advance();
+
+        // Relative imports: from . import x, from ..pkg import y
+        var module = new System.Text.StringBuilder();
+        while (Match(TokenType.DOT))
+            module.Append('.');
+        if (!(Check(TokenType.KEYWORD) && Peek().Value == "import"))
+            module.Append(ParseDottedName());
+
+        if (!(Check(TokenType.KEYWORD) && Peek().Value == "import"))
+            throw new Exception($"Expected 'import' at {Peek()}");
+        Advance();
+
+        var names = new List<(string Name, string? Alias)>();
+        if (Match(TokenType.STAR))
+        {
+            names.Add(("*", null));
+        }
+        else
+        {
+            bool parenthesized = Match(TokenType.LPAREN);
+            do
+            {
+                if (parenthesized) SkipNewlines();
+                if (parenthesized && Check(TokenType.RPAREN))
+                    break; // trailing comma
+                var name = Consume(TokenType.IDENTIFIER, "Expected name after 'import'").Value;
+                names.Add((name, ParseImportAlias()));
+                if (parenthesized) SkipNewlines();
+            } while (Match(TokenType.COMMA));
+            if (parenthesized)
+                Consume(TokenType.RPAREN, "Expected ')' after imported names");
+        }
+
         SkipNewlines();
-        return null!; // Return empty statement
+        return new ImportStmt(module.ToString(), names);
+    }
+
+    private string ParseDottedName()
+    {
+        var name = Consume(TokenType.IDENTIFIER, "Expected module name").Value;
+        while (Match(TokenType.DOT))
+            name += "." + Consume(TokenType.IDENTIFIER, "Expected module name after '.'").Value;
+        return name;
+    }
+
+    private string? ParseImportAlias()
+    {
+        if (Check(TokenType.KEYWORD) && Peek().Value == "as")
+        {
+            Advance();
+            return Consume(TokenType.IDENTIFIER, "Expected alias after 'as'").Value;
+        }
+        return null;
     }
 
     private Stmt ParseReturnStatement()
@@ -666,12 +839,12 @@ internal class PythonParser
         if (Check(TokenType.NEWLINE) || IsAtEnd())
         {
             SkipNewlines();
-            return new ExprStmt(new Literal(null)); // Return None
+            return new ReturnStmt(null);
         }
 
         var value = ParseExpression();
         SkipNewlines();
-        return new ExprStmt(value); // Treat return as expression statement
+        return new ReturnStmt(value);
     }
 
     private Stmt ParseYieldStatement()
@@ -682,12 +855,17 @@ internal class PythonParser
         if (Check(TokenType.NEWLINE) || IsAtEnd())
         {
             SkipNewlines();
-            return new ExprStmt(new Literal(null)); // Yield None
+            return new YieldStmt(null);
         }
 
+        // yield from iterable
+        bool isFrom = Check(TokenType.KEYWORD) && Peek().Value == "from";
+        if (isFrom)
+            Advance();
+
         var value = ParseExpression();
         SkipNewlines();
-        return new ExprStmt(value); // Treat yield as expression statement
+        return new YieldStmt(value, isFrom);
     }
 
     private Stmt ParseRaiseStatement()
@@ -716,14 +894,14 @@ internal class PythonParser
     {
         Consume(TokenType.KEYWORD, "Expected 'break'");
         SkipNewlines();
-        return new PassStmt(); // Treat as pass for now
+        return new BreakStmt();
     }
 
     private Stmt ParseContinueStatement()
     {
         Consume(TokenType.KEYWORD, "Expected 'continue'");
         SkipNewlines();
-        return new PassStmt(); // Treat as pass for now
+        return new ContinueStmt();
     }
 
     private Stmt ParseTupleUnpacking()
@@ -796,6 +974,10 @@ internal class PythonParser
                     new List<Expr> { mc.Args[0], rhs }));
             }
             
+            // Attribute assignment on a longer target: a.b.c = value
+            if (expr is Intrinsic { Name: "getattr" } attr)
+                return new ExprStmt(new Intrinsic("setattr", new List<Expr> { attr.Args[0], attr.Args[1], rhs }));
+
             // Otherwise, this might be an error case, but return as expression statement
             return new ExprStmt(expr);
         }
@@ -1414,12 +1596,6 @@ internal class PythonParser
 
     private Expr ParseExpression()
     {
-        // Check for lambda expressions
-        if (Check(TokenType.KEYWORD) && Peek().Value == "lambda")
-        {
-            return ParseLambda();
-        }
-        
         var expr = ParseTernary();
         
         // Check for tuple expression (comma-separated values)
@@ -1444,6 +1620,12 @@ internal class PythonParser
 
     private Expr ParseTernary()
     {
+        // A lambda goes wherever a conditional expression does: map(lambda x: ..., xs)
+        if (Check(TokenType.KEYWORD) && Peek().Value == "lambda")
+        {
+            return ParseLambda();
+        }
+
         var expr = ParseOrExpression();
         
         // Check for ternary conditional: expr if condition else expr
@@ -1481,194 +1663,154 @@ internal class PythonParser
         }
         
         Consume(TokenType.COLON, "Expected ':'");
-        var body = ParseOrExpression();
+        var body = ParseTernary();
         
         return new LambdaExpr(parameters, body);
     }
 
-    private Expr ParseOrExpression()
+    // Binary operator precedence levels, loosest first. Every level but ** is
+    // left-associative: x ** y ** z is x ** (y ** z). The unary operators, `not` among
+    // them, bind tighter than any of them.
+    private const int OrLevel = 0;
+    private const int AndLevel = 1;
+    private const int ComparisonLevel = 2;
+    private const int AdditiveLevel = 3;
+    private const int MultiplicativeLevel = 4;
+    private const int BitwiseOrLevel = 5;
+    private const int BitwiseXorLevel = 6;
+    private const int BitwiseAndLevel = 7;
+    private const int ShiftLevel = 8;
+    private const int PowerLevel = 9;
+
+    private Expr ParseOrExpression() => ParseBinaryExpression(OrLevel);
+
+    // Operators looser than minLevel end the expression: the operand of not stops at
+    // the and/or after it.
+    private Expr ParseBinaryExpression(int minLevel)
     {
-        var expr = ParseAndExpression();
+        // Precedence climbing: operands waiting on a looser operator are kept on a stack
+        // rather than in nested calls, so a chain of any length parses at constant stack
+        // depth, with one ParseNotExpression call per operand.
+        var operands = new Stack<Expr>();
+        var operators = new Stack<(string Op, int Level)>();
+        operands.Push(ParseNotExpression());
 
-        while (Match(TokenType.OR) || (Check(TokenType.KEYWORD) && Peek().Value == "or"))
+        while (PeekBinaryOperator(out var op, out var level, out var length) && level >= minLevel)
         {
-            // If we matched the keyword "or", consume it
-            if (Check(TokenType.KEYWORD) && Peek().Value == "or")
-            {
-                Advance();
-            }
-            var op = "or";
-            var right = ParseAndExpression();
-            expr = new BinaryOp(expr, op, right);
+            _current += length;
+            if (level is BitwiseOrLevel or BitwiseXorLevel or BitwiseAndLevel)
+                SkipNewlines();  // Handle multi-line expressions
+
+            while (operators.Count > 0 && (operators.Peek().Level > level || (operators.Peek().Level == level && level != PowerLevel)))
+                ReduceBinary(operands, operators);
+            operators.Push((op, level));
+            operands.Push(ParseNotExpression());
         }
 
-        return expr;
+        while (operators.Count > 0)
+            ReduceBinary(operands, operators);
+        return operands.Pop();
     }
 
-    private Expr ParseAndExpression()
+    private static void ReduceBinary(Stack<Expr> operands, Stack<(string Op, int Level)> operators)
     {
-        var expr = ParseComparisonExpression();
-
-        while (Match(TokenType.AND) || (Check(TokenType.KEYWORD) && Peek().Value == "and"))
-        {
-            // If we matched the keyword "and", consume it
-            if (Check(TokenType.KEYWORD) && Peek().Value == "and")
-            {
-                Advance();
-            }
-            var op = "and";
-            var right = ParseComparisonExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
+        var right = operands.Pop();
+        var left = operands.Pop();
+        operands.Push(new BinaryOp(left, operators.Pop().Op, right));
     }
 
-    private Expr ParseComparisonExpression()
+    // The binary operator at the current token, if any, without consuming it: its IR
+    // spelling, its precedence level and how many tokens it spans ("is not", "not in").
+    private bool PeekBinaryOperator(out string op, out int level, out int length)
     {
-        var expr = ParseAdditiveExpression();
-
-        while (true)
-        {
-            if (Match(TokenType.EQEQ, TokenType.NOTEQ, TokenType.LT, TokenType.GT, TokenType.LTEQ, TokenType.GTEQ))
-            {
-                var op = Previous().Value;
-                var right = ParseAdditiveExpression();
-                expr = new BinaryOp(expr, op, right);
-            }
-            else if (Check(TokenType.KEYWORD) && Peek().Value == "is")
-            {
-                Advance();  // consume 'is'
-                // Check for "is not"
-                var op = "is";
-                if (Check(TokenType.KEYWORD) && Peek().Value == "not")
-                {
-                    Advance();  // consume 'not'
-                    op = "is not";
-                }
-                var right = ParseAdditiveExpression();
-                expr = new BinaryOp(expr, op, right);
-            }
-            else if (Check(TokenType.KEYWORD) && Peek().Value == "in")
-            {
-                Advance();  // consume 'in'
-                var op = "in";
-                var right = ParseAdditiveExpression();
-                expr = new BinaryOp(expr, op, right);
-            }
-            else if (Check(TokenType.KEYWORD) && Peek().Value == "not")
-            {
-                // Check for "not in"
-                var pos = _current;
-                Advance();  // consume 'not'
-                if (Check(TokenType.KEYWORD) && Peek().Value == "in")
-                {
-                    Advance();  // consume 'in'
-                    var op = "not in";
-                    var right = ParseAdditiveExpression();
-                    expr = new BinaryOp(expr, op, right);
-                }
-                else
+        var token = Peek();
+        op = token.Value;
+        length = 1;
+        switch (token.Type)
+        {
+            case TokenType.OR:
+                op = "or";
+                level = OrLevel;
+                return true;
+            case TokenType.AND:
+                op = "and";
+                level = AndLevel;
+                return true;
+            case TokenType.EQEQ or TokenType.NOTEQ or TokenType.LT or TokenType.GT or TokenType.LTEQ or TokenType.GTEQ:
+                level = ComparisonLevel;
+                return true;
+            case TokenType.PLUS or TokenType.MINUS:
+                level = AdditiveLevel;
+                return true;
+            case TokenType.STAR or TokenType.SLASH or TokenType.PERCENT or TokenType.SLASHSLASH:
+                level = MultiplicativeLevel;
+                return true;
+            case TokenType.STARSTAR:
+                level = PowerLevel;
+                return true;
+            case TokenType.PIPE:
+                op = "|";
+                level = BitwiseOrLevel;
+                return true;
+            case TokenType.CARET:
+                op = "^";
+                level = BitwiseXorLevel;
+                return true;
+            case TokenType.AMPERSAND:
+                op = "&";
+                level = BitwiseAndLevel;
+                return true;
+            case TokenType.LTLT or TokenType.GTGT:
+                level = ShiftLevel;
+                return true;
+            case TokenType.KEYWORD:
+                var next = PeekNext();
+                bool nextIs(string value) => next is { Type: TokenType.KEYWORD } && next.Value == value;
+                switch (token.Value)
                 {
-                    // Not "not in", restore position
-                    _current = pos;
-                    break;
+                    case "or":
+                        level = OrLevel;
+                        return true;
+                    case "and":
+                        level = AndLevel;
+                        return true;
+                    case "in":
+                        level = ComparisonLevel;
+                        return true;
+                    case "is":
+                        if (nextIs("not"))
+                        {
+                            op = "is not";
+                            length = 2;
+                        }
+                        level = ComparisonLevel;
+                        return true;
+                    case "not" when nextIs("in"):
+                        op = "not in";
+                        length = 2;
+                        level = ComparisonLevel;
+                        return true;
                 }
-            }
-            else
-            {
                 break;
-            }
-        }
-
-        return expr;
-    }
-
-    private Expr ParseAdditiveExpression()
-    {
-        var expr = ParseMultiplicativeExpression();
-
-        while (Match(TokenType.PLUS, TokenType.MINUS))
-        {
-            var op = Previous().Value;
-            var right = ParseMultiplicativeExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
-
-    private Expr ParseMultiplicativeExpression()
-    {
-        var expr = ParseBitwiseOrExpression();
-
-        while (Match(TokenType.STAR, TokenType.SLASH, TokenType.PERCENT, TokenType.SLASHSLASH, TokenType.STARSTAR))
-        {
-            var op = Previous().Value;
-            var right = ParseBitwiseOrExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
-
-    private Expr ParseBitwiseOrExpression()
-    {
-        var expr = ParseBitwiseXorExpression();
-
-        while (Match(TokenType.PIPE))
-        {
-            SkipNewlines();  // Handle multi-line expressions
-            var op = "|";
-            var right = ParseBitwiseXorExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
-
-    private Expr ParseBitwiseXorExpression()
-    {
-        var expr = ParseBitwiseAndExpression();
-
-        while (Match(TokenType.CARET))
-        {
-            SkipNewlines();  // Handle multi-line expressions
-            var op = "^";
-            var right = ParseBitwiseAndExpression();
-            expr = new BinaryOp(expr, op, right);
-        }
-
-        return expr;
-    }
-
-    private Expr ParseBitwiseAndExpression()
-    {
-        var expr = ParseShiftExpression();
-
-        while (Match(TokenType.AMPERSAND))
-        {
-            SkipNewlines();  // Handle multi-line expressions
-            var op = "&";
-            var right = ParseShiftExpression();
-            expr = new BinaryOp(expr, op, right);
         }
-
-        return expr;
+        level = -1;
+        return false;
     }
 
-    private Expr ParseShiftExpression()
+    // not binds looser than a comparison: not a in b is not (a in b)
+    private Expr ParseNotExpression()
     {
-        var expr = ParseUnaryExpression();
+        if (Match(TokenType.NOT))
+            return new UnaryOp("not", ParseBinaryExpression(ComparisonLevel));
 
-        while (Match(TokenType.LTLT, TokenType.GTGT))
+        // Handle 'not' as keyword
+        if (Check(TokenType.KEYWORD) && Peek().Value == "not")
         {
-            var op = Previous().Value;
-            var right = ParseUnaryExpression();
-            expr = new BinaryOp(expr, op, right);
+            Advance(); // consume the 'not' keyword
+            return new UnaryOp("not", ParseBinaryExpression(ComparisonLevel));
         }
 
-        return expr;
+        return ParseUnaryExpression();
     }
 
     private Expr ParseUnaryExpression()
@@ -1679,20 +1821,6 @@ internal class PythonParser
             return new UnaryOp("~", expr);
         }
 
-        if (Match(TokenType.NOT))
-        {
-            var expr = ParseUnaryExpression();
-            return new UnaryOp("not", expr);
-        }
-        
-        // Handle 'not' as keyword
-        if (Check(TokenType.KEYWORD) && Peek().Value == "not")
-        {
-            Advance(); // consume the 'not' keyword
-            var expr = ParseUnaryExpression();
-            return new UnaryOp("not", expr);
-        }
-
         if (Match(TokenType.MINUS))
         {
             var expr = ParseUnaryExpression();
@@ -1719,7 +1847,8 @@ internal class PythonParser
                 }
                 else
                 {
-                    expr = new MethodCall(expr, methodName, new List<Expr>());
+                    // Attribute read, as opposed to a call with no arguments
+                    expr = new Intrinsic("getattr", new List<Expr> { expr, new Literal(methodName) });
                 }
             }
             else if (Check(TokenType.LPAREN) && expr is Variable v)
@@ -1779,71 +1908,158 @@ internal class PythonParser
         return expr;
     }
 
-    private Expr ParsePrimaryExpression()
+    // Splits the body of an f-string, as the lexer left it, into literal text and
+    // replacement fields: {expr}, {expr!r}, {expr:>10.2f}, and {expr=}, which also
+    // writes out the expression's own text. A field that is only a name, with no
+    // conversion or spec, stays a StringPartVariable.
+    private static void AddFStringParts(string body, List<StringPart> parts)
     {
-        if (Match(TokenType.NUMBER))
+        var text = new System.Text.StringBuilder();
+        int i = 0;
+        while (i < body.Length)
         {
-            var value = Previous().Value;
-            
-            // Parse different number formats
-            object parsedValue = 0;
-            
-            try
+            char c = body[i];
+            if ((c == '{' || c == '}') && i + 1 < body.Length && body[i + 1] == c)
             {
-                if (value.StartsWith("0x") || value.StartsWith("0X"))
-                {
-                    // Hexadecimal
-                    parsedValue = Convert.ToInt64(value, 16);
-                }
-                else if (value.StartsWith("0o") || value.StartsWith("0O"))
-                {
-                    // Octal
-                    parsedValue = Convert.ToInt64(value, 8);
-                }
-                else if (value.StartsWith("0b") || value.StartsWith("0B"))
-                {
-                    // Binary
-                    parsedValue = Convert.ToInt64(value, 2);
-                }
-                else if (double.TryParse(value, out var d))
+                text.Append(c);
+                i += 2;
+                continue;
+            }
+            if (c != '{')
+            {
+                text.Append(c);
+                i++;
+                continue;
+            }
+
+            // Find where the expression stops: a !, : or } outside any brackets or quotes
+            int exprStart = ++i;
+            int depth = 0;
+            char quote = '\0';
+            for (; i < body.Length; i++)
+            {
+                c = body[i];
+                if (quote != '\0')
                 {
-                    // Float or regular integer
-                    parsedValue = d;
+                    if (c == quote) quote = '\0';
                 }
-                else if (int.TryParse(value, out var i))
+                else if (c == '\'' || c == '"') quote = c;
+                else if (c is '(' or '[' or '{') depth++;
+                else if (c is ')' or ']' || (c == '}' && depth > 0)) depth--;
+                else if (depth == 0 && (c == '}' || c == ':' || (c == '!' && (i + 1 >= body.Length || body[i + 1] != '='))))
+                    break;
+            }
+            var source = body.Substring(exprStart, i - exprStart);
+
+            char? conversion = null;
+            if (i < body.Length && body[i] == '!')
+            {
+                if (i + 1 >= body.Length || body[i + 1] is not ('r' or 's' or 'a'))
+                    throw new Exception($"Invalid conversion in f-string field '{{{source}!...}}'");
+                conversion = body[i + 1];
+                i += 2;
+            }
+
+            string? spec = null;
+            if (i < body.Length && body[i] == ':')
+            {
+                // The spec runs to the matching brace; nested {width} fields stay in its text
+                int specStart = ++i;
+                for (depth = 0; i < body.Length && (body[i] != '}' || depth > 0); i++)
                 {
-                    parsedValue = i;
+                    if (body[i] == '{') depth++;
+                    else if (body[i] == '}') depth--;
                 }
+                spec = body.Substring(specStart, i - specStart);
+            }
+
+            if (i >= body.Length || body[i] != '}')
+                throw new Exception($"Unterminated field in f-string: '{{{source}'");
+            i++;
+
+            // {x=} writes "x=" and then the value, as repr unless there's a conversion or spec
+            var trimmed = source.TrimEnd();
+            if (trimmed.EndsWith('=') && !(trimmed.EndsWith("==") || trimmed.EndsWith("!=") || trimmed.EndsWith("<=") || trimmed.EndsWith(">=")))
+            {
+                text.Append(source);
+                source = trimmed[..^1];
+                if (conversion == null && spec == null)
+                    conversion = 'r';
             }
-            catch
+
+            if (text.Length > 0)
             {
-                // If all parsing fails, treat as string
-                parsedValue = value;
+                AddLiteralPart(parts, text.ToString());
+                text.Clear();
             }
-            
-            return new Literal(parsedValue);
+
+            var expr = ParseFieldExpression(source.Trim());
+            parts.Add(expr is Variable v && conversion == null && spec == null
+                ? new StringPartVariable(v.Name)
+                : new StringPartExpr(expr, conversion, spec));
         }
 
-        if (Match(TokenType.STRING))
+        if (text.Length > 0)
+            AddLiteralPart(parts, text.ToString());
+    }
+
+    // Adjacent literal text is merged into one part.
+    private static void AddLiteralPart(List<StringPart> parts, string text)
+    {
+        if (parts.Count > 0 && parts[^1] is StringPartLiteral last)
+            parts[^1] = new StringPartLiteral(last.Value + text);
+        else
+            parts.Add(new StringPartLiteral(text));
+    }
+
+    private static Expr ParseFieldExpression(string source)
+    {
+        if (source.Length == 0)
+            throw new Exception("Empty expression in f-string field");
+
+        var parser = new PythonParser(new PythonLexer<StringText>(new StringText(source)).Tokenize());
+        var expr = parser.ParseExpression();
+        parser.SkipNewlines();
+        if (!parser.IsAtEnd())
+            throw new Exception($"Unexpected {parser.Peek()} in f-string field '{{{source}}}'");
+        return expr;
+    }
+
+    private Expr ParsePrimaryExpression()
+    {
+        if (Match(TokenType.NUMBER))
         {
             var value = Previous().Value;
+            // If it doesn't parse as a number, treat as string
+            return NumericLiteral.Parse(value) ?? new Literal(value);
+        }
+
+        if (Check(TokenType.STRING) || Check(TokenType.FSTRING))
+        {
             // Python allows implicit string concatenation: "hello" "world" becomes "helloworld"
-            // This works even across newlines inside parentheses
-            // Check if there are more string literals following this one
-            while (true)
+            // This works even across newlines inside parentheses. If any piece is an
+            // f-string the whole is one interpolation.
+            var parts = new List<StringPart>();
+            bool interpolated = false;
+            do
             {
-                SkipNewlines();
-                if (Check(TokenType.STRING))
+                var token = Advance();
+                if (token.Type == TokenType.FSTRING)
                 {
-                    Advance();
-                    value += Previous().Value;
+                    interpolated = true;
+                    AddFStringParts(token.Value, parts);
                 }
                 else
                 {
-                    break;
+                    AddLiteralPart(parts, token.Value);
                 }
-            }
-            return new Literal(value);
+                SkipNewlines();
+            } while (Check(TokenType.STRING) || Check(TokenType.FSTRING));
+
+            if (!interpolated)
+                return new Literal(((StringPartLiteral)parts[0]).Value);
+            parts.RemoveAll(p => p is StringPartLiteral { Value: "" });
+            return new StringInterpolation(parts);
         }
 
         if (Match(TokenType.BOOL))
@@ -1883,9 +2099,18 @@ internal class PythonParser
             if (Check(TokenType.KEYWORD) && Peek().Value == "for")
             {
                 Advance(); // consume 'for'
+                // Loop variable(s), comma-joined as for dict comprehensions: "k,v"
+                var loopVars = new List<string>();
                 if (!Check(TokenType.IDENTIFIER))
                     throw new Exception("Expected variable name after 'for' in list comprehension");
-                var loopVar = Advance().Value;
+                loopVars.Add(Advance().Value);
+                while (Match(TokenType.COMMA))
+                {
+                    if (!Check(TokenType.IDENTIFIER))
+                        throw new Exception("Expected variable name after ',' in list comprehension");
+                    loopVars.Add(Advance().Value);
+                }
+                var loopVar = string.Join(",", loopVars);
                 
                 if (!Check(TokenType.KEYWORD) || Peek().Value != "in")
                     throw new Exception("Expected 'in' after variable in list comprehension");
@@ -2058,9 +2283,8 @@ internal class PythonParser
                     if (Match(TokenType.EQUALS))
                     {
                         var value = ParseTernary();
-                        // Store keyword arg as a variable assignment expression for now
-                        // (We'll treat it as a special expression)
-                        args.Add(new Variable(name + "=" + (value as Variable)?.Name ?? value.ToString()));
+                        // keyword(name, value): backends without keyword arguments pass the value alone
+                        args.Add(new Intrinsic("keyword", new List<Expr> { new Literal(name), value }));
                     }
                     else
                     {
@@ -0,0 +1,178 @@
+using System.IO.MemoryMappedFiles;
+using System.Runtime.CompilerServices;
+using System.Text;
+
+namespace PLT.CORE.Frontends;
+
+// The lexers are generic over the text they scan so the same code runs over a .NET
+// string or directly over UTF-8 bytes (e.g. a memory-mapped file) without decoding
+// the whole input first. Both implementations are structs, so the JIT specializes
+// the lexer for each and the indexer is inlined.
+//
+// The indexer is exact for ASCII, which is everything the lexers branch on
+// (operators, quotes, digits, whitespace, newlines). Non-ASCII code units come back
+// as values >= 0x80 and only matter inside identifiers, strings and comments:
+// identifiers go through IsLetter/IsLetterOrDigit, which decode one code point, and
+// token text is produced by Slice, which decodes just that range.
+internal interface ISourceText
+{
+    int Length { get; }
+
+    char this[int index] { get; }
+
+    string Slice(int start, int length);
+
+    // Whether a letter (or letter/digit) starts at index; width is the number of
+    // code units it occupies.
+    bool IsLetter(int index, out int width);
+
+    bool IsLetterOrDigit(int index, out int width);
+}
+
+internal readonly struct StringText : ISourceText
+{
+    private readonly string _text;
+
+    public StringText(string text)
+    {
+        _text = text;
+    }
+
+    public int Length => _text.Length;
+
+    public char this[int index]
+    {
+        [MethodImpl(MethodImplOptions.AggressiveInlining)]
+        get => _text[index];
+    }
+
+    public string Slice(int start, int length) => _text.Substring(start, length);
+
+    public bool IsLetter(int index, out int width)
+    {
+        width = 1;
+        return char.IsLetter(_text[index]);
+    }
+
+    public bool IsLetterOrDigit(int index, out int width)
+    {
+        width = 1;
+        return char.IsLetterOrDigit(_text[index]);
+    }
+}
+
+internal readonly unsafe struct Utf8Text : ISourceText
+{
+    private readonly byte* _bytes;
+    private readonly int _length;
+
+    public Utf8Text(byte* bytes, int length)
+    {
+        _bytes = bytes;
+        _length = length;
+    }
+
+    public int Length => _length;
+
+    public char this[int index]
+    {
+        [MethodImpl(MethodImplOptions.AggressiveInlining)]
+        get
+        {
+            if ((uint)index >= (uint)_length)
+                throw new IndexOutOfRangeException();
+            return (char)_bytes[index];
+        }
+    }
+
+    public string Slice(int start, int length)
+    {
+        if ((uint)start > (uint)_length || (uint)length > (uint)(_length - start))
+            throw new ArgumentOutOfRangeException(nameof(length));
+        return Encoding.UTF8.GetString(_bytes + start, length);
+    }
+
+    public bool IsLetter(int index, out int width)
+    {
+        var b = this[index];
+        if (b < 0x80)
+        {
+            width = 1;
+            return char.IsLetter(b);
+        }
+        return DecodeRune(index, out width) is Rune r && Rune.IsLetter(r);
+    }
+
+    public bool IsLetterOrDigit(int index, out int width)
+    {
+        var b = this[index];
+        if (b < 0x80)
+        {
+            width = 1;
+            return char.IsLetterOrDigit(b);
+        }
+        return DecodeRune(index, out width) is Rune r && Rune.IsLetterOrDigit(r);
+    }
+
+    private Rune? DecodeRune(int index, out int width)
+    {
+        var span = new ReadOnlySpan<byte>(_bytes + index, _length - index);
+        if (Rune.DecodeFromUtf8(span, out var rune, out width) == System.Buffers.OperationStatus.Done)
+            return rune;
+        width = 1;
+        return null;
+    }
+}
+
+// A read-only memory mapping of a UTF-8 source file. The lexers scan the mapped
+// pages in place; only token text is copied out. A UTF-8 BOM is skipped, matching
+// File.ReadAllText.
+internal sealed unsafe class MappedSourceFile : IDisposable
+{
+    private readonly MemoryMappedFile? _file;
+    private readonly MemoryMappedViewAccessor? _view;
+    private readonly byte* _pointer;
+
+    public MappedSourceFile(string path)
+    {
+        var length = new FileInfo(path).Length;
+        if (length > int.MaxValue)
+            throw new NotSupportedException($"Input file is too large: {path}");
+
+        if (length == 0)
+        {
+            Text = new Utf8Text(null, 0);
+            return;
+        }
+
+        _file = MemoryMappedFile.CreateFromFile(path, FileMode.Open, null, 0, MemoryMappedFileAccess.Read);
+        _view = _file.CreateViewAccessor(0, length, MemoryMappedFileAccess.Read);
+        _view.SafeMemoryMappedViewHandle.AcquirePointer(ref _pointer);
+
+        var bytes = _pointer + _view.PointerOffset;
+        int offset = length >= 3 && bytes[0] == 0xEF && bytes[1] == 0xBB && bytes[2] == 0xBF ? 3 : 0;
+        Text = new Utf8Text(bytes + offset, (int)length - offset);
+    }
+
+    public Utf8Text Text { get; }
+
+    // Files starting with a UTF-16/UTF-32 byte order mark can't be scanned as UTF-8.
+    public static bool IsUtf8Compatible(string path)
+    {
+        Span<byte> head = stackalloc byte[2];
+        using var stream = File.OpenRead(path);
+        var read = stream.Read(head);
+        return read < 2 || !((head[0] == 0xFF && head[1] == 0xFE) || (head[0] == 0xFE && head[1] == 0xFF));
+    }
+
+    public void Dispose()
+    {
+        if (_view != null)
+        {
+            if (_pointer != null)
+                _view.SafeMemoryMappedViewHandle.ReleasePointer();
+            _view.Dispose();
+        }
+        _file?.Dispose();
+    }
+}
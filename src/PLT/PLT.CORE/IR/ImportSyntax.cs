@@ -0,0 +1,14 @@
+namespace PLT.CORE.IR;
+
+// The Python spelling of an import, emitted as-is by the Python backend and as a
+// comment by backends that have no module system to map it to.
+public static class ImportSyntax
+{
+    public static string Format(ImportStmt import)
+    {
+        var names = string.Join(", ", import.Names.Select(n => n.Alias is null ? n.Name : $"{n.Name} as {n.Alias}"));
+        return import.FromModule is null
+            ? $"import {names}"
+            : $"from {import.FromModule} import {names}";
+    }
+}
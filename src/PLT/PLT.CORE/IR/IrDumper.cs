@@ -0,0 +1,486 @@
+using System.Globalization;
+using System.Text;
+using System.Text.Json;
+
+namespace PLT.CORE.IR;
+
+public enum IrDumpFormat
+{
+    Tree,       // indented, one node per line (the --print-ir format)
+    SExpr,      // one S-expression per line for each dumped subtree
+    JsonLines,  // one JSON object per node, linked by id/parent
+}
+
+public sealed class IrDumpOptions
+{
+    public IrDumpFormat Format { get; init; } = IrDumpFormat.Tree;
+
+    // Only dump subtrees rooted at nodes of these kinds; case-insensitive, and the
+    // Stmt/DefStmt suffix may be left off ("FunctionDefStmt", "FunctionDef", "class").
+    public IReadOnlyCollection<string>? Kinds { get; init; }
+
+    // Only dump subtrees rooted at nodes that define or reference this name.
+    // Definitions nested in classes/functions also match their qualified name
+    // ("Parser.parse").
+    public string? Name { get; init; }
+
+    // Levels printed below each dumped root; deeper children are elided.
+    public int? MaxDepth { get; init; }
+
+    public bool IsFiltered => Kinds is { Count: > 0 } || Name != null;
+}
+
+// Writes the IR to a TextWriter node by node instead of building one string, so
+// the first lines of a dump of a huge program appear immediately and memory stays
+// flat. Traversal uses an explicit stack, like IrWalker.Descendants.
+public static class IrDumper
+{
+    public static void Dump(Node root, TextWriter writer, IrDumpOptions? options = null)
+    {
+        options ??= new IrDumpOptions();
+        var dumper = new Writer(writer, options);
+        foreach (var match in FindRoots(root, options))
+            dumper.Write(match);
+        writer.Flush();
+    }
+
+    public static string Dump(Node root, IrDumpOptions? options = null)
+    {
+        var sw = new StringWriter();
+        Dump(root, sw, options);
+        return sw.ToString();
+    }
+
+    // A child of a node, with the field it came from when that is not obvious
+    // ("then"/"else" of an if, "key"/"value" of a dict item, ...).
+    private readonly record struct Field(string? Label, Node Child);
+
+    // Filtering: pre-order search for matching nodes; the search doesn't descend
+    // into a match, since its whole subtree is dumped.
+    private static IEnumerable<Node> FindRoots(Node root, IrDumpOptions options)
+    {
+        if (!options.IsFiltered)
+        {
+            yield return root;
+            yield break;
+        }
+
+        var kinds = options.Kinds?.Select(k => k.ToLowerInvariant()).ToHashSet();
+        var stack = new Stack<(Node Node, string Scope)>();
+        stack.Push((root, ""));
+        var buffer = new List<Field>();
+
+        while (stack.Count > 0)
+        {
+            var (node, scope) = stack.Pop();
+            if (Matches(node, scope, kinds, options.Name))
+            {
+                yield return node;
+                continue;
+            }
+
+            var childScope = node switch
+            {
+                FunctionDefStmt f => scope + f.FunctionName + ".",
+                ClassDefStmt c => scope + c.ClassName + ".",
+                _ => scope
+            };
+            buffer.Clear();
+            buffer.AddRange(Fields(node));
+            for (int i = buffer.Count - 1; i >= 0; i--)
+                stack.Push((buffer[i].Child, childScope));
+        }
+    }
+
+    private static bool Matches(Node node, string scope, HashSet<string>? kinds, string? name)
+    {
+        if (kinds is { Count: > 0 })
+        {
+            var kind = node.GetType().Name.ToLowerInvariant();
+            if (!kinds.Contains(kind)
+                && !(kind.EndsWith("stmt") && kinds.Contains(kind[..^4]))
+                && !(kind.EndsWith("defstmt") && kinds.Contains(kind[..^7])))
+                return false;
+        }
+
+        if (name != null)
+        {
+            var symbol = SymbolName(node);
+            if (symbol == null || (symbol != name && scope + symbol != name))
+                return false;
+        }
+
+        return true;
+    }
+
+    private static string? SymbolName(Node node) => node switch
+    {
+        FunctionDefStmt f => f.FunctionName,
+        ClassDefStmt c => c.ClassName,
+        VarAssignment v => v.VarName,
+        ForEachStmt f => f.LoopVar,
+        Variable v => v.Name,
+        FunctionCall f => f.FunctionName,
+        MethodCall m => m.MethodName,
+        StringPartVariable s => s.VarName,
+        _ => null
+    };
+
+    private static IEnumerable<Field> Fields(Node node)
+    {
+        switch (node)
+        {
+            case IfStmt i:
+                yield return new Field("cond", i.Condition);
+                foreach (var s in i.ThenBody) yield return new Field("then", s);
+                if (i.ElseBody != null)
+                    foreach (var s in i.ElseBody) yield return new Field("else", s);
+                break;
+
+            case ForEachStmt f:
+                yield return new Field("iter", f.IterableExpr);
+                foreach (var s in f.Body) yield return new Field("body", s);
+                break;
+
+            case WhileStmt w:
+                yield return new Field("cond", w.Condition);
+                foreach (var s in w.Body) yield return new Field("body", s);
+                break;
+
+            case TryStmt t:
+                foreach (var s in t.TryBody) yield return new Field("try", s);
+                foreach (var (type, name, body) in t.ExceptClauses)
+                {
+                    var label = "except" + (type != null ? " " + type : "") + (name != null ? " as " + name : "");
+                    foreach (var s in body) yield return new Field(label, s);
+                }
+                if (t.FinallyBody != null)
+                    foreach (var s in t.FinallyBody) yield return new Field("finally", s);
+                break;
+
+            case DictLiteral d:
+                foreach (var (key, value) in d.Items)
+                {
+                    yield return new Field("key", key);
+                    yield return new Field("value", value);
+                }
+                break;
+
+            case ListComprehension lc:
+                yield return new Field("element", lc.Element);
+                yield return new Field("iter", lc.IterableExpr);
+                if (lc.FilterCondition != null) yield return new Field("if", lc.FilterCondition);
+                break;
+
+            case DictComprehension dc:
+                yield return new Field("key", dc.KeyExpr);
+                yield return new Field("value", dc.ValueExpr);
+                yield return new Field("iter", dc.IterableExpr);
+                if (dc.FilterCondition != null) yield return new Field("if", dc.FilterCondition);
+                break;
+
+            case MethodCall m:
+                yield return new Field("target", m.Target);
+                foreach (var a in m.Args) yield return new Field("args", a);
+                break;
+
+            default:
+                foreach (var child in IrWalker.Children(node))
+                    yield return new Field(null, child);
+                break;
+        }
+    }
+
+    // Scalar attributes of a node; the first is the node's "headline" value.
+    private static List<(string Key, object? Value)> Attributes(Node node)
+    {
+        var attributes = new List<(string, object?)>();
+        switch (node)
+        {
+            case VarAssignment v: attributes.Add(("name", v.VarName)); break;
+            case TupleUnpackingAssignment t: attributes.Add(("names", t.VarNames)); break;
+            case ForEachStmt f: attributes.Add(("var", f.LoopVar)); break;
+            case YieldStmt { IsFrom: true }: attributes.Add(("from", true)); break;
+            case FunctionDefStmt f:
+                attributes.Add(("name", f.FunctionName));
+                attributes.Add(("params", f.Parameters));
+                break;
+            case ClassDefStmt c:
+                attributes.Add(("name", c.ClassName));
+                if (c.BaseClass != null) attributes.Add(("base", c.BaseClass));
+                break;
+            case ImportStmt i:
+                attributes.Add(("import", ImportSyntax.Format(i)));
+                break;
+            case Literal l:
+                attributes.Add(("value", l.Value));
+                // Only where the value alone hides it: 1.0, 0xFF, 1e3
+                if (l.Spelling != null && l.Spelling != Convert.ToString(l.Value, CultureInfo.InvariantCulture))
+                    attributes.Add(("spelling", l.Spelling));
+                break;
+            case Variable v: attributes.Add(("name", v.Name)); break;
+            case StringPartLiteral s: attributes.Add(("value", s.Value)); break;
+            case StringPartVariable s: attributes.Add(("name", s.VarName)); break;
+            case StringPartExpr s:
+                if (s.Conversion != null) attributes.Add(("conversion", s.Conversion.ToString()));
+                if (s.FormatSpec != null) attributes.Add(("spec", s.FormatSpec));
+                break;
+            case ListComprehension lc: attributes.Add(("var", lc.LoopVar)); break;
+            case DictComprehension dc: attributes.Add(("var", dc.LoopVar)); break;
+            case LambdaExpr lam: attributes.Add(("params", lam.Parameters)); break;
+            case BinaryOp b: attributes.Add(("op", b.Op)); break;
+            case UnaryOp u: attributes.Add(("op", u.Op)); break;
+            case FunctionCall f:
+                attributes.Add(("name", f.FunctionName));
+                if (f.IsNamespaced) attributes.Add(("namespace", f.Namespace));
+                break;
+            case MethodCall m: attributes.Add(("method", m.MethodName)); break;
+            case Intrinsic i: attributes.Add(("name", i.Name)); break;
+        }
+        return attributes;
+    }
+
+    private static string? LeadingComment(Node node) => node switch
+    {
+        ExprStmt s => s.LeadingComment,
+        VarAssignment s => s.LeadingComment,
+        TupleUnpackingAssignment s => s.LeadingComment,
+        PassStmt s => s.LeadingComment,
+        ReturnStmt s => s.LeadingComment,
+        BreakStmt s => s.LeadingComment,
+        ContinueStmt s => s.LeadingComment,
+        YieldStmt s => s.LeadingComment,
+        IfStmt s => s.LeadingComment,
+        ForEachStmt s => s.LeadingComment,
+        WhileStmt s => s.LeadingComment,
+        FunctionDefStmt s => s.LeadingComment,
+        ClassDefStmt s => s.LeadingComment,
+        ImportStmt s => s.LeadingComment,
+        TryStmt s => s.LeadingComment,
+        _ => null
+    };
+
+    private sealed class Writer
+    {
+        private readonly TextWriter _out;
+        private readonly IrDumpOptions _options;
+        private readonly List<Field> _fields = new();
+        private readonly StringBuilder _line = new();
+        private int _nextId;
+
+        public Writer(TextWriter output, IrDumpOptions options)
+        {
+            _out = output;
+            _options = options;
+        }
+
+        public void Write(Node root)
+        {
+            switch (_options.Format)
+            {
+                case IrDumpFormat.Tree: WriteTree(root); break;
+                case IrDumpFormat.SExpr: WriteSExpr(root); break;
+                case IrDumpFormat.JsonLines: WriteJsonLines(root); break;
+            }
+        }
+
+        // Children of node, or null when MaxDepth elides them.
+        private List<Field>? ChildrenAt(Node node, int depth, out int elided)
+        {
+            _fields.Clear();
+            _fields.AddRange(Fields(node));
+            elided = 0;
+            if (_options.MaxDepth is int max && depth >= max)
+            {
+                elided = _fields.Count;
+                return null;
+            }
+            return new List<Field>(_fields);
+        }
+
+        // Tree
+
+        private enum TreeItem { Node, Label }
+
+        private void WriteTree(Node root)
+        {
+            var stack = new Stack<(TreeItem Item, Node? Node, string? Label, int Depth, int Indent)>();
+            stack.Push((TreeItem.Node, root, null, 0, 0));
+
+            while (stack.Count > 0)
+            {
+                var (item, node, label, depth, indent) = stack.Pop();
+                var pad = new string(' ', indent * 2);
+
+                if (item == TreeItem.Label)
+                {
+                    _out.Write(pad);
+                    _out.Write(label);
+                    _out.WriteLine(':');
+                    continue;
+                }
+
+                var comment = LeadingComment(node!);
+                if (!string.IsNullOrWhiteSpace(comment))
+                    _out.WriteLine($"{pad}// {comment}");
+
+                _line.Clear();
+                _line.Append(pad).Append(node!.GetType().Name);
+                var attributes = Attributes(node);
+                for (int i = 0; i < attributes.Count; i++)
+                {
+                    _line.Append(' ');
+                    if (i > 0) _line.Append(attributes[i].Key).Append('=');
+                    AppendValue(_line, attributes[i].Value);
+                }
+
+                var children = ChildrenAt(node, depth, out var elided);
+                if (elided > 0)
+                    _line.Append(" ...").Append(elided).Append(elided == 1 ? " child" : " children");
+                _out.WriteLine(_line);
+
+                if (children == null)
+                    continue;
+
+                // Push in reverse; a label line precedes each run of children from the same field.
+                for (int i = children.Count - 1; i >= 0; i--)
+                {
+                    var field = children[i];
+                    if (field.Label == null)
+                    {
+                        stack.Push((TreeItem.Node, field.Child, null, depth + 1, indent + 1));
+                        continue;
+                    }
+                    stack.Push((TreeItem.Node, field.Child, null, depth + 1, indent + 2));
+                    if (i == 0 || children[i - 1].Label != field.Label)
+                        stack.Push((TreeItem.Label, null, field.Label, depth, indent + 1));
+                }
+            }
+        }
+
+        private static void AppendValue(StringBuilder sb, object? value)
+        {
+            switch (value)
+            {
+                case null: sb.Append("null"); break;
+                case string s: sb.Append('"').Append(Escape(s)).Append('"'); break;
+                case bool b: sb.Append(b ? "true" : "false"); break;
+                case IReadOnlyList<string> list: sb.Append('(').Append(string.Join(", ", list)).Append(')'); break;
+                case IFormattable f: sb.Append(f.ToString(null, CultureInfo.InvariantCulture)); break;
+                default: sb.Append(value); break;
+            }
+        }
+
+        private static string Escape(string s) =>
+            s.Replace("\\", "\\\\").Replace("\"", "\\\"").Replace("\n", "\\n").Replace("\r", "\\r").Replace("\t", "\\t");
+
+        // S-expressions: (Kind attr... (label child...) child...)
+
+        private void WriteSExpr(Node root)
+        {
+            // Items are either a node to open, or text to write once its children are done.
+            var stack = new Stack<(Node? Node, string? Text, int Depth)>();
+            stack.Push((root, null, 0));
+            _line.Clear();
+
+            while (stack.Count > 0)
+            {
+                var (node, text, depth) = stack.Pop();
+                if (node == null)
+                {
+                    _line.Append(text);
+                    continue;
+                }
+
+                if (_line.Length > 0 && _line[^1] != '(')
+                    _line.Append(' ');
+                _line.Append('(').Append(node.GetType().Name);
+                foreach (var (key, value) in Attributes(node))
+                {
+                    _line.Append(" :").Append(key).Append(' ');
+                    if (value is IReadOnlyList<string> list)
+                        _line.Append('(').Append(string.Join(" ", list.Select(v => $"\"{Escape(v)}\""))).Append(')');
+                    else
+                        AppendValue(_line, value);
+                }
+
+                var children = ChildrenAt(node, depth, out var elided);
+                if (elided > 0)
+                    _line.Append(" ...");
+
+                stack.Push((null, ")", depth));
+                if (children != null)
+                {
+                    // Group consecutive children of a labelled field into (label ...).
+                    for (int i = children.Count - 1; i >= 0; i--)
+                    {
+                        var field = children[i];
+                        bool lastOfRun = field.Label != null && (i == children.Count - 1 || children[i + 1].Label != field.Label);
+                        bool firstOfRun = field.Label != null && (i == 0 || children[i - 1].Label != field.Label);
+                        if (lastOfRun)
+                            stack.Push((null, ")", depth));
+                        stack.Push((field.Child, null, depth + 1));
+                        if (firstOfRun)
+                            stack.Push((null, $" ({field.Label}", depth));
+                    }
+                }
+
+                // Flush big subtrees as we go rather than holding the whole line.
+                if (_line.Length > 64 * 1024)
+                {
+                    _out.Write(_line);
+                    _line.Clear();
+                }
+            }
+
+            _out.WriteLine(_line);
+            _line.Clear();
+        }
+
+        // JSON lines: {"id":..,"parent":..,"depth":..,"field":..,"kind":..,attrs...}
+
+        private void WriteJsonLines(Node root)
+        {
+            var stack = new Stack<(Node Node, int? Parent, string? Label, int Depth)>();
+            stack.Push((root, null, null, 0));
+
+            while (stack.Count > 0)
+            {
+                var (node, parent, label, depth) = stack.Pop();
+                var id = _nextId++;
+                var children = ChildrenAt(node, depth, out var elided);
+
+                _line.Clear();
+                _line.Append("{\"id\":").Append(id);
+                if (parent != null) _line.Append(",\"parent\":").Append(parent.Value);
+                _line.Append(",\"depth\":").Append(depth);
+                if (label != null) _line.Append(",\"field\":").Append(JsonSerializer.Serialize(label));
+                _line.Append(",\"kind\":\"").Append(node.GetType().Name).Append('"');
+                foreach (var (key, value) in Attributes(node))
+                    _line.Append(",\"").Append(key).Append("\":").Append(JsonValue(value));
+                var comment = LeadingComment(node);
+                if (!string.IsNullOrWhiteSpace(comment))
+                    _line.Append(",\"comment\":").Append(JsonSerializer.Serialize(comment));
+                if (elided > 0)
+                    _line.Append(",\"elided\":").Append(elided);
+                _line.Append('}');
+                _out.WriteLine(_line);
+
+                if (children != null)
+                    for (int i = children.Count - 1; i >= 0; i--)
+                        stack.Push((children[i].Child, id, children[i].Label, depth + 1));
+            }
+        }
+
+        private static string JsonValue(object? value) => value switch
+        {
+            null => "null",
+            string s => JsonSerializer.Serialize(s),
+            bool b => b ? "true" : "false",
+            IReadOnlyList<string> list => JsonSerializer.Serialize(list),
+            double d when !double.IsFinite(d) => JsonSerializer.Serialize(d.ToString(CultureInfo.InvariantCulture)),
+            int or long or double or float or decimal or System.Numerics.BigInteger => Convert.ToString(value, CultureInfo.InvariantCulture)!,
+            _ => JsonSerializer.Serialize(value.ToString())
+        };
+    }
+}
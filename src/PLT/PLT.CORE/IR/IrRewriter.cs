@@ -0,0 +1,253 @@
+namespace PLT.CORE.IR;
+
+// Rebuilds IR with some expressions replaced. The replace callback sees each
+// expression before its children; returning null keeps the expression and carries
+// on into its children. Unchanged nodes are returned as-is (by reference), so
+// tables keyed on nodes stay valid for everything a rewrite didn't touch.
+public static class IrRewriter
+{
+    public static IReadOnlyList<Stmt> Rewrite(IReadOnlyList<Stmt> body, Func<Expr, Expr?> replace)
+    {
+        List<Stmt>? rewritten = null;
+        for (int i = 0; i < body.Count; i++)
+        {
+            var stmt = Rewrite(body[i], replace);
+            if (rewritten == null && !ReferenceEquals(stmt, body[i]))
+                rewritten = new List<Stmt>(body.Take(i));
+            rewritten?.Add(stmt);
+        }
+        return rewritten ?? body;
+    }
+
+    public static Stmt Rewrite(Stmt stmt, Func<Expr, Expr?> replace)
+    {
+        switch (stmt)
+        {
+            case ExprStmt s:
+            {
+                var expr = Rewrite(s.Expr, replace);
+                return ReferenceEquals(expr, s.Expr) ? s : s with { Expr = expr };
+            }
+
+            case VarAssignment v:
+            {
+                var value = Rewrite(v.Value, replace);
+                return ReferenceEquals(value, v.Value) ? v : v with { Value = value };
+            }
+
+            case TupleUnpackingAssignment t:
+            {
+                var value = Rewrite(t.Value, replace);
+                return ReferenceEquals(value, t.Value) ? t : t with { Value = value };
+            }
+
+            case ReturnStmt { Value: { } returned } r:
+            {
+                var value = Rewrite(returned, replace);
+                return ReferenceEquals(value, returned) ? r : r with { Value = value };
+            }
+
+            case YieldStmt { Value: { } yielded } y:
+            {
+                var value = Rewrite(yielded, replace);
+                return ReferenceEquals(value, yielded) ? y : y with { Value = value };
+            }
+
+            case IfStmt i:
+            {
+                var condition = Rewrite(i.Condition, replace);
+                var thenBody = Rewrite(i.ThenBody, replace);
+                var elseBody = i.ElseBody == null ? null : Rewrite(i.ElseBody, replace);
+                return ReferenceEquals(condition, i.Condition) && ReferenceEquals(thenBody, i.ThenBody) && ReferenceEquals(elseBody, i.ElseBody)
+                    ? i
+                    : i with { Condition = condition, ThenBody = thenBody, ElseBody = elseBody };
+            }
+
+            case ForEachStmt f:
+            {
+                var iterable = Rewrite(f.IterableExpr, replace);
+                var body = Rewrite(f.Body, replace);
+                return ReferenceEquals(iterable, f.IterableExpr) && ReferenceEquals(body, f.Body)
+                    ? f
+                    : f with { IterableExpr = iterable, Body = body };
+            }
+
+            case WhileStmt w:
+            {
+                var condition = Rewrite(w.Condition, replace);
+                var body = Rewrite(w.Body, replace);
+                return ReferenceEquals(condition, w.Condition) && ReferenceEquals(body, w.Body)
+                    ? w
+                    : w with { Condition = condition, Body = body };
+            }
+
+            case FunctionDefStmt f:
+            {
+                var body = Rewrite(f.Body, replace);
+                return ReferenceEquals(body, f.Body) ? f : f with { Body = body };
+            }
+
+            case ClassDefStmt c:
+            {
+                var body = Rewrite(c.Body, replace);
+                return ReferenceEquals(body, c.Body) ? c : c with { Body = body };
+            }
+
+            case TryStmt t:
+            {
+                var tryBody = Rewrite(t.TryBody, replace);
+                var clauses = t.ExceptClauses
+                    .Select(c => (c.ExceptionType, c.VarName, Body: Rewrite(c.Body, replace)))
+                    .ToList();
+                var finallyBody = t.FinallyBody == null ? null : Rewrite(t.FinallyBody, replace);
+                bool clausesChanged = clauses.Where((c, j) => !ReferenceEquals(c.Body, t.ExceptClauses[j].Body)).Any();
+                return ReferenceEquals(tryBody, t.TryBody) && !clausesChanged && ReferenceEquals(finallyBody, t.FinallyBody)
+                    ? t
+                    : t with { TryBody = tryBody, ExceptClauses = clausesChanged ? clauses : t.ExceptClauses, FinallyBody = finallyBody };
+            }
+
+            default:
+                // PassStmt, ImportStmt, a bare return or yield, break, continue: no expressions
+                return stmt;
+        }
+    }
+
+    public static Expr Rewrite(Expr expr, Func<Expr, Expr?> replace)
+    {
+        if (replace(expr) is { } replacement)
+            return replacement;
+
+        switch (expr)
+        {
+            case ListLiteral l:
+            {
+                var elements = RewriteAll(l.Elements, replace);
+                return ReferenceEquals(elements, l.Elements) ? l : l with { Elements = elements };
+            }
+
+            case DictLiteral d:
+            {
+                var items = d.Items.Select(item => (Key: Rewrite(item.Key, replace), Value: Rewrite(item.Value, replace))).ToList();
+                bool changed = items.Where((item, j) => !ReferenceEquals(item.Key, d.Items[j].Key) || !ReferenceEquals(item.Value, d.Items[j].Value)).Any();
+                return changed ? d with { Items = items } : d;
+            }
+
+            case ListComprehension lc:
+            {
+                var element = Rewrite(lc.Element, replace);
+                var iterable = Rewrite(lc.IterableExpr, replace);
+                var filter = lc.FilterCondition == null ? null : Rewrite(lc.FilterCondition, replace);
+                return ReferenceEquals(element, lc.Element) && ReferenceEquals(iterable, lc.IterableExpr) && ReferenceEquals(filter, lc.FilterCondition)
+                    ? lc
+                    : lc with { Element = element, IterableExpr = iterable, FilterCondition = filter };
+            }
+
+            case DictComprehension dc:
+            {
+                var key = Rewrite(dc.KeyExpr, replace);
+                var value = Rewrite(dc.ValueExpr, replace);
+                var iterable = Rewrite(dc.IterableExpr, replace);
+                var filter = dc.FilterCondition == null ? null : Rewrite(dc.FilterCondition, replace);
+                return ReferenceEquals(key, dc.KeyExpr) && ReferenceEquals(value, dc.ValueExpr) &&
+                       ReferenceEquals(iterable, dc.IterableExpr) && ReferenceEquals(filter, dc.FilterCondition)
+                    ? dc
+                    : dc with { KeyExpr = key, ValueExpr = value, IterableExpr = iterable, FilterCondition = filter };
+            }
+
+            case StringInterpolation s:
+            {
+                List<StringPart>? parts = null;
+                for (int i = 0; i < s.Parts.Count; i++)
+                {
+                    var part = s.Parts[i];
+                    if (part is StringPartExpr p && Rewrite(p.Expr, replace) is var e && !ReferenceEquals(e, p.Expr))
+                    {
+                        parts ??= new List<StringPart>(s.Parts.Take(i));
+                        parts.Add(p with { Expr = e });
+                    }
+                    else
+                        parts?.Add(part);
+                }
+                return parts == null ? s : s with { Parts = parts };
+            }
+
+            case LambdaExpr lam:
+            {
+                var body = Rewrite(lam.Body, replace);
+                return ReferenceEquals(body, lam.Body) ? lam : lam with { Body = body };
+            }
+
+            case BinaryOp b:
+            {
+                // Down the left spine with a loop, in the same order as recursion would
+                // go: operator chains nest as deep as they are long.
+                var spine = new List<BinaryOp> { b };
+                Expr left;
+                while (true)
+                {
+                    var next = spine[^1].Left;
+                    if (next is not BinaryOp inner)
+                    {
+                        left = Rewrite(next, replace);
+                        break;
+                    }
+                    if (replace(inner) is { } replaced)
+                    {
+                        left = replaced;
+                        break;
+                    }
+                    spine.Add(inner);
+                }
+                for (int i = spine.Count - 1; i >= 0; i--)
+                {
+                    var op = spine[i];
+                    var right = Rewrite(op.Right, replace);
+                    left = ReferenceEquals(left, op.Left) && ReferenceEquals(right, op.Right) ? op : op with { Left = left, Right = right };
+                }
+                return left;
+            }
+
+            case UnaryOp u:
+            {
+                var operand = Rewrite(u.Operand, replace);
+                return ReferenceEquals(operand, u.Operand) ? u : u with { Operand = operand };
+            }
+
+            case FunctionCall f:
+            {
+                var args = RewriteAll(f.Args, replace);
+                return ReferenceEquals(args, f.Args) ? f : f with { Args = args };
+            }
+
+            case MethodCall m:
+            {
+                var target = Rewrite(m.Target, replace);
+                var args = RewriteAll(m.Args, replace);
+                return ReferenceEquals(target, m.Target) && ReferenceEquals(args, m.Args) ? m : m with { Target = target, Args = args };
+            }
+
+            case Intrinsic i:
+            {
+                var args = RewriteAll(i.Args, replace);
+                return ReferenceEquals(args, i.Args) ? i : i with { Args = args };
+            }
+
+            default:
+                // Literal, Variable: no sub-expressions
+                return expr;
+        }
+    }
+
+    private static IReadOnlyList<Expr> RewriteAll(IReadOnlyList<Expr> exprs, Func<Expr, Expr?> replace)
+    {
+        List<Expr>? rewritten = null;
+        for (int i = 0; i < exprs.Count; i++)
+        {
+            var expr = Rewrite(exprs[i], replace);
+            if (rewritten == null && !ReferenceEquals(expr, exprs[i]))
+                rewritten = new List<Expr>(exprs.Take(i));
+            rewritten?.Add(expr);
+        }
+        return rewritten ?? exprs;
+    }
+}
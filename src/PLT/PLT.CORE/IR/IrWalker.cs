@@ -0,0 +1,153 @@
+namespace PLT.CORE.IR;
+
+public static class IrWalker
+{
+    // Direct children of a node, in source order.
+    public static IEnumerable<Node> Children(Node node)
+    {
+        switch (node)
+        {
+            case IrProgram p:
+                foreach (var s in p.Body) yield return s;
+                break;
+
+            case ExprStmt s:
+                yield return s.Expr;
+                break;
+
+            case VarAssignment v:
+                yield return v.Value;
+                break;
+
+            case TupleUnpackingAssignment t:
+                yield return t.Value;
+                break;
+
+            case ReturnStmt { Value: { } value }:
+                yield return value;
+                break;
+
+            case YieldStmt { Value: { } yielded }:
+                yield return yielded;
+                break;
+
+            case IfStmt i:
+                yield return i.Condition;
+                foreach (var s in i.ThenBody) yield return s;
+                if (i.ElseBody != null)
+                    foreach (var s in i.ElseBody) yield return s;
+                break;
+
+            case ForEachStmt f:
+                yield return f.IterableExpr;
+                foreach (var s in f.Body) yield return s;
+                break;
+
+            case WhileStmt w:
+                yield return w.Condition;
+                foreach (var s in w.Body) yield return s;
+                break;
+
+            case FunctionDefStmt f:
+                foreach (var s in f.Body) yield return s;
+                break;
+
+            case ClassDefStmt c:
+                foreach (var s in c.Body) yield return s;
+                break;
+
+            case TryStmt t:
+                foreach (var s in t.TryBody) yield return s;
+                foreach (var (_, _, body) in t.ExceptClauses)
+                    foreach (var s in body) yield return s;
+                if (t.FinallyBody != null)
+                    foreach (var s in t.FinallyBody) yield return s;
+                break;
+
+            case StringInterpolation s:
+                foreach (var part in s.Parts) yield return part;
+                break;
+
+            case StringPartExpr p:
+                yield return p.Expr;
+                break;
+
+            case ListLiteral l:
+                foreach (var e in l.Elements) yield return e;
+                break;
+
+            case DictLiteral d:
+                foreach (var (key, value) in d.Items)
+                {
+                    yield return key;
+                    yield return value;
+                }
+                break;
+
+            case ListComprehension lc:
+                yield return lc.Element;
+                yield return lc.IterableExpr;
+                if (lc.FilterCondition != null) yield return lc.FilterCondition;
+                break;
+
+            case DictComprehension dc:
+                yield return dc.KeyExpr;
+                yield return dc.ValueExpr;
+                yield return dc.IterableExpr;
+                if (dc.FilterCondition != null) yield return dc.FilterCondition;
+                break;
+
+            case LambdaExpr lam:
+                yield return lam.Body;
+                break;
+
+            case BinaryOp b:
+                yield return b.Left;
+                yield return b.Right;
+                break;
+
+            case UnaryOp u:
+                yield return u.Operand;
+                break;
+
+            case FunctionCall f:
+                foreach (var a in f.Args) yield return a;
+                break;
+
+            case MethodCall m:
+                yield return m.Target;
+                foreach (var a in m.Args) yield return a;
+                break;
+
+            case Intrinsic i:
+                foreach (var a in i.Args) yield return a;
+                break;
+        }
+    }
+
+    // Pre-order traversal using an explicit stack, so very deep trees don't recurse.
+    public static IEnumerable<Node> Descendants(Node root)
+    {
+        var stack = new Stack<Node>();
+        stack.Push(root);
+        var buffer = new List<Node>();
+        while (stack.Count > 0)
+        {
+            var node = stack.Pop();
+            yield return node;
+
+            buffer.Clear();
+            buffer.AddRange(Children(node));
+            for (int i = buffer.Count - 1; i >= 0; i--)
+                stack.Push(buffer[i]);
+        }
+    }
+
+    public static int CountNodes(Node root)
+    {
+        int count = 0;
+        foreach (var _ in Descendants(root))
+            count++;
+        return count;
+    }
+}
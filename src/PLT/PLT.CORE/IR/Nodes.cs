@@ -15,6 +15,17 @@ public record TupleUnpackingAssignment(IReadOnlyList<string> VarNames, Expr Valu
 
 public record PassStmt(string? LeadingComment = null) : Stmt;
 
+// return value, or a bare return (Value null)
+public record ReturnStmt(Expr? Value, string? LeadingComment = null) : Stmt;
+
+public record BreakStmt(string? LeadingComment = null) : Stmt;
+
+public record ContinueStmt(string? LeadingComment = null) : Stmt;
+
+// yield value (Value null for a bare yield), or yield from an iterable (IsFrom). A
+// function whose body yields is a generator; see Scope.IsGenerator.
+public record YieldStmt(Expr? Value, bool IsFrom = false, string? LeadingComment = null) : Stmt;
+
 public record IfStmt(Expr Condition, IReadOnlyList<Stmt> ThenBody, IReadOnlyList<Stmt>? ElseBody = null, string? LeadingComment = null) : Stmt;
 
 public record ForEachStmt(string LoopVar, Expr IterableExpr, IReadOnlyList<Stmt> Body, string? LeadingComment = null) : Stmt;
@@ -25,12 +36,18 @@ public record FunctionDefStmt(string FunctionName, IReadOnlyList<string> Paramet
 
 public record ClassDefStmt(string ClassName, IReadOnlyList<Stmt> Body, string? BaseClass = null, string? LeadingComment = null) : Stmt;
 
+// import a.b as c, d        -> ImportStmt(null, [("a.b", "c"), ("d", null)])
+// from ..pkg import x as y  -> ImportStmt("..pkg", [("x", "y")])
+public record ImportStmt(string? FromModule, IReadOnlyList<(string Name, string? Alias)> Names, string? LeadingComment = null) : Stmt;
+
 public record TryStmt(IReadOnlyList<Stmt> TryBody, IReadOnlyList<(string? ExceptionType, string? VarName, IReadOnlyList<Stmt> Body)> ExceptClauses, IReadOnlyList<Stmt>? FinallyBody = null, string? LeadingComment = null) : Stmt;
 
 // Expressions
 public abstract record Expr : Node;
 
-public record Literal(object? Value) : Expr;
+// Numbers are long, BigInteger or double (see NumericLiteral), with Spelling the
+// source text they were parsed from; null for every other literal.
+public record Literal(object? Value, string? Spelling = null) : Expr;
 
 public record Variable(string Name) : Expr;
 
@@ -40,6 +57,10 @@ public abstract record StringPart : Node;
 public record StringPartLiteral(string Value) : StringPart;
 public record StringPartVariable(string VarName) : StringPart;
 
+// A replacement field such as {total:>10.2f} or {name!r}: any expression, with the
+// conversion ('r', 's' or 'a') and the format spec as written in the source.
+public record StringPartExpr(Expr Expr, char? Conversion = null, string? FormatSpec = null) : StringPart;
+
 public record ListLiteral(IReadOnlyList<Expr> Elements) : Expr;
 
 public record DictLiteral(IReadOnlyList<(Expr Key, Expr Value)> Items) : Expr;
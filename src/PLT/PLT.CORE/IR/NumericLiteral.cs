@@ -0,0 +1,77 @@
+using System.Globalization;
+using System.Numerics;
+
+namespace PLT.CORE.IR;
+
+// Numeric literals are typed exactly: an integer is a long when it fits and a
+// BigInteger when it doesn't, and only a literal with a fraction or an exponent is a
+// double. Each keeps its source spelling, which backends reuse where the target reads
+// it as the same number (0xFF stays hex, 1.0 stays a float, 1e-9 isn't expanded).
+public static class NumericLiteral
+{
+    // Integers in decimal or with a 0x/0o/0b prefix, and decimal floats, with _ as a
+    // digit separator (the syntax Python, JS and C# share). Null if text isn't one.
+    public static Literal? Parse(string text)
+    {
+        var spelling = text.Replace("_", "");
+        if (spelling.Length == 0)
+            return null;
+
+        if (spelling.Length > 2 && spelling[0] == '0' && char.ToLowerInvariant(spelling[1]) is 'x' or 'o' or 'b')
+        {
+            int radix = char.ToLowerInvariant(spelling[1]) switch { 'x' => 16, 'o' => 8, _ => 2 };
+            var value = BigInteger.Zero;
+            foreach (var c in spelling.AsSpan(2))
+            {
+                int digit = char.IsAsciiHexDigit(c) ? Convert.ToInt32(c.ToString(), 16) : -1;
+                if (digit < 0 || digit >= radix)
+                    return null;
+                value = value * radix + digit;
+            }
+            return new Literal(Narrow(value), spelling);
+        }
+
+        if (spelling.All(char.IsAsciiDigit))
+            return new Literal(Narrow(BigInteger.Parse(spelling, CultureInfo.InvariantCulture)), spelling);
+
+        if (double.TryParse(spelling, NumberStyles.AllowDecimalPoint | NumberStyles.AllowExponent, CultureInfo.InvariantCulture, out var d))
+            return new Literal(d, spelling);
+
+        return null;
+    }
+
+    public static bool IsInteger(object? value) => value is int or long or BigInteger;
+
+    public static bool IsNumber(object? value) => IsInteger(value) || value is float or double;
+
+    // The text a backend writes for a number: its spelling where the target reads it
+    // as the same value and type, otherwise a canonical form. Hex reads the same
+    // everywhere; 0o and 0b only where the target has them. Decimal integers are
+    // always reformatted, since a leading zero means octal in C and Tcl.
+    public static string Format(object value, string? spelling, bool octalAndBinary)
+    {
+        if (spelling != null)
+        {
+            bool prefixed = spelling.Length > 2 && spelling[0] == '0' && char.IsAsciiLetter(spelling[1]);
+            if (value is double ? !prefixed : prefixed && (char.ToLowerInvariant(spelling[1]) == 'x' || octalAndBinary))
+                return spelling;
+        }
+
+        return value switch
+        {
+            double d => FormatDouble(d),
+            float f => FormatDouble(f),
+            IFormattable n => n.ToString(null, CultureInfo.InvariantCulture),
+            _ => value.ToString() ?? "",
+        };
+    }
+
+    // Round-trips, and always reads as floating point: 1.0 rather than 1.
+    private static string FormatDouble(double d)
+    {
+        var text = d.ToString("R", CultureInfo.InvariantCulture);
+        return double.IsFinite(d) && text.IndexOfAny(new[] { '.', 'E' }) < 0 ? text + ".0" : text;
+    }
+
+    private static object Narrow(BigInteger value) => value <= long.MaxValue ? (long)value : (object)value;
+}
@@ -0,0 +1,359 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Optimization;
+
+// Common subexpression elimination for attribute/subscript chains (obj.a.b[k]) in
+// straight-line code: when the same chain is read more than once with nothing in
+// between that could change it, it is read once into a temporary before the
+// statement that first uses it.
+//
+// A block is a run of simple statements, ending with the condition of an if or the
+// iterable of a for (both evaluated once, in order). Events are considered in
+// evaluation order. A cached chain is invalidated by:
+//   - assigning any name it reads;
+//   - a setattr of any attribute it reads, or a __setitem__ when it subscripts
+//     (on any base, since another name may refer to the same object);
+//   - a call that isn't known to be free of mutation (see Purity).
+// A chain only gets a temporary at an occurrence that is always evaluated (not
+// behind and/or or a ternary branch) and that nothing earlier in its statement
+// could invalidate, since the temporary is assigned before that statement.
+public static class CommonSubexpressions
+{
+    public static IrProgram Run(IrProgram program)
+    {
+        using var phase = PltTelemetry.StartPhase("optimize.cse");
+        var pass = new Pass(program);
+        var body = pass.RewriteBody(program.Body);
+        phase.SetTag("temps", pass.Temps);
+        return ReferenceEquals(body, program.Body) ? program : program with { Body = body };
+    }
+
+    private sealed record Chain(string Key, int Length, HashSet<string> Names, HashSet<string> Attributes, bool Subscripts);
+
+    private sealed class Group
+    {
+        public required Chain Chain;
+        public readonly List<Occurrence> Occurrences = new();
+    }
+
+    private sealed record Occurrence(int Statement, int Order, Expr Node, bool CanDefine);
+
+    private sealed class Pass
+    {
+        private readonly IReadOnlySet<string> _modules;
+        private readonly TempNames _temps;
+        private readonly Dictionary<Expr, Chain?> _chains = new(ReferenceEqualityComparer.Instance);
+
+        public int Temps { get; private set; }
+
+        public Pass(IrProgram program)
+        {
+            _modules = Purity.ModuleNames(program);
+            _temps = new TempNames(program);
+        }
+
+        public IReadOnlyList<Stmt> RewriteBody(IReadOnlyList<Stmt> body)
+        {
+            var stmts = body.Select(RewriteNested).ToList();
+            bool changed = stmts.Where((s, i) => !ReferenceEquals(s, body[i])).Any();
+
+            var result = new List<Stmt>();
+            int start = 0;
+            for (int i = 0; i < stmts.Count; i++)
+            {
+                if (EndsBlock(stmts[i]))
+                {
+                    changed |= EliminateBlock(stmts, start, i + 1, result);
+                    start = i + 1;
+                }
+            }
+            changed |= EliminateBlock(stmts, start, stmts.Count, result);
+            return changed ? result : body;
+        }
+
+        private Stmt RewriteNested(Stmt stmt)
+        {
+            switch (stmt)
+            {
+                case IfStmt i:
+                {
+                    var thenBody = RewriteBody(i.ThenBody);
+                    var elseBody = i.ElseBody == null ? null : RewriteBody(i.ElseBody);
+                    return ReferenceEquals(thenBody, i.ThenBody) && ReferenceEquals(elseBody, i.ElseBody)
+                        ? i
+                        : i with { ThenBody = thenBody, ElseBody = elseBody };
+                }
+                case ForEachStmt f:
+                {
+                    var body = RewriteBody(f.Body);
+                    return ReferenceEquals(body, f.Body) ? f : f with { Body = body };
+                }
+                case WhileStmt w:
+                {
+                    var body = RewriteBody(w.Body);
+                    return ReferenceEquals(body, w.Body) ? w : w with { Body = body };
+                }
+                case FunctionDefStmt f:
+                {
+                    var body = RewriteBody(f.Body);
+                    return ReferenceEquals(body, f.Body) ? f : f with { Body = body };
+                }
+                case ClassDefStmt c:
+                {
+                    var body = RewriteBody(c.Body);
+                    return ReferenceEquals(body, c.Body) ? c : c with { Body = body };
+                }
+                case TryStmt t:
+                {
+                    var tryBody = RewriteBody(t.TryBody);
+                    var clauses = t.ExceptClauses.Select(c => (c.ExceptionType, c.VarName, Body: RewriteBody(c.Body))).ToList();
+                    var finallyBody = t.FinallyBody == null ? null : RewriteBody(t.FinallyBody);
+                    bool clausesChanged = clauses.Where((c, j) => !ReferenceEquals(c.Body, t.ExceptClauses[j].Body)).Any();
+                    return ReferenceEquals(tryBody, t.TryBody) && !clausesChanged && ReferenceEquals(finallyBody, t.FinallyBody)
+                        ? t
+                        : t with { TryBody = tryBody, ExceptClauses = clausesChanged ? clauses : t.ExceptClauses, FinallyBody = finallyBody };
+                }
+                default:
+                    return stmt;
+            }
+        }
+
+        private static bool EndsBlock(Stmt stmt) =>
+            stmt is not (ExprStmt or VarAssignment or TupleUnpackingAssignment or PassStmt);
+
+        // The expression a statement evaluates as part of its block.
+        private static Expr? BlockExpr(Stmt stmt) =>
+            stmt switch
+            {
+                ExprStmt s => s.Expr,
+                VarAssignment v => v.Value,
+                TupleUnpackingAssignment t => t.Value,
+                IfStmt i => i.Condition,
+                ForEachStmt f => f.IterableExpr,
+                _ => null,
+            };
+
+        // Appends stmts[start..end) to result, with temporaries for repeated chains.
+        private bool EliminateBlock(List<Stmt> stmts, int start, int end, List<Stmt> result)
+        {
+            var groups = new List<Group>();
+            var open = new Dictionary<string, Group>();
+            int order = 0;
+
+            for (int si = start; si < end; si++)
+            {
+                bool killed = false;
+                if (BlockExpr(stmts[si]) is { } expr)
+                {
+                    Scan(expr, conditional: false, (e, conditional) =>
+                    {
+                        var chain = ChainOf(e)!;
+                        if (open.TryGetValue(chain.Key, out var group))
+                        {
+                            group.Occurrences.Add(new Occurrence(si, order++, e, false));
+                        }
+                        else if (!killed && !conditional)
+                        {
+                            group = new Group { Chain = chain };
+                            groups.Add(group);
+                            open[chain.Key] = group;
+                            group.Occurrences.Add(new Occurrence(si, order++, e, true));
+                        }
+                    },
+                    kill =>
+                    {
+                        killed = true;
+                        foreach (var key in open.Where(g => kill(g.Value.Chain)).Select(g => g.Key).ToList())
+                            open.Remove(key);
+                    });
+                }
+
+                var assigned = stmts[si] switch
+                {
+                    VarAssignment v => new[] { v.VarName },
+                    TupleUnpackingAssignment t => t.VarNames,
+                    _ => Array.Empty<string>(),
+                };
+                foreach (var key in open.Where(g => g.Value.Chain.Names.Overlaps(assigned)).Select(g => g.Key).ToList())
+                    open.Remove(key);
+            }
+
+            // Longest chains first; the chains inside them are then read only once.
+            var consumed = new HashSet<Expr>(ReferenceEqualityComparer.Instance);
+            var temps = new List<(Occurrence Definition, string Name)>();
+            var replacements = new Dictionary<Expr, Expr>(ReferenceEqualityComparer.Instance);
+            foreach (var group in groups.OrderByDescending(g => g.Chain.Length))
+            {
+                var occurrences = group.Occurrences.Where(o => !consumed.Contains(o.Node)).ToList();
+                if (occurrences.Count < 2 || !occurrences[0].CanDefine)
+                    continue;
+
+                var name = _temps.Next("cse");
+                Temps++;
+                temps.Add((occurrences[0], name));
+                foreach (var occurrence in occurrences)
+                {
+                    replacements[occurrence.Node] = new Variable(name);
+                    foreach (var node in IrWalker.Descendants(occurrence.Node).Skip(1))
+                        if (node is Expr e)
+                            consumed.Add(e);
+                }
+            }
+
+            for (int si = start; si < end; si++)
+            {
+                foreach (var (definition, name) in temps.Where(t => t.Definition.Statement == si).OrderBy(t => t.Definition.Order))
+                    result.Add(new VarAssignment(name, definition.Node));
+                result.Add(replacements.Count == 0
+                    ? stmts[si]
+                    : IrRewriter.Rewrite(stmts[si], e => replacements.TryGetValue(e, out var r) ? r : null));
+            }
+            return temps.Count > 0;
+        }
+
+        // Walks expr in evaluation order, reporting each chain read (outer chains after
+        // the chains inside them) and each event that may invalidate cached chains.
+        // The walk keeps an explicit stack: operator chains nest as deep as they are long.
+        private void Scan(Expr expr, bool conditional, Action<Expr, bool> read, Action<Func<Chain, bool>> kill)
+        {
+            // Visited: the node's operands have been scanned, and it is its own turn
+            var stack = new Stack<(Expr Expr, bool Conditional, bool Visited)>();
+            stack.Push((expr, conditional, false));
+            var operands = new List<(Expr, bool, bool)>();
+            while (stack.Count > 0)
+            {
+                var (node, isConditional, visited) = stack.Pop();
+                if (visited)
+                {
+                    Visit(node, isConditional, read, kill);
+                    continue;
+                }
+
+                operands.Clear();
+                switch (node)
+                {
+                    case BinaryOp { Op: "and" or "or" } b:
+                        operands.Add((b.Left, isConditional, false));
+                        operands.Add((b.Right, true, false));
+                        break;
+
+                    case Intrinsic { Name: "ternary" } t:
+                        for (int i = 0; i < t.Args.Count; i++)
+                            operands.Add((t.Args[i], isConditional || i > 0, false));
+                        break;
+
+                    case ListComprehension lc:
+                        // The element and filter run in a scope of their own, once per item.
+                        stack.Push((node, isConditional, true));
+                        operands.Add((lc.IterableExpr, isConditional, false));
+                        break;
+
+                    case DictComprehension dc:
+                        stack.Push((node, isConditional, true));
+                        operands.Add((dc.IterableExpr, isConditional, false));
+                        break;
+
+                    case LambdaExpr:
+                        // Not evaluated until called
+                        break;
+
+                    default:
+                        stack.Push((node, isConditional, true));
+                        foreach (var child in IrWalker.Children(node))
+                            if (child is Expr e)
+                                operands.Add((e, isConditional, false));
+                        break;
+                }
+                for (int i = operands.Count - 1; i >= 0; i--)
+                    stack.Push(operands[i]);
+            }
+        }
+
+        // Reports what evaluating expr itself, after its operands, reads or invalidates.
+        private void Visit(Expr expr, bool conditional, Action<Expr, bool> read, Action<Func<Chain, bool>> kill)
+        {
+            if (expr is ListComprehension or DictComprehension)
+            {
+                if (IrWalker.Descendants(expr).Any(IsUnknownCall))
+                    kill(_ => true);
+            }
+            else if (ChainOf(expr) != null)
+            {
+                read(expr, conditional);
+            }
+            else if (expr is Intrinsic { Name: "setattr" } set)
+            {
+                if (set.Args is [_, Literal { Value: string attribute }, _])
+                    kill(c => c.Attributes.Contains(attribute));
+                else
+                    kill(_ => true);
+            }
+            else if (expr is MethodCall { MethodName: "__setitem__" })
+            {
+                kill(c => c.Subscripts);
+            }
+            else if (IsUnknownCall(expr))
+            {
+                kill(_ => true);
+            }
+        }
+
+        private bool IsUnknownCall(Node node) =>
+            node is FunctionCall or MethodCall or Intrinsic && Purity.Of((Expr)node, _modules) == Effect.Unknown;
+
+        // getattr(base, "name") or base[key], where base is a name or another chain
+        // and key is a literal or a name.
+        private Chain? ChainOf(Expr expr)
+        {
+            if (_chains.TryGetValue(expr, out var known))
+                return known;
+
+            Chain? chain = null;
+            switch (expr)
+            {
+                case Intrinsic { Name: "getattr", Args: [var target, Literal { Value: string attribute }] }:
+                {
+                    var inner = Base(target);
+                    if (inner != null)
+                    {
+                        var attributes = new HashSet<string>(inner.Attributes) { attribute };
+                        chain = new Chain($"{inner.Key}.{attribute}", inner.Length + 1, inner.Names, attributes, inner.Subscripts);
+                    }
+                    break;
+                }
+
+                case MethodCall { MethodName: "__getitem__", Args: [var key] } m when key is Literal or Variable:
+                {
+                    var inner = Base(m.Target);
+                    if (inner != null)
+                    {
+                        var names = new HashSet<string>(inner.Names);
+                        if (key is Variable v)
+                            names.Add(v.Name);
+                        var keyText = key is Variable kv ? kv.Name : FormatLiteralKey(((Literal)key).Value);
+                        chain = new Chain($"{inner.Key}[{keyText}]", inner.Length + 1, names, inner.Attributes, true);
+                    }
+                    break;
+                }
+            }
+
+            _chains[expr] = chain;
+            return chain;
+        }
+
+        private Chain? Base(Expr target) =>
+            target is Variable v
+                ? new Chain(v.Name, 0, new HashSet<string> { v.Name }, new HashSet<string>(), false)
+                : ChainOf(target);
+
+        // Literal keys are typed so that x[1] and x["1"] stay distinct.
+        private static string FormatLiteralKey(object? value) =>
+            value switch
+            {
+                null => "None",
+                string s => $"\"{s.Replace("\\", "\\\\").Replace("\"", "\\\"")}\"",
+                _ => $"{value.GetType().Name}:{value}",
+            };
+    }
+}
@@ -0,0 +1,18 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Optimization;
+
+// The IR-to-IR optimization pipeline behind the CLI's --optimize flag. Each pass
+// returns the program unchanged (by reference) when it has nothing to do.
+public static class IrOptimizer
+{
+    public static IrProgram Optimize(IrProgram program)
+    {
+        using var phase = PltTelemetry.StartPhase("optimize");
+        program = LoopInvariantMotion.Run(program);
+        program = CommonSubexpressions.Run(program);
+        phase.RecordIrNodes(program);
+        return program;
+    }
+}
@@ -0,0 +1,430 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Optimization;
+
+// Loop-invariant code motion: expressions inside a for/while loop whose value can't
+// change between iterations are computed once into a temporary just before the loop.
+//
+// An expression is invariant when it only calls pure builtins (see Purity), reads no
+// name the loop assigns, and - if it reads object state (len(x), x[k], getattr) - the
+// loop contains no call that might mutate objects. At module level any unknown call
+// may also rebind globals, so only constant expressions are invariant there.
+//
+// Hoisting evaluates the expression even if the loop runs zero times, or exits before
+// reaching it. So an expression that can raise is only hoisted from a while
+// condition, which is always evaluated first on entry; from loop bodies only
+// expressions that can't raise are hoisted (constant containers, string building).
+// Fresh mutable values - a list literal, sorted(...) - are hoisted only where the
+// loop reads them without keeping or mutating them: `x in [...]`, `[...][i]`, len().
+public static class LoopInvariantMotion
+{
+    public static IrProgram Run(IrProgram program)
+    {
+        using var phase = PltTelemetry.StartPhase("optimize.licm");
+        var pass = new Pass(program);
+        var body = pass.RewriteBody(program.Body, inFunction: false);
+        phase.SetTag("hoisted", pass.Hoisted);
+        return ReferenceEquals(body, program.Body) ? program : program with { Body = body };
+    }
+
+    private sealed class Info
+    {
+        public bool Invariant;
+        public bool MayRaise;
+        public bool Fresh;      // evaluates to a new mutable object
+        public bool Worthwhile; // does enough work to be worth a temporary
+        public bool ReadsName;  // a variable is read somewhere in it
+    }
+
+    private sealed class Pass
+    {
+        private readonly IReadOnlySet<string> _modules;
+        private readonly TempNames _temps;
+
+        public int Hoisted { get; private set; }
+
+        public Pass(IrProgram program)
+        {
+            _modules = Purity.ModuleNames(program);
+            _temps = new TempNames(program);
+        }
+
+        public IReadOnlyList<Stmt> RewriteBody(IReadOnlyList<Stmt> body, bool inFunction)
+        {
+            List<Stmt>? rewritten = null;
+            for (int i = 0; i < body.Count; i++)
+            {
+                var replacement = RewriteStmt(body[i], inFunction);
+                if (rewritten == null && (replacement.Count != 1 || !ReferenceEquals(replacement[0], body[i])))
+                    rewritten = new List<Stmt>(body.Take(i));
+                rewritten?.AddRange(replacement);
+            }
+            return rewritten ?? body;
+        }
+
+        private IReadOnlyList<Stmt> RewriteStmt(Stmt stmt, bool inFunction)
+        {
+            switch (stmt)
+            {
+                case ForEachStmt or WhileStmt:
+                {
+                    var hoisted = Hoist(ref stmt, inFunction);
+                    // Then the loops inside, against their own (smaller) bodies.
+                    stmt = stmt switch
+                    {
+                        ForEachStmt f => WithBody(f, RewriteBody(f.Body, inFunction)),
+                        WhileStmt w => WithBody(w, RewriteBody(w.Body, inFunction)),
+                        _ => stmt,
+                    };
+                    hoisted.Add(stmt);
+                    return hoisted;
+                }
+
+                case IfStmt i:
+                {
+                    var thenBody = RewriteBody(i.ThenBody, inFunction);
+                    var elseBody = i.ElseBody == null ? null : RewriteBody(i.ElseBody, inFunction);
+                    return new[]
+                    {
+                        ReferenceEquals(thenBody, i.ThenBody) && ReferenceEquals(elseBody, i.ElseBody)
+                            ? i
+                            : i with { ThenBody = thenBody, ElseBody = elseBody },
+                    };
+                }
+
+                case TryStmt t:
+                {
+                    var tryBody = RewriteBody(t.TryBody, inFunction);
+                    var clauses = t.ExceptClauses.Select(c => (c.ExceptionType, c.VarName, Body: RewriteBody(c.Body, inFunction))).ToList();
+                    var finallyBody = t.FinallyBody == null ? null : RewriteBody(t.FinallyBody, inFunction);
+                    bool clausesChanged = clauses.Where((c, j) => !ReferenceEquals(c.Body, t.ExceptClauses[j].Body)).Any();
+                    return new[]
+                    {
+                        ReferenceEquals(tryBody, t.TryBody) && !clausesChanged && ReferenceEquals(finallyBody, t.FinallyBody)
+                            ? t
+                            : t with { TryBody = tryBody, ExceptClauses = clausesChanged ? clauses : t.ExceptClauses, FinallyBody = finallyBody },
+                    };
+                }
+
+                case FunctionDefStmt f:
+                {
+                    var body = RewriteBody(f.Body, inFunction: true);
+                    return new[] { ReferenceEquals(body, f.Body) ? f : f with { Body = body } };
+                }
+
+                case ClassDefStmt c:
+                {
+                    var body = RewriteBody(c.Body, inFunction: false);
+                    return new[] { ReferenceEquals(body, c.Body) ? c : c with { Body = body } };
+                }
+
+                default:
+                    return new[] { stmt };
+            }
+        }
+
+        private static Stmt WithBody(ForEachStmt f, IReadOnlyList<Stmt> body) =>
+            ReferenceEquals(body, f.Body) ? f : f with { Body = body };
+
+        private static Stmt WithBody(WhileStmt w, IReadOnlyList<Stmt> body) =>
+            ReferenceEquals(body, w.Body) ? w : w with { Body = body };
+
+        // Moves the loop's invariant expressions into temporaries; returns their
+        // assignments and replaces loop with the rewritten loop.
+        private List<Stmt> Hoist(ref Stmt loop, bool inFunction)
+        {
+            var assigned = new HashSet<string>();
+            bool mutates = false;
+            ScanLoop(loop, assigned, ref mutates);
+
+            var info = new Dictionary<Expr, Info>(ReferenceEqualityComparer.Instance);
+            var selected = new List<Expr>();
+
+            if (loop is WhileStmt w)
+                Select(w.Condition, alwaysEvaluated: true, readOnly: false, assigned, mutates, inFunction, info, selected);
+            foreach (var expr in LoopBodyExprs(loop))
+                Select(expr.Expr, alwaysEvaluated: false, expr.ReadOnly, assigned, mutates, inFunction, info, selected);
+
+            var hoisted = new List<Stmt>();
+            if (selected.Count == 0)
+                return hoisted;
+
+            // Identical expressions share a temporary.
+            var temps = new Dictionary<string, string>();
+            var replacements = new Dictionary<Expr, Expr>(ReferenceEqualityComparer.Instance);
+            foreach (var expr in selected)
+            {
+                var key = IrDumper.Dump(expr, new IrDumpOptions { Format = IrDumpFormat.SExpr });
+                if (!temps.TryGetValue(key, out var temp))
+                {
+                    temp = _temps.Next("inv");
+                    temps[key] = temp;
+                    hoisted.Add(new VarAssignment(temp, expr));
+                    Hoisted++;
+                }
+                replacements[expr] = new Variable(temp);
+            }
+
+            Func<Expr, Expr?> replace = e => replacements.TryGetValue(e, out var r) ? r : null;
+            loop = loop switch
+            {
+                ForEachStmt f => WithBody(f, IrRewriter.Rewrite(f.Body, replace)),
+                WhileStmt ws => (Stmt)(ws with { Condition = IrRewriter.Rewrite(ws.Condition, replace), Body = IrRewriter.Rewrite(ws.Body, replace) }),
+                _ => loop,
+            };
+            return hoisted;
+        }
+
+        // Names the loop (re)binds, and whether it calls anything that may mutate
+        // objects. Nested function and class bodies don't run as part of the loop.
+        private void ScanLoop(Stmt loop, HashSet<string> assigned, ref bool mutates)
+        {
+            var stack = new Stack<Node>();
+            stack.Push(loop);
+            while (stack.Count > 0)
+            {
+                var node = stack.Pop();
+                switch (node)
+                {
+                    case VarAssignment v:
+                        assigned.Add(v.VarName);
+                        break;
+                    case TupleUnpackingAssignment t:
+                        assigned.UnionWith(t.VarNames);
+                        break;
+                    case ForEachStmt f:
+                        assigned.UnionWith(f.LoopVar.Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries));
+                        break;
+                    case TryStmt t:
+                        foreach (var (_, varName, _) in t.ExceptClauses)
+                            if (varName != null)
+                                assigned.Add(varName);
+                        break;
+                    case FunctionDefStmt f:
+                        assigned.Add(f.FunctionName);
+                        continue;
+                    case ClassDefStmt c:
+                        assigned.Add(c.ClassName);
+                        continue;
+                    case ImportStmt:
+                        mutates = true;
+                        break;
+                    case FunctionCall or MethodCall or Intrinsic:
+                        if (Purity.Of((Expr)node, _modules) == Effect.Unknown)
+                            mutates = true;
+                        break;
+                }
+                foreach (var child in IrWalker.Children(node))
+                    stack.Push(child);
+            }
+        }
+
+        // The expressions evaluated on every iteration, outside nested function and
+        // class bodies, with whether each is only read (see Select).
+        private static IEnumerable<(Expr Expr, bool ReadOnly)> LoopBodyExprs(Stmt loop)
+        {
+            var stack = new Stack<Stmt>();
+            foreach (var stmt in (loop is ForEachStmt f ? f.Body : ((WhileStmt)loop).Body).Reverse())
+                stack.Push(stmt);
+            while (stack.Count > 0)
+            {
+                var stmt = stack.Pop();
+                if (stmt is FunctionDefStmt or ClassDefStmt)
+                    continue;
+                if (stmt is ForEachStmt inner)
+                {
+                    // Iterating doesn't keep or mutate the iterable.
+                    yield return (inner.IterableExpr, true);
+                    foreach (var s in inner.Body.Reverse())
+                        stack.Push(s);
+                    continue;
+                }
+                var children = IrWalker.Children(stmt).ToList();
+                for (int i = children.Count - 1; i >= 0; i--)
+                    if (children[i] is Stmt s)
+                        stack.Push(s);
+                foreach (var child in children)
+                    if (child is Expr e)
+                        yield return (e, false);
+            }
+        }
+
+        // Picks the largest hoistable sub-expressions of expr. readOnly: expr's value
+        // is only inspected by its consumer, so a fresh object may be shared. Walks
+        // with an explicit stack, in pre-order: operator chains nest as deep as they
+        // are long.
+        private void Select(Expr expr, bool alwaysEvaluated, bool readOnly, HashSet<string> assigned, bool mutates,
+            bool inFunction, Dictionary<Expr, Info> info, List<Expr> selected)
+        {
+            var stack = new Stack<(Expr Expr, bool AlwaysEvaluated, bool ReadOnly)>();
+            stack.Push((expr, alwaysEvaluated, readOnly));
+            var next = new List<(Expr, bool, bool)>();
+            while (stack.Count > 0)
+            {
+                (expr, alwaysEvaluated, readOnly) = stack.Pop();
+                var e = Classify(expr, assigned, mutates, inFunction, info);
+                if (e.Invariant && e.Worthwhile && (alwaysEvaluated || !e.MayRaise) && (!e.Fresh || readOnly))
+                {
+                    selected.Add(expr);
+                    continue;
+                }
+
+                next.Clear();
+                switch (expr)
+                {
+                    // Not evaluated once per iteration, or with names of their own.
+                    case ListComprehension or DictComprehension or LambdaExpr:
+                        break;
+
+                    // Only the condition of a ternary is sure to be evaluated.
+                    case Intrinsic { Name: "ternary" } t:
+                        for (int i = 0; i < t.Args.Count; i++)
+                            next.Add((t.Args[i], alwaysEvaluated && i == 0, false));
+                        break;
+
+                    // The right operand of and/or is evaluated conditionally.
+                    case BinaryOp { Op: "and" or "or" } b:
+                        next.Add((b.Left, alwaysEvaluated, false));
+                        next.Add((b.Right, false, false));
+                        break;
+
+                    case BinaryOp b:
+                        bool inspects = b.Op is "in" or "not in" or "==" or "!=";
+                        next.Add((b.Left, alwaysEvaluated, b.Op is "==" or "!="));
+                        next.Add((b.Right, alwaysEvaluated, inspects));
+                        break;
+
+                    case MethodCall m:
+                        next.Add((m.Target, alwaysEvaluated, Purity.Of(m, _modules) != Effect.Unknown));
+                        foreach (var arg in m.Args)
+                            next.Add((arg, alwaysEvaluated, false));
+                        break;
+
+                    case FunctionCall f:
+                        bool pure = Purity.IsPure(Purity.Of(f, _modules));
+                        foreach (var arg in f.Args)
+                            next.Add((arg, alwaysEvaluated, pure));
+                        break;
+
+                    default:
+                        foreach (var child in IrWalker.Children(expr))
+                            if (child is Expr c)
+                                next.Add((c, alwaysEvaluated, false));
+                        break;
+                }
+                for (int i = next.Count - 1; i >= 0; i--)
+                    stack.Push(next[i]);
+            }
+        }
+
+        // Classifies expr and everything in it, children before parents, from an
+        // explicit stack for the same reason as Select.
+        private Info Classify(Expr root, HashSet<string> assigned, bool mutates, bool inFunction, Dictionary<Expr, Info> info)
+        {
+            var stack = new Stack<(Expr Expr, bool ChildrenDone)>();
+            stack.Push((root, false));
+            while (stack.Count > 0)
+            {
+                var (expr, childrenDone) = stack.Pop();
+                if (info.ContainsKey(expr))
+                    continue;
+                if (childrenDone)
+                {
+                    info[expr] = ClassifyNode(expr, assigned, mutates, inFunction, info);
+                    continue;
+                }
+                stack.Push((expr, true));
+                foreach (var child in Operands(expr))
+                    stack.Push((child, false));
+            }
+            return info[root];
+        }
+
+        // The expressions whose classes decide expr's: its children, and an f-string's fields.
+        private static IEnumerable<Expr> Operands(Expr expr) =>
+            expr is StringInterpolation s
+                ? s.Parts.OfType<StringPartExpr>().Select(p => p.Expr)
+                : IrWalker.Children(expr).OfType<Expr>();
+
+        // expr's class, from those of its operands (already in info).
+        private Info ClassifyNode(Expr expr, HashSet<string> assigned, bool mutates, bool inFunction, Dictionary<Expr, Info> info)
+        {
+            var result = new Info();
+            var children = IrWalker.Children(expr).OfType<Expr>().Select(c => info[c]).ToList();
+            bool childrenInvariant = children.All(c => c.Invariant);
+            bool childrenMayRaise = children.Any(c => c.MayRaise);
+            result.ReadsName = children.Any(c => c.ReadsName);
+
+            switch (expr)
+            {
+                case Literal:
+                    result.Invariant = true;
+                    break;
+
+                case Variable v:
+                    // A name read but never assigned in the loop is taken to be bound on entry.
+                    result.Invariant = !assigned.Contains(v.Name) && (inFunction || !mutates);
+                    result.ReadsName = true;
+                    break;
+
+                case StringInterpolation s:
+                {
+                    var fields = s.Parts.OfType<StringPartExpr>().Select(p => info[p.Expr]).ToList();
+                    result.Invariant = s.Parts.OfType<StringPartVariable>().All(p => !assigned.Contains(p.VarName) && (inFunction || !mutates)) &&
+                                       fields.All(f => f.Invariant);
+                    // Formatting can raise: a spec that doesn't suit the value's type
+                    result.MayRaise = fields.Count > 0;
+                    result.Worthwhile = s.Parts.Any(p => p is not StringPartLiteral);
+                    result.ReadsName = fields.Any(f => f.ReadsName);
+                    break;
+                }
+
+                case ListLiteral or DictLiteral:
+                    result.Invariant = childrenInvariant;
+                    result.MayRaise = childrenMayRaise;
+                    result.Fresh = true;
+                    result.Worthwhile = true;
+                    break;
+
+                case UnaryOp u:
+                    result.Invariant = childrenInvariant;
+                    result.MayRaise = childrenMayRaise || u.Op != "not";
+                    result.Worthwhile = children[0].Worthwhile;
+                    break;
+
+                case BinaryOp b:
+                    bool comparison = b.Op is "==" or "!=" or "<" or ">" or "<=" or ">=" or "in" or "not in" or "is" or "is not";
+                    result.Invariant = childrenInvariant;
+                    result.MayRaise = childrenMayRaise || b.Op is not ("and" or "or" or "==" or "!=" or "is" or "is not");
+                    result.Fresh = !comparison && children.Any(c => c.Fresh);
+                    // Constant arithmetic isn't worth a variable; anything reading a name is.
+                    result.Worthwhile = children.Any(c => c.Worthwhile || c.ReadsName);
+                    break;
+
+                case Intrinsic { Name: "ternary" }:
+                    result.Invariant = childrenInvariant;
+                    result.MayRaise = childrenMayRaise;
+                    result.Fresh = children.Any(c => c.Fresh);
+                    result.Worthwhile = children.Any(c => c.Worthwhile);
+                    break;
+
+                case FunctionCall or MethodCall or Intrinsic:
+                    var effect = Purity.Of(expr, _modules);
+                    // Reading object state is only invariant if nothing in the loop can change it.
+                    result.Invariant = childrenInvariant && Purity.IsPure(effect) && !mutates;
+                    result.MayRaise = true;
+                    // A pure call may hand back (part of) a fresh argument: {"a": []}["a"]
+                    result.Fresh = effect == Effect.PureFresh || children.Any(c => c.Fresh);
+                    result.Worthwhile = true;
+                    break;
+
+                default:
+                    // comprehensions, lambdas
+                    result.ReadsName = IrWalker.Descendants(expr).Any(n => n is Variable);
+                    break;
+            }
+            return result;
+        }
+    }
+}
@@ -0,0 +1,107 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Optimization;
+
+public enum Effect
+{
+    Unknown,     // may mutate objects or rebind globals
+    Pure,        // result depends only on the arguments (and what they reference)
+    PureFresh,   // pure, but returns a new mutable object (list, dict, ...)
+    NoMutation,  // has side effects (I/O) but never changes program state
+}
+
+// What the optimizer may assume about calls to known builtins, by name. Methods are
+// matched by name alone and assumed to have their str/list/dict meaning, except on
+// imported modules (`requests.get(...)` is not dict.get).
+public static class Purity
+{
+    private static readonly Dictionary<string, Effect> Functions = new()
+    {
+        ["len"] = Effect.Pure,
+        ["abs"] = Effect.Pure,
+        ["min"] = Effect.Pure,
+        ["max"] = Effect.Pure,
+        ["sum"] = Effect.Pure,
+        ["any"] = Effect.Pure,
+        ["all"] = Effect.Pure,
+        ["round"] = Effect.Pure,
+        ["int"] = Effect.Pure,
+        ["float"] = Effect.Pure,
+        ["bool"] = Effect.Pure,
+        ["str"] = Effect.Pure,
+        ["repr"] = Effect.Pure,
+        ["ord"] = Effect.Pure,
+        ["chr"] = Effect.Pure,
+        ["hex"] = Effect.Pure,
+        ["oct"] = Effect.Pure,
+        ["bin"] = Effect.Pure,
+        ["isinstance"] = Effect.Pure,
+        ["getattr"] = Effect.Pure,
+        ["hasattr"] = Effect.Pure,
+        ["tuple"] = Effect.Pure,
+        ["frozenset"] = Effect.Pure,
+        ["list"] = Effect.PureFresh,
+        ["dict"] = Effect.PureFresh,
+        ["set"] = Effect.PureFresh,
+        ["sorted"] = Effect.PureFresh,
+        ["print"] = Effect.NoMutation,
+    };
+
+    private static readonly Dictionary<string, Effect> Methods = new()
+    {
+        ["__getitem__"] = Effect.Pure,
+        ["__slice__"] = Effect.Pure,
+        ["get"] = Effect.Pure,
+        ["startswith"] = Effect.Pure,
+        ["endswith"] = Effect.Pure,
+        ["upper"] = Effect.Pure,
+        ["lower"] = Effect.Pure,
+        ["strip"] = Effect.Pure,
+        ["lstrip"] = Effect.Pure,
+        ["rstrip"] = Effect.Pure,
+        ["find"] = Effect.Pure,
+        ["count"] = Effect.Pure,
+        ["index"] = Effect.Pure,
+        ["replace"] = Effect.Pure,
+        ["join"] = Effect.Pure,
+        ["format"] = Effect.Pure,
+        ["encode"] = Effect.Pure,
+        ["decode"] = Effect.Pure,
+        ["isdigit"] = Effect.Pure,
+        ["isalpha"] = Effect.Pure,
+        ["isspace"] = Effect.Pure,
+        ["split"] = Effect.PureFresh,
+        ["keys"] = Effect.PureFresh,
+        ["values"] = Effect.PureFresh,
+        ["items"] = Effect.PureFresh,
+        ["copy"] = Effect.PureFresh,
+    };
+
+    private static readonly Dictionary<string, Effect> Intrinsics = new()
+    {
+        ["getattr"] = Effect.Pure,
+        ["ternary"] = Effect.Pure,
+        ["print"] = Effect.NoMutation,
+    };
+
+    public static Effect Of(Expr call, IReadOnlySet<string> modules) =>
+        call switch
+        {
+            FunctionCall { IsNamespaced: false } f => Functions.GetValueOrDefault(f.FunctionName),
+            MethodCall { Target: Variable v } when modules.Contains(v.Name) => Effect.Unknown,
+            MethodCall m => Methods.GetValueOrDefault(m.MethodName),
+            Intrinsic i => Intrinsics.GetValueOrDefault(i.Name),
+            _ => Effect.Unknown,
+        };
+
+    public static bool IsPure(Effect effect) => effect is Effect.Pure or Effect.PureFresh;
+
+    // Names bound by import statements anywhere in the program.
+    public static IReadOnlySet<string> ModuleNames(IrProgram program) =>
+        IrWalker.Descendants(program)
+            .OfType<ImportStmt>()
+            .SelectMany(i => i.Names)
+            .Where(n => n.Name != "*")
+            .Select(n => n.Alias ?? n.Name.Split('.')[0])
+            .ToHashSet();
+}
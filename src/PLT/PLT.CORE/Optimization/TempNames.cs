@@ -0,0 +1,38 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Optimization;
+
+// Hands out temporary variable names (_inv1, _cse1, ...) that no name in the
+// program uses.
+internal sealed class TempNames
+{
+    private readonly HashSet<string> _names = new();
+    private readonly Dictionary<string, int> _next = new();
+
+    public TempNames(IrProgram program)
+    {
+        foreach (var node in IrWalker.Descendants(program))
+        {
+            switch (node)
+            {
+                case Variable v: _names.Add(v.Name); break;
+                case VarAssignment v: _names.Add(v.VarName); break;
+                case TupleUnpackingAssignment t: _names.UnionWith(t.VarNames); break;
+                case FunctionDefStmt f: _names.UnionWith(f.Parameters); break;
+            }
+        }
+    }
+
+    public string Next(string prefix)
+    {
+        string name;
+        do
+        {
+            var n = _next.GetValueOrDefault(prefix, 1);
+            _next[prefix] = n + 1;
+            name = $"_{prefix}{n}";
+        }
+        while (!_names.Add(name));
+        return name;
+    }
+}
@@ -0,0 +1,92 @@
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Optimization;
+
+public sealed record TreeShakeResult(IrProgram Program, IReadOnlyList<string> Removed, bool KeptEverything);
+
+// Drops top-level functions and classes that nothing reachable refers to.
+//
+// Roots are every other top-level statement (they run when the module loads) plus
+// any entry points named by the caller. A reachable definition makes everything
+// its body refers to reachable; a class is kept or dropped as a whole, since a
+// method call can't be tied to a class by name. References are names (variables,
+// calls, base classes) and string literals spelling a definition's name, which
+// covers __all__, getattr(module, "name") and dispatch tables. Code calling
+// globals(), eval() and the like can reach anything, so then nothing is dropped.
+public static class TreeShaker
+{
+    private static readonly HashSet<string> Dynamic = new() { "globals", "locals", "vars", "eval", "exec", "__import__" };
+
+    public static TreeShakeResult Shake(IrProgram program, IEnumerable<string>? entryPoints = null)
+    {
+        using var phase = PltTelemetry.StartPhase("treeshake");
+
+        var definitions = new Dictionary<string, List<Stmt>>();
+        foreach (var stmt in program.Body)
+        {
+            if (NameOf(stmt) is { } name)
+            {
+                if (!definitions.TryGetValue(name, out var list))
+                    definitions[name] = list = new List<Stmt>();
+                list.Add(stmt);
+            }
+        }
+
+        var reached = new HashSet<string>();
+        var pending = new Stack<string>();
+        bool dynamic = false;
+
+        void Visit(Node root)
+        {
+            foreach (var node in IrWalker.Descendants(root))
+            {
+                string? name = node switch
+                {
+                    Variable v => v.Name,
+                    FunctionCall f => f.FunctionName,
+                    ClassDefStmt { BaseClass: { } b } => b,
+                    StringPartVariable p => p.VarName,
+                    Literal { Value: string s } => s,
+                    _ => null,
+                };
+                if (name == null)
+                    continue;
+                if (node is FunctionCall && Dynamic.Contains(name))
+                    dynamic = true;
+                if (definitions.ContainsKey(name) && reached.Add(name))
+                    pending.Push(name);
+            }
+        }
+
+        foreach (var stmt in program.Body.Where(s => NameOf(s) == null))
+            Visit(stmt);
+        foreach (var name in entryPoints ?? Enumerable.Empty<string>())
+            if (definitions.ContainsKey(name) && reached.Add(name))
+                pending.Push(name);
+
+        while (pending.Count > 0 && !dynamic)
+            foreach (var definition in definitions[pending.Pop()])
+                Visit(definition);
+
+        var removed = dynamic
+            ? new List<string>()
+            : program.Body.Select(NameOf).Where(n => n != null && !reached.Contains(n)).Select(n => n!).ToList();
+
+        phase.SetTag("removed", removed.Count);
+        phase.SetTag("kept", definitions.Values.Sum(d => d.Count) - removed.Count);
+
+        if (removed.Count == 0)
+            return new TreeShakeResult(program, removed, dynamic);
+        var body = program.Body.Where(s => NameOf(s) is not { } n || reached.Contains(n)).ToList();
+        return new TreeShakeResult(program with { Body = body }, removed, false);
+    }
+
+    private static string? NameOf(Stmt stmt) =>
+        stmt switch
+        {
+            FunctionDefStmt f => f.FunctionName,
+            ClassDefStmt c => c.ClassName,
+            _ => null,
+        };
+}
@@ -0,0 +1,181 @@
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Project;
+
+// A Python source file inside a project root. Name is its dotted module name
+// ("pkg/util.py" -> "pkg.util", "pkg/__init__.py" -> "pkg").
+public sealed record ProjectModule(string Name, string RelativePath, bool IsPackage);
+
+public static class ModuleGraph
+{
+    // Every .py file under root, skipping hidden directories and __pycache__.
+    public static List<ProjectModule> Discover(string root)
+    {
+        var modules = new List<ProjectModule>();
+        foreach (var path in Directory.EnumerateFiles(root, "*.py", SearchOption.AllDirectories))
+        {
+            var relative = Path.GetRelativePath(root, path);
+            var parts = relative.Split(Path.DirectorySeparatorChar, Path.AltDirectorySeparatorChar).ToList();
+            if (parts.Take(parts.Count - 1).Any(p => p.StartsWith('.') || p == "__pycache__"))
+                continue;
+
+            parts[^1] = Path.GetFileNameWithoutExtension(parts[^1]);
+            bool isPackage = parts[^1] == "__init__";
+            if (isPackage)
+                parts.RemoveAt(parts.Count - 1);
+            if (parts.Count == 0)
+                continue; // a top-level __init__.py has no module name of its own
+
+            modules.Add(new ProjectModule(string.Join(".", parts), relative, isPackage));
+        }
+
+        modules.Sort((a, b) => string.CompareOrdinal(a.Name, b.Name));
+        return modules;
+    }
+
+    // Absolute module names an importing module may depend on, in first-seen order.
+    // Each import contributes the module itself and its parent packages; names pulled
+    // in with "from m import x" also contribute "m.x" in case x is a submodule. The
+    // caller keeps the ones that exist in the project.
+    public static List<string> ImportedModuleNames(ProjectModule importer, Node program)
+    {
+        var names = new List<string>();
+        var seen = new HashSet<string>();
+
+        void AddWithParents(string module)
+        {
+            var parts = module.Split('.');
+            for (int i = 1; i <= parts.Length; i++)
+            {
+                var name = string.Join(".", parts, 0, i);
+                if (seen.Add(name))
+                    names.Add(name);
+            }
+        }
+
+        foreach (var node in IrWalker.Descendants(program))
+        {
+            if (node is not ImportStmt import)
+                continue;
+
+            if (import.FromModule is null)
+            {
+                foreach (var (name, _) in import.Names)
+                    AddWithParents(name);
+                continue;
+            }
+
+            var baseModule = ResolveFromModule(importer, import.FromModule);
+            if (baseModule is null)
+                continue;
+            if (baseModule.Length > 0)
+                AddWithParents(baseModule);
+            foreach (var (name, _) in import.Names)
+            {
+                if (name != "*")
+                    AddWithParents(baseModule.Length > 0 ? $"{baseModule}.{name}" : name);
+            }
+        }
+
+        return names;
+    }
+
+    // Turns the module of a "from ... import" into an absolute name; relative imports
+    // are resolved against the importer's package. Returns null when the dots climb
+    // above the project root.
+    private static string? ResolveFromModule(ProjectModule importer, string fromModule)
+    {
+        int level = 0;
+        while (level < fromModule.Length && fromModule[level] == '.')
+            level++;
+        if (level == 0)
+            return fromModule;
+
+        var package = importer.Name.Split('.').ToList();
+        if (!importer.IsPackage)
+            package.RemoveAt(package.Count - 1);
+        for (int i = 1; i < level; i++)
+        {
+            if (package.Count == 0)
+                return null;
+            package.RemoveAt(package.Count - 1);
+        }
+
+        var rest = fromModule.Substring(level);
+        if (rest.Length > 0)
+            package.Add(rest);
+        return string.Join(".", package);
+    }
+
+    // Strongly connected components of the import graph (Tarjan), dependencies
+    // before dependents. Modules in an import cycle share a component.
+    public static List<List<string>> StronglyConnectedComponents(IReadOnlyDictionary<string, IReadOnlyList<string>> dependencies)
+    {
+        var index = new Dictionary<string, int>();
+        var lowLink = new Dictionary<string, int>();
+        var onStack = new HashSet<string>();
+        var stack = new Stack<string>();
+        var components = new List<List<string>>();
+
+        foreach (var root in dependencies.Keys.OrderBy(k => k, StringComparer.Ordinal))
+        {
+            if (index.ContainsKey(root))
+                continue;
+
+            // Iterative DFS; each frame remembers how far through its edges it got.
+            var frames = new Stack<(string Node, int Edge)>();
+            Visit(root);
+            frames.Push((root, 0));
+
+            while (frames.Count > 0)
+            {
+                var (node, edge) = frames.Pop();
+                var edges = dependencies[node];
+                if (edge < edges.Count)
+                {
+                    frames.Push((node, edge + 1));
+                    var next = edges[edge];
+                    if (!index.ContainsKey(next))
+                    {
+                        Visit(next);
+                        frames.Push((next, 0));
+                    }
+                    else if (onStack.Contains(next))
+                    {
+                        lowLink[node] = Math.Min(lowLink[node], index[next]);
+                    }
+                    continue;
+                }
+
+                if (frames.Count > 0)
+                {
+                    var parent = frames.Peek().Node;
+                    lowLink[parent] = Math.Min(lowLink[parent], lowLink[node]);
+                }
+
+                if (lowLink[node] == index[node])
+                {
+                    var component = new List<string>();
+                    string member;
+                    do
+                    {
+                        member = stack.Pop();
+                        onStack.Remove(member);
+                        component.Add(member);
+                    } while (member != node);
+                    component.Sort(StringComparer.Ordinal);
+                    components.Add(component);
+                }
+            }
+        }
+
+        return components;
+
+        void Visit(string node)
+        {
+            index[node] = lowLink[node] = index.Count;
+            stack.Push(node);
+            onStack.Add(node);
+        }
+    }
+}
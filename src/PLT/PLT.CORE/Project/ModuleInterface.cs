@@ -0,0 +1,73 @@
+using System.Security.Cryptography;
+using System.Text;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Project;
+
+// What other modules can see of a module: the names it binds at module level,
+// function signatures and class shapes. Editing a function body leaves the
+// fingerprint unchanged, so importers don't need to be retranslated.
+public static class ModuleInterface
+{
+    public static string Fingerprint(IrProgram program)
+    {
+        var entries = new List<string>();
+        Collect(program.Body, "", entries);
+        entries.Sort(StringComparer.Ordinal);
+        return Hash(string.Join("\n", entries));
+    }
+
+    public static string Hash(string text) =>
+        Convert.ToHexString(SHA256.HashData(Encoding.UTF8.GetBytes(text)));
+
+    public static string Hash(byte[] bytes) =>
+        Convert.ToHexString(SHA256.HashData(bytes));
+
+    private static void Collect(IReadOnlyList<Stmt> body, string scope, List<string> entries)
+    {
+        foreach (var stmt in body)
+        {
+            switch (stmt)
+            {
+                case FunctionDefStmt f:
+                    entries.Add($"def {scope}{f.FunctionName}({string.Join(",", f.Parameters)})");
+                    break;
+                case ClassDefStmt c:
+                    entries.Add($"class {scope}{c.ClassName}({c.BaseClass})");
+                    Collect(c.Body, $"{scope}{c.ClassName}.", entries);
+                    break;
+                case VarAssignment v:
+                    entries.Add($"var {scope}{v.VarName}");
+                    break;
+                case TupleUnpackingAssignment t:
+                    foreach (var name in t.VarNames)
+                        entries.Add($"var {scope}{name}");
+                    break;
+                case ImportStmt i:
+                    entries.Add($"{scope}{ImportSyntax.Format(i)}");
+                    break;
+
+                // Blocks at module or class level bind names in that same scope.
+                case IfStmt i:
+                    Collect(i.ThenBody, scope, entries);
+                    if (i.ElseBody != null)
+                        Collect(i.ElseBody, scope, entries);
+                    break;
+                case TryStmt t:
+                    Collect(t.TryBody, scope, entries);
+                    foreach (var (_, _, clause) in t.ExceptClauses)
+                        Collect(clause, scope, entries);
+                    if (t.FinallyBody != null)
+                        Collect(t.FinallyBody, scope, entries);
+                    break;
+                case ForEachStmt f:
+                    entries.Add($"var {scope}{f.LoopVar}");
+                    Collect(f.Body, scope, entries);
+                    break;
+                case WhileStmt w:
+                    Collect(w.Body, scope, entries);
+                    break;
+            }
+        }
+    }
+}
@@ -0,0 +1,300 @@
+using System.Collections.Concurrent;
+using System.Text.Json;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.IR;
+using PLT.CORE.Telemetry;
+
+namespace PLT.CORE.Project;
+
+public enum ModuleStatus
+{
+    Translated,
+    UpToDate,
+    Failed,
+    Blocked,   // not attempted because a module it imports failed
+}
+
+public sealed record ModuleOutcome(ProjectModule Module, ModuleStatus Status, string? OutputPath, string? Error = null);
+
+public sealed record ProjectResult(
+    IReadOnlyList<ModuleOutcome> Modules,
+    IReadOnlyDictionary<string, IReadOnlyList<string>> Dependencies)
+{
+    public IEnumerable<ModuleOutcome> WithStatus(ModuleStatus status) => Modules.Where(m => m.Status == status);
+}
+
+// Translates every Python module under SourceRoot into OutputRoot, mirroring the
+// directory layout.
+//
+// Modules are scheduled over the import graph: a module is emitted once every
+// project module it imports has finished, and independent modules run
+// concurrently. Import cycles are translated together as one unit. A failure
+// blocks the modules that depend on it rather than the whole project.
+//
+// A manifest in OutputRoot records each module's source hash, imports and
+// interface fingerprint. On the next run a module is retranslated only if its
+// source changed, its output is missing, or the interface of a module it imports
+// changed; unchanged modules are not even parsed unless that last case applies.
+public sealed class ProjectTranslator
+{
+    public const string ManifestFileName = ".plt-project.json";
+
+    public required string SourceRoot { get; init; }
+    public required string OutputRoot { get; init; }
+
+    // Backend name recorded in the manifest; changing it invalidates every module.
+    public required string Target { get; init; }
+    public required string OutputExtension { get; init; }
+    public required Func<IrProgram, string> Emit { get; init; }
+
+    public bool Parallel { get; init; } = true;
+
+    public ProjectResult Translate()
+    {
+        using var phase = PltTelemetry.StartPhase("project");
+        phase.SetTag("root", SourceRoot);
+
+        var modules = ModuleGraph.Discover(SourceRoot);
+        var manifest = LoadManifest();
+        var states = new Dictionary<string, ModuleState>();
+
+        using (var scan = PltTelemetry.StartPhase("project.scan"))
+        {
+            foreach (var module in modules)
+                states[module.Name] = new ModuleState(module, OutputPathFor(module));
+
+            // Hash everything; parse only what changed, since the imports of an
+            // unchanged module are already in the manifest.
+            ForEach(states.Values, state =>
+            {
+                var path = Path.Combine(SourceRoot, state.Module.RelativePath);
+                state.SourceHash = ModuleInterface.Hash(File.ReadAllBytes(path));
+                if (manifest.TryGetValue(state.Module.Name, out var cached) && cached.SourceHash == state.SourceHash)
+                {
+                    state.Cached = cached;
+                    state.Imports = cached.Imports;
+                    state.InterfaceHash = cached.InterfaceHash;
+                }
+                else
+                {
+                    state.Load(SourceRoot, Parallel);
+                }
+            });
+            scan.SetTag("modules", states.Count);
+        }
+
+        var dependencies = new Dictionary<string, IReadOnlyList<string>>();
+        foreach (var state in states.Values)
+        {
+            dependencies[state.Module.Name] = (state.Imports ?? new List<string>())
+                .Where(name => name != state.Module.Name && states.ContainsKey(name))
+                .ToList();
+        }
+
+        var outcomes = new ConcurrentDictionary<string, ModuleOutcome>();
+        var components = ModuleGraph.StronglyConnectedComponents(dependencies);
+
+        void RunComponent(List<string> component)
+        {
+            // Everything outside the component that it imports has already finished.
+            var blockedBy = component
+                .SelectMany(name => dependencies[name])
+                .Where(dep => !component.Contains(dep))
+                .FirstOrDefault(dep => outcomes[dep].Status is ModuleStatus.Failed or ModuleStatus.Blocked);
+
+            foreach (var name in component)
+            {
+                var state = states[name];
+                if (state.LoadError != null)
+                {
+                    outcomes[name] = new ModuleOutcome(state.Module, ModuleStatus.Failed, state.OutputPath, state.LoadError);
+                    blockedBy ??= name; // the rest of an import cycle can't be translated without it
+                }
+            }
+
+            foreach (var name in component)
+            {
+                var state = states[name];
+                if (outcomes.ContainsKey(name))
+                    continue;
+                outcomes[name] = blockedBy != null
+                    ? new ModuleOutcome(state.Module, ModuleStatus.Blocked, state.OutputPath, $"imports {blockedBy}, which was not translated")
+                    : TranslateModule(state, dependencies[name], states);
+            }
+        }
+
+        if (Parallel)
+        {
+            // One task per component, started when the components it imports finish.
+            var tasks = new Dictionary<string, Task>();
+            foreach (var component in components)
+            {
+                var prerequisites = component
+                    .SelectMany(name => dependencies[name])
+                    .Where(dep => !component.Contains(dep))
+                    .Select(dep => tasks[dep])
+                    .Distinct()
+                    .ToArray();
+
+                var task = prerequisites.Length == 0
+                    ? Task.Run(() => RunComponent(component))
+                    : Task.WhenAll(prerequisites).ContinueWith(_ => RunComponent(component), TaskScheduler.Default);
+
+                foreach (var name in component)
+                    tasks[name] = task;
+            }
+            Task.WaitAll(tasks.Values.Distinct().ToArray());
+        }
+        else
+        {
+            foreach (var component in components)
+                RunComponent(component);
+        }
+
+        SaveManifest(states, outcomes);
+
+        var ordered = components.SelectMany(c => c).Select(name => outcomes[name]).ToList();
+        phase.SetTag("translated", ordered.Count(o => o.Status == ModuleStatus.Translated));
+        return new ProjectResult(ordered, dependencies);
+    }
+
+    private ModuleOutcome TranslateModule(ModuleState state, IReadOnlyList<string> dependencies, Dictionary<string, ModuleState> states)
+    {
+        using var phase = PltTelemetry.StartPhase("project.module");
+        phase.SetTag("module", state.Module.Name);
+
+        try
+        {
+            var dependencyInterfaces = dependencies.ToDictionary(dep => dep, dep => states[dep].InterfaceHash!);
+
+            if (state.Cached != null
+                && File.Exists(state.OutputPath)
+                && SameInterfaces(state.Cached.DependencyInterfaces, dependencyInterfaces))
+            {
+                state.DependencyInterfaces = dependencyInterfaces;
+                phase.SetTag("status", "up-to-date");
+                return new ModuleOutcome(state.Module, ModuleStatus.UpToDate, state.OutputPath);
+            }
+
+            if (state.Program == null)
+            {
+                state.Load(SourceRoot, Parallel);
+                if (state.LoadError != null)
+                    throw new InvalidOperationException(state.LoadError);
+            }
+
+            var output = Emit(state.Program!);
+            Directory.CreateDirectory(Path.GetDirectoryName(state.OutputPath)!);
+            File.WriteAllText(state.OutputPath, output);
+            phase.RecordOutput(output);
+
+            state.DependencyInterfaces = dependencyInterfaces;
+            phase.SetTag("status", "translated");
+            return new ModuleOutcome(state.Module, ModuleStatus.Translated, state.OutputPath);
+        }
+        catch (Exception ex)
+        {
+            phase.SetTag("status", "failed");
+            return new ModuleOutcome(state.Module, ModuleStatus.Failed, state.OutputPath, ex.Message);
+        }
+    }
+
+    private static bool SameInterfaces(Dictionary<string, string> recorded, Dictionary<string, string> current) =>
+        recorded.Count == current.Count
+        && current.All(kv => recorded.TryGetValue(kv.Key, out var hash) && hash == kv.Value);
+
+    private string OutputPathFor(ProjectModule module) =>
+        Path.Combine(OutputRoot, Path.ChangeExtension(module.RelativePath, OutputExtension));
+
+    private void ForEach(IEnumerable<ModuleState> states, Action<ModuleState> body)
+    {
+        if (Parallel)
+            System.Threading.Tasks.Parallel.ForEach(states, body);
+        else
+            foreach (var state in states)
+                body(state);
+    }
+
+    // Manifest
+
+    private sealed record ManifestEntry(
+        string SourceHash,
+        string InterfaceHash,
+        List<string> Imports,
+        Dictionary<string, string> DependencyInterfaces);
+
+    private sealed record Manifest(string Target, Dictionary<string, ManifestEntry> Modules);
+
+    private string ManifestPath => Path.Combine(OutputRoot, ManifestFileName);
+
+    private Dictionary<string, ManifestEntry> LoadManifest()
+    {
+        try
+        {
+            if (!File.Exists(ManifestPath))
+                return new();
+            var manifest = JsonSerializer.Deserialize<Manifest>(File.ReadAllText(ManifestPath));
+            return manifest?.Target == Target ? manifest.Modules : new();
+        }
+        catch (JsonException)
+        {
+            return new(); // unreadable manifest: translate everything again
+        }
+    }
+
+    private void SaveManifest(Dictionary<string, ModuleState> states, ConcurrentDictionary<string, ModuleOutcome> outcomes)
+    {
+        var entries = new Dictionary<string, ManifestEntry>();
+        foreach (var (name, state) in states)
+        {
+            var status = outcomes[name].Status;
+            if (status is ModuleStatus.Translated or ModuleStatus.UpToDate)
+            {
+                entries[name] = new ManifestEntry(state.SourceHash!, state.InterfaceHash!, state.Imports!, state.DependencyInterfaces!);
+            }
+            else if (status == ModuleStatus.Blocked && state.Cached != null)
+            {
+                // Keep what the previous run produced; it is retried once its imports translate.
+                entries[name] = state.Cached;
+            }
+        }
+
+        Directory.CreateDirectory(OutputRoot);
+        File.WriteAllText(ManifestPath, JsonSerializer.Serialize(new Manifest(Target, entries), new JsonSerializerOptions { WriteIndented = true }));
+    }
+
+    private sealed class ModuleState
+    {
+        public ModuleState(ProjectModule module, string outputPath)
+        {
+            Module = module;
+            OutputPath = outputPath;
+        }
+
+        public ProjectModule Module { get; }
+        public string OutputPath { get; }
+        public string? SourceHash { get; set; }
+        public ManifestEntry? Cached { get; set; }
+        public IrProgram? Program { get; private set; }
+        public List<string>? Imports { get; set; }
+        public string? InterfaceHash { get; set; }
+        public Dictionary<string, string>? DependencyInterfaces { get; set; }
+        public string? LoadError { get; private set; }
+
+        public void Load(string sourceRoot, bool parallel)
+        {
+            try
+            {
+                var path = Path.Combine(sourceRoot, Module.RelativePath);
+                Program = parallel ? PythonFrontend.ParseFile(path) : PythonFrontend.ParseFile(path, parallel: false);
+                Imports = ModuleGraph.ImportedModuleNames(Module, Program);
+                InterfaceHash = ModuleInterface.Fingerprint(Program);
+            }
+            catch (Exception ex)
+            {
+                LoadError = ex.Message;
+                Imports = new List<string>();
+            }
+        }
+    }
+}
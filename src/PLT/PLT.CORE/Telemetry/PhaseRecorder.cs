@@ -0,0 +1,128 @@
+using System.Collections.Concurrent;
+using System.Diagnostics;
+using System.Globalization;
+using System.Text;
+using System.Text.Json;
+
+namespace PLT.CORE.Telemetry;
+
+public sealed record PhaseRecord(
+    string Name,
+    DateTime StartUtc,
+    TimeSpan Duration,
+    int ThreadId,
+    IReadOnlyList<KeyValuePair<string, object?>> Tags);
+
+// Listens to PltTelemetry.Source and keeps every completed phase so a run can be
+// summarized (--stats) or exported in Chrome trace format (--trace out.json).
+public sealed class PhaseRecorder : IDisposable
+{
+    private const string ThreadIdProperty = "plt.tid";
+
+    private readonly ActivityListener _listener;
+    private readonly ConcurrentQueue<PhaseRecord> _records = new();
+
+    public PhaseRecorder()
+    {
+        _listener = new ActivityListener
+        {
+            ShouldListenTo = source => source.Name == PltTelemetry.Name,
+            Sample = (ref ActivityCreationOptions<ActivityContext> _) => ActivitySamplingResult.AllDataAndRecorded,
+            ActivityStarted = activity => activity.SetCustomProperty(ThreadIdProperty, Environment.CurrentManagedThreadId),
+            ActivityStopped = activity => _records.Enqueue(new PhaseRecord(
+                activity.OperationName,
+                activity.StartTimeUtc,
+                activity.Duration,
+                activity.GetCustomProperty(ThreadIdProperty) as int? ?? Environment.CurrentManagedThreadId,
+                activity.TagObjects.ToList())),
+        };
+        ActivitySource.AddActivityListener(_listener);
+    }
+
+    public IReadOnlyList<PhaseRecord> Records => _records.OrderBy(r => r.StartUtc).ToList();
+
+    public string FormatSummary()
+    {
+        var sb = new StringBuilder();
+        sb.AppendLine("=== Stats ===");
+        sb.AppendLine($"{"phase",-16} {"runs",5} {"total ms",10} {"alloc KB",10}  details");
+
+        foreach (var group in Records.GroupBy(r => r.Name))
+        {
+            var totalMs = group.Sum(r => r.Duration.TotalMilliseconds);
+            var allocated = group.Sum(r => TagAsLong(r, "allocated.bytes"));
+
+            var details = new List<string>();
+            foreach (var key in new[] { "input.bytes", "tokens", "ir.nodes", "output.bytes" })
+            {
+                if (group.Any(r => r.Tags.Any(t => t.Key == key)))
+                    details.Add($"{key}={group.Sum(r => TagAsLong(r, key))}");
+            }
+
+            sb.AppendLine(string.Format(CultureInfo.InvariantCulture,
+                "{0,-16} {1,5} {2,10:F2} {3,10:F1}  {4}",
+                group.Key, group.Count(), totalMs, allocated / 1024.0, string.Join(" ", details)));
+        }
+
+        return sb.ToString();
+    }
+
+    // https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    // Complete ("X") events; timestamps are microseconds since the first recorded phase.
+    public void WriteChromeTrace(Stream stream)
+    {
+        var records = Records;
+        var origin = records.Count > 0 ? records.Min(r => r.StartUtc) : DateTime.UtcNow;
+        var pid = Environment.ProcessId;
+
+        using var writer = new Utf8JsonWriter(stream, new JsonWriterOptions { Indented = true });
+        writer.WriteStartObject();
+        writer.WriteString("displayTimeUnit", "ms");
+        writer.WriteStartArray("traceEvents");
+        foreach (var r in records)
+        {
+            writer.WriteStartObject();
+            writer.WriteString("name", r.Name);
+            writer.WriteString("cat", PltTelemetry.Name);
+            writer.WriteString("ph", "X");
+            writer.WriteNumber("ts", (r.StartUtc - origin).Ticks / 10.0);
+            writer.WriteNumber("dur", r.Duration.Ticks / 10.0);
+            writer.WriteNumber("pid", pid);
+            writer.WriteNumber("tid", r.ThreadId);
+            writer.WriteStartObject("args");
+            foreach (var (key, value) in r.Tags)
+            {
+                switch (value)
+                {
+                    case int i: writer.WriteNumber(key, i); break;
+                    case long l: writer.WriteNumber(key, l); break;
+                    case double d: writer.WriteNumber(key, d); break;
+                    case bool b: writer.WriteBoolean(key, b); break;
+                    default: writer.WriteString(key, value?.ToString()); break;
+                }
+            }
+            writer.WriteEndObject();
+            writer.WriteEndObject();
+        }
+        writer.WriteEndArray();
+        writer.WriteEndObject();
+    }
+
+    public void WriteChromeTrace(string path)
+    {
+        using var stream = File.Create(path);
+        WriteChromeTrace(stream);
+    }
+
+    public void Dispose() => _listener.Dispose();
+
+    private static long TagAsLong(PhaseRecord record, string key)
+    {
+        foreach (var (k, v) in record.Tags)
+        {
+            if (k == key)
+                return v switch { int i => i, long l => l, _ => 0 };
+        }
+        return 0;
+    }
+}
@@ -0,0 +1,118 @@
+using System.Diagnostics;
+using System.Diagnostics.Metrics;
+using System.Text;
+using PLT.CORE.IR;
+
+namespace PLT.CORE.Telemetry;
+
+// Every pipeline phase (read, lex, parse, emit, write) publishes one Activity on
+// Source and records its duration/counters on Meter. Nothing is measured unless a
+// listener is attached, so the default CLI path pays only for the Enabled checks.
+public static class PltTelemetry
+{
+    public const string Name = "PLT";
+
+    public static readonly ActivitySource Source = new(Name);
+    public static readonly Meter Meter = new(Name);
+
+    internal static readonly Histogram<double> PhaseDuration =
+        Meter.CreateHistogram<double>("plt.phase.duration", "ms", "Wall-clock time spent in a pipeline phase");
+    internal static readonly Counter<long> AllocatedBytes =
+        Meter.CreateCounter<long>("plt.phase.allocated", "By", "Managed bytes allocated by the thread running a phase");
+    internal static readonly Counter<long> Tokens =
+        Meter.CreateCounter<long>("plt.tokens", "{token}", "Tokens produced by a lexer");
+    internal static readonly Counter<long> IrNodes =
+        Meter.CreateCounter<long>("plt.ir.nodes", "{node}", "IR nodes produced by a parser");
+    internal static readonly Counter<long> InputBytes =
+        Meter.CreateCounter<long>("plt.input.bytes", "By", "Source bytes read");
+    internal static readonly Counter<long> OutputBytes =
+        Meter.CreateCounter<long>("plt.output.bytes", "By", "UTF-8 bytes produced by an emitter or written to disk");
+
+    public static bool IsEnabled =>
+        Source.HasListeners() || PhaseDuration.Enabled || AllocatedBytes.Enabled
+        || Tokens.Enabled || IrNodes.Enabled || InputBytes.Enabled || OutputBytes.Enabled;
+
+    public static PhaseScope StartPhase(string phase) =>
+        IsEnabled ? new PhaseScope(phase) : PhaseScope.Disabled;
+}
+
+public sealed class PhaseScope : IDisposable
+{
+    internal static readonly PhaseScope Disabled = new();
+
+    private readonly Activity? _activity;
+    private readonly long _startTimestamp;
+    private readonly long _startAllocated;
+    private readonly KeyValuePair<string, object?> _phaseTag;
+    private bool _disposed;
+
+    private PhaseScope()
+    {
+        _disposed = true;
+    }
+
+    internal PhaseScope(string phase)
+    {
+        _phaseTag = new KeyValuePair<string, object?>("phase", phase);
+        _activity = PltTelemetry.Source.StartActivity(phase);
+        _startAllocated = GC.GetAllocatedBytesForCurrentThread();
+        _startTimestamp = Stopwatch.GetTimestamp();
+    }
+
+    public bool IsActive => !_disposed;
+
+    public void SetTag(string key, object? value) => _activity?.SetTag(key, value);
+
+    public void RecordTokens(int count)
+    {
+        if (!IsActive) return;
+        _activity?.SetTag("tokens", count);
+        PltTelemetry.Tokens.Add(count, _phaseTag);
+    }
+
+    public void RecordIrNodes(Node program)
+    {
+        if (!IsActive) return;
+        var count = IrWalker.CountNodes(program);
+        _activity?.SetTag("ir.nodes", count);
+        PltTelemetry.IrNodes.Add(count, _phaseTag);
+    }
+
+    public void RecordInputBytes(long bytes)
+    {
+        if (!IsActive) return;
+        _activity?.SetTag("input.bytes", bytes);
+        PltTelemetry.InputBytes.Add(bytes, _phaseTag);
+    }
+
+    public void RecordOutput(string output)
+    {
+        if (!IsActive) return;
+        RecordOutputBytes(Encoding.UTF8.GetByteCount(output));
+    }
+
+    public void RecordOutputBytes(long bytes)
+    {
+        if (!IsActive) return;
+        _activity?.SetTag("output.bytes", bytes);
+        PltTelemetry.OutputBytes.Add(bytes, _phaseTag);
+    }
+
+    public void Dispose()
+    {
+        if (_disposed) return;
+        _disposed = true;
+
+        var elapsed = Stopwatch.GetElapsedTime(_startTimestamp);
+        var allocated = GC.GetAllocatedBytesForCurrentThread() - _startAllocated;
+
+        PltTelemetry.PhaseDuration.Record(elapsed.TotalMilliseconds, _phaseTag);
+        PltTelemetry.AllocatedBytes.Add(allocated, _phaseTag);
+
+        if (_activity != null)
+        {
+            _activity.SetTag("allocated.bytes", allocated);
+            _activity.Dispose();
+        }
+    }
+}
@@ -0,0 +1,63 @@
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class BuiltinLoweringTests
+{
+    private const string Source =
+        "counts = {}\n" +
+        "names = []\n" +
+        "title = \"report\"\n" +
+        "names.append(title)\n" +
+        "n = counts.get(title, 0) + len(counts)\n" +
+        "seen = title in counts and not \"x\" in names\n" +
+        "width = len(title) if title.startswith(\"re\") else len(names)\n";
+
+    [Fact]
+    public void TestTclUsesNativeContainerCommands()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        // A statement runs the command itself
+        Assert.Contains("\nlappend names $title\n", tcl);
+        Assert.Contains("set n [expr {[dict getdef $counts $title 0] + [dict size $counts]}]", tcl);
+        // A dict membership test is a hash lookup; a list keeps expr's in
+        Assert.Contains("set seen [expr {[dict exists $counts $title] && [expr {! [expr {\"x\" in $names}]}]}]", tcl);
+        Assert.Contains("[string length $title]", tcl);
+        Assert.Contains("[string equal -length [string length \"re\"] \"re\" $title]", tcl);
+        Assert.Contains("[llength $names]", tcl);
+    }
+
+    [Fact]
+    public void TestCUsesStringFunctionsAndOperators()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(Source));
+
+        Assert.Contains("#include <string.h>", c);
+        Assert.Contains("width = (strncmp(title, \"re\", strlen(\"re\")) == 0) ? strlen(title) : len(names);", c);
+        Assert.Contains("seen = title in counts && ! (\"x\" in names);", c);
+        Assert.DoesNotContain(" and ", c);
+    }
+
+    [Fact]
+    public void TestUnknownKindsKeepGenericEmission()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse("def f(s):\n    return len(s)\nxs = sorted([10, 9, 2])\n"));
+
+        // s may be a string or a dict as well as a list
+        Assert.Contains("return [len $s]", tcl);
+        Assert.Contains("set xs [sorted [list 10 9 2]]", tcl);
+        Assert.DoesNotContain("lsort", tcl);
+    }
+
+    [Fact]
+    public void TestOwnDefinitionsAreNotLowered()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse("def len(x):\n    return 1\nitems = []\nn = len(items)\n"));
+
+        Assert.Contains("set n [len $items]", tcl);
+        Assert.DoesNotContain("llength", tcl);
+    }
+}
@@ -0,0 +1,43 @@
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class ComprehensionTests
+{
+    private static string Tcl(string python) =>
+        new TclEmitter().Emit(PythonFrontend.Parse(python)).Replace("\r\n", "\n");
+
+    [Fact]
+    public void TestListComprehensionsUseLmap()
+    {
+        var tcl = Tcl("squares = [x * x for x in items if x > 2]\nkeys = [k for k, v in pairs]\ncopy = [x for x in items]\n");
+
+        Assert.Contains("set squares [lmap x $items {if {!($x > 2)} continue; expr {$x * $x}}]\n", tcl);
+        Assert.Contains("set keys [lmap {k v} $pairs {set k}]\n", tcl);
+        Assert.Contains("set copy [lmap x $items {set x}]\n", tcl);
+        Assert.DoesNotContain("_result", tcl);
+    }
+
+    [Fact]
+    public void TestLoopVariablesDoNotOverwriteLocals()
+    {
+        var tcl = Tcl("def f(x, k):\n    ys = [x * k for x in [1, 2]]\n    d = {x: 1 for x in ys}\n    return x\n");
+
+        // Python's comprehension has a scope of its own; lmap would set the proc's x
+        Assert.Contains("    set ys [apply {k {lmap x [list 1 2] {expr {$x * $k}}}} $k]\n", tcl);
+        Assert.Contains("    set d [apply {ys {set _dict_x [dict create]; foreach x $ys {dict set _dict_x $x 1}; set _dict_x}} $ys]\n", tcl);
+    }
+
+    [Fact]
+    public void TestDictComprehensionsFillOneDict()
+    {
+        var tcl = Tcl("inverse = {v: k for k, v in pairs if v}\ncounts = {k: counts[k] + 1 for k in counts}\n");
+
+        // An assignment fills its target directly
+        Assert.Contains("set inverse [dict create]\nforeach {k v} $pairs {if {!$v} continue; dict set inverse $v $k}\n", tcl);
+        // ...unless the comprehension reads it, when a local of its own is filled first
+        Assert.Contains("set counts [set _dict_k [dict create]; foreach k $counts {dict set _dict_k $k [expr {[lindex $counts $k] + 1}]}; set _dict_k]\n", tcl);
+        Assert.DoesNotContain("{*}", tcl);
+    }
+}
@@ -0,0 +1,59 @@
+using PLT.CORE.IR;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Js;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class ControlFlowTests
+{
+    private const string Source =
+        "def find(xs, target):\n" +
+        "    for x in xs:\n" +
+        "        if x < 0:\n" +
+        "            continue\n" +
+        "        if x == target:\n" +
+        "            return x\n" +
+        "        if x > 100:\n" +
+        "            break\n" +
+        "    return\n";
+
+    [Fact]
+    public void TestFrontendsBuildControlFlowNodes()
+    {
+        var loop = (ForEachStmt)((FunctionDefStmt)PythonFrontend.Parse(Source).Body[0]).Body[0];
+        var body = loop.Body.Cast<IfStmt>().Select(i => i.ThenBody.Single()).ToList();
+        Assert.IsType<ContinueStmt>(body[0]);
+        Assert.Equal(new ReturnStmt(new Variable("x")), body[1]);
+        Assert.IsType<BreakStmt>(body[2]);
+
+        var js = JsFrontend.Parse("function f(xs) { for (const x of xs) { if (x) { break; } } return; }");
+        var nodes = IrWalker.Descendants(js).ToList();
+        Assert.Contains(nodes, n => n is BreakStmt);
+        Assert.Contains(nodes, n => n is ReturnStmt { Value: null });
+    }
+
+    [Fact]
+    public void TestEachBackendExitsEarly()
+    {
+        var program = PythonFrontend.Parse(Source);
+
+        var tcl = new TclEmitter().Emit(program).Replace("\r\n", "\n");
+        Assert.Contains("            continue\n", tcl);
+        Assert.Contains("            return $x\n", tcl);
+        Assert.Contains("            break\n", tcl);
+        Assert.Contains("    return\n}", tcl);
+
+        var c = new CEmitter().Emit(program);
+        Assert.Contains("int find(int xs, int target) {", c);
+        Assert.Contains("return x;", c);
+        Assert.Contains("break;", c);
+        Assert.Contains("continue;", c);
+
+        var python = new PythonEmitter().Emit(program);
+        Assert.Contains("            return x\n", python.Replace("\r\n", "\n"));
+        Assert.Contains("    return\n", python.Replace("\r\n", "\n"));
+    }
+}
@@ -0,0 +1,69 @@
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class CountedLoopTests
+{
+    private const string Source =
+        "for i in range(n):\n    total += i\n" +
+        "for j in range(10, 0, -2):\n    total += j\n" +
+        "for k in range(len(xs)):\n    xs.append(k)\n" +
+        "for m in range(a, b, step):\n    total += m\n";
+
+    [Fact]
+    public void TestTclRangeLoopsAreCounted()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source));
+
+        Assert.Contains("for {set i 0} {$i < $n} {incr i} {", tcl);
+        Assert.Contains("for {set j 10} {$j > 0} {incr j -2} {", tcl);
+        // The body grows xs, so its length is read once, as range() does
+        Assert.Contains("for {set k 0; set _stop_k [len $xs]} {$k < $_stop_k} {incr k} {", tcl);
+        Assert.Contains("for {set m $a} {$step > 0 ? $m < $b : $m > $b} {incr m $step} {", tcl);
+        Assert.DoesNotContain("range", tcl.Replace("_stop_", ""));
+    }
+
+    [Fact]
+    public void TestTclEnumerateAndZip()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "for i, x in enumerate(xs):\n    print(i)\nfor a, b in zip(xs, ys):\n    print(a)\n")).Replace("\r\n", "\n");
+
+        Assert.Contains("set i -1\nforeach x $xs {\n    incr i\n    puts $i\n}\n", tcl);
+        // zip stops at the shortest list, where foreach would pad it
+        Assert.Contains("set _len_a [tcl::mathfunc::min [llength $xs] [llength $ys]]\n" +
+            "foreach a [lrange $xs 0 $_len_a-1] b [lrange $ys 0 $_len_a-1] {\n", tcl);
+    }
+
+    [Fact]
+    public void TestCountersPythonLeavesSetAreNotCounted()
+    {
+        var source =
+            "for i in range(n):\n    total += i\nprint(i)\n" +
+            "for j, x in enumerate(xs):\n    j = 0\n" +
+            "for k in range(3):\n    total += k\nfor k in range(4):\n    print(k)\n";
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(source));
+        var c = new CEmitter().Emit(PythonFrontend.Parse(source));
+
+        // After the loop i is n - 1 in Python, but a counted loop leaves it at n
+        Assert.Contains("foreach i [range $n] {", tcl);
+        Assert.DoesNotContain("for (i = 0;", c);
+        Assert.Contains("foreach {j x} [enumerate $xs] {", tcl);
+        // A read in a later loop over k sees that loop's values
+        Assert.Contains("for {set k 0} {$k < 4} {incr k} {", tcl);
+        Assert.Contains("for (k = 0; k < 3; k++) {", c);
+    }
+
+    [Fact]
+    public void TestCRangeLoopsAreCounted()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains("for (i = 0; i < n; i++) {", c);
+        Assert.Contains("for (j = 10; j > 0; j -= 2) {", c);
+        Assert.Contains("{\n        int _stop_k = len(xs);\n        for (k = 0; k < _stop_k; k++) {", c);
+        Assert.Contains("for (m = a; (step > 0 ? m < b : m > b); m += step) {", c);
+    }
+}
@@ -0,0 +1,85 @@
+using System.Text;
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.CSharp;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class ExpressionParserTests
+{
+    private static string SExpr(IrProgram program) =>
+        IrDumper.Dump(program, new IrDumpOptions { Format = IrDumpFormat.SExpr });
+
+    [Fact]
+    public void TestPythonPrecedenceAndAssociativity()
+    {
+        var program = PythonFrontend.Parse("x = a - b - c * d or not e in f and g is not h\n");
+
+        var expected = new IrProgram(new List<Stmt>
+        {
+            new VarAssignment("x", new BinaryOp(
+                new BinaryOp(
+                    new BinaryOp(new Variable("a"), "-", new Variable("b")),
+                    "-",
+                    new BinaryOp(new Variable("c"), "*", new Variable("d"))),
+                "or",
+                new BinaryOp(
+                    new UnaryOp("not", new BinaryOp(new Variable("e"), "in", new Variable("f"))),
+                    "and",
+                    new BinaryOp(new Variable("g"), "is not", new Variable("h"))))),
+        });
+        Assert.Equal(SExpr(expected), SExpr(program));
+    }
+
+    [Fact]
+    public void TestCSharpPrecedenceAndAssociativity()
+    {
+        var program = CSharpFrontend.Parse("var x = a || b && c == d + e * f - g;");
+
+        var expected = new IrProgram(new List<Stmt>
+        {
+            new VarAssignment("x", new BinaryOp(
+                new Variable("a"),
+                "||",
+                new BinaryOp(
+                    new Variable("b"),
+                    "&&",
+                    new BinaryOp(
+                        new Variable("c"),
+                        "==",
+                        new BinaryOp(
+                            new BinaryOp(new Variable("d"), "+", new BinaryOp(new Variable("e"), "*", new Variable("f"))),
+                            "-",
+                            new Variable("g")))))),
+        });
+        Assert.Equal(SExpr(expected), SExpr(program));
+    }
+
+    [Fact]
+    public void TestLongChainsParseWithoutDeepRecursion()
+    {
+        const int terms = 100_000;
+        var chain = new StringBuilder("x0");
+        for (int i = 1; i < terms; i++)
+            chain.Append(i % 2 == 0 ? " + x" : " * x").Append(i);
+
+        var python = Assert.IsType<VarAssignment>(Assert.Single(PythonFrontend.Parse($"y = {chain}\n").Body));
+        var csharp = Assert.IsType<VarAssignment>(Assert.Single(CSharpFrontend.Parse($"var y = {chain};").Body));
+
+        foreach (var value in new[] { python.Value, csharp.Value })
+        {
+            // Left-associative: the spine runs down the left operands, with each
+            // product folded into the sum that follows it.
+            int sums = 0;
+            Expr node = value;
+            while (node is BinaryOp { Op: "+" } sum)
+            {
+                Assert.IsType<BinaryOp>(sum.Right);
+                sums++;
+                node = sum.Left;
+            }
+            Assert.Equal(terms / 2 - 1, sums);
+            Assert.Equal(new BinaryOp(new Variable("x0"), "*", new Variable("x1")), node);
+        }
+    }
+}
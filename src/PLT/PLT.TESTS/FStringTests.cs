@@ -0,0 +1,119 @@
+using PLT.CORE.IR;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Js;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class FStringTests
+{
+    private const string Source =
+        "name = \"Ada\"\n" +
+        "greeting = f\"Hello {name}!\"\n" +
+        "row = f\"{name:<10}|{count:>5d}|{price:8.2f}|{count * 2}\"\n" +
+        "debug = f\"{count=} {{braces}} {len(items)}\"\n";
+
+    [Fact]
+    public void TestFieldsParseAsExpressions()
+    {
+        var program = PythonFrontend.Parse(Source);
+        var row = (StringInterpolation)program.Body.OfType<VarAssignment>().Single(v => v.VarName == "row").Value;
+
+        Assert.Equal(7, row.Parts.Count);
+        Assert.Equal(new StringPartExpr(new Variable("name"), null, "<10"), row.Parts[0]);
+        Assert.Equal(new StringPartExpr(new Variable("price"), null, "8.2f"), row.Parts[4]);
+        Assert.IsType<BinaryOp>(((StringPartExpr)row.Parts[6]).Expr);
+
+        var debug = (StringInterpolation)program.Body.OfType<VarAssignment>().Single(v => v.VarName == "debug").Value;
+        Assert.Equal(new StringPartLiteral("count="), debug.Parts[0]);
+        Assert.Equal(new StringPartExpr(new Variable("count"), 'r'), debug.Parts[1]);
+        Assert.Equal(new StringPartLiteral(" {braces} "), debug.Parts[2]);
+    }
+
+    [Fact]
+    public void TestEachBackendFormatsOnce()
+    {
+        var program = PythonFrontend.Parse(Source);
+
+        var python = new PythonEmitter().Emit(program);
+        Assert.Contains("row = f\"{name:<10}|{count:>5d}|{price:8.2f}|{count * 2}\"", python);
+        Assert.Contains("debug = f\"count={count!r} {{braces}} {len(items)}\"", python);
+
+        var tcl = new TclEmitter().Emit(program);
+        Assert.Contains("set greeting \"Hello $name!\"", tcl);
+        Assert.Contains("set row [format \"%-10s|%5d|%8.2f|%s\" $name $count $price [expr {$count * 2}]]", tcl);
+        Assert.Contains("set debug \"count=[expr {[string is double -strict $count] ? $count : \"'$count'\"}] {braces} [len $items]\"", tcl);
+
+        var c = new CEmitter().Emit(program);
+        Assert.Contains("static char *plt_format(const char *fmt, ...)", c);
+        Assert.Contains("row = plt_format(\"%-10s|%5d|%8.2f|%d\", name, count, price, count * 2);", c);
+    }
+
+    [Fact]
+    public void TestCFieldsMatchDeclaredTypes()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(
+            "a = 10\nname = \"x\"\nm = f\"v={a} n={name} {a + 1:>4} {name:>4}\"\n")).Replace("\r\n", "\n");
+
+        // An int local printed with %s would be read as a pointer
+        Assert.Contains("    int a = 10;\n", c);
+        Assert.Contains("    const char *name = \"x\";\n", c);
+        Assert.Contains("m = plt_format(\"v=%d n=%s %4d %4s\", a, name, a + 1, name);", c);
+    }
+
+    [Fact]
+    public void TestReprQuotesStrings()
+    {
+        var program = PythonFrontend.Parse("name = \"bob\"\nm = f\"{name!r} {name!s} {'x'!r:>5}\"\n");
+
+        Assert.Contains("set m [format \"%s %s %5s\" \"'$name'\" $name \"'x'\"]", new TclEmitter().Emit(program));
+        Assert.Throws<NotSupportedException>(() => new CEmitter().Emit(program));
+        Assert.Contains("m = plt_format(\"'%s' %s\", name, name);",
+            new CEmitter().Emit(PythonFrontend.Parse("name = \"bob\"\nm = f\"{name!r} {name!s}\"\n")));
+    }
+
+    [Fact]
+    public void TestSpecsPrintfCannotExpressFail()
+    {
+        foreach (var spec in new[] { ",", "^10", "*>10", ".1%" })
+        {
+            var program = PythonFrontend.Parse($"n = 1234\nm = f\"{{n:{spec}}}\"\n");
+            Assert.Throws<NotSupportedException>(() => new TclEmitter().Emit(program));
+            Assert.Throws<NotSupportedException>(() => new CEmitter().Emit(program));
+        }
+    }
+
+    [Fact]
+    public void TestCFreesReplacedFormats()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(
+            "i = 0\ns = f\"{i}\"\nwhile i < 3:\n    s = f\"{s},{i}\"\n    i = i + 1\nprint(s)\n" +
+            "t = f\"{i}\"\nu = t\nt = f\"{i}!\"\n"));
+
+        Assert.Contains("        s = plt_replace(s, plt_format(\"%s,%d\", s, i));", c);
+        // u still points at t's first string
+        Assert.Contains("    t = plt_format(\"%d!\", i);", c);
+    }
+
+    [Fact]
+    public void TestStringLiteralsInsideFields()
+    {
+        var program = PythonFrontend.Parse("s = f\"{d['key']} [{'a' if ok else 'b'}] 100%\"\n");
+
+        // The field's literals are written with ", so the f-string takes '
+        Assert.Contains("s = f'{d[\"key\"]} [{\"a\" if ok else \"b\"}] 100%'", new PythonEmitter().Emit(program));
+        Assert.Contains("set s \"[lindex $d \"key\"] \\[[expr {$ok ? \"a\" : \"b\"}]\\] 100%\"", new TclEmitter().Emit(program));
+    }
+
+    [Fact]
+    public void TestJsTemplatesKeepExpressionFields()
+    {
+        var program = JsFrontend.Parse("const label = `${n} of ${items.length + 1}`;");
+
+        var value = program.Body.OfType<VarAssignment>().Single().Value;
+        Assert.IsType<StringInterpolation>(value);
+        Assert.Contains("label = f\"{n} of {", new PythonEmitter().Emit(program));
+    }
+}
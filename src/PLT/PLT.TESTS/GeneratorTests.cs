@@ -0,0 +1,73 @@
+using PLT.CORE.Analysis;
+using PLT.CORE.IR;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class GeneratorTests
+{
+    private const string Source =
+        "def count(n):\n" +
+        "    i = 0\n" +
+        "    while i < n:\n" +
+        "        yield i\n" +
+        "        i += 1\n" +
+        "def both(xs):\n" +
+        "    yield from xs\n" +
+        "    yield from count(2)\n" +
+        "def plain(n):\n" +
+        "    return n\n" +
+        "for x in count(10):\n" +
+        "    if x > 3:\n" +
+        "        break\n" +
+        "    print(x)\n";
+
+    [Fact]
+    public void TestYieldingFunctionsAreGenerators()
+    {
+        var program = PythonFrontend.Parse(Source);
+        var symbols = ScopeAnalyzer.Analyze(program);
+
+        var both = (FunctionDefStmt)program.Body[1];
+        Assert.Equal(new YieldStmt(new Variable("xs"), IsFrom: true), both.Body[0]);
+        Assert.True(symbols.ScopeOf(program.Body[0])!.IsGenerator);
+        Assert.False(symbols.ScopeOf(program.Body[2])!.IsGenerator);
+        Assert.Equal(ValueKind.Generator, ValueKinds.Analyze(program, symbols).KindOf(new FunctionCall("count", new List<Expr>())));
+    }
+
+    [Fact]
+    public void TestTclStepsCoroutinesLazily()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains("proc count {n} {\n    coroutine count#[incr ::_generators] apply {{n} {\n        yield [info coroutine]\n", tcl);
+        Assert.Contains("            yield $i\n", tcl);
+        Assert.Contains("    }} $n\n}", tcl);
+        Assert.Contains("foreach _item $xs {yield $_item}", tcl);
+        Assert.Contains(
+            "set _gen_x [count 10]\nwhile 1 {\n    set x [$_gen_x]\n    if {[namespace which $_gen_x] eq \"\"} break\n", tcl);
+        Assert.Contains("catch {rename $_gen_x {}}", tcl);
+        Assert.Contains("proc plain {n} {\n    return $n\n}", tcl);
+    }
+
+    [Fact]
+    public void TestTclBuiltinsTakeAGeneratorsValues()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source + "xs = list(count(3))\ng = count(4)\nprint(sum(g))\n"));
+
+        Assert.Contains("set xs [apply {g {set items {}; while 1 {set item [$g]; if {[namespace which $g] eq \"\"} break; lappend items $item}; return $items}} [count 3]]\n", tcl);
+        Assert.Contains("puts [tcl::mathop::+ {*}[apply {g {", tcl);
+        Assert.Contains("return $items}} $g]]", tcl);
+    }
+
+    [Fact]
+    public void TestPythonKeepsGenerators()
+    {
+        var python = new PythonEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains("        yield i\n", python);
+        Assert.Contains("    yield from xs\n", python);
+    }
+}
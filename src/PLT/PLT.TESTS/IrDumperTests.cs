@@ -0,0 +1,72 @@
+using System.Text.Json;
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class IrDumperTests
+{
+    private const string Source = @"class Parser:
+    def parse(self, text):
+        if text == ""x"":
+            return {""a"": [1, 2]}
+        return None
+
+def parse(data):
+    print(data)
+";
+
+    [Fact]
+    public void TestTreeFormat()
+    {
+        var ast = new IrProgram(new Stmt[]
+        {
+            new ExprStmt(new Intrinsic("print", new Expr[] { new Literal("Hello, world!") }), "Prints a greeting"),
+        });
+
+        var expected = string.Join(Environment.NewLine,
+            "IrProgram",
+            "  // Prints a greeting",
+            "  ExprStmt",
+            "    Intrinsic \"print\"",
+            "      Literal \"Hello, world!\"",
+            "");
+        Assert.Equal(expected, PrettyPrinter.Print(ast));
+    }
+
+    [Fact]
+    public void TestFilterByQualifiedName()
+    {
+        var ast = PythonFrontend.Parse(Source);
+
+        var dump = IrDumper.Dump(ast, new IrDumpOptions { Name = "Parser.parse", Format = IrDumpFormat.SExpr });
+        var lines = dump.Split(Environment.NewLine, StringSplitOptions.RemoveEmptyEntries);
+
+        var line = Assert.Single(lines);
+        Assert.StartsWith("(FunctionDefStmt :name \"parse\" :params (\"self\" \"text\") (IfStmt (cond (BinaryOp :op \"==\"", line);
+        Assert.Contains("(then ", line);
+        Assert.Contains("(DictLiteral (key (Literal :value \"a\")) (value (ListLiteral", line);
+
+        // The unqualified name matches both definitions.
+        var both = IrDumper.Dump(ast, new IrDumpOptions { Name = "parse", Kinds = new[] { "FunctionDef" }, Format = IrDumpFormat.SExpr });
+        Assert.Equal(2, both.Split(Environment.NewLine, StringSplitOptions.RemoveEmptyEntries).Length);
+    }
+
+    [Fact]
+    public void TestJsonLinesWithDepthLimit()
+    {
+        var ast = PythonFrontend.Parse(Source);
+
+        var dump = IrDumper.Dump(ast, new IrDumpOptions { Kinds = new[] { "class" }, MaxDepth = 1, Format = IrDumpFormat.JsonLines });
+        var nodes = dump.Split(Environment.NewLine, StringSplitOptions.RemoveEmptyEntries)
+            .Select(line => JsonDocument.Parse(line).RootElement)
+            .ToList();
+
+        Assert.Equal(2, nodes.Count);
+        Assert.Equal("ClassDefStmt", nodes[0].GetProperty("kind").GetString());
+        Assert.Equal("Parser", nodes[0].GetProperty("name").GetString());
+        Assert.Equal("FunctionDefStmt", nodes[1].GetProperty("kind").GetString());
+        Assert.Equal(0, nodes[1].GetProperty("parent").GetInt32());
+        Assert.True(nodes[1].GetProperty("elided").GetInt32() > 0);
+    }
+}
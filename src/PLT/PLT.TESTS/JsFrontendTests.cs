@@ -0,0 +1,134 @@
+using System.Text;
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.Js;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Python;
+
+namespace PLT.TESTS;
+
+public class JsFrontendTests
+{
+    private static string ToPython(string js) =>
+        new PythonEmitter().Emit(JsFrontend.Parse(js)).Replace("\r\n", "\n");
+
+    [Fact]
+    public void TestHelloWorldKeepsComment()
+    {
+        var ast = JsFrontend.Parse("// Prints \"Hello, world!\" to the console\nconsole.log(\"Hello, world!\")");
+
+        var stmt = Assert.IsType<ExprStmt>(Assert.Single(ast.Body));
+        Assert.Equal("Prints \"Hello, world!\" to the console", stmt.LeadingComment);
+        var print = Assert.IsType<Intrinsic>(stmt.Expr);
+        Assert.Equal("print", print.Name);
+        Assert.Equal(new Literal("Hello, world!"), Assert.Single(print.Args));
+    }
+
+    [Fact]
+    public void TestStatementsMatchPythonFrontend()
+    {
+        var js = @"function score(items, limit) {
+  let total = 0;
+  for (const x of items) {
+    if (x > limit && !done) {
+      total += x;
+    } else {
+      console.log('skip', x);
+    }
+  }
+  return total;
+}
+";
+        var py = @"def score(items, limit):
+    total = 0
+    for x in items:
+        if x > limit and not done:
+            total += x
+        else:
+            print('skip', x)
+    return total
+";
+        Assert.Equal(new PythonEmitter().Emit(PythonFrontend.Parse(py)), new PythonEmitter().Emit(JsFrontend.Parse(js)));
+    }
+
+    [Fact]
+    public void TestLoopsClassesAndExpressions()
+    {
+        var output = ToPython(@"for (let i = 0; i < 10; i += 2) console.log(i);
+for (let j = n; j >= 1; j--) { console.log(j) }
+for (let i = 0; i < items.length; i++) { total += items[i]; }
+class Counter extends Base {
+  constructor(start) { this.count = start; }
+  inc() { this.count++; return this.count; }
+}
+const sq = x => x * x;
+const label = `n=${n}`;
+obj[""k""] = new Counter(1);
+");
+
+        Assert.Contains("for i in range(0, 10, 2):\n    print(i)\n", output);
+        Assert.Contains("for j in range(n, 0, -1):\n", output);
+        // The bound is re-read on every iteration, so this stays a while loop.
+        Assert.Contains("i = 0\nwhile i < len(items):\n    total = total + items[i]\n    i = i + 1\n", output);
+        Assert.Contains("class Counter(Base):\n    def __init__(self, start)\n        setattr(self, \"count\", start)\n", output);
+        Assert.Contains("sq = lambda x: x * x\n", output);
+        Assert.Contains("label = f\"n={n}\"\n", output);
+        Assert.Contains("obj.__setitem__(\"k\", Counter(1))\n", output);
+    }
+
+    [Fact]
+    public void TestContinueInForRunsTheUpdate()
+    {
+        var output = ToPython(@"for (let i = 1; i < 100; i = i * 2) {
+  if (i == 4) { continue; }
+  for (const x of xs) { if (x) { continue; } }
+  console.log(i);
+}
+");
+
+        Assert.Contains("    if i == 4:\n        i = i * 2\n        continue\n", output);
+        // The inner loop's continue is its own
+        Assert.Contains("        if x:\n            continue\n", output);
+        Assert.EndsWith("    print(i)\n    i = i * 2\n", output);
+    }
+
+    [Fact]
+    public void TestDoWhileIsOneLoop()
+    {
+        var output = ToPython("do { k++; if (k == 2) { break; } } while (k < 5);\n");
+
+        Assert.Equal(
+            "_first = True\nwhile _first or k < 5:\n    _first = False\n    k = k + 1\n    if k == 2:\n        break\n",
+            output);
+    }
+
+    [Fact]
+    public void TestBitwiseOperators()
+    {
+        var output = ToPython("let d = a & 1;\nlet e = a << 1 | b >> 2 ^ c;\nlet g = a >>> 3;\nd <<= 2;\n");
+
+        Assert.Contains("d = a & 1\n", output);
+        Assert.Contains("e = a << 1 | b >> 2 ^ c\n", output);
+        Assert.Contains("g = a % 4294967296 >> 3\n", output);
+        Assert.Contains("d = d << 2\n", output);
+
+        // & binds looser than == in JS
+        var f = (VarAssignment)JsFrontend.Parse("let f = a & 1 == 0;").Body.Single();
+        Assert.Equal("&", Assert.IsType<BinaryOp>(f.Value).Op);
+        Assert.Equal("==", Assert.IsType<BinaryOp>(((BinaryOp)f.Value).Right).Op);
+    }
+
+    [Fact]
+    public void TestLargeInputParsesInOnePass()
+    {
+        // Deeply nested parentheses used to be where lookahead for arrow functions goes
+        // quadratic; the matching-paren table keeps it linear.
+        var sb = new StringBuilder("let x = ");
+        sb.Append('(', 200).Append('1').Append(')', 200).AppendLine(";");
+        for (int i = 0; i < 5000; i++)
+            sb.AppendLine($"let v{i} = f(v{i}, (a, b) => a + b);");
+
+        var ast = JsFrontend.Parse(sb.ToString());
+
+        Assert.Equal(5001, ast.Body.Count);
+    }
+}
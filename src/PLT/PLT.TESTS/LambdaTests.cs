@@ -0,0 +1,62 @@
+using PLT.CORE.IR;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class LambdaTests
+{
+    [Fact]
+    public void TestTclLambdasAreApplyTerms()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "double = lambda x: x * 2\nanswer = lambda: 42\nadd = lambda a, b: a + b\n")).Replace("\r\n", "\n");
+
+        Assert.Equal(
+            "set double {apply {x {expr {$x * 2}}}}\n" +
+            "set answer {apply {{} {string cat 42}}}\n" +
+            "set add {apply {{a b} {expr {$a + $b}}}}\n",
+            tcl);
+    }
+
+    [Fact]
+    public void TestCapturedVariablesArePassedExplicitly()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "scale = lambda x: x * k\nscaled = lambda xs: [y * k + x0 for y in xs]\n"));
+
+        Assert.Contains("set scale [list apply {{k x} {expr {$x * $k}}} $k]", tcl);
+        // The comprehension's own variable isn't captured
+        Assert.Contains("set scaled [list apply {{k x0 xs} {lmap y $xs {expr {[expr {$y * $k}] + $x0}}}} $k $x0]", tcl);
+    }
+
+    [Fact]
+    public void TestTclCallsLambdasThroughTheirVariables()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "double = lambda x: x * 2\nprint(double(21))\ndef twice(f, x):\n    return f(f(x))\nprint(twice(double, 5))\n"))
+            .Replace("\r\n", "\n");
+
+        Assert.Contains("puts [{*}$double 21]\n", tcl);
+        Assert.Contains("    return [{*}$f [{*}$f $x]]\n", tcl);
+        // A def is a proc, called by name
+        Assert.Contains("puts [twice $double 5]\n", tcl);
+    }
+
+    [Fact]
+    public void TestLambdasAsArguments()
+    {
+        var program = PythonFrontend.Parse("ys = sorted(xs, key=lambda p: p[1] if p else 0)\nzs = list(map(lambda s: s.upper(), names))\n");
+
+        var call = (FunctionCall)program.Body.OfType<VarAssignment>().First().Value;
+        Assert.Equal(new Literal("key"), ((Intrinsic)call.Args[1]).Args[0]);
+
+        var python = new PythonEmitter().Emit(program);
+        Assert.Contains("ys = sorted(xs, key=lambda p: p[1] if p else 0)", python);
+        Assert.Contains("zs = list(map(lambda s: s.upper(), names))", python);
+
+        var tcl = new TclEmitter().Emit(program);
+        Assert.Contains("-key {apply {p {expr {$p ? [lindex $p 1] : 0}}}}", tcl);
+    }
+}
@@ -0,0 +1,70 @@
+using System.Numerics;
+using PLT.CORE.IR;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.CSharp;
+using PLT.CORE.Frontends.Js;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class NumericLiteralTests
+{
+    private static object? ValueOf(IrProgram program, string name) =>
+        program.Body.OfType<VarAssignment>().Single(v => v.VarName == name).Value is Literal l ? l.Value : null;
+
+    [Fact]
+    public void TestPythonLiteralsAreTypedExactly()
+    {
+        var program = PythonFrontend.Parse("a = 1\nb = 1.0\nc = 0xFF\nd = 12345678901234567890123\ne = 1_000\nf = 1e3\ng = 9007199254740993\n");
+
+        Assert.Equal(1L, ValueOf(program, "a"));
+        Assert.Equal(1.0, ValueOf(program, "b"));
+        Assert.Equal(255L, ValueOf(program, "c"));
+        Assert.Equal(BigInteger.Parse("12345678901234567890123"), ValueOf(program, "d"));
+        Assert.Equal(1000L, ValueOf(program, "e"));
+        Assert.Equal(1000.0, ValueOf(program, "f"));
+        // Beyond 2^53, where a double would have rounded it
+        Assert.Equal(9007199254740993L, ValueOf(program, "g"));
+
+        Assert.Equal(
+            "a = 1\nb = 1.0\nc = 0xFF\nd = 12345678901234567890123\ne = 1000\nf = 1e3\ng = 9007199254740993\n",
+            new PythonEmitter().Emit(program).Replace("\r\n", "\n"));
+    }
+
+    [Fact]
+    public void TestBackendsKeepIntegersAndFloatsApart()
+    {
+        var program = PythonFrontend.Parse("half = n / 2.0\nmask = 0o17\n");
+
+        var tcl = new TclEmitter().Emit(program);
+        Assert.Contains("set half [expr {$n / 2.0}]", tcl);
+        Assert.Contains("set mask 0o17", tcl);
+
+        // C has no 0o prefix
+        var c = new CEmitter().Emit(program);
+        Assert.Contains("half = n / 2.0;", c);
+        Assert.Contains("mask = 15;", c);
+
+        var single = new CEmitter().Emit(new IrProgram(new List<Stmt> { new VarAssignment("x", new Literal(0.1f)), new VarAssignment("y", new Literal(1f)) }));
+        Assert.Contains("x = 0.1f;", single);
+        Assert.Contains("y = 1.0f;", single);
+    }
+
+    [Fact]
+    public void TestCSharpAndJsLiterals()
+    {
+        var cs = CSharpFrontend.Parse("var a = 10L; var b = 1f; var c = 0x1F; var d = 2.5e-3;");
+        Assert.Equal(10L, ValueOf(cs, "a"));
+        Assert.Equal(1.0, ValueOf(cs, "b"));
+        Assert.Equal(31L, ValueOf(cs, "c"));
+        Assert.Equal(2.5e-3, ValueOf(cs, "d"));
+        Assert.Contains("b = 1.0\nc = 0x1F\nd = 2.5e-3\n", new PythonEmitter().Emit(cs).Replace("\r\n", "\n"));
+
+        var js = JsFrontend.Parse("let n = 3; let x = 0.5; let big = 123456789012345678901234567890n;");
+        Assert.Equal(3L, ValueOf(js, "n"));
+        Assert.Equal(0.5, ValueOf(js, "x"));
+        Assert.Equal(BigInteger.Parse("123456789012345678901234567890"), ValueOf(js, "big"));
+    }
+}
@@ -0,0 +1,61 @@
+using System.Text;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class OperatorChainTests
+{
+    private static string Sum(int terms, string separator = " + ") =>
+        string.Join(separator, Enumerable.Range(0, terms).Select(i => $"x{i}"));
+
+    [Fact]
+    public void TestLongChainsEmitInEveryBackend()
+    {
+        const int terms = 50_000;
+        var program = PythonFrontend.Parse($"total = {Sum(terms)}\nmixed = {Sum(terms, " * ")} - {Sum(terms, " - ")}\n");
+
+        var python = new PythonEmitter().Emit(program);
+        Assert.Contains($"total = {Sum(terms)}", python);
+
+        var c = new CEmitter().Emit(program);
+        Assert.Contains(Sum(terms), c);
+
+        // One expr for the sum; the difference holds the product in a nested one.
+        var tcl = new TclEmitter().Emit(program).Replace("\r\n", "\n");
+        var dollars = string.Join(" + ", Enumerable.Range(0, terms).Select(i => $"$x{i}"));
+        Assert.Contains($"set total [expr {{{dollars}}}]\n", tcl);
+        Assert.Contains($"set mixed [expr {{[expr {{$x0 * $x1 * ", tcl);
+        Assert.EndsWith($" - $x{terms - 2} - $x{terms - 1}}}]\n", tcl);
+    }
+
+    [Fact]
+    public void TestTclNestsOperatorsOfDifferentPrecedence()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "a = x + y - z * w + v\nb = (x + y) * z\nc = x ** y ** z\nd = \"ab\" * n + s + t\n")).Replace("\r\n", "\n");
+
+        Assert.Equal(
+            "set a [expr {$x + $y - [expr {$z * $w}] + $v}]\n" +
+            "set b [expr {[expr {$x + $y}] * $z}]\n" +
+            // ** is right-associative, in Python as in Tcl
+            "set c [expr {$x ** [expr {$y ** $z}]}]\n" +
+            // + on strings joins them
+            "set d [string cat [string repeat \"ab\" $n] $s $t]\n",
+            tcl);
+    }
+
+    [Fact]
+    public void TestLongConcatenationStillAccumulates()
+    {
+        var source = new StringBuilder("s = \"start\"");
+        for (int i = 0; i < 50_000; i++)
+            source.Append($" + \"{i}\"");
+        source.Append("\nfor item in items:\n    s += item + \", \"\nprint(s)\n");
+
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(source.ToString()));
+        Assert.Contains("append s $item \", \"", tcl);
+    }
+}
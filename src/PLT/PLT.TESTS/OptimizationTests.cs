@@ -0,0 +1,115 @@
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Optimization;
+
+namespace PLT.TESTS;
+
+public class OptimizationTests
+{
+    private static string Optimized(string source) =>
+        new PythonEmitter().Emit(IrOptimizer.Optimize(PythonFrontend.Parse(source))).Replace("\r\n", "\n");
+
+    [Fact]
+    public void TestLongChainsOptimize()
+    {
+        // Each pass walks expressions without recursing, so chain length doesn't bound it
+        const int terms = 50_000;
+        var reads = string.Join(" + ", Enumerable.Range(0, terms).Select(i => $"p.x{i % 2}"));
+        var invariant = string.Join(" + ", Enumerable.Repeat("k", terms));
+
+        var output = Optimized($"def f(p, k, i):\n    while i < {invariant}:\n        total = {reads} + i\n        i = i + 1\n");
+
+        Assert.Contains($"    _inv1 = {invariant}\n    while i < _inv1:\n", output);
+        Assert.Contains("        _cse1 = p.x0\n        _cse2 = p.x1\n        total = _cse1 + _cse2 + _cse1", output);
+    }
+
+    [Fact]
+    public void TestHoistsLoopInvariants()
+    {
+        var output = Optimized(@"def scan(items, limit):
+    i = 0
+    while i < len(items) and i < limit * 2:
+        if items[i] in ["".py"", "".txt""]:
+            print(items[i])
+        i = i + 1
+");
+
+        Assert.Contains("    _inv1 = len(items)\n    _inv2 = [\".py\", \".txt\"]\n", output);
+        // The right of "and" may never run, and limit * 2 could raise.
+        Assert.Contains("    while i < _inv1 and i < limit * 2:\n", output);
+        Assert.Contains("        if items[i] in _inv2:\n", output);
+    }
+
+    [Fact]
+    public void TestKeepsUnsafeExpressions()
+    {
+        var source = @"def fill(rows, table, key):
+    n = 0
+    while n < len(rows):
+        rows.append(n)
+        n = n + 1
+    for r in rows:
+        print(table[key])
+        row = [0, 0]
+";
+        var ast = PythonFrontend.Parse(source);
+
+        // append may change len(rows); table[key] could raise on an empty loop; each
+        // iteration needs its own [0, 0].
+        Assert.Same(ast, IrOptimizer.Optimize(ast));
+        Assert.DoesNotContain("_inv", Optimized(source));
+    }
+
+    [Fact]
+    public void TestCachesRepeatedChains()
+    {
+        var output = Optimized(@"def show(self, k):
+    print(self.cfg.opts[k])
+    width = self.cfg.opts[k] + self.cfg.pad
+    return width
+");
+
+        Assert.Contains("    _cse1 = self.cfg.opts[k]\n    print(_cse1)\n    width = _cse1 + self.cfg.pad\n", output);
+        // self.cfg is read once more, outside the cached chain: not worth a temporary.
+        Assert.DoesNotContain("_cse2", output);
+    }
+
+    [Fact]
+    public void TestWritesInvalidateChains()
+    {
+        var source = @"def update(a, b, k, other):
+    print(a.x.y)
+    b.y = 1
+    print(a.x.y)
+    print(a[k])
+    other[0] = 2
+    print(a[k])
+    print(a.z)
+    refresh(a)
+    print(a.z)
+    print(a.w)
+    a = other
+    print(a.w)
+";
+        var output = Optimized(source);
+
+        // Setting b.y may change a.x.y (b could be a.x), but not a.x itself.
+        Assert.Contains("    _cse1 = a.x\n    print(_cse1.y)\n    setattr(b, \"y\", 1)\n    print(_cse1.y)\n", output);
+        Assert.DoesNotContain("_cse2", output);
+    }
+
+    [Fact]
+    public void TestConditionalReadsDoNotDefineTemporaries()
+    {
+        var output = Optimized(@"def pick(o, flag):
+    x = flag and o.a.b
+    y = o.a.b
+    z = o.a.b if flag else 0
+    print(x, y, z)
+");
+
+        // The first read may never run, so the temporary starts at the second.
+        Assert.Contains("    x = flag and o.a.b\n    _cse1 = o.a.b\n    y = _cse1\n    z = _cse1 if flag else 0\n", output);
+    }
+}
@@ -0,0 +1,149 @@
+using System.Text;
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.CSharp;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Tcl;
+
+namespace PLT.TESTS;
+
+public class ParallelTranslationTests
+{
+    private static string BuildLargeModule()
+    {
+        var sb = new StringBuilder();
+        for (int i = 0; i < 200; i++)
+        {
+            sb.AppendLine($@"@dataclass
+class Item{i}(Base):
+    name = ""item{i}""
+    def get(self, key):
+        return self.data[key]
+
+def handler_{i}(cmd, args):
+    if cmd == ""run"":
+        print(""running"", args)
+    else:
+        print(f""unknown {{cmd}}"")
+
+try:
+    value_{i} = load({i})
+except Exception as e:
+    value_{i} = None
+
+""doc"" ""string""
+TABLE_{i} = {{
+    ""a"": [1, 2,
+3],
+}}
+if value_{i}:
+    pass
+elif TABLE_{i}:
+    pass
+");
+        }
+        return sb.ToString();
+    }
+
+    [Fact]
+    public void TestParallelParseMatchesSequential()
+    {
+        var source = BuildLargeModule();
+        Assert.True(source.Length > PythonFrontend.ParallelThreshold);
+
+        var sequential = PythonFrontend.Parse(source, parallel: false);
+        var parallel = PythonFrontend.Parse(source, parallel: true);
+
+        Assert.Equal(sequential.Body.Count, parallel.Body.Count);
+        Assert.Equal(new PythonEmitter().Emit(sequential), new PythonEmitter().Emit(parallel));
+        Assert.Equal(new TclEmitter().Emit(sequential), new TclEmitter().Emit(parallel));
+    }
+
+    private static string BuildLargeCSharpFile()
+    {
+        var sb = new StringBuilder("using System;\n\nConsole.WriteLine(\"start\");\n\n");
+        for (int i = 0; i < 100; i++)
+        {
+            sb.AppendLine($@"class Worker{i}
+{{
+    static void Run{i}()
+    {{
+        int count = {i};
+        string label = ""braces {{ }} in a string"";
+        for (int j = 0; j < count; j++)
+        {{
+            if (j > 2)
+            {{
+                Console.WriteLine(label);
+            }}
+            else
+            {{
+                Console.WriteLine(j);
+            }}
+        }}
+        {{
+            Console.WriteLine(""nested block"");
+        }}
+    }}
+
+    public static void Check{i}(int x)
+    {{
+        while (x > 0)
+        {{
+            x = x - 1;
+        }}
+        return;
+    }}
+}}
+
+int total{i} = {i} * 2;");
+        }
+        return sb.ToString();
+    }
+
+    [Fact]
+    public void TestParallelCSharpParseMatchesSequential()
+    {
+        var source = BuildLargeCSharpFile();
+        Assert.True(source.Length > CSharpFrontend.ParallelThreshold);
+
+        var sequential = CSharpFrontend.Parse(source, parallel: false);
+        var parallel = CSharpFrontend.Parse(source, parallel: true);
+
+        Assert.Equal(sequential.Body.Count, parallel.Body.Count);
+        Assert.Equal(new PythonEmitter().Emit(sequential), new PythonEmitter().Emit(parallel));
+    }
+
+    [Fact]
+    public void TestParallelEmissionIsByteIdentical()
+    {
+        var ast = PythonFrontend.Parse(BuildLargeModule(), parallel: false);
+        Assert.True(ast.Body.Count > 256);
+
+        Assert.Equal(new PythonEmitter { Parallel = false }.Emit(ast), new PythonEmitter { Parallel = true }.Emit(ast));
+        Assert.Equal(new TclEmitter { Parallel = false }.Emit(ast), new TclEmitter { Parallel = true }.Emit(ast));
+    }
+
+    [Fact]
+    public void TestParallelEmissionReportsSequentialError()
+    {
+        // The C backend rejects both prints below; the earlier one must be the one reported.
+        var body = new List<Stmt>();
+        for (int i = 0; i < 300; i++)
+        {
+            var args = i switch
+            {
+                100 => new Expr[] { new Variable("x") },
+                250 => new Expr[] { new Literal("a"), new Literal("b") },
+                _ => new Expr[] { new Literal(i) }
+            };
+            body.Add(new ExprStmt(new Intrinsic("print", args)));
+        }
+        var ast = new IrProgram(body);
+
+        var sequential = Assert.Throws<NotSupportedException>(() => new CEmitter { Parallel = false }.Emit(ast));
+        var parallel = Assert.Throws<NotSupportedException>(() => new CEmitter { Parallel = true }.Emit(ast));
+        Assert.Equal(sequential.Message, parallel.Message);
+    }
+}
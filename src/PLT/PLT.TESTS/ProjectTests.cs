@@ -0,0 +1,128 @@
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Project;
+
+namespace PLT.TESTS;
+
+public class ProjectTests
+{
+    private sealed class TempProject : IDisposable
+    {
+        public TempProject()
+        {
+            Root = Path.Combine(Path.GetTempPath(), $"plt_project_{Guid.NewGuid():N}");
+            Directory.CreateDirectory(Source);
+        }
+
+        public string Root { get; }
+        public string Source => Path.Combine(Root, "src");
+        public string Output => Path.Combine(Root, "out");
+
+        public void Write(string relativePath, string contents)
+        {
+            var path = Path.Combine(Source, relativePath);
+            Directory.CreateDirectory(Path.GetDirectoryName(path)!);
+            File.WriteAllText(path, contents);
+        }
+
+        public ProjectResult Translate(bool parallel = true) => new ProjectTranslator
+        {
+            SourceRoot = Source,
+            OutputRoot = Output,
+            Target = "tcl",
+            OutputExtension = ".tcl",
+            Emit = ir => new TclEmitter().Emit(ir),
+            Parallel = parallel,
+        }.Translate();
+
+        public void Dispose() => Directory.Delete(Root, recursive: true);
+    }
+
+    private static string[] Names(ProjectResult result, ModuleStatus status) =>
+        result.WithStatus(status).Select(m => m.Module.Name).OrderBy(n => n, StringComparer.Ordinal).ToArray();
+
+    [Fact]
+    public void TestImportsAreRecorded()
+    {
+        var ast = PythonFrontend.Parse("import os.path as p, sys\nfrom ..pkg import (a as b,\n    c)\nfrom . import *\n");
+
+        Assert.Equal(3, ast.Body.Count);
+        var first = Assert.IsType<ImportStmt>(ast.Body[0]);
+        Assert.Null(first.FromModule);
+        Assert.Equal(new[] { ("os.path", (string?)"p"), ("sys", null) }, first.Names);
+        var second = Assert.IsType<ImportStmt>(ast.Body[1]);
+        Assert.Equal("..pkg", second.FromModule);
+        Assert.Equal(new[] { ("a", (string?)"b"), ("c", null) }, second.Names);
+        Assert.Equal("from . import *", ImportSyntax.Format((ImportStmt)ast.Body[2]));
+    }
+
+    [Fact]
+    public void TestDependencyGraph()
+    {
+        using var project = new TempProject();
+        project.Write("app.py", "from pkg import util\nimport helpers\n\nutil.run()\n");
+        project.Write("helpers.py", "import os\n\ndef helper():\n    pass\n");
+        project.Write("pkg/__init__.py", "");
+        project.Write("pkg/util.py", "from .core import VALUE\n\ndef run():\n    print(VALUE)\n");
+        project.Write("pkg/core.py", "VALUE = 1\n");
+
+        var result = project.Translate();
+
+        Assert.Equal(5, Names(result, ModuleStatus.Translated).Length);
+        Assert.Equal(new[] { "pkg", "pkg.util", "helpers" }, result.Dependencies["app"]);
+        Assert.Equal(new[] { "pkg", "pkg.core" }, result.Dependencies["pkg.util"]);
+        Assert.Empty(result.Dependencies["helpers"]);
+
+        // Dependencies come before the modules that import them.
+        var order = result.Modules.Select(m => m.Module.Name).ToList();
+        Assert.True(order.IndexOf("pkg.core") < order.IndexOf("pkg.util"));
+        Assert.True(order.IndexOf("pkg.util") < order.IndexOf("app"));
+        Assert.True(File.Exists(Path.Combine(project.Output, "pkg", "util.tcl")));
+    }
+
+    [Fact]
+    public void TestIncrementalRetranslation()
+    {
+        using var project = new TempProject();
+        project.Write("app.py", "from lib import greet\n\ngreet()\n");
+        project.Write("lib.py", "def greet():\n    print(\"hi\")\n");
+        project.Write("other.py", "x = 1\n");
+
+        Assert.Equal(3, Names(project.Translate(), ModuleStatus.Translated).Length);
+
+        // Nothing changed.
+        var rerun = project.Translate();
+        Assert.Empty(Names(rerun, ModuleStatus.Translated));
+        Assert.Equal(3, Names(rerun, ModuleStatus.UpToDate).Length);
+
+        // A body-only edit doesn't change lib's interface, so app stays up to date.
+        project.Write("lib.py", "def greet():\n    print(\"hello\")\n");
+        Assert.Equal(new[] { "lib" }, Names(project.Translate(), ModuleStatus.Translated));
+
+        // A signature change retranslates lib and its importer, but not other.
+        project.Write("lib.py", "def greet(name):\n    print(name)\n");
+        Assert.Equal(new[] { "app", "lib" }, Names(project.Translate(parallel: false), ModuleStatus.Translated));
+
+        // Deleted output is regenerated.
+        File.Delete(Path.Combine(project.Output, "other.tcl"));
+        Assert.Equal(new[] { "other" }, Names(project.Translate(), ModuleStatus.Translated));
+    }
+
+    [Fact]
+    public void TestFailureBlocksDependents()
+    {
+        using var project = new TempProject();
+        project.Write("a.py", "import b\n");
+        project.Write("b.py", "import c\n");
+        project.Write("c.py", "x = (\n");
+        project.Write("cycle1.py", "import cycle2\n");
+        project.Write("cycle2.py", "import cycle1\n");
+
+        var result = project.Translate();
+
+        Assert.Equal(new[] { "c" }, Names(result, ModuleStatus.Failed));
+        Assert.Equal(new[] { "a", "b" }, Names(result, ModuleStatus.Blocked));
+        Assert.Equal(new[] { "cycle1", "cycle2" }, Names(result, ModuleStatus.Translated));
+    }
+}
@@ -0,0 +1,66 @@
+using PLT.CORE.IR;
+using PLT.CORE.Analysis;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Tcl;
+
+namespace PLT.TESTS;
+
+public class ScopeAnalyzerTests
+{
+    private const string Source = @"counter = 0
+limit = 10
+
+def step(n):
+    total = n
+    if n > limit:
+        big = True
+    total = total + counter
+    squares = [i * i for i in range(total)]
+    return squares
+";
+
+    [Fact]
+    public void TestResolution()
+    {
+        var ast = PythonFrontend.Parse(Source);
+        var symbols = ScopeAnalyzer.Analyze(ast);
+
+        var step = ast.Body.OfType<FunctionDefStmt>().Single();
+        var scope = symbols.ScopeOf(step)!;
+        Assert.Equal(ScopeKind.Function, scope.Kind);
+        Assert.Equal(SymbolKind.Parameter, scope.Lookup("n")!.Kind);
+        Assert.Null(scope.Lookup("counter"));
+
+        // Globals are listed in first-use order.
+        Assert.Equal(new[] { "limit", "counter" }, scope.GlobalsUsed.Select(s => s.Name));
+        var uses = IrWalker.Descendants(step).OfType<Variable>().ToList();
+        Assert.True(symbols.Resolve(uses.First(v => v.Name == "counter"))!.IsGlobal);
+
+        // The comprehension variable lives in its own scope.
+        var i = symbols.Resolve(uses.First(v => v.Name == "i"))!;
+        Assert.Equal(ScopeKind.Comprehension, i.Scope.Kind);
+        Assert.Null(scope.Lookup("i"));
+
+        // "big" is first bound inside the if, so it is hoisted; "total" is declared once.
+        Assert.Equal(new[] { "big" }, scope.HoistedLocals.Select(s => s.Name));
+        var assignments = IrWalker.Descendants(step).OfType<VarAssignment>().Where(v => v.VarName == "total").ToList();
+        Assert.True(symbols.IsDeclaration(assignments[0]));
+        Assert.False(symbols.IsDeclaration(assignments[1]));
+    }
+
+    [Fact]
+    public void TestBackendsUseScopes()
+    {
+        var ast = PythonFrontend.Parse(Source);
+
+        var tcl = new TclEmitter().Emit(ast);
+        Assert.Contains("proc step {n} {\n    global limit counter\n", tcl.Replace("\r\n", "\n"));
+
+        var c = new CEmitter().Emit(ast).Replace("\r\n", "\n");
+        Assert.Contains("    int big;\n", c);
+        Assert.Contains("int total = n;", c);
+        Assert.Contains("total = total + counter;", c);
+        Assert.DoesNotContain("int total = (total", c);
+    }
+}
@@ -0,0 +1,77 @@
+using System.Text;
+using PLT.CORE.Frontends.CSharp;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+
+namespace PLT.TESTS;
+
+public class SourceFileTests
+{
+    private static string WriteTempFile(string contents, string extension, Encoding encoding)
+    {
+        var path = Path.Combine(Path.GetTempPath(), $"plt_{Guid.NewGuid():N}{extension}");
+        File.WriteAllText(path, contents, encoding);
+        return path;
+    }
+
+    [Fact]
+    public void TestPythonParseFileMatchesParse()
+    {
+        var source = @"# café
+naïve = ""héllo wörld ✓\tend""
+def größe(ß):
+    return ß * 2
+
+print(naïve, größe(2), 'it\'s')
+";
+        foreach (var encoding in new Encoding[] { new UTF8Encoding(false), new UTF8Encoding(true), Encoding.Unicode })
+        {
+            var path = WriteTempFile(source, ".py", encoding);
+            try
+            {
+                var expected = PythonFrontend.Parse(source, parallel: false);
+                var actual = PythonFrontend.ParseFile(path, parallel: false);
+
+                Assert.Equal(new PythonEmitter().Emit(expected), new PythonEmitter().Emit(actual));
+                Assert.Equal(new TclEmitter().Emit(expected), new TclEmitter().Emit(actual));
+            }
+            finally
+            {
+                File.Delete(path);
+            }
+        }
+    }
+
+    [Fact]
+    public void TestCSharpParseFileMatchesParse()
+    {
+        var source = "// ü\nstring größe = \"héllo \\\"wörld\\\" ✓\";\nConsole.WriteLine(größe);\n";
+        var path = WriteTempFile(source, ".cs", new UTF8Encoding(false));
+        try
+        {
+            var expected = CSharpFrontend.Parse(source);
+            var actual = CSharpFrontend.ParseFile(path);
+
+            Assert.Equal(new PythonEmitter().Emit(expected), new PythonEmitter().Emit(actual));
+        }
+        finally
+        {
+            File.Delete(path);
+        }
+    }
+
+    [Fact]
+    public void TestEmptyFile()
+    {
+        var path = WriteTempFile("", ".py", new UTF8Encoding(false));
+        try
+        {
+            Assert.Empty(PythonFrontend.ParseFile(path).Body);
+        }
+        finally
+        {
+            File.Delete(path);
+        }
+    }
+}
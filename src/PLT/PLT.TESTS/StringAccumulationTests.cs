@@ -0,0 +1,59 @@
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+
+namespace PLT.TESTS;
+
+public class StringAccumulationTests
+{
+    private const string Source = @"def render(rows):
+    out = """"
+    for row in rows:
+        for cell in row:
+            out += cell + "",""
+        out += ""|""
+    return out
+";
+
+    private static string Normalize(string s) => s.Replace("\r\n", "\n");
+
+    [Fact]
+    public void TestBuilderPerBackend()
+    {
+        var ast = PythonFrontend.Parse(Source);
+
+        var tcl = Normalize(new TclEmitter().Emit(ast));
+        Assert.Contains("append out $cell \",\"\n", tcl);
+        Assert.Contains("append out \"|\"\n", tcl);
+
+        // One list around the outer loop, joined once after it.
+        var python = Normalize(new PythonEmitter().Emit(ast));
+        Assert.Contains("    _out_parts = [out]\n    for row in rows:\n", python);
+        Assert.Contains("            _out_parts.extend((cell, \",\"))\n", python);
+        Assert.Contains("        _out_parts.append(\"|\")\n    out = ''.join(_out_parts)\n", python);
+        Assert.DoesNotContain("out = out +", python);
+
+        var c = Normalize(new CEmitter().Emit(ast));
+        Assert.Contains("static void plt_strbuf_append(", c);
+        Assert.Contains("const char *out = \"\";", c);
+        Assert.Contains("plt_strbuf_append(&out_buf, cell);", c);
+        Assert.Contains("out = out_buf.data;", c);
+    }
+
+    [Fact]
+    public void TestReadInsideLoopKeepsString()
+    {
+        var ast = PythonFrontend.Parse("s = \"\"\nn = 0\nfor x in items:\n    s += x\n    print(s)\n    n += 1\n");
+
+        // Tcl can still append in place; a builder would hide the intermediate values.
+        var tcl = Normalize(new TclEmitter().Emit(ast));
+        Assert.Contains("append s $x\n", tcl);
+        Assert.Contains("set n [expr {$n + 1}]", tcl);
+
+        var python = Normalize(new PythonEmitter().Emit(ast));
+        Assert.Contains("    s = s + x\n", python);
+        Assert.DoesNotContain("_parts", python);
+        Assert.DoesNotContain("plt_strbuf", new CEmitter().Emit(ast));
+    }
+}
@@ -0,0 +1,43 @@
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class SwitchChainTests
+{
+    private const string Source =
+        "if args.cmd == \"c\":\n    create(args)\n" +
+        "elif args.cmd == \"a\" or args.cmd == \"append\":\n    append(args)\n" +
+        "elif args.cmd == \"l\":\n    listing(args)\n" +
+        "else:\n    usage()\n" +
+        "if k == 1:\n    n = 10\nelif 2 == k:\n    n = 20\nelif k == 3:\n    n = 30\n" +
+        "if x == 1:\n    n = 1\nelif y == 2:\n    n = 2\nelif x == 3:\n    n = 3\n";
+
+    [Fact]
+    public void TestTclDispatchesStringChainsWithSwitch()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains(
+            "switch -exact -- [getattr $args \"cmd\"] {\n" +
+            "    \"c\" {\n        create $args\n    }\n" +
+            "    \"a\" -\n    \"append\" {\n        append $args\n    }\n" +
+            "    \"l\" {\n        listing $args\n    }\n" +
+            "    default {\n        usage\n    }\n}\n", tcl);
+        // switch compares strings; integer chains stay numeric comparisons
+        Assert.Contains("if {[expr {$k == 1}]} {", tcl);
+    }
+
+    [Fact]
+    public void TestCSwitchesOnIntegerChains()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains("switch (k) {\n", c);
+        Assert.Contains("        case 2:\n            n = 20;\n            break;\n", c);
+        // Arms that test different variables are not one dispatch
+        Assert.Contains("if (x == 1) {", c);
+        Assert.DoesNotContain("switch (x)", c);
+    }
+}
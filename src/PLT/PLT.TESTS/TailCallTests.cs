@@ -0,0 +1,122 @@
+using System.Diagnostics;
+using PLT.CORE.Backends.C;
+using PLT.CORE.Backends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Frontends.Python;
+
+namespace PLT.TESTS;
+
+public class TailCallTests
+{
+    private const string Source =
+        "def count(n, total):\n" +
+        "    if n == 0:\n" +
+        "        return total\n" +
+        "    return count(n - 1, total + n)\n" +
+        "def gcd(a, b):\n" +
+        "    if b == 0:\n" +
+        "        return a\n" +
+        "    return gcd(b, a % b)\n" +
+        "def find(xs, i):\n" +
+        "    for x in xs:\n" +
+        "        return find(xs, i + 1)\n" +
+        "    return len(xs)\n" +
+        "def fib(n, a, b):\n" +
+        "    if n == 0:\n" +
+        "        return a\n" +
+        "    return fib(n - 1, b, a + b)\n" +
+        "print(count(100000, 0))\n";
+
+    [Fact]
+    public void TestTclMakesTailCallsInPlace()
+    {
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains("    tailcall count [expr {$n - 1}] [expr {$total + $n}]\n", tcl);
+        Assert.Contains("    tailcall gcd $b [expr {$a % $b}]\n", tcl);
+        // A builtin isn't a proc to call
+        Assert.Contains("    return [len $xs]\n", tcl);
+    }
+
+    [Fact]
+    public void TestPythonLoopsInsteadOfRecursing()
+    {
+        var python = new PythonEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        Assert.Contains(
+            "def count(n, total)\n    while True:\n        if n == 0:\n            return total\n        (n, total) = [n - 1, total + n]\n", python);
+        Assert.Contains("(a, b) = [b, a % b]", python);
+        // continue inside the for would go round that loop instead
+        Assert.Contains("        return find(xs, i + 1)\n", python);
+    }
+
+    [Fact]
+    public void TestCLoopsInsteadOfRecursing()
+    {
+        var c = new CEmitter().Emit(PythonFrontend.Parse(Source)).Replace("\r\n", "\n");
+
+        // total reads n, so it is assigned before n is
+        Assert.Contains("    while (1) {\n", c);
+        Assert.Contains("total = total + n;\n            n = n - 1;\n        }", c);
+        // Each of gcd's arguments reads the other parameter, so no order will do
+        Assert.Contains(
+            "            {\n" +
+            "                int _next_a = b;\n" +
+            "                int _next_b = a % b;\n" +
+            "                a = _next_a;\n" +
+            "                b = _next_b;\n" +
+            "            }\n", c);
+        Assert.DoesNotContain("return gcd(", c);
+        Assert.DoesNotContain("return fib(", c);
+    }
+
+    [Fact]
+    public void TestTclRecursesPastTheInterpreterLimit()
+    {
+        // Tcl stops at 1000 nested calls unless each replaces its caller's frame
+        var tcl = new TclEmitter().Emit(PythonFrontend.Parse(
+            "def count(n, total):\n    if n == 0:\n        return total\n    return count(n - 1, total + n)\n" +
+            "def fib(n, a, b):\n    if n == 0:\n        return a\n    return fib(n - 1, b, a + b)\n" +
+            "print(count(100000, 0))\nprint(fib(5000, 0, 1) % 1000000007)\n"));
+
+        var output = RunTclsh(tcl);
+        if (output == null)
+            return;
+        Assert.Equal("5000050000\n" + Fib(5000) + "\n", output.Replace("\r\n", "\n"));
+    }
+
+    private static string Fib(int n)
+    {
+        System.Numerics.BigInteger a = 0, b = 1;
+        for (int i = 0; i < n; i++)
+            (a, b) = (b, a + b);
+        return (a % 1000000007).ToString();
+    }
+
+    // The script's output, or null where no tclsh is installed.
+    private static string? RunTclsh(string script)
+    {
+        var path = Path.GetTempFileName();
+        try
+        {
+            File.WriteAllText(path, script);
+            using var process = Process.Start(new ProcessStartInfo("tclsh", path)
+            {
+                RedirectStandardOutput = true,
+                RedirectStandardError = true,
+            })!;
+            var output = process.StandardOutput.ReadToEnd();
+            process.WaitForExit();
+            Assert.True(process.ExitCode == 0, process.StandardError.ReadToEnd());
+            return output;
+        }
+        catch (System.ComponentModel.Win32Exception)
+        {
+            return null;
+        }
+        finally
+        {
+            File.Delete(path);
+        }
+    }
+}
@@ -0,0 +1,46 @@
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Backends.Tcl;
+using PLT.CORE.Telemetry;
+
+namespace PLT.TESTS;
+
+public class TelemetryTests
+{
+    [Fact]
+    public void TestPhasesAreRecorded()
+    {
+        var pythonCode = @"
+x = 1
+def f(a):
+    print(a)
+f(x)
+";
+
+        using var recorder = new PhaseRecorder();
+        var ast = PythonFrontend.Parse(pythonCode);
+        new TclEmitter().Emit(ast);
+
+        // Other tests may run concurrently and publish phases too, so only look for ours.
+        var records = recorder.Records;
+        Assert.Contains(records, r => r.Name == "lex.py" && r.Tags.Any(t => t.Key == "tokens" && t.Value is int n && n > 0));
+        Assert.Contains(records, r => r.Name == "parse.py" && r.Tags.Any(t => t.Key == "ir.nodes" && t.Value is int n && n > 0));
+        Assert.Contains(records, r => r.Name == "emit.tcl" && r.Tags.Any(t => t.Key == "output.bytes"));
+
+        Assert.Contains("parse.py", recorder.FormatSummary());
+    }
+
+    [Fact]
+    public void TestChromeTraceExport()
+    {
+        using var recorder = new PhaseRecorder();
+        PythonFrontend.Parse("print(1)");
+
+        using var stream = new MemoryStream();
+        recorder.WriteChromeTrace(stream);
+        var json = System.Text.Encoding.UTF8.GetString(stream.ToArray());
+
+        Assert.Contains("\"traceEvents\"", json);
+        Assert.Contains("\"ph\": \"X\"", json);
+        Assert.Contains("\"lex.py\"", json);
+    }
+}
@@ -0,0 +1,61 @@
+using PLT.CORE.IR;
+using PLT.CORE.Frontends.Python;
+using PLT.CORE.Optimization;
+
+namespace PLT.TESTS;
+
+public class TreeShakerTests
+{
+    private const string Source = @"def helper(x):
+    return x * 2
+
+def unused(y):
+    return helper(y)
+
+class Base:
+    pass
+
+class Thing(Base):
+    def go(self):
+        return helper(1)
+
+class Orphan:
+    pass
+
+def by_name():
+    return 3
+
+HANDLERS = {""a"": ""by_name""}
+print(Thing().go())
+";
+
+    private static IEnumerable<string> Defined(IrProgram program) =>
+        program.Body.Select(s => s switch
+        {
+            FunctionDefStmt f => f.FunctionName,
+            ClassDefStmt c => c.ClassName,
+            _ => null,
+        }).OfType<string>();
+
+    [Fact]
+    public void TestDropsUnreachableDefinitions()
+    {
+        var result = TreeShaker.Shake(PythonFrontend.Parse(Source));
+
+        // Base is reached through Thing, by_name through a string naming it.
+        Assert.Equal(new[] { "helper", "Base", "Thing", "by_name" }, Defined(result.Program));
+        Assert.Equal(new[] { "unused", "Orphan" }, result.Removed);
+    }
+
+    [Fact]
+    public void TestEntryPointsAndDynamicLookups()
+    {
+        var withEntry = TreeShaker.Shake(PythonFrontend.Parse(Source), new[] { "unused" });
+        Assert.Equal(new[] { "Orphan" }, withEntry.Removed);
+
+        var ast = PythonFrontend.Parse(Source + "print(globals()[\"Orphan\"])\n");
+        var dynamic = TreeShaker.Shake(ast);
+        Assert.True(dynamic.KeptEverything);
+        Assert.Same(ast, dynamic.Program);
+    }
+}
@@ -0,0 +1,8 @@
+# Builds a long string one piece at a time; see bench_string_accumulation.sh
+count = 100000
+s = ""
+i = 0
+while i < count:
+    s += "0123456789"
+    i += 1
+print(s[0:10])